@@ -0,0 +1,32 @@
+"""Add partial index for sampling owned cards per chat
+
+Revision ID: 20261018_0059
+Revises: 20260416_0058
+Create Date: 2026-10-18
+
+Adds a partial index on cards (chat_id, season_id, id) restricted to owned
+cards. Ride the Bus samples its card pool by random offsets into this index
+instead of loading every owned card in the chat, and the per-chat rarity
+histogram is computed from the same index.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_0059"
+down_revision = "20260416_0058"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_cards_chat_season_owned",
+        "cards",
+        ["chat_id", "season_id", "id"],
+        postgresql_where=sa.text("owner IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_cards_chat_season_owned", table_name="cards")
@@ -0,0 +1,38 @@
+"""Add unlogged rate_limit_counters table
+
+Revision ID: 20261018_0060
+Revises: 20261018_0059
+Create Date: 2026-10-18
+
+Backs the API rate limiter so limits are shared by every API worker instead
+of being counted per process. The table is UNLOGGED: counters skip the WAL
+and are truncated after a crash, which only resets the current windows.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_0060"
+down_revision = "20261018_0059"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_counters",
+        sa.Column("key", sa.Text(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        "idx_rate_limit_counters_expires_at",
+        "rate_limit_counters",
+        ["expires_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_rate_limit_counters_expires_at", table_name="rate_limit_counters")
+    op.drop_table("rate_limit_counters")
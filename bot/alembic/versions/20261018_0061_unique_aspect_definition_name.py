@@ -0,0 +1,67 @@
+"""Unique (name, set_id, season_id) on aspect_definitions
+
+Revision ID: 20261018_0061
+Revises: 20261018_0060
+Create Date: 2026-10-18
+
+Bulk catalog imports upsert definitions with INSERT ... ON CONFLICT, which
+needs a unique constraint on the natural key. Duplicates created before the
+constraint existed are merged into the oldest row: owned aspects and aspect
+counts are re-pointed to it and the extra definitions are deleted.
+"""
+
+from alembic import op
+
+revision = "20261018_0061"
+down_revision = "20261018_0060"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE aspect_definition_duplicates ON COMMIT DROP AS
+        SELECT id, keep_id
+        FROM (
+            SELECT id,
+                   min(id) OVER (PARTITION BY name, set_id, season_id) AS keep_id
+            FROM aspect_definitions
+        ) grouped
+        WHERE id <> keep_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE owned_aspects o
+        SET aspect_definition_id = d.keep_id
+        FROM aspect_definition_duplicates d
+        WHERE o.aspect_definition_id = d.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE aspect_counts c
+        SET definition_id = d.keep_id
+        FROM aspect_definition_duplicates d
+        WHERE c.definition_id = d.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM aspect_definitions a
+        USING aspect_definition_duplicates d
+        WHERE a.id = d.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_aspect_definitions_name_set_season",
+        "aspect_definitions",
+        ["name", "set_id", "season_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_aspect_definitions_name_set_season", "aspect_definitions", type_="unique"
+    )
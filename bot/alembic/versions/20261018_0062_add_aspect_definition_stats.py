@@ -0,0 +1,68 @@
+"""Add aspect_definition_stats counters table
+
+Revision ID: 20261018_0062
+Revises: 20261018_0061
+Create Date: 2026-10-18
+
+Denormalized owned/equipped/burned/recycled counts per aspect definition,
+kept current by the event pipeline so the admin catalog no longer runs a
+COUNT over owned_aspects per definition. Owned and equipped counts are
+backfilled from the live tables. Burned and recycled counts start at zero:
+burned and recycled aspects were hard-deleted, and earlier events did not
+record their definitions.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_0062"
+down_revision = "20261018_0061"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "aspect_definition_stats",
+        sa.Column(
+            "definition_id",
+            sa.BigInteger(),
+            sa.ForeignKey("aspect_definitions.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("season_id", sa.BigInteger(), nullable=False),
+        sa.Column("owned_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("equipped_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("burned_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("recycled_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "idx_aspect_definition_stats_season",
+        "aspect_definition_stats",
+        ["season_id"],
+    )
+
+    op.execute(
+        """
+        INSERT INTO aspect_definition_stats (definition_id, season_id, owned_count, equipped_count)
+        SELECT d.id,
+               d.season_id,
+               count(o.id),
+               count(ca.id)
+        FROM aspect_definitions d
+        LEFT JOIN owned_aspects o ON o.aspect_definition_id = d.id
+        LEFT JOIN card_aspects ca ON ca.aspect_id = o.id
+        GROUP BY d.id, d.season_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_aspect_definition_stats_season", table_name="aspect_definition_stats")
+    op.drop_table("aspect_definition_stats")
@@ -0,0 +1,141 @@
+"""Partition events by month; add hourly/daily event rollups
+
+Revision ID: 20261018_0063
+Revises: 20261018_0062
+Create Date: 2026-10-18
+
+Rebuilds ``events`` as a table range-partitioned on ``timestamp``: one
+partition per UTC month (``events_YYYY_MM``) from the oldest event through
+two months ahead, plus ``events_default`` as a catch-all. Existing rows are
+copied over while the old table is locked against writes (reads continue),
+so plan a quiet window on large databases. The primary key becomes
+``(id, timestamp)`` because a partitioned table's unique constraints must
+include the partition key; ids keep coming from ``events_id_seq``.
+
+Also adds ``event_rollups_hourly`` / ``event_rollups_daily`` (counts per
+bucket, event type, outcome and chat), backfilled from the existing events.
+"""
+
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_0063"
+down_revision = "20261018_0062"
+branch_labels = None
+depends_on = None
+
+_MONTHS_AHEAD = 2
+
+_EVENT_INDEXES = (
+    ("idx_events_type_outcome", "event_type, outcome"),
+    ("idx_events_user_timestamp", "user_id, timestamp"),
+    ("idx_events_chat_timestamp", "chat_id, timestamp"),
+    ("idx_events_card_id", "card_id"),
+    ("idx_events_aspect_id", "aspect_id"),
+)
+
+
+def _month_start(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    value = value.astimezone(datetime.timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime.datetime, months: int) -> datetime.datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _create_rollups() -> None:
+    for table, bucket_column in (
+        ("event_rollups_hourly", sa.Column("bucket", sa.DateTime(timezone=True), primary_key=True)),
+        ("event_rollups_daily", sa.Column("day", sa.Date(), primary_key=True)),
+    ):
+        op.create_table(
+            table,
+            bucket_column,
+            sa.Column("event_type", sa.Text(), primary_key=True),
+            sa.Column("outcome", sa.Text(), primary_key=True),
+            sa.Column("chat_id", sa.Text(), primary_key=True),
+            sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+        )
+    op.create_index(
+        "idx_event_rollups_hourly_type_bucket",
+        "event_rollups_hourly",
+        ["event_type", "outcome", "bucket"],
+    )
+    op.create_index(
+        "idx_event_rollups_daily_type_day",
+        "event_rollups_daily",
+        ["event_type", "outcome", "day"],
+    )
+    op.create_index(
+        "idx_event_rollups_daily_chat_day",
+        "event_rollups_daily",
+        ["chat_id", "day"],
+    )
+
+    op.execute(
+        """
+        INSERT INTO event_rollups_hourly (bucket, event_type, outcome, chat_id, count)
+        SELECT date_trunc('hour', timestamp AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+               event_type, outcome, chat_id, count(*)
+        FROM events
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO event_rollups_daily (day, event_type, outcome, chat_id, count)
+        SELECT (timestamp AT TIME ZONE 'UTC')::date, event_type, outcome, chat_id, count(*)
+        FROM events
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def _swap_events_table(partitioned: bool) -> None:
+    """Copy ``events`` into a new (partitioned or plain) table and swap it in."""
+    op.execute("LOCK TABLE events IN EXCLUSIVE MODE")
+    partition_by = " PARTITION BY RANGE (timestamp)" if partitioned else ""
+    op.execute(f"CREATE TABLE events_new (LIKE events INCLUDING DEFAULTS){partition_by}")
+
+    if partitioned:
+        bind = op.get_bind()
+        oldest = bind.execute(sa.text("SELECT min(timestamp) FROM events")).scalar()
+        now = datetime.datetime.now(datetime.timezone.utc)
+        month = _month_start(oldest or now)
+        last = _add_months(_month_start(now), _MONTHS_AHEAD)
+        while month <= last:
+            end = _add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE events_{month.year:04d}_{month.month:02d} PARTITION OF events_new "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            month = end
+        op.execute("CREATE TABLE events_default PARTITION OF events_new DEFAULT")
+
+    op.execute("INSERT INTO events_new SELECT * FROM events")
+    # Keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE events_id_seq OWNED BY events_new.id")
+    op.execute("DROP TABLE events")
+    op.execute("ALTER TABLE events_new RENAME TO events")
+
+    primary_key = "id, timestamp" if partitioned else "id"
+    op.execute(f"ALTER TABLE events ADD CONSTRAINT events_pkey PRIMARY KEY ({primary_key})")
+    for name, columns in _EVENT_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON events ({columns})")
+
+
+def upgrade() -> None:
+    _create_rollups()
+    _swap_events_table(partitioned=True)
+
+
+def downgrade() -> None:
+    _swap_events_table(partitioned=False)
+    op.drop_table("event_rollups_daily")
+    op.drop_table("event_rollups_hourly")
@@ -0,0 +1,37 @@
+"""Add backfill_checkpoints table
+
+Revision ID: 20261018_0064
+Revises: 20261018_0063
+Create Date: 2026-10-18
+
+Resume points for chunked maintenance backfills (first user:
+``tools/backfill_aspect_counts.py``). Each row records the last event id a
+named backfill has fully applied and the last event id the run covers.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_0064"
+down_revision = "20261018_0063"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backfill_checkpoints",
+        sa.Column("name", sa.Text(), primary_key=True),
+        sa.Column("last_event_id", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("end_event_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("backfill_checkpoints")
@@ -0,0 +1,40 @@
+"""Add slot icon version counters
+
+Revision ID: 20261018_0065
+Revises: 20261018_0064
+Create Date: 2026-10-18
+
+``users.slot_icon_version``, ``characters.slot_icon_version`` and
+``set_icons.icon_version`` are bumped whenever the icon is written.  Slot
+symbol bundle versions (and their ETags) are derived from these counters
+instead of hashing every icon blob in the database on each request.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261018_0065"
+down_revision = "20261018_0064"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("slot_icon_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "characters",
+        sa.Column("slot_icon_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "set_icons",
+        sa.Column("icon_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("set_icons", "icon_version")
+    op.drop_column("characters", "slot_icon_version")
+    op.drop_column("users", "slot_icon_version")
@@ -0,0 +1,44 @@
+"""Draw slot icon versions from a shared sequence
+
+Revision ID: 20261018_0066
+Revises: 20261018_0065
+Create Date: 2026-10-18
+
+Per-row counters restart at 0 when an icon row is deleted and recreated,
+which can reproduce an earlier bundle version (and ETag).  Every icon write
+now takes the next value of ``icon_version_seq`` instead, which is also the
+column default for new rows.  The sequence starts above every version
+already stored.
+"""
+
+from alembic import op
+
+revision = "20261018_0066"
+down_revision = "20261018_0065"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    ("users", "slot_icon_version"),
+    ("characters", "slot_icon_version"),
+    ("set_icons", "icon_version"),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE icon_version_seq")
+    op.execute(
+        "SELECT setval('icon_version_seq', GREATEST("
+        + ", ".join(f"(SELECT COALESCE(MAX({column}), 0) FROM {table})" for table, column in _COLUMNS)
+        + ") + 1, false)"
+    )
+    for table, column in _COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT nextval('icon_version_seq')"
+        )
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT 0")
+    op.execute("DROP SEQUENCE icon_version_seq")
@@ -8,9 +8,7 @@ operations asynchronously after responding to the client.
 import asyncio
 import base64
 import logging
-from typing import Optional
-
-from telegram.constants import ParseMode
+from typing import Any, Dict, List, Optional
 
 from api.config import (
     create_bot_instance,
@@ -46,7 +44,8 @@ from utils import rolling
 from utils.events import EventType, SpinOutcome, MegaspinOutcome, MinesweeperOutcome
 from repos import card_repo
 from repos import spin_repo
-from repos import thread_repo
+from managers import card_pool_manager
+from managers import chat_context_manager
 from managers import event_manager
 
 logger = logging.getLogger(__name__)
@@ -76,6 +75,7 @@ async def process_slots_victory_background(
     try:
         # Initialize bot
         from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+        from telegram.constants import ParseMode
 
         bot = create_bot_instance()
 
@@ -90,7 +90,7 @@ async def process_slots_victory_background(
         )
 
         # Get thread_id if available
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params = {
             "chat_id": chat_id,
@@ -151,13 +151,14 @@ async def process_slots_victory_background(
             )
 
             await asyncio.to_thread(card_repo.set_card_owner, card_id, username, user_id)
+            card_pool_manager.record_card_claimed(chat_id, normalized_rarity)
 
             # Mark that card was successfully generated and assigned
             card_generated_and_assigned = True
 
             # Log spin/megaspin card win event after successful card generation
             if is_megaspin:
-                event_manager.log(
+                event_manager.alog(
                     EventType.MEGASPIN,
                     MegaspinOutcome.CARD_WIN,
                     user_id=user_id,
@@ -170,7 +171,7 @@ async def process_slots_victory_background(
                     source_id=source_id,
                 )
             else:
-                event_manager.log(
+                event_manager.alog(
                     EventType.SPIN,
                     SpinOutcome.CARD_WIN,
                     user_id=user_id,
@@ -291,6 +292,8 @@ async def process_burn_notification(
     chat_id: str,
 ):
     """Send burn notification to chat in background after responding to client."""
+    from telegram.constants import ParseMode
+
     try:
         # Initialize bot
         bot = create_bot_instance()
@@ -304,7 +307,7 @@ async def process_burn_notification(
         )
 
         # Get thread_id if available
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params = {
             "chat_id": chat_id,
@@ -333,6 +336,8 @@ async def process_minesweeper_bet_notification(
     chat_id: str,
 ):
     """Send minesweeper bet notification to chat in background after responding to client."""
+    from telegram.constants import ParseMode
+
     try:
         # Initialize bot
         bot = create_bot_instance()
@@ -344,7 +349,7 @@ async def process_minesweeper_bet_notification(
         )
 
         # Get thread_id if available
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params = {
             "chat_id": chat_id,
@@ -375,6 +380,8 @@ async def process_rtb_result_notification(
     multiplier: float,
 ):
     """Send RTB game result notification to chat in background after responding to client."""
+    from telegram.constants import ParseMode
+
     from settings.constants import RTB_RESULT_MESSAGE
 
     try:
@@ -390,7 +397,7 @@ async def process_rtb_result_notification(
         )
 
         # Get thread_id if available
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params = {
             "chat_id": chat_id,
@@ -434,6 +441,7 @@ async def process_minesweeper_victory_background(
     try:
         # Initialize bot
         from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+        from telegram.constants import ParseMode
 
         bot = create_bot_instance()
 
@@ -445,7 +453,7 @@ async def process_minesweeper_victory_background(
         )
 
         # Get thread_id if available
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params = {
             "chat_id": chat_id,
@@ -477,9 +485,10 @@ async def process_minesweeper_victory_background(
             )
 
             await asyncio.to_thread(card_repo.set_card_owner, card_id, username, user_id)
+            card_pool_manager.record_card_claimed(chat_id, rarity)
 
             # Log minesweeper win event after successful card generation
-            event_manager.log(
+            event_manager.alog(
                 EventType.MINESWEEPER,
                 MinesweeperOutcome.WON,
                 user_id=user_id,
@@ -583,6 +592,8 @@ async def process_minesweeper_loss_background(
     card_title: str,
 ):
     """Process minesweeper loss in background after responding to client."""
+    from telegram.constants import ParseMode
+
     try:
         # Delete the bet card from database
         success = await asyncio.to_thread(card_repo.delete_card, bet_card_id)
@@ -591,6 +602,8 @@ async def process_minesweeper_loss_background(
             logger.error("Failed to delete bet card %s after minesweeper loss", bet_card_id)
             return
 
+        card_pool_manager.invalidate(chat_id)
+
         # Initialize bot
         bot = create_bot_instance()
 
@@ -601,7 +614,7 @@ async def process_minesweeper_loss_background(
         )
 
         # Get thread_id if available
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params = {
             "chat_id": chat_id,
@@ -673,6 +686,7 @@ async def process_slot_aspect_victory_background(
 
     try:
         from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+        from telegram.constants import ParseMode
 
         bot = create_bot_instance()
 
@@ -683,7 +697,7 @@ async def process_slot_aspect_victory_background(
             set_name=set_name.title(),
         )
 
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params = {
             "chat_id": chat_id,
@@ -739,7 +753,7 @@ async def process_slot_aspect_victory_background(
 
             # Log spin/megaspin aspect win event
             if is_megaspin:
-                event_manager.log(
+                event_manager.alog(
                     EventType.MEGASPIN,
                     MegaspinOutcome.ASPECT_WIN,
                     user_id=user_id,
@@ -752,7 +766,7 @@ async def process_slot_aspect_victory_background(
                     type="aspect",
                 )
             else:
-                event_manager.log(
+                event_manager.alog(
                     EventType.SPIN,
                     SpinOutcome.ASPECT_WIN,
                     user_id=user_id,
@@ -858,6 +872,57 @@ async def process_slot_aspect_victory_background(
             )
 
 
+async def process_slots_autospin_wins_background(
+    username: str,
+    chat_id: str,
+    user_id: int,
+    wins: List[Dict[str, Any]],
+    gemini_util_instance,
+):
+    """Generate the card and aspect wins of an auto-spin batch one at a time.
+
+    Each entry in ``wins`` has ``win_type`` ("card" or "aspect") and
+    ``rarity``; card wins also carry ``source_type``, ``source_id`` and
+    ``display_name``, aspect wins carry ``set_id``.  Every win reuses the
+    single-spin victory task (pending message, generation, refund on failure),
+    run sequentially so one batch does not flood the chat or the generator.
+    """
+    for win in wins:
+        try:
+            if win["win_type"] == "card":
+                await process_slots_victory_background(
+                    bot_token=TELEGRAM_TOKEN,
+                    debug_mode=DEBUG_MODE,
+                    username=username,
+                    normalized_rarity=win["rarity"],
+                    display_name=win["display_name"],
+                    chat_id=chat_id,
+                    source_type=win["source_type"],
+                    source_id=win["source_id"],
+                    user_id=user_id,
+                    gemini_util_instance=gemini_util_instance,
+                )
+            else:
+                await process_slot_aspect_victory_background(
+                    bot_token=TELEGRAM_TOKEN,
+                    debug_mode=DEBUG_MODE,
+                    username=username,
+                    normalized_rarity=win["rarity"],
+                    chat_id=chat_id,
+                    user_id=user_id,
+                    gemini_util_instance=gemini_util_instance,
+                    set_id=win.get("set_id"),
+                )
+        except Exception as exc:
+            logger.error(
+                "Error processing auto-spin %s win for user %s in chat %s: %s",
+                win.get("win_type"),
+                username,
+                chat_id,
+                exc,
+            )
+
+
 async def refund_slots_victory_failure(
     bot,
     bot_token: str,
@@ -871,6 +936,8 @@ async def refund_slots_victory_failure(
     thread_id: Optional[int] = None,
 ) -> bool:
     """Refund spins to the user and notify the chat about the failure."""
+    from telegram.constants import ParseMode
+
     if spin_amount <= 0:
         return False
 
@@ -907,7 +974,7 @@ async def refund_slots_victory_failure(
 
     try:
         if thread_id is None:
-            thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+            thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params = {
             "chat_id": chat_id,
@@ -945,6 +1012,8 @@ async def send_achievement_notification(
     Returns:
         True if notification was sent successfully, False otherwise.
     """
+    from telegram.constants import ParseMode
+
     from settings.constants import ACHIEVEMENT_NOTIFICATION_MESSAGE
     from repos import user_repo
 
@@ -958,7 +1027,7 @@ async def send_achievement_notification(
             return False
 
         # Get thread_id if available
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         # Build notification message
         achievement = user_achievement.achievement
@@ -1013,6 +1082,8 @@ async def process_claim_countdown(
 
     Rotates through fun messages during the delay, then reveals the claim button.
     Message rotation is best-effort; the final reveal is retried on failure.
+    Roll state is tracked in ``utils.roll_state``: ticks read the cached
+    snapshot, and a claim or reroll ends the countdown immediately.
 
     Args:
         chat_id: The chat where the message was sent.
@@ -1024,18 +1095,30 @@ async def process_claim_countdown(
     """
     import random
 
+    from telegram.constants import ParseMode
     from telegram.error import NetworkError, RetryAfter, TimedOut
 
+    from utils import roll_state
     from utils.roll_manager import RollManager
 
     bot = create_bot_instance()
 
+    initial_manager = RollManager(roll_type, roll_id)
+    try:
+        snapshot = await asyncio.to_thread(lambda: initial_manager.snapshot)
+    except Exception as exc:
+        logger.error("Fatal error in claim countdown (roll_id=%d): %s", roll_id, exc)
+        return
+    # Claim/lock/reroll paths publish state changes to this entry, so the
+    # rotation below reads cached state only and wakes up as soon as the
+    # roll is claimed or rerolled.
+    tracked = roll_state.track(roll_type, roll_id, snapshot)
+
     def get_manager_if_active() -> Optional[RollManager]:
-        """Return RollManager if item is still claimable, else None."""
-        manager = RollManager(roll_type, roll_id)
-        if not manager.is_valid() or manager.is_claimed() or manager.is_being_rerolled():
+        """Return a RollManager over the cached state if the item is still claimable."""
+        if not tracked.is_claimable:
             return None
-        return manager
+        return RollManager(roll_type, roll_id, snapshot=tracked.snapshot)
 
     try:
         # === Phase 1: Rotate messages during delay ===
@@ -1055,20 +1138,17 @@ async def process_claim_countdown(
         )
 
         # Get shuffled messages for rotation (type-appropriate)
-        manager_for_messages = RollManager(roll_type, roll_id)
-        messages = manager_for_messages.pre_claim_messages.copy()
+        messages = initial_manager.pre_claim_messages.copy()
         random.shuffle(messages)
 
         for i in range(num_iterations):
-            if get_manager_if_active() is None:
+            manager = get_manager_if_active()
+            if manager is None:
                 logger.debug("Claim countdown aborted early (roll_id=%d)", roll_id)
                 return
 
             # Best-effort caption update
             try:
-                manager = get_manager_if_active()
-                if manager is None:
-                    return
                 message_text = messages[i % len(messages)]
                 await bot.edit_message_caption(
                     chat_id=chat_id,
@@ -1079,18 +1159,24 @@ async def process_claim_countdown(
             except (RetryAfter, TimedOut, NetworkError, Exception):
                 pass  # Best effort, ignore failures
 
-            # Wait for interval, add leftover to final iteration
+            # Wait for interval, add leftover to final iteration. A state change
+            # ends the wait early; the next check decides whether to continue.
             sleep_time = interval + leftover if i == num_iterations - 1 else interval
-            await asyncio.sleep(sleep_time)
+            await tracked.wait_for_change(sleep_time)
 
         # Handle case where total_delay < interval (no iterations)
         if num_iterations == 0:
-            await asyncio.sleep(total_delay)
+            await tracked.wait_for_change(total_delay)
 
         if get_manager_if_active() is None:
             logger.debug("Claim countdown aborted after delay (roll_id=%d)", roll_id)
             return
 
+        # Confirm against the database once before revealing the button, in
+        # case the roll changed outside this process.
+        fresh_manager = RollManager(roll_type, roll_id)
+        tracked.snapshot = await asyncio.to_thread(lambda: fresh_manager.snapshot)
+
         # === Phase 2: Reveal claim button (critical, with retries) ===
         max_retries = 3
         base_delay = 1.0
@@ -1165,3 +1251,5 @@ async def process_claim_countdown(
 
     except Exception as exc:
         logger.error("Fatal error in claim countdown (roll_id=%d): %s", roll_id, exc)
+    finally:
+        roll_state.untrack(roll_type, roll_id, tracked)
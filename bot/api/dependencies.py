@@ -9,32 +9,80 @@ import hmac
 import hashlib
 import json
 import logging
+import threading
 import time
 import urllib.parse
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 
 from fastapi import Header, HTTPException
 
 from api.config import TELEGRAM_TOKEN
+from settings.constants import INIT_DATA_CACHE_SIZE
 from utils.models import ChatModel
 from utils.session import get_session
 from managers import auth_manager
 
 logger = logging.getLogger(__name__)
 
+# Init data older than this is rejected
+INIT_DATA_MAX_AGE_SECONDS = 24 * 60 * 60
+
+# HMAC key for init data signatures, derived from the bot token once
+_INIT_DATA_SECRET_KEY: Optional[bytes] = (
+    hmac.new(b"WebAppData", TELEGRAM_TOKEN.encode(), hashlib.sha256).digest()
+    if TELEGRAM_TOKEN
+    else None
+)
+
+# Validated init data string -> (parsed result, unix time it stops being valid).
+# The mini app sends the same init data on every request of a session, so
+# repeat validations are a dict lookup.  Only successful validations are cached.
+_init_data_cache: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_init_data_cache_lock = threading.Lock()
+
 
 def validate_telegram_init_data(init_data: str) -> Optional[Dict[str, Any]]:
     """
     Validate Telegram WebApp init data according to:
     https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app
 
+    Results are cached per init data string (LRU, ``INIT_DATA_CACHE_SIZE``
+    entries) until the data's ``auth_date`` is too old.  The returned
+    dictionary is shared between callers and must not be modified.
+
     Args:
         init_data: URL-encoded init data from Telegram WebApp
 
     Returns:
         Dictionary with parsed and validated data, or None if validation fails
     """
-    if not TELEGRAM_TOKEN:
+    now = time.time()
+    with _init_data_cache_lock:
+        entry = _init_data_cache.get(init_data)
+        if entry is not None:
+            if now < entry[1]:
+                _init_data_cache.move_to_end(init_data)
+                return entry[0]
+            del _init_data_cache[init_data]
+
+    validated = _verify_init_data(init_data)
+    if validated is None:
+        return None
+
+    auth_date = validated.get("auth_date")
+    expires_at = (int(auth_date) if auth_date else now) + INIT_DATA_MAX_AGE_SECONDS
+    with _init_data_cache_lock:
+        _init_data_cache[init_data] = (validated, expires_at)
+        _init_data_cache.move_to_end(init_data)
+        while len(_init_data_cache) > INIT_DATA_CACHE_SIZE:
+            _init_data_cache.popitem(last=False)
+    return validated
+
+
+def _verify_init_data(init_data: str) -> Optional[Dict[str, Any]]:
+    """Check the init data signature and age, and parse it (uncached)."""
+    if _INIT_DATA_SECRET_KEY is None:
         logger.error("Bot token not available for init data validation")
         return None
 
@@ -58,11 +106,10 @@ def validate_telegram_init_data(init_data: str) -> Optional[Dict[str, Any]]:
 
         data_check_string = "\n".join(data_check_string_parts)
 
-        # Create secret key from bot token
-        secret_key = hmac.new(b"WebAppData", TELEGRAM_TOKEN.encode(), hashlib.sha256).digest()
-
         # Calculate expected hash
-        expected_hash = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+        expected_hash = hmac.new(
+            _INIT_DATA_SECRET_KEY, data_check_string.encode(), hashlib.sha256
+        ).hexdigest()
 
         # Verify hash
         if not hmac.compare_digest(received_hash, expected_hash):
@@ -85,7 +132,7 @@ def validate_telegram_init_data(init_data: str) -> Optional[Dict[str, Any]]:
                 auth_timestamp = int(auth_date)
                 current_timestamp = int(time.time())
                 # Check if auth_date is not older than 24 hours
-                if current_timestamp - auth_timestamp > 24 * 60 * 60:
+                if current_timestamp - auth_timestamp > INIT_DATA_MAX_AGE_SECONDS:
                     logger.warning("Init data is too old (older than 24 hours)")
                     return None
             except (ValueError, TypeError):
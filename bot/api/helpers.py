@@ -11,7 +11,7 @@ import urllib.parse
 from datetime import datetime, timezone
 from typing import List, Optional, Set
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 
 from api.config import MINIAPP_URL
 from api.schemas import SlotSymbolInfo
@@ -206,3 +206,23 @@ def generate_slot_loss_pattern(
         same_symbol = symbols[same_idx]
         different_symbol = _weighted_choice_symbol({same_idx}, [same_idx])
         return [same_symbol, same_symbol, different_symbol]  # [a, a, b]
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Return True if an ``If-None-Match`` header covers ``etag``."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return etag in candidates or f"W/{etag}" in candidates or "*" in candidates
+
+
+def etag_json_response(etag: str, body: Optional[bytes] = None) -> Response:
+    """Return pre-serialized JSON tagged with ``etag``, or ``304`` when ``body`` is None.
+
+    ``Cache-Control: no-cache`` makes clients revalidate on every use, so a
+    changed bundle is seen immediately while an unchanged one costs no body.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -3,10 +3,168 @@ Rate limiter configuration for the API server.
 
 This module provides a global rate limiter instance that can be imported
 by any router to apply rate limits to endpoints.
+
+The API runs as several gunicorn workers, so counters live in Postgres
+(``rate_limit_counters``, see ``repos/rate_limit_repo.py``) rather than in
+each worker's memory; otherwise every limit would be multiplied by the
+worker count and reset whenever a worker is recycled. If the database is
+unreachable slowapi falls back to per-worker in-memory counters until it
+recovers. Set ``RATE_LIMIT_STORAGE`` to ``"memory"`` to use in-memory
+counters only (single-worker development).
+
+The counter queries are blocking. slowapi checks limits inline, which for an
+``async def`` route means on the event loop, so ``limiter.limit`` runs the
+check for async routes in a worker thread first (sync routes already run in
+Starlette's threadpool).
+
+Clients are identified by their Telegram user id when the request carries
+valid init data, and by IP address otherwise.
 """
 
+import asyncio
+import functools
+import ipaddress
+import logging
+import threading
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.requests import Request
+from limits.storage import Storage
+
+from api.dependencies import extract_init_data_from_header, validate_telegram_init_data
+from repos import rate_limit_repo
+from settings.constants import RATE_LIMIT_STORAGE
+
+logger = logging.getLogger(__name__)
+
+# How often a worker deletes expired counters (seconds)
+_PURGE_INTERVAL_SECONDS = 300
+
+
+class PostgresCounterStorage(Storage):
+    """``limits`` storage keeping fixed-window counters in Postgres.
+
+    Registered under the ``pgcounter://`` scheme. Every hit is one atomic
+    upsert, so all API workers share the same windows.
+    """
+
+    STORAGE_SCHEME = ["pgcounter"]
+
+    def __init__(self, uri=None, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._purge_lock = threading.Lock()
+        self._next_purge_at = time.monotonic() + _PURGE_INTERVAL_SECONDS
+
+    @property
+    def base_exceptions(self):
+        return SQLAlchemyError
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        count = rate_limit_repo.increment(key, int(expiry), amount)
+        self._maybe_purge()
+        return count
+
+    def get(self, key: str) -> int:
+        return rate_limit_repo.get_count(key)
+
+    def get_expiry(self, key: str) -> float:
+        expires_at = rate_limit_repo.get_expiry(key)
+        return expires_at.timestamp() if expires_at is not None else time.time()
+
+    def check(self) -> bool:
+        try:
+            rate_limit_repo.get_count("__health__")
+            return True
+        except SQLAlchemyError:
+            return False
+
+    def reset(self) -> int:
+        return rate_limit_repo.clear_all()
+
+    def clear(self, key: str) -> None:
+        rate_limit_repo.clear(key)
+
+    def _maybe_purge(self) -> None:
+        now = time.monotonic()
+        if now < self._next_purge_at or not self._purge_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_purge_at = now + _PURGE_INTERVAL_SECONDS
+            removed = rate_limit_repo.purge_expired()
+            if removed:
+                logger.debug("Purged %d expired rate limit counters", removed)
+        except SQLAlchemyError as e:
+            logger.warning("Failed to purge expired rate limit counters: %s", e)
+        finally:
+            self._purge_lock.release()
+
+
+def _client_ip(request: Request) -> str:
+    """Client address, taken from nginx's ``X-Real-IP`` when proxied.
+
+    The header is only trusted when the direct peer is a private address
+    (the reverse proxy on the Docker network); a client connecting to the
+    API port directly could otherwise pick its own key.
+    """
+    peer = get_remote_address(request)
+    real_ip = request.headers.get("X-Real-IP")
+    if real_ip:
+        try:
+            if ipaddress.ip_address(peer).is_private:
+                return real_ip.strip()
+        except ValueError:
+            pass
+    return peer
+
+
+def rate_limit_key(request: Request) -> str:
+    """Rate limit key: the Telegram user id if authenticated, else the client IP."""
+    init_data = extract_init_data_from_header(request.headers.get("Authorization"))
+    if init_data:
+        validated = validate_telegram_init_data(init_data)
+        user_id = ((validated or {}).get("user") or {}).get("id")
+        if isinstance(user_id, int):
+            return f"user:{user_id}"
+    return f"ip:{_client_ip(request)}"
+
+
+class ThreadedCheckLimiter(Limiter):
+    """slowapi ``Limiter`` that never touches the counter storage on the event loop."""
+
+    def limit(self, limit_value, *args, **kwargs):
+        decorator = super().limit(limit_value, *args, **kwargs)
+
+        def wrap(func):
+            limited = decorator(func)
+            if not asyncio.iscoroutinefunction(func):
+                return limited
+
+            @functools.wraps(limited)
+            async def offloaded(*f_args, **f_kwargs):
+                request = f_kwargs.get("request")
+                if (
+                    self.enabled
+                    and self._auto_check
+                    and isinstance(request, Request)
+                    and not getattr(request.state, "_rate_limiting_complete", False)
+                ):
+                    # Same check slowapi's async wrapper would run inline; the
+                    # flag makes that wrapper skip it and only add the headers
+                    await asyncio.to_thread(self._check_request_limit, request, func, False)
+                    request.state._rate_limiting_complete = True
+                return await limited(*f_args, **f_kwargs)
+
+            return offloaded
+
+        return wrap
+
 
-# Global rate limiter instance using client IP as the key
-limiter = Limiter(key_func=get_remote_address)
+# Global rate limiter instance shared by all routers
+limiter = ThreadedCheckLimiter(
+    key_func=rate_limit_key,
+    storage_uri="pgcounter://" if RATE_LIMIT_STORAGE == "postgres" else "memory://",
+    in_memory_fallback_enabled=RATE_LIMIT_STORAGE == "postgres",
+)
@@ -5,6 +5,7 @@ This module exports all API routers for use in the main FastAPI application.
 """
 
 from api.routers.aspects import router as aspects_router
+from api.routers.assets import router as assets_router
 from api.routers.cards import router as cards_router
 from api.routers.chat import router as chat_router
 from api.routers.downloads import router as downloads_router
@@ -19,6 +20,7 @@ from api.routers.admin_types import router as admin_types_router
 
 __all__ = [
     "aspects_router",
+    "assets_router",
     "cards_router",
     "chat_router",
     "downloads_router",
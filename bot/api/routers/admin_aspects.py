@@ -5,20 +5,24 @@ All routes require a valid admin JWT (``Depends(get_admin_user)``).
 
 import asyncio
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from api.dependencies import get_admin_user
 from api.schemas import (
     AdminAspectDefCreateRequest,
     AdminAspectDefResponse,
     AdminAspectDefUpdateRequest,
+    AdminAspectStatsRebuildResponse,
     AdminBulkAspectDefRequest,
     AdminBulkAspectDefResponse,
+    AdminBulkAspectDefResult,
 )
+from repos import aspect_definition_stats_repo
 from repos import aspect_repo
 from repos import set_repo
+from utils.schemas import AspectDefinition, AspectDefinitionStats
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +33,7 @@ router = APIRouter(prefix="/admin/aspects", tags=["admin-aspects"])
 
 
 def _definition_to_response(
-    defn: "AspectDefinition",
+    defn: AspectDefinition,
     owned_count: int = 0,
 ) -> AdminAspectDefResponse:
     """Convert an ``AspectDefinition`` Pydantic DTO to an API response."""
@@ -45,6 +49,23 @@ def _definition_to_response(
     )
 
 
+def _stats_to_response(stats: AspectDefinitionStats) -> AdminAspectDefResponse:
+    """Convert an ``AspectDefinitionStats`` DTO to an API response."""
+    return AdminAspectDefResponse(
+        id=stats.definition_id,
+        name=stats.name,
+        rarity=stats.rarity,
+        set_id=stats.set_id,
+        season_id=stats.season_id,
+        type_id=stats.type_id,
+        created_at=stats.created_at,
+        owned_count=stats.owned_count,
+        equipped_count=stats.equipped_count,
+        burned_count=stats.burned_count,
+        recycled_count=stats.recycled_count,
+    )
+
+
 # ── Endpoints ────────────────────────────────────────────────────────────────
 
 
@@ -57,15 +78,44 @@ async def list_aspect_definitions_for_set(
     season_id: int,
     _admin: Dict[str, Any] = Depends(get_admin_user),
 ):
-    """Return all aspect definitions belonging to a set, with per-definition owned counts."""
-    defs = await asyncio.to_thread(aspect_repo.get_aspect_definitions_by_set, set_id, season_id)
+    """Return all aspect definitions belonging to a set, with per-definition counters."""
+    stats = await asyncio.to_thread(
+        aspect_definition_stats_repo.get_stats, season_id=season_id, set_id=set_id
+    )
+    return [_stats_to_response(st) for st in stats]
 
-    results = []
-    for d in defs:
-        count = await asyncio.to_thread(aspect_repo.get_owned_count_for_definition, d.id)
-        results.append(_definition_to_response(d, count))
 
-    return results
+@router.get("/stats", response_model=List[AdminAspectDefResponse])
+async def list_aspect_definition_stats(
+    season_id: Optional[int] = Query(None),
+    set_id: Optional[int] = Query(None),
+    _admin: Dict[str, Any] = Depends(get_admin_user),
+):
+    """Return every aspect definition with its counters in one query.
+
+    Counters come from the ``aspect_definition_stats`` table, which the
+    event pipeline keeps current. Optionally filtered by season and/or set.
+    """
+    stats = await asyncio.to_thread(
+        aspect_definition_stats_repo.get_stats, season_id=season_id, set_id=set_id
+    )
+    return [_stats_to_response(st) for st in stats]
+
+
+@router.post("/stats/rebuild", response_model=AdminAspectStatsRebuildResponse)
+async def rebuild_aspect_definition_stats(
+    season_id: Optional[int] = Query(None),
+    _admin: Dict[str, Any] = Depends(get_admin_user),
+):
+    """Recompute owned/equipped counters from the live tables.
+
+    A repair tool for counters that drifted (e.g. events lost while the
+    listener was down); burned and recycled counters are left unchanged.
+    """
+    rebuilt = await asyncio.to_thread(
+        aspect_definition_stats_repo.rebuild_live_counts, season_id
+    )
+    return AdminAspectStatsRebuildResponse(rebuilt=rebuilt)
 
 
 @router.post("", response_model=AdminAspectDefResponse, status_code=201)
@@ -96,14 +146,18 @@ async def create_aspect_definition(
             detail=f"Aspect '{body.name}' already exists in set {body.set_id}",
         )
 
-    defn = await asyncio.to_thread(
-        aspect_repo.create_aspect_definition,
-        set_id=body.set_id,
-        name=body.name,
-        rarity=body.rarity,
-        season_id=body.season_id,
-        type_id=body.type_id,
-    )
+    try:
+        defn = await asyncio.to_thread(
+            aspect_repo.create_aspect_definition,
+            set_id=body.set_id,
+            name=body.name,
+            rarity=body.rarity,
+            season_id=body.season_id,
+            type_id=body.type_id,
+        )
+    except ValueError as e:
+        # A concurrent create won the race past the check above
+        raise HTTPException(status_code=409, detail=str(e))
     return _definition_to_response(defn)
 
 
@@ -113,20 +167,31 @@ async def update_aspect_definition(
     body: AdminAspectDefUpdateRequest,
     _admin: Dict[str, Any] = Depends(get_admin_user),
 ):
-    """Update an existing aspect definition's fields."""
-    updated = await asyncio.to_thread(
-        aspect_repo.update_aspect_definition,
-        definition_id,
-        name=body.name,
-        rarity=body.rarity,
-        set_id=body.set_id,
-        type_id=body.type_id,
-    )
+    """Update an existing aspect definition's fields.
+
+    Fails with 409 if the new name already exists in the (new) set.
+    """
+    try:
+        updated = await asyncio.to_thread(
+            aspect_repo.update_aspect_definition,
+            definition_id,
+            name=body.name,
+            rarity=body.rarity,
+            set_id=body.set_id,
+            type_id=body.type_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if updated is None:
         raise HTTPException(status_code=404, detail="Aspect definition not found")
 
-    count = await asyncio.to_thread(aspect_repo.get_owned_count_for_definition, definition_id)
-    return _definition_to_response(updated, count)
+    stats = await asyncio.to_thread(
+        aspect_definition_stats_repo.get_stats_for_definition, definition_id
+    )
+    if stats is None:
+        # Deleted between the update and the read
+        raise HTTPException(status_code=404, detail="Aspect definition not found")
+    return _stats_to_response(stats)
 
 
 @router.delete("/{definition_id}")
@@ -153,13 +218,30 @@ async def bulk_upsert_aspect_definitions(
     """Bulk insert or update aspect definitions for a season.
 
     Existing definitions (matched by ``name + set_id + season_id``) have their
-    rarity updated; new ones are inserted.
+    rarity updated; new ones are inserted. Each definition's outcome is
+    reported in ``results``.
     """
     items = [item.model_dump() for item in body.definitions]
-    count = await asyncio.to_thread(
+    upserts = await asyncio.to_thread(
         aspect_repo.bulk_upsert_aspect_definitions, items, body.season_id
     )
-    return AdminBulkAspectDefResponse(upserted=count)
+    results = [
+        AdminBulkAspectDefResult(
+            id=u.id,
+            set_id=u.set_id,
+            name=u.name,
+            rarity=u.rarity,
+            status="inserted" if u.inserted else "updated",
+        )
+        for u in upserts
+    ]
+    inserted = sum(1 for u in upserts if u.inserted)
+    return AdminBulkAspectDefResponse(
+        upserted=len(results),
+        inserted=inserted,
+        updated=len(results) - inserted,
+        results=results,
+    )
 
 
 @router.get("/{definition_id}/stats")
@@ -168,18 +250,20 @@ async def aspect_definition_stats(
     _admin: Dict[str, Any] = Depends(get_admin_user),
 ):
     """Return usage statistics for a single aspect definition."""
-    defn = await asyncio.to_thread(aspect_repo.get_aspect_definition_by_id, definition_id)
-    if defn is None:
+    stats = await asyncio.to_thread(
+        aspect_definition_stats_repo.get_stats_for_definition, definition_id
+    )
+    if stats is None:
         raise HTTPException(status_code=404, detail="Aspect definition not found")
 
-    owned_count = await asyncio.to_thread(
-        aspect_repo.get_owned_count_for_definition, definition_id
-    )
     return {
-        "definition_id": defn.id,
-        "name": defn.name,
-        "rarity": defn.rarity,
-        "set_id": defn.set_id,
-        "season_id": defn.season_id,
-        "owned_count": owned_count,
+        "definition_id": stats.definition_id,
+        "name": stats.name,
+        "rarity": stats.rarity,
+        "set_id": stats.set_id,
+        "season_id": stats.season_id,
+        "owned_count": stats.owned_count,
+        "equipped_count": stats.equipped_count,
+        "burned_count": stats.burned_count,
+        "recycled_count": stats.recycled_count,
     }
@@ -16,6 +16,7 @@ from api.schemas import (
     AdminSetResponse,
     AdminSetUpdateRequest,
 )
+from managers import slot_symbol_manager
 from repos import aspect_repo
 from repos import set_repo
 from repos import set_icon_repo
@@ -137,6 +138,7 @@ async def update_set(
     updated = await asyncio.to_thread(_do_update)
     if updated is None:
         raise HTTPException(status_code=404, detail="Set not found")
+    slot_symbol_manager.invalidate_sets()
 
     counts = await asyncio.to_thread(aspect_repo.get_aspect_definition_count_per_set, season_id)
     icon_b64 = await asyncio.to_thread(set_icon_repo.get_icon_b64, set_id, season_id)
@@ -165,6 +167,7 @@ async def delete_set_endpoint(
             raise HTTPException(status_code=404, detail="Set not found")
 
     await asyncio.to_thread(_do_delete)
+    slot_symbol_manager.invalidate_sets()
     return None
 
 
@@ -203,4 +206,5 @@ def _generate_and_store_icon(
     icon_b64 = generate_set_slot_icon(set_name, set_description)
     if icon_b64:
         set_icon_repo.upsert_icon(set_id, season_id, base64.b64decode(icon_b64))
+        slot_symbol_manager.invalidate_sets()
     return icon_b64
@@ -50,9 +50,9 @@ from repos import card_repo
 from repos import claim_repo
 from repos import equip_session_repo
 from repos import spin_repo
-from repos import thread_repo
 from repos import user_repo
 from managers import aspect_manager
+from managers import chat_context_manager
 from managers import event_manager
 from utils.events import EventType, BurnOutcome, LockOutcome
 
@@ -346,7 +346,7 @@ async def equip_initiate(
     # Send to group chat
     try:
         bot = create_bot_instance()
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params: Dict[str, Any] = {
             "chat_id": chat_id,
@@ -415,7 +415,7 @@ async def share_aspect(
         if aspect.owner and aspect.owner != username:
             message += f"\n\n<i>Owned by @{aspect.owner}</i>"
 
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, aspect_chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, aspect_chat_id)
 
         send_params = {
             "chat_id": aspect_chat_id,
@@ -544,13 +544,14 @@ async def burn_aspect(
         new_spin_total,
     )
 
-    event_manager.log(
+    event_manager.alog(
         EventType.BURN,
         BurnOutcome.SUCCESS,
         user_id=auth_user_id,
         chat_id=chat_id,
         aspect_id=aspect_id,
         rarity=aspect.rarity,
+        aspect_definition_id=aspect.aspect_definition_id,
         spin_reward=reward,
         new_spin_total=new_spin_total,
     )
@@ -568,7 +569,7 @@ async def burn_aspect(
         burn_text = f"@{username} burned an aspect:\n\n<b>{header}</b>\n\nReward: <b>{reward} spins</b>"
 
         bot = create_bot_instance()
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
 
         send_params: Dict[str, Any] = {
             "chat_id": chat_id,
@@ -669,7 +670,7 @@ async def lock_aspect(
     action = "locked" if new_lock_state else "unlocked"
     logger.info("User %s %s aspect %s", auth_user_id, action, aspect_id)
 
-    event_manager.log(
+    event_manager.alog(
         EventType.LOCK,
         LockOutcome.LOCKED if new_lock_state else LockOutcome.UNLOCKED,
         user_id=auth_user_id,
@@ -0,0 +1,32 @@
+"""
+Static asset endpoints.
+
+Serves the images bundled under ``bot/data/`` from the in-memory asset
+registry.  URLs embed a content fingerprint (see ``utils.assets``), so
+responses are marked immutable and cached by clients permanently.
+"""
+
+from fastapi import APIRouter, HTTPException, Response
+
+from utils import assets
+
+router = APIRouter(prefix="/assets", tags=["assets"])
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{namespace}/{filename}")
+async def get_static_asset(namespace: str, filename: str):
+    """Return a bundled asset by its fingerprinted file name."""
+    asset = assets.find_by_filename(namespace, filename)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    return Response(
+        content=asset.data,
+        media_type=asset.mime_type,
+        headers={
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "ETag": f'"{asset.fingerprint}"',
+        },
+    )
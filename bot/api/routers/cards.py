@@ -15,7 +15,6 @@ import urllib.parse
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from telegram.constants import ParseMode
 
 from api.config import (
     create_bot_instance,
@@ -42,8 +41,8 @@ from utils.miniapp import encode_single_card_token
 from utils.schemas import Card as APICard
 from repos import card_repo
 from repos import claim_repo
-from repos import thread_repo
 from repos import user_repo
+from managers import chat_context_manager
 from managers import event_manager
 from utils.events import EventType, LockOutcome
 from utils.download_token import validate_download_token
@@ -145,6 +144,7 @@ async def share_card(
 
     try:
         from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+        from telegram.constants import ParseMode
 
         share_token = encode_single_card_token(request.card_id)
         share_url = MINIAPP_URL
@@ -164,7 +164,7 @@ async def share_card(
             message += f"\n\n<i>Owned by @{card.owner}</i>"
 
         # Get thread_id if available
-        thread_id = await asyncio.to_thread(thread_repo.get_thread_id, card_chat_id)
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, card_chat_id)
 
         send_params = {
             "chat_id": card_chat_id,
@@ -375,7 +375,7 @@ async def lock_card(
     action = "locked" if request.lock else "unlocked"
     logger.info("User %s %s card %s", auth_user_id, action, card_id)
 
-    event_manager.log(
+    event_manager.alog(
         EventType.LOCK,
         LockOutcome.LOCKED if request.lock else LockOutcome.UNLOCKED,
         user_id=auth_user_id,
@@ -5,16 +5,15 @@ This module contains all endpoints for chat operations.
 """
 
 import asyncio
-import base64
 import logging
-import os
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 
 from api.dependencies import get_validated_user
+from api.helpers import etag_json_response, etag_matches
 from api.schemas import SlotSymbolSummary
-from repos import user_repo
+from managers import slot_symbol_manager
 
 logger = logging.getLogger(__name__)
 
@@ -24,43 +23,22 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 @router.get("/{chat_id}/slot-symbols", response_model=List[SlotSymbolSummary])
 async def get_slot_symbols_endpoint(
     chat_id: str,
+    if_none_match: Optional[str] = Header(None),
     validated_user: Dict[str, Any] = Depends(get_validated_user),
 ):
-    """Get all slot symbols (users, characters, and claim) for a specific chat with their display names and icons."""
-    try:
-        # Get users and characters data from database
-        data = await asyncio.to_thread(user_repo.get_chat_users_and_characters, chat_id)
-
-        # Load claim icon from file
-        claim_icon_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "data",
-            "slots",
-            "claim_icon.png",
-        )
+    """Get all slot symbols (users, characters, and claim) for a specific chat with their display names and icons.
 
-        claim_icon_b64: Optional[str] = None
-        try:
-            with open(claim_icon_path, "rb") as f:
-                claim_icon_bytes = f.read()
-                claim_icon_b64 = base64.b64encode(claim_icon_bytes).decode("utf-8")
-        except Exception as e:
-            logger.error(f"Failed to load claim icon: {e}")
-            # Continue without claim icon rather than failing the whole request
-
-        # Add claim point as a special symbol if icon was loaded successfully
-        if claim_icon_b64:
-            # Use a special ID that won't conflict with user/character IDs (e.g., -1)
-            claim_symbol = {
-                "id": -1,
-                "display_name": "Claim",
-                "slot_icon_b64": claim_icon_b64,
-                "type": "claim",
-            }
-            data.append(claim_symbol)
+    The bundle is cached per chat and versioned; clients sending the previous
+    ``ETag`` in ``If-None-Match`` get ``304 Not Modified`` while it is current.
+    """
+    try:
+        version = await asyncio.to_thread(slot_symbol_manager.get_chat_bundle_version, chat_id)
+        etag = f'"{version}"'
+        if etag_matches(etag, if_none_match):
+            return etag_json_response(etag)
 
-        # Convert to response models and return directly
-        return [SlotSymbolSummary(**item) for item in data]
+        bundle = await asyncio.to_thread(slot_symbol_manager.get_chat_bundle, chat_id, version)
+        return etag_json_response(bundle.etag, bundle.body)
 
     except Exception as e:
         logger.error(f"Error fetching slot symbols for chat_id {chat_id}: {e}")
@@ -118,7 +118,7 @@ async def minesweeper_game(
             )
 
         # Load minesweeper icons
-        claim_point_icon, mine_icon = await asyncio.to_thread(minesweeper.get_minesweeper_icons)
+        claim_point_icon_url, mine_icon_url = minesweeper.get_minesweeper_icon_urls()
 
         started_timestamp = ensure_utc(game.started_timestamp)
         last_updated_timestamp = ensure_utc(game.last_updated_timestamp)
@@ -143,8 +143,8 @@ async def minesweeper_game(
             mine_positions=mine_positions,
             claim_point_positions=visible_claim_points,
             card_icon=card_icon,
-            claim_point_icon=claim_point_icon,
-            mine_icon=mine_icon,
+            claim_point_icon_url=claim_point_icon_url,
+            mine_icon_url=mine_icon_url,
             next_refresh_time=next_refresh_time,
         )
 
@@ -298,7 +298,7 @@ async def minesweeper_create(
             raise HTTPException(status_code=500, detail="Failed to start game")
 
         # Log game created
-        event_manager.log(
+        event_manager.alog(
             EventType.MINESWEEPER,
             MinesweeperOutcome.CREATED,
             user_id=request.user_id,
@@ -348,7 +348,7 @@ async def minesweeper_create(
             )
 
         # Load minesweeper icons
-        claim_point_icon, mine_icon = await asyncio.to_thread(minesweeper.get_minesweeper_icons)
+        claim_point_icon_url, mine_icon_url = minesweeper.get_minesweeper_icon_urls()
 
         started_timestamp = ensure_utc(game.started_timestamp)
         last_updated_timestamp = ensure_utc(game.last_updated_timestamp)
@@ -373,8 +373,8 @@ async def minesweeper_create(
             mine_positions=mine_positions,
             claim_point_positions=visible_claim_points,
             card_icon=card_icon,
-            claim_point_icon=claim_point_icon,
-            mine_icon=mine_icon,
+            claim_point_icon_url=claim_point_icon_url,
+            mine_icon_url=mine_icon_url,
             next_refresh_time=next_refresh_time,
         )
 
@@ -599,7 +599,7 @@ async def minesweeper_update(
                 set(updated_game.revealed_cells) & set(updated_game.claim_point_positions)
             )
             # Log loss event
-            event_manager.log(
+            event_manager.alog(
                 EventType.MINESWEEPER,
                 MinesweeperOutcome.LOST,
                 user_id=request.user_id,
@@ -169,7 +169,7 @@ async def start_rtb_game(
         raise HTTPException(status_code=400, detail=error or "Failed to create game")
 
     # Log game started
-    event_manager.log(
+    event_manager.alog(
         EventType.RTB,
         RtbOutcome.STARTED,
         user_id=request.user_id,
@@ -234,7 +234,7 @@ async def make_rtb_guess(
         )
         message = f"🎉 Correct! You won {payout} spins!"
         # Log win event
-        event_manager.log(
+        event_manager.alog(
             EventType.RTB,
             RtbOutcome.WON,
             user_id=request.user_id,
@@ -262,7 +262,7 @@ async def make_rtb_guess(
     else:
         message = f"❌ Wrong! Next card was {actual}. You lost {updated_game.bet_amount} spins."
         # Log loss event
-        event_manager.log(
+        event_manager.alog(
             EventType.RTB,
             RtbOutcome.LOST,
             user_id=request.user_id,
@@ -327,7 +327,7 @@ async def cash_out_rtb_game(
     )
 
     # Log cash out event
-    event_manager.log(
+    event_manager.alog(
         EventType.RTB,
         RtbOutcome.CASHED_OUT,
         user_id=request.user_id,
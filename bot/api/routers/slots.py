@@ -11,17 +11,23 @@ import asyncio
 import logging
 import random
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
 from api.background_tasks import (
+    process_slots_autospin_wins_background,
     process_slots_victory_background,
     process_slot_aspect_victory_background,
 )
 from api.config import DEBUG_MODE, TELEGRAM_TOKEN, gemini_util
 from api.dependencies import get_validated_user, validate_user_in_chat, verify_user_match
-from api.helpers import generate_slot_loss_pattern, normalize_rarity
+from api.helpers import (
+    etag_json_response,
+    etag_matches,
+    generate_slot_loss_pattern,
+    normalize_rarity,
+)
 from api.schemas import (
     ConsumeSpinResponse,
     DailyBonusClaimResponse,
@@ -29,6 +35,8 @@ from api.schemas import (
     MegaspinInfo,
     SlotSymbolInfo,
     SlotSymbolSummary,
+    SlotsAutoSpinRequest,
+    SlotsAutoSpinResponse,
     SlotsClaimWinRequest,
     SlotsClaimWinResponse,
     SlotsVictoryRequest,
@@ -38,18 +46,24 @@ from api.schemas import (
     SpinsRequest,
     SpinsResponse,
 )
-from settings.constants import SLOT_ASPECT_WIN_CHANCE, SLOT_CLAIM_CHANCE, SLOT_CARD_WIN_CHANCE
+from settings.constants import (
+    SLOT_ASPECT_WIN_CHANCE,
+    SLOT_CARD_WIN_CHANCE,
+    SLOT_CLAIM_CHANCE,
+    SLOT_MAX_AUTOSPIN,
+)
 from utils.rolling import get_random_rarity
 from repos import character_repo
 from repos import claim_repo
 from repos import aspect_repo
-from repos import set_icon_repo
 from repos import set_repo
 from repos import spin_repo
 from repos import user_repo
 from managers import event_manager
+from managers import slot_symbol_manager
 from managers import spin_manager
 from utils.events import EventType, SpinOutcome, MegaspinOutcome
+from utils.schemas import Megaspins, SpinConsumption
 
 logger = logging.getLogger(__name__)
 
@@ -156,6 +170,15 @@ async def claim_daily_bonus(
         raise HTTPException(status_code=500, detail="Failed to claim daily bonus")
 
 
+def _build_megaspin_info(megaspins: Megaspins) -> MegaspinInfo:
+    """Convert a Megaspins DTO into the API's MegaspinInfo payload."""
+    return MegaspinInfo(
+        spins_until_megaspin=megaspins.spins_until_megaspin,
+        total_spins_required=spin_repo._get_spins_for_megaspin(),
+        megaspin_available=megaspins.megaspin_available,
+    )
+
+
 @router.post("/spins", response_model=ConsumeSpinResponse)
 async def consume_user_spin(
     request: SpinsRequest,
@@ -167,62 +190,20 @@ async def consume_user_spin(
         await verify_user_match(request.user_id, validated_user)
         await validate_user_in_chat(request.user_id, request.chat_id)
 
-        # Attempt to consume a spin
-        success = await asyncio.to_thread(
-            spin_repo.consume_user_spin, request.user_id, request.chat_id
+        # Spend the spin and advance the megaspin counter in one statement
+        consumption = await asyncio.to_thread(
+            spin_repo.consume_spins_and_advance_megaspin, request.user_id, request.chat_id
         )
 
-        if success:
-            # Update megaspin counter (decrement by 1)
-            megaspins_data = await asyncio.to_thread(
-                spin_manager.decrement_megaspin_counter, request.user_id, request.chat_id
-            )
-            total_spins_required = spin_repo._get_spins_for_megaspin()
-            megaspin_info = MegaspinInfo(
-                spins_until_megaspin=megaspins_data.spins_until_megaspin,
-                total_spins_required=total_spins_required,
-                megaspin_available=megaspins_data.megaspin_available,
-            )
-
-            # Get remaining spins after consumption
-            remaining_spins = await asyncio.to_thread(
-                spin_repo.get_user_spin_count,
-                request.user_id,
-                request.chat_id,
-            )
-
-            return ConsumeSpinResponse(
-                success=True,
-                spins_remaining=remaining_spins,
-                message="Spin consumed successfully",
-                megaspin=megaspin_info,
-            )
-        else:
-            # Get current spins to show in error
-            current_spins = await asyncio.to_thread(
-                spin_repo.get_user_spin_count,
-                request.user_id,
-                request.chat_id,
-            )
-
-            # Get current megaspin info
-            megaspins_data = await asyncio.to_thread(
-                spin_repo.get_user_megaspins, request.user_id, request.chat_id
-            )
-            total_spins_required = spin_repo._get_spins_for_megaspin()
-            megaspin_info = MegaspinInfo(
-                spins_until_megaspin=megaspins_data.spins_until_megaspin,
-                total_spins_required=total_spins_required,
-                megaspin_available=megaspins_data.megaspin_available,
-            )
-
-            return ConsumeSpinResponse(
-                success=False,
-                spins_remaining=current_spins,
-                message="No spins available",
-                megaspin=megaspin_info,
-            )
+        return ConsumeSpinResponse(
+            success=consumption.success,
+            spins_remaining=consumption.spins_remaining,
+            message="Spin consumed successfully" if consumption.success else "No spins available",
+            megaspin=_build_megaspin_info(consumption.megaspins),
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             f"Error consuming spin for user {request.user_id} in chat {request.chat_id}: {e}"
@@ -241,37 +222,21 @@ async def consume_megaspin(
         await verify_user_match(request.user_id, validated_user)
         await validate_user_in_chat(request.user_id, request.chat_id)
 
-        # Attempt to consume the megaspin
-        success = await asyncio.to_thread(
-            spin_repo.consume_megaspin, request.user_id, request.chat_id
+        consumption = await asyncio.to_thread(
+            spin_repo.consume_megaspin_with_state, request.user_id, request.chat_id
         )
 
-        # Get updated megaspin info
-        megaspins_data = await asyncio.to_thread(
-            spin_repo.get_user_megaspins, request.user_id, request.chat_id
+        return ConsumeSpinResponse(
+            success=consumption.success,
+            spins_remaining=None,  # Megaspin doesn't affect regular spin count
+            message=(
+                "Megaspin consumed successfully" if consumption.success else "No megaspin available"
+            ),
+            megaspin=_build_megaspin_info(consumption.megaspins),
         )
-        total_spins_required = spin_repo._get_spins_for_megaspin()
-        megaspin_info = MegaspinInfo(
-            spins_until_megaspin=megaspins_data.spins_until_megaspin,
-            total_spins_required=total_spins_required,
-            megaspin_available=megaspins_data.megaspin_available,
-        )
-
-        if success:
-            return ConsumeSpinResponse(
-                success=True,
-                spins_remaining=None,  # Megaspin doesn't affect regular spin count
-                message="Megaspin consumed successfully",
-                megaspin=megaspin_info,
-            )
-        else:
-            return ConsumeSpinResponse(
-                success=False,
-                spins_remaining=None,
-                message="No megaspin available",
-                megaspin=megaspin_info,
-            )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             f"Error consuming megaspin for user {request.user_id} in chat {request.chat_id}: {e}"
@@ -282,39 +247,136 @@ async def consume_megaspin(
 @router.get("/set-symbols", response_model=List[SlotSymbolSummary])
 async def get_set_symbols(
     chat_id: str = Query(..., description="Chat ID"),
+    if_none_match: Optional[str] = Header(None),
     validated_user: Dict[str, Any] = Depends(get_validated_user),
 ):
     """Return set icons for the slot reel symbol strip.
 
     Returns active sets (source "all" or "slots") that have a generated slot
-    icon, formatted as SlotSymbolSummary with type="set".
+    icon, formatted as SlotSymbolSummary with type="set". The bundle is cached
+    and served with an ``ETag``; a matching ``If-None-Match`` gets ``304``.
     """
     try:
-        eligible_sets = await asyncio.to_thread(set_repo.get_eligible_sets_for_slots)
-        if not eligible_sets:
-            return []
-
-        icons = await asyncio.to_thread(set_icon_repo.get_all_icons_b64)
-
-        symbols: List[SlotSymbolSummary] = []
-        for s in eligible_sets:
-            icon_b64 = icons.get(s.id)
-            if not icon_b64:
-                continue
-            symbols.append(
-                SlotSymbolSummary(
-                    id=s.id,
-                    display_name=s.name,
-                    slot_icon_b64=icon_b64,
-                    type="set",
-                )
-            )
-        return symbols
+        version = await asyncio.to_thread(slot_symbol_manager.get_set_bundle_version)
+        etag = f'"{version}"'
+        if etag_matches(etag, if_none_match):
+            return etag_json_response(etag)
+
+        bundle = await asyncio.to_thread(slot_symbol_manager.get_set_bundle, None, version)
+        return etag_json_response(bundle.etag, bundle.body)
     except Exception as e:
         logger.error(f"Error loading set symbols for chat {chat_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to load set symbols")
 
 
+def _get_slot_win_chances() -> Tuple[float, float, float, float]:
+    """Return (card, aspect, claim, loss) probabilities for a regular spin."""
+    card_chance = 0.1 if DEBUG_MODE else SLOT_CARD_WIN_CHANCE
+    aspect_chance = 0.4 if DEBUG_MODE else SLOT_ASPECT_WIN_CHANCE
+    claim_chance = 0.2 if DEBUG_MODE else SLOT_CLAIM_CHANCE
+    loss_chance = max(0.0, 1.0 - card_chance - aspect_chance - claim_chance)
+    return card_chance, aspect_chance, claim_chance, loss_chance
+
+
+async def _resolve_spin_outcome(
+    symbols: List[SlotSymbolInfo],
+    defs_cache: Dict[str, Any],
+) -> SlotVerifyResponse:
+    """Draw one regular spin outcome using the module-level ``random`` state.
+
+    Shared by ``/verify`` and ``/autospin`` so both use identical odds.
+    ``defs_cache`` memoizes the slots aspect definitions under ``"defs"`` so a
+    batch of spins loads them at most once.
+    """
+    # Partition symbols by type — each win branch picks only from its own pool
+    card_symbols = [s for s in symbols if s.type in ("user", "character")]
+    set_symbols = [s for s in symbols if s.type == "set"]
+    claim_symbols = [s for s in symbols if s.type == "claim"]
+
+    winning_symbol: Optional[SlotSymbolInfo] = None
+    rarity: Optional[str] = None
+    win_type: Optional[str] = None
+    chosen_set_id: Optional[int] = None
+    chosen_set_name: Optional[str] = None
+
+    # Single weighted draw — all win types determined simultaneously
+    card_chance, aspect_chance, claim_chance, loss_chance = _get_slot_win_chances()
+    outcome = random.choices(
+        ["card", "aspect", "claim", "loss"],
+        weights=[card_chance, aspect_chance, claim_chance, loss_chance],
+        k=1,
+    )[0]
+
+    if outcome == "card" and card_symbols:
+        winning_symbol = random.choice(card_symbols)
+        rarity = get_random_rarity(source="slots")
+        win_type = "card"
+    elif outcome == "aspect" and set_symbols:
+        rarity = get_random_rarity(source="slots")
+        try:
+            if "defs" not in defs_cache:
+                defs_cache["defs"] = await asyncio.to_thread(
+                    aspect_repo.get_aspect_definitions_by_rarity,
+                    source="slots",
+                )
+            defs_by_rarity = defs_cache["defs"]
+            eligible_ids = {d.set_id for d in defs_by_rarity.get(rarity, [])}
+            eligible = [s for s in set_symbols if s.id in eligible_ids]
+            if eligible:
+                winning_symbol = random.choice(eligible)
+                chosen_set_id = winning_symbol.id
+                chosen_set_name = next(
+                    (
+                        d.set_name
+                        for d in defs_by_rarity.get(rarity, [])
+                        if d.set_id == chosen_set_id
+                    ),
+                    None,
+                )
+                win_type = "aspect"
+            else:
+                rarity = None  # No eligible sets for this rarity
+        except Exception as e:
+            logger.warning("Failed to pick set for aspect win: %s", e)
+            rarity = None
+    elif outcome == "claim" and claim_symbols:
+        winning_symbol = claim_symbols[0]
+        win_type = "claim"
+
+    # Build results
+    if winning_symbol:
+        slot_results = [winning_symbol, winning_symbol, winning_symbol]
+    else:
+        slot_results = generate_slot_loss_pattern(random, symbols)
+
+    return SlotVerifyResponse(
+        is_win=win_type is not None,
+        slot_results=slot_results,
+        rarity=rarity,
+        win_type=win_type,
+        set_id=chosen_set_id,
+        set_name=chosen_set_name.title() if chosen_set_name else None,
+    )
+
+
+def _log_spin_outcome(user_id: int, chat_id: str, result: SlotVerifyResponse) -> None:
+    """Log claim/loss spin events (card/aspect wins are logged after generation)."""
+    if result.win_type == "claim":
+        event_manager.alog(
+            EventType.SPIN,
+            SpinOutcome.CLAIM_WIN,
+            user_id=user_id,
+            chat_id=chat_id,
+        )
+    elif not result.win_type:
+        event_manager.alog(
+            EventType.SPIN,
+            SpinOutcome.LOSS,
+            user_id=user_id,
+            chat_id=chat_id,
+        )
+
+
 @router.post("/verify", response_model=SlotVerifyResponse)
 async def verify_slot_spin(
     request: SlotVerifyRequest,
@@ -336,6 +398,8 @@ async def verify_slot_spin(
             detail=f"Random number must be between 0 and {symbol_count - 1}",
         )
 
+    # The outcome is drawn before the spin is spent, so a failure while
+    # resolving it costs nothing (as in /autospin)
     try:
         random.seed()
         entropy_source = hash(
@@ -343,121 +407,190 @@ async def verify_slot_spin(
         )
         random.seed(entropy_source)
 
-        # Partition symbols by type — each win branch picks only from its own pool
-        card_symbols = [s for s in request.symbols if s.type in ("user", "character")]
-        set_symbols = [s for s in request.symbols if s.type == "set"]
-        claim_symbols = [s for s in request.symbols if s.type == "claim"]
+        result = await _resolve_spin_outcome(request.symbols, {})
 
-        winning_symbol: Optional[SlotSymbolInfo] = None
-        slot_results: List[SlotSymbolInfo] = []
-        rarity: Optional[str] = None
-        win_type: Optional[str] = None
-        chosen_set_id: Optional[int] = None
-        chosen_set_name: Optional[str] = None
+    except Exception as e:
+        logger.error(
+            f"Error verifying slot spin for user {request.user_id} in chat {request.chat_id}: {e}"
+        )
+        # Log spin error
+        event_manager.alog(
+            EventType.SPIN,
+            SpinOutcome.ERROR,
+            user_id=request.user_id,
+            chat_id=request.chat_id,
+            error_message=str(e),
+        )
+        raise HTTPException(status_code=500, detail="Failed to verify slot spin")
 
-        # Single weighted draw — all win types determined simultaneously
-        card_chance = 0.1 if DEBUG_MODE else SLOT_CARD_WIN_CHANCE
-        aspect_chance = 0.4 if DEBUG_MODE else SLOT_ASPECT_WIN_CHANCE
-        claim_chance = 0.2 if DEBUG_MODE else SLOT_CLAIM_CHANCE
-        loss_chance = max(0.0, 1.0 - card_chance - aspect_chance - claim_chance)
-
-        outcome = random.choices(
-            ["card", "aspect", "claim", "loss"],
-            weights=[card_chance, aspect_chance, claim_chance, loss_chance],
-            k=1,
-        )[0]
-
-        if outcome == "card" and card_symbols:
-            winning_symbol = random.choice(card_symbols)
-            rarity = get_random_rarity(source="slots")
-            win_type = "card"
-        elif outcome == "aspect" and set_symbols:
-            rarity = get_random_rarity(source="slots")
-            try:
-                defs_by_rarity = await asyncio.to_thread(
-                    aspect_repo.get_aspect_definitions_by_rarity,
-                    source="slots",
-                )
-                eligible_ids = {d.set_id for d in defs_by_rarity.get(rarity, [])}
-                eligible = [s for s in set_symbols if s.id in eligible_ids]
-                if eligible:
-                    winning_symbol = random.choice(eligible)
-                    chosen_set_id = winning_symbol.id
-                    chosen_set_name = next(
-                        (
-                            d.set_name
-                            for d in defs_by_rarity.get(rarity, [])
-                            if d.set_id == chosen_set_id
-                        ),
-                        None,
-                    )
-                    win_type = "aspect"
-                else:
-                    rarity = None  # No eligible sets for this rarity
-            except Exception as e:
-                logger.warning("Failed to pick set for aspect win: %s", e)
-                rarity = None
-        elif outcome == "claim" and claim_symbols:
-            winning_symbol = claim_symbols[0]
-            win_type = "claim"
-
-        # Build results
-        if winning_symbol:
-            slot_results = [winning_symbol, winning_symbol, winning_symbol]
-        else:
-            slot_results = generate_slot_loss_pattern(random, request.symbols)
-
-        # Logging
-        win_type_log = (
-            f"{win_type} ({rarity})"
-            if win_type in ("card", "aspect") and rarity
-            else win_type or "loss"
+    consumption: Optional[SpinConsumption] = None
+    if request.consume_spin:
+        consumption = await asyncio.to_thread(
+            spin_repo.consume_spins_and_advance_megaspin, request.user_id, request.chat_id
         )
-        logger.info(
-            "Slot verification for user %s in chat %s: result=%s",
-            request.user_id,
-            request.chat_id,
-            win_type_log,
+        if not consumption.success:
+            raise HTTPException(status_code=400, detail="No spins available")
+
+    # Logging
+    win_type_log = (
+        f"{result.win_type} ({result.rarity})"
+        if result.win_type in ("card", "aspect") and result.rarity
+        else result.win_type or "loss"
+    )
+    logger.info(
+        "Slot verification for user %s in chat %s: result=%s",
+        request.user_id,
+        request.chat_id,
+        win_type_log,
+    )
+
+    # Event logging (card/aspect wins logged after generation in background task)
+    _log_spin_outcome(request.user_id, request.chat_id, result)
+
+    if consumption:
+        result.spins_remaining = consumption.spins_remaining
+        result.megaspin = _build_megaspin_info(consumption.megaspins)
+    return result
+
+
+@router.post("/autospin", response_model=SlotsAutoSpinResponse)
+async def autospin(
+    request: SlotsAutoSpinRequest,
+    validated_user: Dict[str, Any] = Depends(get_validated_user),
+):
+    """Consume ``count`` spins at once and resolve every outcome server-side.
+
+    Replaces ``count`` rounds of ``/spins`` + ``/verify`` (+ ``/claim-win`` or
+    ``/victory``) with one request. Outcomes use the same odds as ``/verify``.
+    Outcomes are drawn and card sources validated before any spin is spent, so
+    a rejected request costs nothing. Claim points are credited in one update
+    and card/aspect wins are queued for sequential background generation.
+    """
+    await verify_user_match(request.user_id, validated_user)
+
+    chat_id = str(request.chat_id).strip()
+    if not chat_id:
+        raise HTTPException(status_code=400, detail="chat_id is required")
+
+    await validate_user_in_chat(request.user_id, chat_id)
+
+    if not request.symbols:
+        raise HTTPException(status_code=400, detail="Symbols list cannot be empty")
+    if request.count < 1 or request.count > SLOT_MAX_AUTOSPIN:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Spin count must be between 1 and {SLOT_MAX_AUTOSPIN}",
         )
 
-        # Event logging (card/aspect wins logged after generation in background task)
-        if win_type == "claim":
-            event_manager.log(
-                EventType.SPIN,
-                SpinOutcome.CLAIM_WIN,
-                user_id=request.user_id,
-                chat_id=request.chat_id,
+    random.seed()
+    defs_cache: Dict[str, Any] = {}
+    results = [
+        await _resolve_spin_outcome(request.symbols, defs_cache) for _ in range(request.count)
+    ]
+
+    card_results = [r for r in results if r.win_type == "card"]
+    aspect_results = [r for r in results if r.win_type == "aspect"]
+    claim_wins = sum(1 for r in results if r.win_type == "claim")
+
+    username: Optional[str] = None
+    display_names: Dict[Tuple[str, int], str] = {}
+    if card_results or aspect_results:
+        if not TELEGRAM_TOKEN:
+            raise HTTPException(status_code=503, detail="Bot service unavailable")
+
+        user_data: Dict[str, Any] = validated_user["user"] or {}
+        username = user_data.get("username")
+        if not username:
+            username = await asyncio.to_thread(
+                user_repo.get_username_for_user_id, user_data.get("id")
             )
-        elif not win_type:
-            event_manager.log(
-                EventType.SPIN,
-                SpinOutcome.LOSS,
-                user_id=request.user_id,
-                chat_id=request.chat_id,
+        if not username:
+            raise HTTPException(status_code=400, detail="Username not found for user")
+
+        for r in card_results:
+            source = r.slot_results[0]
+            key = (source.type, source.id)
+            if key not in display_names:
+                display_names[key] = await _get_card_source_display_name(
+                    source.type, source.id, chat_id
+                )
+
+    consumption = await asyncio.to_thread(
+        spin_repo.consume_spins_and_advance_megaspin, request.user_id, chat_id, request.count
+    )
+    if not consumption.success:
+        raise HTTPException(status_code=400, detail="Not enough spins")
+
+    try:
+        claim_balance: Optional[int] = None
+        if claim_wins:
+            claim_balance = await asyncio.to_thread(
+                claim_repo.increment_claim_balance, request.user_id, chat_id, claim_wins
             )
 
-        return SlotVerifyResponse(
-            is_win=win_type is not None,
-            slot_results=slot_results,
-            rarity=rarity,
-            win_type=win_type,
-            set_id=chosen_set_id,
-            set_name=chosen_set_name.title() if chosen_set_name else None,
+        for r in results:
+            _log_spin_outcome(request.user_id, chat_id, r)
+
+        wins: List[Dict[str, Any]] = []
+        for r in results:
+            if r.win_type == "card":
+                source = r.slot_results[0]
+                wins.append(
+                    {
+                        "win_type": "card",
+                        "rarity": r.rarity,
+                        "source_type": source.type,
+                        "source_id": source.id,
+                        "display_name": display_names[(source.type, source.id)],
+                    }
+                )
+            elif r.win_type == "aspect":
+                wins.append({"win_type": "aspect", "rarity": r.rarity, "set_id": r.set_id})
+
+        if wins:
+            asyncio.create_task(
+                process_slots_autospin_wins_background(
+                    username=username,
+                    chat_id=chat_id,
+                    user_id=request.user_id,
+                    wins=wins,
+                    gemini_util_instance=gemini_util,
+                )
+            )
+
+        logger.info(
+            "Auto-spin for user %s in chat %s: %d spins, %d card, %d aspect, %d claim wins",
+            request.user_id,
+            chat_id,
+            request.count,
+            len(card_results),
+            len(aspect_results),
+            claim_wins,
+        )
+
+        return SlotsAutoSpinResponse(
+            results=results,
+            spins_consumed=request.count,
+            spins_remaining=consumption.spins_remaining,
+            megaspin=_build_megaspin_info(consumption.megaspins),
+            card_wins=len(card_results),
+            aspect_wins=len(aspect_results),
+            claim_wins=claim_wins,
+            claim_balance=claim_balance,
         )
 
     except Exception as e:
         logger.error(
-            f"Error verifying slot spin for user {request.user_id} in chat {request.chat_id}: {e}"
+            f"Error processing auto-spin for user {request.user_id} in chat {chat_id}: {e}"
         )
-        # Log spin error
-        event_manager.log(
+        event_manager.alog(
             EventType.SPIN,
             SpinOutcome.ERROR,
             user_id=request.user_id,
-            chat_id=request.chat_id,
+            chat_id=chat_id,
             error_message=str(e),
         )
-        raise HTTPException(status_code=500, detail="Failed to verify slot spin")
+        raise HTTPException(status_code=500, detail="Failed to process auto-spin")
 
 
 @router.post("/megaspin/verify", response_model=SlotVerifyResponse)
@@ -474,14 +607,21 @@ async def verify_megaspin(
     if not request.symbols or len(request.symbols) == 0:
         raise HTTPException(status_code=400, detail="Symbols list cannot be empty")
 
-    try:
-        random.seed()  # Reset to system randomness
+    # Check eligibility before consuming so a bad request never burns the megaspin
+    eligible_symbols = [s for s in request.symbols if s.type != "claim"]
+    if not eligible_symbols:
+        raise HTTPException(status_code=400, detail="No eligible symbols for megaspin")
 
-        # Filter out claim symbols - megaspins don't give claim points
-        eligible_symbols = [s for s in request.symbols if s.type != "claim"]
+    consumption: Optional[SpinConsumption] = None
+    if request.consume_spin:
+        consumption = await asyncio.to_thread(
+            spin_repo.consume_megaspin_with_state, request.user_id, request.chat_id
+        )
+        if not consumption.success:
+            raise HTTPException(status_code=400, detail="No megaspin available")
 
-        if not eligible_symbols:
-            raise HTTPException(status_code=400, detail="No eligible symbols for megaspin")
+    try:
+        random.seed()  # Reset to system randomness
 
         # Pick a random eligible symbol - guaranteed win
         winning_symbol = random.choice(eligible_symbols)
@@ -521,6 +661,7 @@ async def verify_megaspin(
             win_type=win_type,
             set_id=chosen_set_id,
             set_name=chosen_set_name.title() if chosen_set_name else None,
+            megaspin=_build_megaspin_info(consumption.megaspins) if consumption else None,
         )
 
     except HTTPException:
@@ -530,7 +671,7 @@ async def verify_megaspin(
             f"Error verifying megaspin for user {request.user_id} in chat {request.chat_id}: {e}"
         )
         # Log megaspin error
-        event_manager.log(
+        event_manager.alog(
             EventType.MEGASPIN,
             MegaspinOutcome.ERROR,
             user_id=request.user_id,
@@ -540,6 +681,25 @@ async def verify_megaspin(
         raise HTTPException(status_code=500, detail="Failed to verify megaspin")
 
 
+async def _get_card_source_display_name(source_type: str, source_id: int, chat_id: str) -> str:
+    """Validate a card-win source (user or chat character) and return its display name."""
+    if source_type not in ("user", "character"):
+        raise HTTPException(status_code=400, detail="Invalid source type")
+
+    if source_type == "user":
+        source_user = await asyncio.to_thread(user_repo.get_user, source_id)
+        if not source_user or not source_user.display_name:
+            raise HTTPException(status_code=404, detail="Source user not found or incomplete")
+        return source_user.display_name
+
+    source_character = await asyncio.to_thread(character_repo.get_character_by_id, source_id)
+    if not source_character or not source_character.name:
+        raise HTTPException(status_code=404, detail="Source character not found")
+    if str(source_character.chat_id) != chat_id:
+        raise HTTPException(status_code=400, detail="Character does not belong to chat")
+    return source_character.name
+
+
 @router.post("/victory", response_model=SlotsVictoryResponse)
 async def slots_victory(
     request: SlotsVictoryRequest,
@@ -577,23 +737,9 @@ async def slots_victory(
     # --- dispatch by win_type ------------------------------------------------
     if request.win_type == "card":
         source_type = (request.source_type or "").strip().lower()
-        if source_type not in ("user", "character"):
-            raise HTTPException(status_code=400, detail="Invalid source type")
-
-        if source_type == "user":
-            source_user = await asyncio.to_thread(user_repo.get_user, request.source_id)
-            if not source_user or not source_user.display_name:
-                raise HTTPException(status_code=404, detail="Source user not found or incomplete")
-            display_name = source_user.display_name
-        else:
-            source_character = await asyncio.to_thread(
-                character_repo.get_character_by_id, request.source_id
-            )
-            if not source_character or not source_character.name:
-                raise HTTPException(status_code=404, detail="Source character not found")
-            if str(source_character.chat_id) != chat_id:
-                raise HTTPException(status_code=400, detail="Character does not belong to chat")
-            display_name = source_character.name
+        display_name = await _get_card_source_display_name(
+            source_type, request.source_id, chat_id
+        )
 
         asyncio.create_task(
             process_slots_victory_background(
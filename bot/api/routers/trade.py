@@ -4,22 +4,24 @@ Endpoints:
   GET  /trade/{offer_type}/{offer_id}/options/cards    → tradeable cards
   GET  /trade/{offer_type}/{offer_id}/options/aspects  → tradeable aspects
   POST /trade/{offer_type}/{offer_id}/{want_type}/{want_id}  → execute trade
+
+Both options endpoints accept ``search``, ``limit`` and ``offset`` query
+parameters; without ``limit`` every match is returned.
 """
 
 import asyncio
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from api.config import create_bot_instance, MINIAPP_URL, TELEGRAM_TOKEN
 from api.dependencies import get_validated_user
 from api.helpers import build_single_card_url, build_single_aspect_url
 from settings.constants import TRADE_REQUEST_MESSAGE
 from utils.schemas import Card as APICard, OwnedAspect as APIAspect
-from repos import card_repo, aspect_repo, thread_repo
-from managers import event_manager
+from repos import card_repo, aspect_repo
+from managers import chat_context_manager, event_manager
 from managers.trade_manager import VALID_TRADE_TYPES
 from utils.events import EventType, TradeOutcome
 
@@ -27,6 +29,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/trade", tags=["trade"])
 
+# Largest page a client may request from the options endpoints
+_MAX_OPTIONS_PAGE_SIZE = 200
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -62,6 +67,9 @@ def _build_view_url(item_type: str, item_id: int) -> str | None:
 async def get_trade_card_options(
     offer_type: str,
     offer_id: int,
+    search: Optional[str] = Query(None, max_length=100),
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_OPTIONS_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     validated_user: Dict[str, Any] = Depends(get_validated_user),
 ):
     """Get cards tradeable for the offered item, scoped to the same chat."""
@@ -75,19 +83,24 @@ async def get_trade_card_options(
     if not item.chat_id:
         raise HTTPException(status_code=400, detail="Item has no chat")
 
-    cards = await asyncio.to_thread(card_repo.get_all_cards, item.chat_id)
-    return [
-        c for c in cards
-        if c.id != (offer_id if offer_type == "card" else -1)
-        and c.owner is not None
-        and c.owner != item.owner
-    ]
+    return await asyncio.to_thread(
+        card_repo.get_trade_card_options,
+        item.chat_id,
+        user_id,
+        exclude_card_id=offer_id if offer_type == "card" else None,
+        search=search.strip() if search else None,
+        limit=limit,
+        offset=offset,
+    )
 
 
 @router.get("/{offer_type}/{offer_id}/options/aspects", response_model=List[APIAspect])
 async def get_trade_aspect_options(
     offer_type: str,
     offer_id: int,
+    search: Optional[str] = Query(None, max_length=100),
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_OPTIONS_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     validated_user: Dict[str, Any] = Depends(get_validated_user),
 ):
     """Get aspects tradeable for the offered item, scoped to the same chat."""
@@ -104,7 +117,12 @@ async def get_trade_aspect_options(
         raise HTTPException(status_code=400, detail="Item has no chat")
 
     return await asyncio.to_thread(
-        aspect_repo.get_chat_aspects_for_trade, item.chat_id, user_id
+        aspect_repo.get_chat_aspects_for_trade,
+        item.chat_id,
+        user_id,
+        search=search.strip() if search else None,
+        limit=limit,
+        offset=offset,
     )
 
 
@@ -134,6 +152,8 @@ async def execute_trade(
         raise HTTPException(status_code=503, detail="Bot service unavailable")
 
     try:
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
         offer_item = await _fetch_item(offer_type, offer_id)
         want_item = await _fetch_item(want_type, want_id)
 
@@ -175,9 +195,9 @@ async def execute_trade(
         try:
             bot = create_bot_instance()
 
-            thread_id = await asyncio.to_thread(thread_repo.get_thread_id, str(offer_item.chat_id), "trade")
+            thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, str(offer_item.chat_id), "trade")
             if thread_id is None:
-                thread_id = await asyncio.to_thread(thread_repo.get_thread_id, str(offer_item.chat_id), "main")
+                thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, str(offer_item.chat_id), "main")
 
             send_params: Dict[str, Any] = {
                 "chat_id": offer_item.chat_id,
@@ -190,7 +210,7 @@ async def execute_trade(
 
             await bot.send_message(**send_params)
 
-            event_manager.log(
+            event_manager.alog(
                 EventType.TRADE,
                 TradeOutcome.CREATED,
                 user_id=user_id,
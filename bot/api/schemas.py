@@ -7,7 +7,7 @@ concerns from the database layer.
 """
 
 import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -298,6 +298,9 @@ class SlotVerifyRequest(BaseModel):
     chat_id: str
     random_number: int
     symbols: List[SlotSymbolInfo]
+    # When set, the spin (or megaspin, for /megaspin/verify) is consumed in the
+    # same request instead of a separate POST /slots/spins (/slots/megaspin).
+    consume_spin: bool = False
 
 
 class SlotVerifyResponse(BaseModel):
@@ -309,6 +312,30 @@ class SlotVerifyResponse(BaseModel):
     win_type: Optional[str] = None  # "card", "aspect", "claim", or None (loss)
     set_id: Optional[int] = None  # Set ID for aspect wins (pre-picked)
     set_name: Optional[str] = None  # Set name for aspect wins (display)
+    spins_remaining: Optional[int] = None  # Only populated when consume_spin was set
+    megaspin: Optional[MegaspinInfo] = None  # Only populated when consume_spin was set
+
+
+class SlotsAutoSpinRequest(BaseModel):
+    """Request to consume and resolve several slot spins in one call."""
+
+    user_id: int
+    chat_id: str
+    count: int
+    symbols: List[SlotSymbolInfo]
+
+
+class SlotsAutoSpinResponse(BaseModel):
+    """Aggregated result of an auto-spin batch."""
+
+    results: List[SlotVerifyResponse]
+    spins_consumed: int
+    spins_remaining: int
+    megaspin: Optional[MegaspinInfo] = None
+    card_wins: int = 0
+    aspect_wins: int = 0
+    claim_wins: int = 0
+    claim_balance: Optional[int] = None  # Only populated when claim points were won
 
 
 # =============================================================================
@@ -348,8 +375,8 @@ class MinesweeperStartResponse(BaseModel):
         None  # Visible claim points (revealed or all if game over)
     )
     card_icon: Optional[str] = None  # Base64 slot icon of the game's selected source
-    claim_point_icon: Optional[str] = None  # Base64 icon for claim points
-    mine_icon: Optional[str] = None  # Base64 icon for mines
+    claim_point_icon_url: Optional[str] = None  # Fingerprinted static URL of the claim point icon
+    mine_icon_url: Optional[str] = None  # Fingerprinted static URL of the mine icon
     next_refresh_time: Optional[datetime.datetime] = None
 
 
@@ -525,6 +552,15 @@ class AdminAspectDefResponse(BaseModel):
     type_id: Optional[int] = None
     created_at: Optional[datetime.datetime] = None
     owned_count: int = 0
+    equipped_count: int = 0
+    burned_count: int = 0
+    recycled_count: int = 0
+
+
+class AdminAspectStatsRebuildResponse(BaseModel):
+    """Response from rebuilding the live aspect definition counters."""
+
+    rebuilt: int
 
 
 class AdminAspectDefCreateRequest(BaseModel):
@@ -566,10 +602,23 @@ class AdminBulkAspectDefRequest(BaseModel):
     definitions: List[AdminBulkAspectDefItem]
 
 
+class AdminBulkAspectDefResult(BaseModel):
+    """Outcome of one definition in a bulk upsert."""
+
+    id: int
+    set_id: int
+    name: str
+    rarity: str
+    status: Literal["inserted", "updated"]
+
+
 class AdminBulkAspectDefResponse(BaseModel):
     """Response from bulk aspect definition upsert."""
 
     upserted: int
+    inserted: int = 0
+    updated: int = 0
+    results: List[AdminBulkAspectDefResult] = []
 
 
 # =============================================================================
@@ -5,6 +5,7 @@ This is the main entry point for the API server. It sets up the FastAPI applicat
 configures middleware, and includes all routers from the modular router files.
 """
 
+import asyncio
 import logging
 import os
 import traceback
@@ -19,6 +20,7 @@ from api.config import DEBUG_MODE
 from api.limiter import limiter
 from api.routers import (
     aspects_router,
+    assets_router,
     cards_router,
     chat_router,
     downloads_router,
@@ -88,6 +90,7 @@ app.add_middleware(
 
 # Include all routers
 app.include_router(aspects_router)
+app.include_router(assets_router)
 app.include_router(cards_router)
 app.include_router(downloads_router)
 app.include_router(trade_router)
@@ -106,6 +109,8 @@ async def startup_event():
     """Initialize services on API startup."""
     from utils.achievements import init_achievements, ensure_achievements_registered
     from utils.aspect_counts import init_aspect_count_listener
+    from utils.aspect_definition_stats import init_aspect_definition_stats_listener
+    from utils import image_workers
 
     init_achievements()
     ensure_achievements_registered()
@@ -114,6 +119,21 @@ async def startup_event():
     init_aspect_count_listener()
     logger.info("Aspect count listener initialized for API")
 
+    init_aspect_definition_stats_listener()
+    logger.info("Aspect definition stats listener initialized for API")
+
+    image_workers.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush events queued by routers and stop image workers before the worker exits."""
+    from managers import event_manager
+    from utils import image_workers
+
+    await asyncio.to_thread(event_manager.shutdown)
+    await asyncio.to_thread(image_workers.shutdown)
+
 
 def run_server():
     """Run the FastAPI server."""
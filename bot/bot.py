@@ -7,16 +7,24 @@ configures handlers, and starts the bot polling loop.
 The bot is organized into modular components:
 - core/config: Configuration and environment settings
 - core/application: Application factory
+- core/workers: Chat-sharded multi-process mode (BOT_WORKERS > 1)
 - core/handlers: Handler registration
 - handlers/: Individual handler implementations by domain
 """
 
 from handlers import initialize_bot_utilities
-from core import create_application, register_handlers
+from core import create_application, register_handlers, run_sharded
+from settings.constants import BOT_WORKERS
 
 
 def main() -> None:
     """Start the bot."""
+    if BOT_WORKERS > 1:
+        # Dispatcher + chat-sharded worker processes; each worker initializes
+        # its own utilities and handler stack.
+        run_sharded(BOT_WORKERS)
+        return
+
     # Initialize utilities (database, decorators, etc.)
     initialize_bot_utilities()
 
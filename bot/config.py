@@ -71,6 +71,16 @@ def initialize_bot_utilities():
 
     init_aspect_count_listener()
 
+    # Initialize aspect definition stats listener
+    from utils.aspect_definition_stats import init_aspect_definition_stats_listener
+
+    init_aspect_definition_stats_listener()
+
+    # Move CPU-bound image work off the handler threads
+    from utils import image_workers
+
+    image_workers.start()
+
     logger.info("Bot utilities initialized")
 
 
@@ -5,14 +5,17 @@ This module exports the core components for setting up and running the Telegram
 Components are organized by responsibility:
 - application: Application factory and creation
 - handlers: Handler registration
+- workers: Chat-sharded multi-process update processing
 
 Configuration is centralized in handlers/config.py.
 """
 
 from core.application import create_application
 from core.handlers import register_handlers
+from core.workers import run_sharded
 
 __all__ = [
     "create_application",
     "register_handlers",
+    "run_sharded",
 ]
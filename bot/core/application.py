@@ -17,32 +17,54 @@ logger = logging.getLogger(__name__)
 
 
 async def _post_init(application: Application) -> None:
-    """Recover pending roll notifications after bot startup."""
-    from handlers.notifications import recover_pending_notifications
-    asyncio.create_task(recover_pending_notifications(application))
+    """Start delivering roll notifications and share cache invalidations after bot startup."""
+    from handlers.notifications import start_notification_scheduler
+    from managers import chat_context_manager
+    from utils.coordination import get_backend
+    start_notification_scheduler(application)
+    await chat_context_manager.enable_broadcast(get_backend(application.bot_data))
 
 
-def create_application() -> Application:
+async def _post_shutdown(application: Application) -> None:
+    """Stop the notification scheduler, release coordination resources, flush events."""
+    from handlers.notifications import stop_notification_scheduler
+    from managers import event_manager
+    from utils import image_workers
+    from utils.coordination import close_backend
+    await stop_notification_scheduler(application)
+    await close_backend(application.bot_data)
+    await asyncio.to_thread(event_manager.shutdown)
+    await asyncio.to_thread(image_workers.shutdown)
+
+
+def create_application(with_updater: bool = True) -> Application:
     """
     Create and configure the Telegram bot application.
 
     In debug mode, uses the Telegram test environment endpoints.
     In production mode, uses a local Telegram Bot API server.
 
+    Args:
+        with_updater: Build the polling ``Updater``. Chat-sharded workers
+            (core/workers.py) receive updates from the dispatcher instead.
+
     Returns:
         Application: Configured Telegram bot application instance.
     """
     if DEBUG_MODE:
         # Use test environment endpoints when in debug mode
-        application = (
+        builder = (
             Application.builder()
             .token(TELEGRAM_TOKEN)
             .base_url("https://api.telegram.org/bot")
             .base_file_url("https://api.telegram.org/file/bot")
             .concurrent_updates(True)
             .post_init(_post_init)
-            .build()
+            .post_shutdown(_post_shutdown)
         )
+        if not with_updater:
+            builder = builder.updater(None)
+        application = builder.build()
         # Override the bot's base_url to include /test/ for test environment
         application.bot._base_url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/test"
         application.bot._base_file_url = f"https://api.telegram.org/file/bot{TELEGRAM_TOKEN}/test"
@@ -51,7 +73,7 @@ def create_application() -> Application:
     else:
         # Use local Telegram Bot API server in production
         api_base_url = os.getenv("TELEGRAM_BOT_API_URL", "http://localhost:8081")
-        application = (
+        builder = (
             Application.builder()
             .token(TELEGRAM_TOKEN)
             .base_url(f"{api_base_url}/bot")
@@ -59,8 +81,11 @@ def create_application() -> Application:
             .local_mode(True)
             .concurrent_updates(True)
             .post_init(_post_init)
-            .build()
+            .post_shutdown(_post_shutdown)
         )
+        if not with_updater:
+            builder = builder.updater(None)
+        application = builder.build()
         logger.info("🚀 Running in PRODUCTION mode with local Telegram Bot API server")
         logger.info(f"🔗 API Base URL: {api_base_url}")
 
@@ -0,0 +1,249 @@
+"""
+Chat-sharded multi-process update processing.
+
+``application.run_polling()`` handles every chat on one event loop, so all
+handler CPU work shares one GIL and a blocking call in any handler stalls
+every chat. With ``BOT_WORKERS > 1`` the bot instead runs:
+
+- a dispatcher (this process) that long-polls ``getUpdates`` and forwards
+  each update to ``shard_for_chat(chat_id)``'s inbox queue;
+- N worker processes, each with its own ``Application`` (no updater),
+  handler stack, notification scheduler and database pool, feeding the
+  updates it receives into ``application.update_queue``.
+
+Each chat maps to exactly one worker and each inbox is FIFO, so updates of
+a chat reach the worker's ``update_queue`` in the order Telegram delivered
+them. Workers keep ``concurrent_updates(True)`` like the single-process
+bot, so handlers of one chat still run concurrently and may finish out of
+order; paths that need ordering enforce it themselves (``RollActionBuffer``
+orders roll clicks by ``update_id``). Updates without a chat (inline
+queries, etc.) are sharded by user. Workers are
+started with the ``spawn`` method so no database connection or event loop is
+inherited, and a worker that dies is restarted on the same inbox.
+
+State that is not per-chat must go through shared storage: set
+``COORDINATION_BACKEND`` to ``"postgres"`` so per-user roll locks hold
+across workers.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+from typing import List, Optional
+
+from telegram import Update
+from telegram.error import InvalidToken, NetworkError, RetryAfter, TimedOut
+
+logger = logging.getLogger(__name__)
+
+# Long-poll timeout for getUpdates (seconds)
+_POLL_TIMEOUT = 10
+# How long to wait for workers to drain and stop on shutdown (seconds)
+_WORKER_STOP_TIMEOUT = 30
+
+
+def _update_shard_key(update: Update) -> Optional[int]:
+    """Chat id of the update, falling back to the user id for chat-less updates."""
+    if update.effective_chat is not None:
+        return update.effective_chat.id
+    if update.effective_user is not None:
+        return update.effective_user.id
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+
+def _worker_main(index: int, inbox) -> None:
+    """Entry point of a worker process: run a handler stack fed from ``inbox``."""
+    # The dispatcher owns shutdown: Ctrl+C reaches the whole process group,
+    # but workers stop only when they receive the sentinel, after draining.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    from core.application import create_application
+    from core.handlers import register_handlers
+    from handlers import initialize_bot_utilities
+
+    initialize_bot_utilities()
+
+    application = create_application(with_updater=False)
+    register_handlers(application)
+
+    asyncio.run(_run_worker(application, inbox, index))
+
+
+async def _run_worker(application, inbox, index: int) -> None:
+    """Start ``application`` and push inbox payloads onto its update queue."""
+    loop = asyncio.get_running_loop()
+
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+    await application.start()
+    logger.info("Bot worker %d started", index)
+
+    try:
+        while True:
+            payload = await loop.run_in_executor(None, inbox.get)
+            if payload is None:
+                break
+            try:
+                update = Update.de_json(payload, application.bot)
+            except Exception as e:
+                logger.error("Worker %d dropped an undecodable update: %s", index, e)
+                continue
+            await application.update_queue.put(update)
+    finally:
+        logger.info("Bot worker %d stopping", index)
+        await application.stop()
+        if application.post_stop:
+            await application.post_stop(application)
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+
+
+# ---------------------------------------------------------------------------
+# Dispatcher
+# ---------------------------------------------------------------------------
+
+
+class _WorkerPool:
+    """Worker processes and their inbox queues, indexed by shard."""
+
+    def __init__(self, worker_count: int):
+        self._ctx = multiprocessing.get_context("spawn")
+        self.worker_count = worker_count
+        self.inboxes = [self._ctx.Queue() for _ in range(worker_count)]
+        self.processes: List[Optional[multiprocessing.process.BaseProcess]] = [
+            None
+        ] * worker_count
+
+    def _spawn(self, index: int) -> None:
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(index, self.inboxes[index]),
+            name=f"bot-worker-{index}",
+        )
+        process.start()
+        self.processes[index] = process
+
+    def start(self) -> None:
+        for index in range(self.worker_count):
+            self._spawn(index)
+
+    def ensure_alive(self) -> None:
+        """Restart workers that exited unexpectedly (their inbox is kept)."""
+        for index, process in enumerate(self.processes):
+            if process is not None and not process.is_alive():
+                logger.error(
+                    "Bot worker %d exited with code %s; restarting",
+                    index, process.exitcode,
+                )
+                self._spawn(index)
+
+    def dispatch(self, update: Update) -> None:
+        from utils.sharding import shard_for_chat
+
+        key = _update_shard_key(update)
+        index = shard_for_chat(key, self.worker_count) if key is not None else 0
+        self.inboxes[index].put(update.to_dict())
+
+    def stop(self) -> None:
+        """Let every worker drain its inbox, then wait for it to exit."""
+        for inbox in self.inboxes:
+            inbox.put(None)
+        for index, process in enumerate(self.processes):
+            if process is None:
+                continue
+            process.join(_WORKER_STOP_TIMEOUT)
+            if process.is_alive():
+                logger.warning("Bot worker %d did not stop in time; terminating", index)
+                process.terminate()
+                process.join()
+
+
+async def _poll_updates(bot, pool: _WorkerPool, stop_event: asyncio.Event) -> None:
+    """Long-poll Telegram and hand each update to its chat's worker."""
+    offset: Optional[int] = None
+    stop_wait = asyncio.create_task(stop_event.wait())
+
+    try:
+        while not stop_event.is_set():
+            pool.ensure_alive()
+            poll = asyncio.create_task(
+                bot.get_updates(
+                    offset=offset,
+                    timeout=_POLL_TIMEOUT,
+                    allowed_updates=Update.ALL_TYPES,
+                )
+            )
+            await asyncio.wait({poll, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+            if not poll.done():
+                poll.cancel()
+                break
+
+            try:
+                updates = poll.result()
+            except InvalidToken:
+                raise
+            except RetryAfter as e:
+                await asyncio.sleep(float(e.retry_after))
+                continue
+            except (NetworkError, TimedOut) as e:
+                logger.warning("getUpdates failed: %s", e)
+                await asyncio.sleep(1.0)
+                continue
+
+            for update in updates:
+                pool.dispatch(update)
+                offset = update.update_id + 1
+    finally:
+        stop_wait.cancel()
+
+    if offset is not None:
+        # Acknowledge everything already dispatched so it is not redelivered.
+        try:
+            await bot.get_updates(offset=offset, timeout=0, limit=1)
+        except Exception as e:
+            logger.warning("Failed to acknowledge final update offset: %s", e)
+
+
+async def _dispatch(worker_count: int) -> None:
+    from core.application import create_application
+
+    # Only the Bot is used here; the handler stack lives in the workers.
+    bot = create_application(with_updater=False).bot
+    pool = _WorkerPool(worker_count)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    async with bot:
+        await bot.delete_webhook()
+        pool.start()
+        logger.info("Dispatching updates to %d bot workers", worker_count)
+        try:
+            await _poll_updates(bot, pool, stop_event)
+        finally:
+            logger.info("Stopping bot workers")
+            await asyncio.to_thread(pool.stop)
+
+
+def run_sharded(worker_count: int) -> None:
+    """Run the bot as a polling dispatcher plus ``worker_count`` chat-sharded workers."""
+    from settings.constants import COORDINATION_BACKEND
+
+    if COORDINATION_BACKEND == "memory":
+        logger.warning(
+            "BOT_WORKERS=%d with COORDINATION_BACKEND=memory: per-user roll locks "
+            "only hold within a worker; use the postgres backend",
+            worker_count,
+        )
+    asyncio.run(_dispatch(worker_count))
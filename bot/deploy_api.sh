@@ -22,6 +22,9 @@ if [[ "$*" == *"--no-generation"* ]]; then
     echo "🚫 Card generation DISABLED for spin wins"
 fi
 
+# Apply pending migrations once; workers only verify the schema revision
+python tools/migrate.py
+
 # Run with gunicorn + uvloop + httptools for maximum performance (5 workers)
 # --preload ensures logging is configured before workers fork
 # Access/error logs stay on stdout to align with our centralized logging
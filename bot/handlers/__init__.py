@@ -10,83 +10,88 @@ Handlers are organized by domain:
 - collection: Collection view, balance, stats, casino
 - trade: Trade initiation, acceptance, rejection
 - admin: Admin-only commands (spins, reload, set_thread)
-"""
 
-# User handlers
-from handlers.user import (
-    start,
-    profile,
-    delete_character,
-    enroll,
-    unenroll,
-    help_command,
-    notify_toggle,
-)
+Exports are resolved lazily: ``from handlers import roll`` imports only the
+modules it needs, and importing a submodule such as ``handlers.helpers``
+(done by the API) does not load every handler and the bot configuration.
+"""
 
-# Rolling handlers
-from handlers.rolling import (
-    roll,
-    handle_claim,
-    handle_lock,
-    handle_reroll,
-)
+import importlib
 
-# Card handlers
-from handlers.cards import (
-    refresh,
-    handle_refresh_callback,
-    equip,
-    handle_equip_callback,
-)
+_EXPORTS = {
+    # User handlers
+    "start": "handlers.user",
+    "profile": "handlers.user",
+    "delete_character": "handlers.user",
+    "enroll": "handlers.user",
+    "unenroll": "handlers.user",
+    "help_command": "handlers.user",
+    "notify_toggle": "handlers.user",
+    # Rolling handlers
+    "roll": "handlers.rolling",
+    "handle_claim": "handlers.rolling",
+    "handle_lock": "handlers.rolling",
+    "handle_reroll": "handlers.rolling",
+    # Card handlers
+    "refresh": "handlers.cards",
+    "handle_refresh_callback": "handlers.cards",
+    "equip": "handlers.cards",
+    "handle_equip_callback": "handlers.cards",
+    # Aspect handlers (burn, lock, recycle, create)
+    "burn": "handlers.aspects",
+    "handle_burn_callback": "handlers.aspects",
+    "lock_command": "handlers.aspects",
+    "handle_lock_aspect_confirm": "handlers.aspects",
+    "handle_lock_card_confirm": "handlers.aspects",
+    "recycle": "handlers.aspects",
+    "handle_recycle_callback": "handlers.aspects",
+    "handle_recycle_type_callback": "handlers.aspects",
+    "handle_card_recycle_callback": "handlers.aspects",
+    "create_unique_aspect": "handlers.aspects",
+    "handle_create_callback": "handlers.aspects",
+    # Collection handlers
+    "casino": "handlers.collection",
+    "balance": "handlers.collection",
+    "collection": "handlers.collection",
+    "handle_collection_show": "handlers.collection",
+    "handle_collection_navigation": "handlers.collection",
+    "handle_collection_dismiss": "handlers.collection",
+    "stats": "handlers.collection",
+    # Trade handlers
+    "trade": "handlers.trade",
+    "accept_trade": "handlers.trade",
+    "reject_trade": "handlers.trade",
+    # Admin handlers
+    "spins": "handlers.admin",
+    "reload": "handlers.admin",
+    "set_thread": "handlers.admin",
+    # Config and helpers
+    "DEBUG_MODE": "config",
+    "TELEGRAM_TOKEN": "config",
+    "ADMIN_USERNAME": "config",
+    "MINIAPP_URL_ENV": "config",
+    "initialize_bot_utilities": "config",
+}
 
-# Aspect handlers (burn, lock, recycle, create)
-from handlers.aspects import (
-    burn,
-    handle_burn_callback,
-    lock_command,
-    handle_lock_aspect_confirm,
-    handle_lock_card_confirm,
-    recycle,
-    handle_recycle_callback,
-    handle_recycle_type_callback,
-    handle_card_recycle_callback,
-    create_unique_aspect,
-    handle_create_callback,
-)
 
-# Collection handlers
-from handlers.collection import (
-    casino,
-    balance,
-    collection,
-    handle_collection_show,
-    handle_collection_navigation,
-    handle_collection_dismiss,
-    stats,
-)
+def __getattr__(name: str):
+    """Import the module providing ``name`` on first access (PEP 562)."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(module_name)
+    # Bind every export of the module at once: importing handlers.trade sets
+    # the package attribute ``trade`` to the submodule, which must be
+    # replaced by the handler function of the same name.
+    for export, source in _EXPORTS.items():
+        if source == module_name:
+            globals()[export] = getattr(module, export)
+    return globals()[name]
 
-# Trade handlers
-from handlers.trade import (
-    trade,
-    accept_trade,
-    reject_trade,
-)
 
-# Admin handlers
-from handlers.admin import (
-    spins,
-    reload,
-    set_thread,
-)
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-# Config and helpers
-from config import (
-    DEBUG_MODE,
-    TELEGRAM_TOKEN,
-    ADMIN_USERNAME,
-    MINIAPP_URL_ENV,
-    initialize_bot_utilities,
-)
 
 __all__ = [
     # User handlers
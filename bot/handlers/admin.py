@@ -16,7 +16,7 @@ from config import ADMIN_USERNAME
 from repos import user_repo
 from repos import spin_repo
 from repos import card_repo
-from repos import thread_repo
+from managers import chat_context_manager
 from utils.schemas import User
 from utils.decorators import verify_admin, verify_user_in_chat
 
@@ -119,7 +119,7 @@ async def spins(
 
             # Check if user is enrolled in this chat
             is_member = await asyncio.to_thread(
-                user_repo.is_user_in_chat, chat_id, target_user_id
+                chat_context_manager.is_member, chat_id, target_user_id
             )
 
             if not is_member:
@@ -266,7 +266,7 @@ async def set_thread(
 
         # Handle clear command
         if is_clear:
-            success = await asyncio.to_thread(thread_repo.clear_thread_ids, chat_id)
+            success = await asyncio.to_thread(chat_context_manager.clear_thread_ids, chat_id)
             if success:
                 await message.reply_text(
                     "All thread configurations have been cleared for this chat.\n\n"
@@ -292,7 +292,7 @@ async def set_thread(
             return
 
         success = await asyncio.to_thread(
-            thread_repo.set_thread_id, chat_id, thread_id, thread_type
+            chat_context_manager.set_thread_id, chat_id, thread_id, thread_type
         )
 
         if success:
@@ -92,7 +92,7 @@ from settings.constants import (
 )
 from utils import rolling
 from utils.miniapp import encode_single_aspect_token, encode_single_card_token
-from utils.image import ImageUtil
+from utils import image_workers
 from repos import aspect_repo
 from repos import card_repo
 from repos import claim_repo
@@ -255,7 +255,7 @@ async def handle_burn_callback(
     if action == "cancel":
         await query.answer(ASPECT_BURN_CANCELLED_MESSAGE)
         if chat_id_str:
-            event_manager.log(
+            event_manager.alog(
                 EventType.BURN,
                 BurnOutcome.CANCELLED,
                 user_id=user.user_id,
@@ -336,7 +336,7 @@ async def handle_burn_callback(
                 await query.edit_message_text(ASPECT_BURN_FAILURE_MESSAGE)
             except Exception:
                 pass
-            event_manager.log(
+            event_manager.alog(
                 EventType.BURN,
                 BurnOutcome.ERROR,
                 user_id=user.user_id,
@@ -366,13 +366,14 @@ async def handle_burn_callback(
         )
         await query.answer("Burn complete!")
 
-        event_manager.log(
+        event_manager.alog(
             EventType.BURN,
             BurnOutcome.SUCCESS,
             user_id=user.user_id,
             chat_id=chat_id_str,
             aspect_id=aspect_id,
             rarity=aspect.rarity,
+            aspect_definition_id=aspect.aspect_definition_id,
             spin_reward=reward,
             new_spin_total=new_spin_total,
         )
@@ -386,7 +387,7 @@ async def handle_burn_callback(
         )
     except Exception as exc:
         logger.exception("Unexpected error during aspect burn for aspect %s: %s", aspect_id, exc)
-        event_manager.log(
+        event_manager.alog(
             EventType.BURN,
             BurnOutcome.ERROR,
             user_id=user.user_id,
@@ -616,7 +617,7 @@ async def handle_lock_aspect_confirm(
             f"Remaining balance: <b>{remaining_balance}</b>"
         )
         await query.answer(f"{aspect_name} locked!", show_alert=False)
-        event_manager.log(
+        event_manager.alog(
             EventType.LOCK,
             LockOutcome.LOCKED,
             user_id=user.user_id,
@@ -628,7 +629,7 @@ async def handle_lock_aspect_confirm(
     else:
         response_text = f"🔓 <b>🔮 {aspect_title}</b> unlocked!"
         await query.answer(f"{aspect_name} unlocked!", show_alert=False)
-        event_manager.log(
+        event_manager.alog(
             EventType.LOCK,
             LockOutcome.UNLOCKED,
             user_id=user.user_id,
@@ -830,7 +831,7 @@ async def handle_lock_card_confirm(
             f"Remaining balance: <b>{remaining_balance}</b>"
         )
         await query.answer(f"Card locked!", show_alert=False)
-        event_manager.log(
+        event_manager.alog(
             EventType.LOCK,
             LockOutcome.LOCKED,
             user_id=user.user_id,
@@ -842,7 +843,7 @@ async def handle_lock_card_confirm(
     else:
         response_text = f"🔓 <b>{card_title}</b> unlocked!"
         await query.answer(f"Card unlocked!", show_alert=False)
-        event_manager.log(
+        event_manager.alog(
             EventType.LOCK,
             LockOutcome.UNLOCKED,
             user_id=user.user_id,
@@ -1432,7 +1433,7 @@ async def handle_recycle_callback(
         try:
             generated_aspect = await generation_task
         except rolling.ImageGenerationError:
-            event_manager.log(
+            event_manager.alog(
                 EventType.RECYCLE,
                 RecycleOutcome.ERROR,
                 user_id=user.user_id,
@@ -1447,7 +1448,7 @@ async def handle_recycle_callback(
             return
         except Exception as exc:
             logger.error("Error while generating recycled aspect: %s", exc)
-            event_manager.log(
+            event_manager.alog(
                 EventType.RECYCLE,
                 RecycleOutcome.ERROR,
                 user_id=user.user_id,
@@ -1473,7 +1474,7 @@ async def handle_recycle_callback(
                 user.user_id,
                 aspect_ids_to_delete,
             )
-            event_manager.log(
+            event_manager.alog(
                 EventType.RECYCLE,
                 RecycleOutcome.ERROR,
                 user_id=user.user_id,
@@ -1504,7 +1505,7 @@ async def handle_recycle_callback(
             )
 
         # Log recycle success
-        event_manager.log(
+        event_manager.alog(
             EventType.RECYCLE,
             RecycleOutcome.SUCCESS,
             user_id=user.user_id,
@@ -1513,6 +1514,9 @@ async def handle_recycle_callback(
             source_rarity=rarity_name,
             new_rarity=upgrade_rarity,
             aspects_burned=aspect_ids_to_delete,
+            recycled_aspect_definition_ids=[
+                a.aspect_definition_id for a in aspects_to_burn if a.aspect_definition_id
+            ],
             aspect_name=generated_aspect.aspect_name,
             aspect_definition_id=generated_aspect.aspect_definition_id,
         )
@@ -1743,7 +1747,7 @@ async def handle_card_recycle_callback(
         try:
             generated_card = await generation_task
         except rolling.NoEligibleUserError:
-            event_manager.log(
+            event_manager.alog(
                 EventType.RECYCLE,
                 RecycleOutcome.ERROR,
                 user_id=user.user_id,
@@ -1757,7 +1761,7 @@ async def handle_card_recycle_callback(
             )
             return
         except rolling.ImageGenerationError:
-            event_manager.log(
+            event_manager.alog(
                 EventType.RECYCLE,
                 RecycleOutcome.ERROR,
                 user_id=user.user_id,
@@ -1772,7 +1776,7 @@ async def handle_card_recycle_callback(
             return
         except Exception as exc:
             logger.error("Error while generating recycled card: %s", exc)
-            event_manager.log(
+            event_manager.alog(
                 EventType.RECYCLE,
                 RecycleOutcome.ERROR,
                 user_id=user.user_id,
@@ -1798,7 +1802,7 @@ async def handle_card_recycle_callback(
                 user.user_id,
                 card_ids_to_delete,
             )
-            event_manager.log(
+            event_manager.alog(
                 EventType.RECYCLE,
                 RecycleOutcome.ERROR,
                 user_id=user.user_id,
@@ -1832,7 +1836,7 @@ async def handle_card_recycle_callback(
             )
 
         # Log recycle success
-        event_manager.log(
+        event_manager.alog(
             EventType.RECYCLE,
             RecycleOutcome.SUCCESS,
             user_id=user.user_id,
@@ -1841,6 +1845,12 @@ async def handle_card_recycle_callback(
             source_rarity=rarity_name,
             new_rarity=upgrade_rarity,
             cards_burned=card_ids_to_delete,
+            destroyed_aspect_definition_ids=[
+                ca.aspect.aspect_definition_id
+                for c in cards_to_burn
+                for ca in c.equipped_aspects
+                if ca.aspect and ca.aspect.aspect_definition_id
+            ],
         )
 
         burned_block = "\n".join([f"<s>🔥🃏 {name}🔥</s>" for name in card_titles])
@@ -2122,7 +2132,9 @@ async def handle_create_callback(update: Update, context: ContextTypes.DEFAULT_T
 
                 # Process image and thumbnail
                 image_bytes = base64.b64decode(image_b64)
-                thumbnail_bytes = ImageUtil.compress_to_fraction(image_bytes)
+                thumbnail_bytes = await image_workers.run_async(
+                    "compress_to_fraction", image_bytes
+                )
 
                 # Create the Unique aspect — assigned to user immediately
                 aspect_id = await asyncio.to_thread(
@@ -2144,7 +2156,7 @@ async def handle_create_callback(update: Update, context: ContextTypes.DEFAULT_T
                     await asyncio.to_thread(aspect_manager.recycle_aspects, burn_ids, user_id)
 
                 # Log create success event
-                event_manager.log(
+                event_manager.alog(
                     EventType.CREATE,
                     CreateOutcome.SUCCESS,
                     user_id=user_id,
@@ -2152,6 +2164,15 @@ async def handle_create_callback(update: Update, context: ContextTypes.DEFAULT_T
                     aspect_id=aspect_id,
                     aspect_name=aspect_name,
                     aspects_burned=[a.id for a in aspects_to_burn],
+                    recycled_aspect_definition_ids=(
+                        []
+                        if DEBUG_MODE
+                        else [
+                            a.aspect_definition_id
+                            for a in aspects_to_burn
+                            if a.aspect_definition_id
+                        ]
+                    ),
                 )
 
                 # Clean up session
@@ -2195,7 +2216,7 @@ async def handle_create_callback(update: Update, context: ContextTypes.DEFAULT_T
             except Exception as e:
                 logger.error(f"Error creating unique aspect: {e}", exc_info=True)
                 # Log create error event
-                event_manager.log(
+                event_manager.alog(
                     EventType.CREATE,
                     CreateOutcome.ERROR,
                     user_id=user_id,
@@ -73,6 +73,7 @@ from managers import event_manager
 from managers import aspect_manager
 from utils.schemas import User, Card
 from utils.decorators import verify_user_in_chat
+from utils.generation import CandidateGeneration, CandidateGenerationError
 from utils.events import (
     EventType,
     RefreshOutcome,
@@ -81,6 +82,9 @@ from utils.events import (
 
 logger = logging.getLogger(__name__)
 
+# New images generated per refresh (offered alongside the original)
+REFRESH_NEW_OPTION_COUNT = 2
+
 
 @verify_user_in_chat
 async def refresh(
@@ -268,19 +272,14 @@ async def _handle_refresh_nav(
     card_title = card.title(include_id=True, include_rarity=True) if card else f"Card {card_id}"
     remaining_balance = session["remaining_balance"]
 
-    options_caption = REFRESH_OPTIONS_READY_MESSAGE.format(
-        card_title=card_title,
-        remaining_balance=remaining_balance,
+    caption = _refresh_options_caption(
+        card_title,
+        remaining_balance,
+        option_index,
+        len(options),
+        _pending_refresh_options(session),
     )
 
-    # Label option 1 as "Original", others as regular options
-    if option_index == 1:
-        option_label = f"<b>Option {option_index} of {len(options)} (Original)</b>"
-    else:
-        option_label = f"<b>Option {option_index} of {len(options)}</b>"
-
-    caption = f"{options_caption}\n\n{option_label}"
-
     # Update to show the selected option
     keyboard = _build_refresh_navigation_keyboard(card_id, user.user_id, option_index, len(options))
 
@@ -298,6 +297,7 @@ async def _handle_refresh_nav(
             ),
             reply_markup=keyboard,
         )
+        session["current"] = option_index
         await query.answer()
     except Exception as exc:
         logger.warning("Failed to navigate to option %s: %s", option_index, exc)
@@ -325,6 +325,9 @@ async def _handle_refresh_pick(
         await query.answer("Invalid option.", show_alert=True)
         return
 
+    # The choice is made; options still being generated are not needed
+    _stop_refresh_generation(session)
+
     card = await asyncio.to_thread(card_repo.get_card, card_id)
     card_title = card.title(include_id=True, include_rarity=True) if card else f"Card {card_id}"
     chat_id_for_balance = session["chat_id"]
@@ -383,7 +386,7 @@ async def _handle_refresh_pick(
     )
 
     # Log refresh success event
-    event_manager.log(
+    event_manager.alog(
         EventType.REFRESH,
         RefreshOutcome.SUCCESS,
         user_id=user.user_id,
@@ -413,39 +416,41 @@ async def _generate_refresh_options(
     card: Card,
     gemini_util,
     max_retries: int,
-) -> tuple[str, str]:
-    """Generate two refresh image options.
+) -> CandidateGeneration:
+    """Start generating the new refresh image options concurrently.
 
-    For cards with equipped aspects, uses ``generate_card_with_aspects``
+    Returns the running ``CandidateGeneration``; each option retries on its
+    own.  For cards with equipped aspects, uses ``generate_card_with_aspects``
     which generates from scratch using the character photo + all equipped
     aspect sphere images.
     """
     if card.aspect_count > 0:
         return await _generate_equipped_refresh_options(card, gemini_util, max_retries)
 
-    option1_b64 = await asyncio.to_thread(
-        rolling.regenerate_card_image,
-        card,
-        gemini_util,
-        max_retries=max_retries,
-        refresh_attempt=2,
-    )
-    option2_b64 = await asyncio.to_thread(
-        rolling.regenerate_card_image,
-        card,
-        gemini_util,
+    def generate(index: int) -> str:
+        # A single attempt per call; CandidateGeneration handles retries
+        return rolling.regenerate_card_image(
+            card,
+            gemini_util,
+            max_retries=0,
+            refresh_attempt=index + 2,
+        )
+
+    return CandidateGeneration(
+        generate,
+        REFRESH_NEW_OPTION_COUNT,
         max_retries=max_retries,
-        refresh_attempt=3,
-    )
-    return option1_b64, option2_b64
+        fatal_errors=(rolling.InvalidSourceError, rolling.NoEligibleUserError),
+        label=f"refresh option for card {card.id}",
+    ).start()
 
 
 async def _generate_equipped_refresh_options(
     card: Card,
     gemini_util,
     max_retries: int,
-) -> tuple[str, str]:
-    """Generate two refresh options for a card with equipped aspects.
+) -> CandidateGeneration:
+    """Start generating refresh options for a card with equipped aspects.
 
     Uses ``generate_card_with_aspects`` which starts from scratch with
     the character photo, rarity template, and all equipped aspect sphere
@@ -461,54 +466,124 @@ async def _generate_equipped_refresh_options(
         rolling.get_profile_for_source, card.source_type, card.source_id
     )
 
-    # Gather all equipped aspect images
-    equipped = await asyncio.to_thread(aspect_repo.get_aspects_for_card, card.id)
-    aspects_with_images = []
-    for ca in equipped:
-        aspect_with_img = await asyncio.to_thread(aspect_repo.get_aspect_with_image, ca.aspect_id)
-        if aspect_with_img and aspect_with_img.image_b64:
-            aspects_with_images.append(aspect_with_img)
+    # All equipped aspect images, in slot order
+    aspects_with_images = await asyncio.to_thread(
+        aspect_repo.get_equipped_aspect_images, card.id
+    )
 
     card_name = card.title()
-    total_attempts = max(1, max_retries + 1)
 
-    results: list[str] = []
-    for attempt_idx in range(2):
-        temperature = 1.0 + (0.25 * (attempt_idx + 1))
-        last_error: Optional[Exception] = None
+    def generate(index: int) -> Optional[str]:
+        return gemini_util.generate_card_with_aspects(
+            card.rarity,
+            card_name,
+            aspects_with_images,
+            base_image_b64=profile.image_b64,
+            temperature=1.0 + (0.25 * (index + 1)),
+        )
+
+    return CandidateGeneration(
+        generate,
+        REFRESH_NEW_OPTION_COUNT,
+        max_retries=max_retries,
+        label=f"equipped refresh option for card {card.id}",
+    ).start()
 
-        for attempt in range(1, total_attempts + 1):
+
+def _refresh_options_caption(
+    card_title: str,
+    remaining_balance: int,
+    option_index: int,
+    total_options: int,
+    pending_options: int,
+) -> str:
+    """Caption for the option browser, noting options still being generated."""
+    options_caption = REFRESH_OPTIONS_READY_MESSAGE.format(
+        card_title=card_title,
+        remaining_balance=remaining_balance,
+    )
+
+    # Label option 1 as "Original", others as regular options
+    if option_index == 1:
+        option_label = f"<b>Option {option_index} of {total_options} (Original)</b>"
+    else:
+        option_label = f"<b>Option {option_index} of {total_options}</b>"
+
+    caption = f"{options_caption}\n\n{option_label}"
+    if pending_options:
+        plural = "s" if pending_options > 1 else ""
+        caption += f"\n<i>Generating {pending_options} more option{plural}...</i>"
+    return caption
+
+
+def _pending_refresh_options(session: dict) -> int:
+    generation: Optional[CandidateGeneration] = session.get("generation")
+    return generation.pending if generation is not None else 0
+
+
+def _stop_refresh_generation(session: Optional[dict]) -> None:
+    """Cancel options still being generated for a finished refresh session."""
+    if not session:
+        return
+    generation: Optional[CandidateGeneration] = session.get("generation")
+    if generation is not None:
+        generation.cancel()
+    collector: Optional[asyncio.Task] = session.get("collector")
+    if collector is not None and not collector.done():
+        collector.cancel()
+
+
+async def _collect_refresh_options(
+    query,
+    card_id: int,
+    user_id: int,
+    card_title: str,
+    session: dict,
+) -> None:
+    """Append options to ``session`` as they finish and refresh the caption."""
+    generation: CandidateGeneration = session["generation"]
+    try:
+        async for _, image_b64 in generation.as_completed():
+            session["options"].append(image_b64)
+            current = session["current"]
+            total = len(session["options"])
             try:
-                image_b64 = await asyncio.to_thread(
-                    gemini_util.generate_card_with_aspects,
-                    card.rarity,
-                    card_name,
-                    aspects_with_images,
-                    base_image_b64=profile.image_b64,
-                    temperature=temperature,
+                await query.edit_message_caption(
+                    caption=_refresh_options_caption(
+                        card_title,
+                        session["remaining_balance"],
+                        current,
+                        total,
+                        generation.pending,
+                    ),
+                    parse_mode=ParseMode.HTML,
+                    reply_markup=_build_refresh_navigation_keyboard(
+                        card_id, user_id, current, total
+                    ),
                 )
-                if not image_b64:
-                    raise rolling.ImageGenerationError("Empty image returned")
-                results.append(image_b64)
-                break
             except Exception as exc:
-                last_error = exc
-                logger.warning(
-                    "Equipped refresh attempt %s/%s (option %s) failed for card %s: %s",
-                    attempt,
-                    total_attempts,
-                    attempt_idx + 1,
-                    card.id,
-                    exc,
-                )
-                if attempt < total_attempts:
-                    await asyncio.sleep(1)
-        else:
-            raise last_error or rolling.ImageGenerationError(
-                "Equipped refresh failed after retries"
+                logger.debug("Could not update refresh caption for card %s: %s", card_id, exc)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        logger.warning("Additional refresh options failed for card %s: %s", card_id, exc)
+
+    missing = REFRESH_NEW_OPTION_COUNT + 1 - len(session["options"])
+    if missing > 0:
+        logger.warning("Refresh for card %s finished with %d option(s) missing", card_id, missing)
+        # Drop the "generating" note from the caption
+        current = session["current"]
+        total = len(session["options"])
+        try:
+            await query.edit_message_caption(
+                caption=_refresh_options_caption(
+                    card_title, session["remaining_balance"], current, total, 0
+                ),
+                parse_mode=ParseMode.HTML,
+                reply_markup=_build_refresh_navigation_keyboard(card_id, user_id, current, total),
             )
-
-    return results[0], results[1]
+        except Exception:
+            pass
 
 
 async def _update_to_refresh_options(
@@ -518,16 +593,16 @@ async def _update_to_refresh_options(
     card_title: str,
     remaining_balance: int,
     original_image_b64: str,
+    ready_options: int,
+    pending_options: int,
 ):
     """Update the confirmation message to show the original image as option 1."""
-    num_options = 3  # Original + 2 new options
+    num_options = 1 + ready_options  # Original + new options generated so far
     keyboard = _build_refresh_navigation_keyboard(card_id, user_id, 1, num_options)
 
-    options_caption = REFRESH_OPTIONS_READY_MESSAGE.format(
-        card_title=card_title,
-        remaining_balance=remaining_balance,
+    caption = _refresh_options_caption(
+        card_title, remaining_balance, 1, num_options, pending_options
     )
-    caption = f"{options_caption}\n\n<b>Option 1 of {num_options} (Original)</b>"
 
     original_photo = BytesIO(base64.b64decode(original_image_b64))
     original_photo.name = "refresh_option_1_original.jpg"
@@ -557,6 +632,7 @@ async def _handle_refresh_confirm(
     points_deducted = False
     refresh_cost = 0
     active_chat_id = None
+    generation: Optional[CandidateGeneration] = None
     try:
         card = await asyncio.to_thread(card_repo.get_card, card_id)
         if not card:
@@ -602,22 +678,26 @@ async def _handle_refresh_confirm(
         except Exception:
             pass
 
-        # Generate two image options
+        # Generate the new options concurrently; show the browser once the first is ready
         try:
-            option1_b64, option2_b64 = await _generate_refresh_options(
+            generation = await _generate_refresh_options(
                 card, gemini_util, MAX_BOT_IMAGE_RETRIES
             )
+            _, first_option_b64 = await generation.first_ready()
         except (
             rolling.ImageGenerationError,
             rolling.InvalidSourceError,
             rolling.NoEligibleUserError,
+            CandidateGenerationError,
         ) as exc:
+            if generation is not None:
+                generation.cancel()
             logger.warning("Image regeneration failed for card %s: %s", card_id, exc)
             await asyncio.to_thread(
                 claim_repo.increment_claim_balance, user.user_id, active_chat_id, refresh_cost
             )
             # Log refresh error event
-            event_manager.log(
+            event_manager.alog(
                 EventType.REFRESH,
                 RefreshOutcome.ERROR,
                 user_id=user.user_id,
@@ -649,8 +729,11 @@ async def _handle_refresh_confirm(
                 card_title,
                 remaining_balance,
                 original_image_b64,
+                ready_options=1,
+                pending_options=generation.pending,
             )
         except Exception as exc:
+            generation.cancel()
             logger.warning("Failed to show refresh options for card %s: %s", card_id, exc)
             await asyncio.to_thread(
                 claim_repo.increment_claim_balance, user.user_id, active_chat_id, refresh_cost
@@ -667,16 +750,26 @@ async def _handle_refresh_confirm(
                 pass
             return
 
-        # Store session data with original image as option 1, new images as options 2 and 3
-        refresh_sessions[session_key] = {
-            "options": [original_image_b64, option1_b64, option2_b64],
+        # Store session data with original image as option 1; new options are
+        # appended as they finish
+        session = {
+            "options": [original_image_b64, first_option_b64],
             "cost": refresh_cost,
             "remaining_balance": remaining_balance,
             "chat_id": active_chat_id,
+            "current": 1,
+            "generation": generation,
         }
+        _stop_refresh_generation(refresh_sessions.get(session_key))
+        refresh_sessions[session_key] = session
+        session["collector"] = asyncio.create_task(
+            _collect_refresh_options(query, card_id, user.user_id, card_title, session)
+        )
 
     except Exception as exc:
         logger.exception("Unexpected error during refresh for card %s: %s", card_id, exc)
+        if generation is not None:
+            generation.cancel()
         if points_deducted:
             await asyncio.to_thread(
                 claim_repo.increment_claim_balance, user.user_id, active_chat_id, refresh_cost
@@ -1061,7 +1154,7 @@ async def handle_equip_callback(
             except Exception:
                 pass
         if chat_id_str:
-            event_manager.log(
+            event_manager.alog(
                 EventType.EQUIP,
                 EquipOutcome.FAILURE,
                 user_id=user.user_id,
@@ -1125,7 +1218,7 @@ async def handle_equip_callback(
 
         if not equip_success:
             await query.edit_message_text(EQUIP_DB_FAILURE_MESSAGE)
-            event_manager.log(
+            event_manager.alog(
                 EventType.EQUIP,
                 EquipOutcome.FAILURE,
                 user_id=user.user_id,
@@ -1136,6 +1229,17 @@ async def handle_equip_callback(
             )
             return
 
+        # The equip is committed; the image below is regenerated on a best-effort basis
+        event_manager.alog(
+            EventType.EQUIP,
+            EquipOutcome.SUCCESS,
+            user_id=user.user_id,
+            chat_id=chat_id_str,
+            card_id=card_id,
+            aspect_id=aspect_id,
+            aspect_name=aspect_name,
+        )
+
         # --- Image generation phase ---
         # Retrieve the updated card with its image
         card_with_image = await asyncio.to_thread(card_repo.get_card_with_aspects, card_id)
@@ -1184,16 +1288,10 @@ async def handle_equip_callback(
             )
             return
 
-        # Gather all equipped aspect images (flat list)
-        equipped_aspects_data = await asyncio.to_thread(aspect_repo.get_aspects_for_card, card_id)
-        aspects_with_images = []
-
-        for ca in equipped_aspects_data:
-            aspect_with_img = await asyncio.to_thread(
-                aspect_repo.get_aspect_with_image, ca.aspect_id
-            )
-            if aspect_with_img and aspect_with_img.image_b64:
-                aspects_with_images.append(aspect_with_img)
+        # All equipped aspect images, in slot order
+        aspects_with_images = await asyncio.to_thread(
+            aspect_repo.get_equipped_aspect_images, card_id
+        )
 
         # Generate the card image with the new aspect
         try:
@@ -1241,16 +1339,6 @@ async def handle_equip_callback(
 
             await save_card_file_id_from_message(sent_message, card_id)
 
-            event_manager.log(
-                EventType.EQUIP,
-                EquipOutcome.SUCCESS,
-                user_id=user.user_id,
-                chat_id=chat_id_str,
-                card_id=card_id,
-                aspect_id=aspect_id,
-                aspect_name=aspect_name,
-            )
-
             # Delete the crafting message
             try:
                 await query.message.delete()
@@ -1270,7 +1358,7 @@ async def handle_equip_callback(
 
     except Exception as exc:
         logger.exception("Unexpected error during equip for card %s: %s", card_id, exc)
-        event_manager.log(
+        event_manager.alog(
             EventType.EQUIP,
             EquipOutcome.FAILURE,
             user_id=user.user_id,
@@ -21,6 +21,7 @@ from repos import user_repo
 from repos import claim_repo
 from repos import spin_repo
 from repos import aspect_repo
+from managers import chat_context_manager
 from utils.schemas import User
 from utils.decorators import verify_user, verify_user_in_chat
 from utils.miniapp import encode_miniapp_token, encode_casino_token
@@ -98,7 +99,7 @@ async def balance(
                 )
             return
 
-        is_member = await asyncio.to_thread(user_repo.is_user_in_chat, chat_id, target_user_id)
+        is_member = await asyncio.to_thread(chat_context_manager.is_member, chat_id, target_user_id)
         if not is_member:
             if message:
                 await message.reply_text(
@@ -160,7 +161,7 @@ async def collection(
         chat_id_filter = str(chat.id)
     if chat and chat.type != ChatType.PRIVATE:
         is_member = await asyncio.to_thread(
-            user_repo.is_user_in_chat, str(chat.id), user.user_id
+            chat_context_manager.is_member, str(chat.id), user.user_id
         )
         if not is_member:
             prompt = "You're not enrolled in this chat yet. Use /enroll in this chat to join."
@@ -299,7 +300,7 @@ async def handle_collection_show(
         chat_id_filter = str(chat.id)
     if chat and chat.type != ChatType.PRIVATE:
         is_member = await asyncio.to_thread(
-            user_repo.is_user_in_chat, str(chat.id), user.user_id
+            chat_context_manager.is_member, str(chat.id), user.user_id
         )
         if not is_member:
             await query.answer(
@@ -453,7 +454,7 @@ async def handle_collection_navigation(
         chat_id_filter = str(chat.id)
     if chat and chat.type != ChatType.PRIVATE:
         is_member = await asyncio.to_thread(
-            user_repo.is_user_in_chat, str(chat.id), user.user_id
+            chat_context_manager.is_member, str(chat.id), user.user_id
         )
         if not is_member:
             await query.answer(
@@ -658,7 +659,7 @@ async def _get_user_targets_for_stats(
         if target_user_id is None:
             raise ValueError(f"@{target_username} doesn't exist or isn't enrolled yet.")
 
-        is_member = await asyncio.to_thread(user_repo.is_user_in_chat, chat_id, target_user_id)
+        is_member = await asyncio.to_thread(chat_context_manager.is_member, chat_id, target_user_id)
         if not is_member:
             raise ValueError(f"@{target_username} isn't enrolled in this chat.")
 
@@ -1,10 +1,17 @@
 """Notification handler — PTB-aware notification scheduling and sending.
 
 This module bridges the notification manager (PTB-free business logic)
-with python-telegram-bot's JobQueue and Bot API. It handles:
-- Scheduling one-shot jobs via job_queue.run_once()
-- Sending DM notifications with deep link buttons
-- Startup recovery for unsent notifications
+with the Telegram Bot API. It handles:
+- A DB-driven scheduler that claims due notifications in batches
+- Sending DM notifications with deep link buttons, rate-limited
+- Resolving chat titles and thread IDs via the chat context cache
+
+The ``roll_notifications`` table is the schedule: nothing is materialized
+in memory per notification, so startup does no recovery pass and several
+bot workers can poll the same table (``SKIP LOCKED`` gives each a disjoint
+batch). The scheduler sleeps until the earliest pending ``notify_at``
+(capped at ``NOTIFICATION_POLL_INTERVAL_SECONDS``) and is woken early when
+a roll schedules an earlier notification.
 """
 
 from __future__ import annotations
@@ -13,20 +20,28 @@ import asyncio
 import datetime
 import html
 import logging
-from typing import Optional
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ParseMode
 from telegram.error import Forbidden, RetryAfter
-from telegram.ext import Application, CallbackContext
+from telegram.ext import Application
 
-from managers import notification_manager
-from repos import thread_repo
+from managers import chat_context_manager, notification_manager
+from settings.constants import (
+    BOT_WORKERS,
+    NOTIFICATION_BATCH_SIZE,
+    NOTIFICATION_POLL_INTERVAL_SECONDS,
+    NOTIFICATION_SENDS_PER_SECOND,
+)
+from utils.models import RollNotificationModel
 
 logger = logging.getLogger(__name__)
 
-# Job name prefix for roll notification jobs
-_JOB_NAME_PREFIX = "roll_notif"
+_BOT_DATA_KEY = "notification_scheduler"
+# Shortest sleep between polls of the notification table
+_MIN_POLL_SECONDS = 1.0
 
 
 def build_chat_link(
@@ -49,222 +64,226 @@ def build_chat_link(
     return f"https://t.me/c/{numeric_id}/{thread_id}"
 
 
-def _job_name(user_id: int, chat_id: str) -> str:
-    """Generate a unique job name for a user/chat notification."""
-    return f"{_JOB_NAME_PREFIX}_{user_id}_{chat_id}"
+# ---------------------------------------------------------------------------
+# Rate-limited sender
+# ---------------------------------------------------------------------------
 
 
-def schedule_notification(
-    job_queue, user_id: int, chat_id: str, notify_at: datetime.datetime,
-) -> None:
-    """Schedule a one-shot notification job via JobQueue.
-
-    Removes any existing job for the same user/chat pair first
-    to avoid duplicates when a user re-rolls.
+class _SendRateLimiter:
+    """Spaces sends evenly at ``rate`` messages per second.
 
-    This function is thread-safe — APScheduler's add_job() uses
-    internal locks and call_soon_threadsafe for event loop wakeup.
+    Telegram's bulk limit is ~30 messages/second per bot, shared by every
+    process using the token, so each worker gets an equal share. A
+    ``RetryAfter`` pauses all sends of this process for the requested time.
     """
-    name = _job_name(user_id, chat_id)
-
-    # Remove any existing job for this user/chat pair
-    existing_jobs = job_queue.get_jobs_by_name(name)
-    for job in existing_jobs:
-        job.schedule_removal()
-
-    job_queue.run_once(
-        _send_notification_callback,
-        when=notify_at,
-        name=name,
-        data={
-            "user_id": user_id,
-            "chat_id": chat_id,
-            "notify_at": notify_at.isoformat(),
-        },
-    )
-
-    logger.debug(
-        "Scheduled roll notification for user %d in chat %s at %s",
-        user_id, chat_id, notify_at,
-    )
-
-
-async def _send_notification_callback(context: CallbackContext) -> None:
-    """JobQueue callback that sends the actual DM notification."""
-    data = context.job.data
-    user_id = data["user_id"]
-    chat_id = data["chat_id"]
-    expected_notify_at = datetime.datetime.fromisoformat(data["notify_at"])
-
-    await _send_single_notification(
-        context.bot, user_id, chat_id, expected_notify_at,
-    )
-
-
-async def _send_single_notification(
-    bot: Bot,
-    user_id: int,
-    chat_id: str,
-    expected_notify_at: datetime.datetime,
-) -> None:
-    """Send a single roll-ready DM notification.
 
-    Uses atomic claim_and_complete to check deliverability (enrollment +
-    prefs + staleness) and mark as sent in one transaction. This prevents
-    duplicate sends from concurrent workers.
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
 
-    Thread ID for the deep link is looked up from ThreadModel at send time.
-    """
-    # Atomic: check deliverability + mark as sent in one transaction
-    claimed = await asyncio.to_thread(
-        notification_manager.claim_and_complete,
-        user_id, chat_id, expected_notify_at,
-    )
-
-    if not claimed:
-        logger.debug(
-            "Notification for user %d chat %s not deliverable (opted out, "
-            "unenrolled, already sent, or superseded by newer roll)",
-            user_id, chat_id,
-        )
-        return
-
-    # Look up thread from ThreadModel (source of truth)
-    message_thread_id = await asyncio.to_thread(
-        thread_repo.get_thread_id, str(chat_id),
-    )
-
-    # Get chat title
-    chat_title = "the group"
-    try:
-        chat = await bot.get_chat(chat_id)
-        if chat.title:
-            chat_title = chat.title
-    except Exception as e:
-        logger.warning("Failed to get chat info for %s: %s", chat_id, e)
-
-    # Build message with HTML-escaped title
-    safe_title = html.escape(chat_title)
-    text = (
-        "🎲 <b>Your roll is ready!</b>\n\n"
-        f"You can now /roll in <b>{safe_title}</b>."
-    )
-
-    # Build deep link button if thread available
-    link = build_chat_link(str(chat_id), message_thread_id)
-    reply_markup = None
-    if link:
-        reply_markup = InlineKeyboardMarkup([
-            [InlineKeyboardButton(text="Go to chat →", url=link)]
-        ])
-
-    # Send DM — notification is already marked sent by claim_and_complete
-    try:
-        await bot.send_message(
-            chat_id=user_id,
-            text=text,
-            parse_mode=ParseMode.HTML,
-            reply_markup=reply_markup,
-        )
-        logger.info(
-            "Sent roll notification to user %d for chat %s", user_id, chat_id,
-        )
-    except Forbidden:
-        # User blocked the bot — already marked sent, just log
-        logger.info(
-            "User %d blocked bot, notification already marked sent", user_id,
-        )
-    except RetryAfter as e:
-        logger.warning(
-            "Rate limited sending to user %d, retrying in %ds",
-            user_id, e.retry_after,
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+
+class NotificationScheduler:
+    """Background task that delivers due roll notifications from the database."""
+
+    def __init__(self, bot: Bot):
+        self._bot = bot
+        self._limiter = _SendRateLimiter(
+            NOTIFICATION_SENDS_PER_SECOND / max(1, BOT_WORKERS)
         )
-        await asyncio.sleep(e.retry_after)
-        try:
-            await bot.send_message(
-                chat_id=user_id,
-                text=text,
-                parse_mode=ParseMode.HTML,
-                reply_markup=reply_markup,
+        self._wake = asyncio.Event()
+        self._next_wake_at: Optional[datetime.datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self, notify_at: datetime.datetime) -> None:
+        """Re-plan if a newly scheduled notification is due before the next poll."""
+        if self._next_wake_at is None or notify_at < self._next_wake_at:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        logger.info("Roll notification scheduler started")
+        max_sleep = datetime.timedelta(seconds=NOTIFICATION_POLL_INTERVAL_SECONDS)
+        while True:
+            self._wake.clear()
+            next_due: Optional[datetime.datetime] = None
+            try:
+                await self._deliver_due()
+                next_due = await asyncio.to_thread(notification_manager.get_next_notify_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Roll notification scheduler error: %s", e, exc_info=True)
+
+            now = datetime.datetime.now(datetime.timezone.utc)
+            wake_at = now + max_sleep
+            if next_due is not None and next_due < wake_at:
+                wake_at = next_due
+            self._next_wake_at = wake_at
+
+            # Floor: rows still due here are locked by another worker's
+            # in-flight claim (or were filtered out); don't spin on them.
+            delay = max((wake_at - now).total_seconds(), _MIN_POLL_SECONDS)
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _deliver_due(self) -> None:
+        """Claim and send due notifications batch by batch until none are left."""
+        while True:
+            batch = await asyncio.to_thread(
+                notification_manager.claim_due_notifications, NOTIFICATION_BATCH_SIZE,
             )
-            logger.info(
-                "Sent roll notification to user %d for chat %s (after retry)",
-                user_id, chat_id,
+            # An empty result can also mean every claimed row was undeliverable;
+            # the next due time is then already past, so _run polls again at once.
+            if not batch:
+                return
+            logger.info("Delivering %d roll notifications", len(batch))
+            chat_info = {}
+            for chat_id in {str(n.chat_id) for n in batch}:
+                chat_info[chat_id] = await self._chat_info(chat_id)
+            await asyncio.gather(
+                *(self._deliver(n, *chat_info[str(n.chat_id)]) for n in batch)
             )
-        except Exception as retry_err:
-            logger.error(
-                "Failed to send notification to user %d after retry: %s",
-                user_id, retry_err,
-            )
-    except Exception as e:
-        logger.error(
-            "Failed to send notification to user %d: %s", user_id, e,
+
+    async def _chat_info(self, chat_id: str) -> Tuple[str, Optional[int]]:
+        """Chat title and main thread ID, from the chat context when cached."""
+        thread_id = await asyncio.to_thread(chat_context_manager.get_thread_id, chat_id)
+
+        title = chat_context_manager.get_title(chat_id)
+        if title is None:
+            try:
+                chat = await self._bot.get_chat(chat_id)
+                title = chat.title
+                chat_context_manager.remember_title(chat_id, title)
+            except Exception as e:
+                logger.warning("Failed to get chat info for %s: %s", chat_id, e)
+        return title or "the group", thread_id
+
+    async def _deliver(
+        self,
+        notification: RollNotificationModel,
+        chat_title: str,
+        thread_id: Optional[int],
+    ) -> None:
+        user_id = notification.user_id
+        chat_id = str(notification.chat_id)
+
+        # Build message with HTML-escaped title
+        safe_title = html.escape(chat_title)
+        text = (
+            "🎲 <b>Your roll is ready!</b>\n\n"
+            f"You can now /roll in <b>{safe_title}</b>."
         )
 
+        # Build deep link button if thread available
+        link = build_chat_link(chat_id, thread_id)
+        reply_markup = None
+        if link:
+            reply_markup = InlineKeyboardMarkup([
+                [InlineKeyboardButton(text="Go to chat →", url=link)]
+            ])
+
+        await self._send(user_id, chat_id, text, reply_markup)
+
+    async def _send(
+        self, user_id: int, chat_id: str, text: str, reply_markup: Any,
+    ) -> None:
+        # Notification is already marked sent by claim_due_notifications
+        for attempt in range(2):
+            await self._limiter.acquire()
+            try:
+                await self._bot.send_message(
+                    chat_id=user_id,
+                    text=text,
+                    parse_mode=ParseMode.HTML,
+                    reply_markup=reply_markup,
+                )
+                logger.info(
+                    "Sent roll notification to user %d for chat %s", user_id, chat_id,
+                )
+                return
+            except Forbidden:
+                # User blocked the bot — already marked sent, just log
+                logger.info(
+                    "User %d blocked bot, notification already marked sent", user_id,
+                )
+                return
+            except RetryAfter as e:
+                retry_after = float(e.retry_after)
+                logger.warning(
+                    "Rate limited sending to user %d, retrying in %ss",
+                    user_id, retry_after,
+                )
+                self._limiter.pause(retry_after)
+            except Exception as e:
+                logger.error(
+                    "Failed to send notification to user %d: %s", user_id, e,
+                )
+                return
+        logger.error("Failed to send notification to user %d after retry", user_id)
+
+
+# ---------------------------------------------------------------------------
+# Application wiring
+# ---------------------------------------------------------------------------
+
+
+def start_notification_scheduler(application: Application) -> NotificationScheduler:
+    """Create and start the scheduler for this bot process (post_init)."""
+    scheduler = application.bot_data.get(_BOT_DATA_KEY)
+    if scheduler is None:
+        scheduler = NotificationScheduler(application.bot)
+        application.bot_data[_BOT_DATA_KEY] = scheduler
+    scheduler.start()
+    return scheduler
+
+
+async def stop_notification_scheduler(application: Application) -> None:
+    """Stop the scheduler task if one was started."""
+    scheduler = application.bot_data.pop(_BOT_DATA_KEY, None)
+    if scheduler is not None:
+        await scheduler.stop()
 
-async def recover_pending_notifications(application: Application) -> None:
-    """Startup recovery: send overdue notifications and re-schedule future ones.
 
-    Called from post_init as a background task (asyncio.create_task) so
-    it doesn't block bot startup.
+def schedule_notification(
+    bot_data: Dict[str, Any], notify_at: datetime.datetime,
+) -> None:
+    """Tell the scheduler about a notification just persisted for ``notify_at``.
 
-    Recovery loads ALL unsent rows (no prefs/enrollment filter). The
-    send path (_send_single_notification) does the deliverability check
-    per-notification via atomic claim_and_complete.
+    The row itself is the schedule; this only wakes the scheduler when the
+    new notification is due before its next planned poll.
     """
-    bot = application.bot
-    job_queue = application.job_queue
-
-    logger.info("Starting notification recovery...")
-
-    # 1. Send overdue notifications
-    try:
-        pending = await asyncio.to_thread(
-            notification_manager.get_all_unsent_overdue,
-        )
-        if pending:
-            logger.info("Found %d overdue notifications to send", len(pending))
-            for i, notif in enumerate(pending):
-                try:
-                    await _send_single_notification(
-                        bot, notif.user_id, notif.chat_id, notif.notify_at,
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Failed to send overdue notification for user %d chat %s: %s",
-                        notif.user_id, notif.chat_id, e,
-                    )
-                # Rate limiting: pause every 30 messages
-                if (i + 1) % 30 == 0:
-                    await asyncio.sleep(1.0)
-                else:
-                    await asyncio.sleep(0.05)
-    except Exception as e:
-        logger.error("Error during overdue notification recovery: %s", e)
-
-    # 2. Re-schedule future notifications
-    try:
-        future = await asyncio.to_thread(
-            notification_manager.get_all_unsent_future,
-        )
-        if future:
-            logger.info(
-                "Re-scheduling %d future notifications", len(future),
-            )
-            for notif in future:
-                try:
-                    schedule_notification(
-                        job_queue,
-                        notif.user_id,
-                        notif.chat_id,
-                        notif.notify_at,
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Failed to re-schedule notification for user %d chat %s: %s",
-                        notif.user_id, notif.chat_id, e,
-                    )
-    except Exception as e:
-        logger.error("Error during future notification re-scheduling: %s", e)
-
-    logger.info("Notification recovery complete")
+    scheduler = bot_data.get(_BOT_DATA_KEY)
+    if scheduler is not None:
+        scheduler.wake(notify_at)
@@ -39,6 +39,7 @@ from managers import notification_manager
 from managers import roll_manager
 from utils.schemas import User
 from utils.decorators import verify_user_in_chat
+from utils.coordination import get_backend
 from utils.roll_action_buffer import PendingAction, get_buffer
 from utils.roll_manager import RollManager, ClaimStatus
 from utils.events import EventType, RollOutcome, RerollOutcome, ClaimOutcome, RollLockOutcome
@@ -66,17 +67,17 @@ async def roll(
         await update.message.reply_text("Caught a cheater! Only allowed to roll in the group chat.")
         return
 
-    rolling_users = context.bot_data.setdefault("rolling_users", set())
+    # One roll in flight per user, across every bot worker.
+    coordination = get_backend(context.bot_data)
+    roll_lock_key = f"roll-user:{user.user_id}"
 
-    if user.user_id in rolling_users:
+    if not await coordination.try_acquire(roll_lock_key):
         await update.message.reply_text(
             "Hang tight, I'm still finishing your previous roll.",
             reply_to_message_id=update.message.message_id,
         )
         return
 
-    rolling_users.add(user.user_id)
-
     roll_succeeded = False
     try:
         if not DEBUG_MODE:
@@ -128,7 +129,7 @@ async def roll(
         roll_succeeded = True
 
     except rolling.NoEligibleUserError:
-        event_manager.log(
+        event_manager.alog(
             EventType.ROLL,
             RollOutcome.ERROR,
             user_id=user.user_id,
@@ -142,7 +143,7 @@ async def roll(
         )
         return
     except rolling.ImageGenerationError:
-        event_manager.log(
+        event_manager.alog(
             EventType.ROLL,
             RollOutcome.ERROR,
             user_id=user.user_id,
@@ -156,7 +157,7 @@ async def roll(
         return
     except Exception as e:
         logger.error(f"Error in /roll: {e}")
-        event_manager.log(
+        event_manager.alog(
             EventType.ROLL,
             RollOutcome.ERROR,
             user_id=user.user_id,
@@ -168,7 +169,7 @@ async def roll(
             reply_to_message_id=update.message.message_id,
         )
     finally:
-        rolling_users.discard(user.user_id)
+        await coordination.release(roll_lock_key)
         if not DEBUG_MODE:
             await context.bot.set_message_reaction(
                 chat_id=update.effective_chat.id,
@@ -189,7 +190,7 @@ async def roll(
                 chat_id_str,
                 notify_at,
             )
-            schedule_notification(context.job_queue, user.user_id, chat_id_str, notify_at)
+            schedule_notification(context.bot_data, notify_at)
         except Exception as e:
             logger.error("Failed to schedule roll notification for user %d: %s", user.user_id, e)
 
@@ -248,7 +249,7 @@ async def _handle_card_roll(update, context, user, chat_id_str, generated_card):
     if not DEBUG_MODE:
         await asyncio.to_thread(roll_repo.record_roll, user.user_id, chat_id_str)
 
-    event_manager.log(
+    event_manager.alog(
         EventType.ROLL,
         RollOutcome.SUCCESS,
         user_id=user.user_id,
@@ -317,7 +318,7 @@ async def _handle_aspect_roll(update, context, user, chat_id_str, generated_aspe
     if not DEBUG_MODE:
         await asyncio.to_thread(roll_repo.record_roll, user.user_id, chat_id_str)
 
-    event_manager.log(
+    event_manager.alog(
         EventType.ROLL,
         RollOutcome.SUCCESS,
         user_id=user.user_id,
@@ -451,7 +452,7 @@ async def _process_claim_ordered(pending: PendingAction) -> None:
         if claim_result.balance is not None:
             message += f"\n\nBalance: {claim_result.balance}"
         await query.answer(message, show_alert=True)
-        event_manager.log(
+        event_manager.alog(
             EventType.CLAIM,
             ClaimOutcome.INSUFFICIENT,
             user_id=user.user_id,
@@ -477,7 +478,7 @@ async def _process_claim_ordered(pending: PendingAction) -> None:
 
     if claim_result.status is ClaimStatus.SUCCESS:
         await query.answer(_build_claim_message(claim_result.balance), show_alert=True)
-        event_manager.log(
+        event_manager.alog(
             EventType.CLAIM,
             ClaimOutcome.SUCCESS,
             user_id=user.user_id,
@@ -496,7 +497,7 @@ async def _process_claim_ordered(pending: PendingAction) -> None:
                 claim_repo.get_claim_balance, user.user_id, chat_id
             )
         await query.answer(_build_claim_message(remaining_balance), show_alert=True)
-        event_manager.log(
+        event_manager.alog(
             EventType.CLAIM,
             ClaimOutcome.ALREADY_OWNED,
             user_id=user.user_id,
@@ -509,7 +510,7 @@ async def _process_claim_ordered(pending: PendingAction) -> None:
         fresh_item = manager.item
         owner = fresh_item.owner if fresh_item else "someone"
         await query.answer(f"Too late! Already claimed by @{owner}.", show_alert=True)
-        event_manager.log(
+        event_manager.alog(
             EventType.CLAIM,
             ClaimOutcome.TAKEN,
             user_id=user.user_id,
@@ -587,7 +588,7 @@ async def _process_lock_ordered(pending: PendingAction) -> None:
         if lock_result.current_balance is not None:
             message += f"\n\nBalance: {lock_result.current_balance}"
         await query.answer(message, show_alert=True)
-        event_manager.log(
+        event_manager.alog(
             EventType.ROLL_LOCK,
             RollLockOutcome.INSUFFICIENT,
             user_id=user.user_id,
@@ -610,7 +611,7 @@ async def _process_lock_ordered(pending: PendingAction) -> None:
             lock_message += f"\n\nBalance: {lock_result.remaining_balance}"
     await query.answer(lock_message, show_alert=True)
 
-    event_manager.log(
+    event_manager.alog(
         EventType.ROLL_LOCK,
         RollLockOutcome.LOCKED,
         user_id=user.user_id,
@@ -798,7 +799,7 @@ async def _reroll_image_generation_task(
                 refund_amount,
             )
 
-        event_manager.log(
+        event_manager.alog(
             EventType.REROLL,
             RerollOutcome.SUCCESS,
             user_id=user.user_id,
@@ -808,7 +809,7 @@ async def _reroll_image_generation_task(
             **result.event_kwargs,
         )
     except rolling.NoEligibleUserError:
-        event_manager.log(
+        event_manager.alog(
             EventType.REROLL,
             RerollOutcome.ERROR,
             user_id=user.user_id,
@@ -819,7 +820,7 @@ async def _reroll_image_generation_task(
             manager, query, "No enrolled players have set a display name and profile photo yet."
         )
     except rolling.ImageGenerationError:
-        event_manager.log(
+        event_manager.alog(
             EventType.REROLL,
             RerollOutcome.ERROR,
             user_id=user.user_id,
@@ -130,7 +130,7 @@ def _log_trade_event(
     }
     if error_message:
         kwargs["error_message"] = error_message
-    event_manager.log(
+    event_manager.alog(
         EventType.TRADE,
         outcome,
         user_id=user_id,
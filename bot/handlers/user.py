@@ -19,6 +19,7 @@ from settings.constants import REACTION_IN_PROGRESS
 from repos import user_repo
 from repos import character_repo
 from repos import preferences_repo
+from managers import chat_context_manager
 from managers import character_manager
 from managers import user_manager
 from utils.schemas import User
@@ -329,7 +330,7 @@ async def delete_character(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         return
 
     deleted_count = await asyncio.to_thread(
-        character_repo.delete_characters_by_name, character_name
+        character_manager.delete_characters_by_name, character_name
     )
 
     if deleted_count == 0:
@@ -367,13 +368,13 @@ async def enroll(
         return
 
     chat_id = str(chat.id)
-    is_member = await asyncio.to_thread(user_repo.is_user_in_chat, chat_id, user.user_id)
+    is_member = await asyncio.to_thread(chat_context_manager.is_member, chat_id, user.user_id)
 
     if is_member:
         await message.reply_text("You're already enrolled in this chat.")
         return
 
-    inserted = await asyncio.to_thread(user_repo.add_user_to_chat, chat_id, user.user_id)
+    inserted = await asyncio.to_thread(chat_context_manager.add_member, chat_id, user.user_id)
 
     if inserted:
         await message.reply_text("You're enrolled! Have fun out there.")
@@ -400,13 +401,13 @@ async def unenroll(
         return
 
     chat_id = str(chat.id)
-    is_member = await asyncio.to_thread(user_repo.is_user_in_chat, chat_id, user.user_id)
+    is_member = await asyncio.to_thread(chat_context_manager.is_member, chat_id, user.user_id)
 
     if not is_member:
         await message.reply_text("You're not enrolled in this chat.")
         return
 
-    removed = await asyncio.to_thread(user_repo.remove_user_from_chat, chat_id, user.user_id)
+    removed = await asyncio.to_thread(chat_context_manager.remove_member, chat_id, user.user_id)
 
     if removed:
         await message.reply_text(
@@ -9,6 +9,7 @@ from __future__ import annotations
 import datetime
 from typing import List, Optional
 
+from managers import card_pool_manager
 from repos import card_repo, claim_repo
 from utils.session import get_session
 
@@ -53,7 +54,9 @@ def try_claim_card(
 
         now = datetime.datetime.now(datetime.timezone.utc)
         card_repo.set_card_owner(card_id, owner, user_id, updated_at=now, session=session)
-        return True
+
+    card_pool_manager.record_card_claimed(card.chat_id, card.rarity)
+    return True
 
 
 def recycle_cards(card_ids: List[int], user_id: int) -> bool:
@@ -85,4 +88,6 @@ def recycle_cards(card_ids: List[int], user_id: int) -> bool:
                 return False
 
         deleted = card_repo.delete_cards(card_ids, session=session)
-        return deleted == len(card_ids)
+
+    card_pool_manager.record_cards_removed(cards[0].chat_id, [c.rarity for c in cards])
+    return deleted == len(card_ids)
@@ -0,0 +1,122 @@
+"""Card pool manager — per-chat rarity histogram and random card sampling.
+
+Ride the Bus needs two things from a chat's owned-card pool: the rarity
+histogram (availability checks) and a handful of uniformly random cards (game
+creation).  Both used to scan every owned card in the chat on each request.
+
+This module keeps an in-process histogram per chat, loaded once via an indexed
+GROUP BY and then maintained incrementally when cards are claimed or deleted.
+Sampling draws random offsets from ``range(total)`` and resolves them in one
+indexed query, so game creation cost stays flat as chats grow.
+
+The bot and each API worker hold their own cache, so mutations made in another
+process are only picked up when the entry expires (``HISTOGRAM_TTL_SECONDS``).
+A stale total is detected during sampling and falls back to a full scan.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from repos import card_repo
+
+logger = logging.getLogger(__name__)
+
+HISTOGRAM_TTL_SECONDS = 300
+
+# chat_id -> (loaded_at monotonic seconds, rarity -> count)
+_histograms: Dict[str, Tuple[float, Dict[str, int]]] = {}
+_lock = threading.Lock()
+
+
+def _get_cached(chat_id: str) -> Optional[Dict[str, int]]:
+    entry = _histograms.get(chat_id)
+    if entry is None:
+        return None
+    loaded_at, histogram = entry
+    if time.monotonic() - loaded_at > HISTOGRAM_TTL_SECONDS:
+        return None
+    return histogram
+
+
+def get_rarity_histogram(chat_id: str) -> Dict[str, int]:
+    """Return a copy of the owned-card rarity histogram for a chat."""
+    chat_id = str(chat_id)
+    with _lock:
+        cached = _get_cached(chat_id)
+        if cached is not None:
+            return dict(cached)
+
+    histogram = card_repo.get_chat_card_rarity_counts(chat_id)
+
+    with _lock:
+        _histograms[chat_id] = (time.monotonic(), dict(histogram))
+    return dict(histogram)
+
+
+def record_card_claimed(chat_id: Optional[str], rarity: str) -> None:
+    """Account for a card that just became owned in a chat."""
+    _adjust(chat_id, [rarity], 1)
+
+
+def record_cards_removed(chat_id: Optional[str], rarities: Iterable[str]) -> None:
+    """Account for owned cards that were deleted or released from a chat."""
+    _adjust(chat_id, rarities, -1)
+
+
+def invalidate(chat_id: Optional[str] = None) -> None:
+    """Drop the cached histogram for a chat (or every chat when omitted)."""
+    with _lock:
+        if chat_id is None:
+            _histograms.clear()
+        else:
+            _histograms.pop(str(chat_id), None)
+
+
+def _adjust(chat_id: Optional[str], rarities: Iterable[str], delta: int) -> None:
+    if chat_id is None:
+        return
+    chat_id = str(chat_id)
+    with _lock:
+        cached = _get_cached(chat_id)
+        if cached is None:
+            # Nothing cached (or expired) — the next read loads fresh counts.
+            return
+        for rarity in rarities:
+            count = cached.get(rarity, 0) + delta
+            if count > 0:
+                cached[rarity] = count
+            else:
+                cached.pop(rarity, None)
+
+
+def sample_card_summaries(chat_id: str, count: int) -> List[Dict[str, Any]]:
+    """Pick ``count`` distinct random owned cards from a chat.
+
+    Returns:
+        List of dicts with keys: id, base_name, modifier, rarity.
+        Empty list if the chat does not own enough cards.
+    """
+    chat_id = str(chat_id)
+    total = sum(get_rarity_histogram(chat_id).values())
+    if total < count:
+        return []
+
+    offsets = random.sample(range(total), count)
+    selected = card_repo.get_card_summaries_at_offsets(chat_id, offsets)
+    if len({card["id"] for card in selected}) == count:
+        return selected
+
+    # The pool shrank since the histogram was cached (e.g. a card was deleted
+    # by another process). Refresh the counts and sample the slow way once.
+    logger.info(
+        "Card pool histogram for chat %s was stale (expected %d cards); rescanning",
+        chat_id,
+        total,
+    )
+    invalidate(chat_id)
+    return card_repo.get_random_card_summaries(chat_id, count)
@@ -23,7 +23,7 @@ from typing import Optional, Tuple
 
 from utils.schemas import RideTheBusGame
 from utils.session import get_session
-from repos import card_repo
+from managers import card_pool_manager
 from repos import rtb_repo
 from settings.constants import (
     RARITY_ORDER,
@@ -146,7 +146,7 @@ def check_availability(chat_id: str) -> Tuple[bool, Optional[str]]:
     if DEBUG_MODE:
         return True, None
 
-    rarity_counts = card_repo.get_chat_card_rarity_counts(chat_id)
+    rarity_counts = card_pool_manager.get_rarity_histogram(chat_id)
     total_cards = sum(rarity_counts.values())
 
     if total_cards < RTB_NUM_CARDS_TO_UNLOCK:
@@ -185,8 +185,8 @@ def create_game(
                 else:
                     return None, f"Please wait {int(remaining)} seconds before playing again"
 
-    # Select random cards from chat (lightweight query - only fetches id, rarity, title columns)
-    selected = card_repo.get_random_card_summaries(chat_id, RTB_CARDS_PER_GAME)
+    # Sample random cards via indexed offsets into the chat's owned-card pool
+    selected = card_pool_manager.sample_card_summaries(chat_id, RTB_CARDS_PER_GAME)
     if len(selected) < RTB_CARDS_PER_GAME:
         return None, f"Not enough cards in this chat. Need at least {RTB_CARDS_PER_GAME} cards."
 
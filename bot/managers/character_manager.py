@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
+from managers import chat_context_manager, slot_symbol_manager
 from repos import character_repo
 from utils.slot_icon import generate_slot_icon
 
@@ -14,10 +15,25 @@ logger = logging.getLogger(__name__)
 def add_character(chat_id: str, name: str, imageb64: str) -> int:
     """Add a character with auto-generated slot icon."""
     slot_icon_b64 = generate_slot_icon(imageb64)
-    return character_repo.add_character(chat_id, name, imageb64, slot_icon_b64=slot_icon_b64)
+    character_id = character_repo.add_character(chat_id, name, imageb64, slot_icon_b64=slot_icon_b64)
+    slot_symbol_manager.invalidate_chat(chat_id)
+    chat_context_manager.invalidate(chat_id)
+    return character_id
 
 
 def update_character_image(character_id: int, imageb64: str) -> bool:
     """Update a character's image with auto-generated slot icon."""
     slot_icon_b64 = generate_slot_icon(imageb64)
-    return character_repo.update_character_image(character_id, imageb64, slot_icon_b64=slot_icon_b64)
+    updated = character_repo.update_character_image(character_id, imageb64, slot_icon_b64=slot_icon_b64)
+    if updated:
+        slot_symbol_manager.invalidate_chat()
+    return updated
+
+
+def delete_characters_by_name(name: str) -> int:
+    """Delete every character with this name (case-insensitive) in any chat."""
+    deleted = character_repo.delete_characters_by_name(name)
+    if deleted:
+        slot_symbol_manager.invalidate_chat()
+        chat_context_manager.invalidate()
+    return deleted
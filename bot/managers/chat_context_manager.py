@@ -0,0 +1,240 @@
+"""Chat context manager — cached per-chat metadata used by chat-facing actions.
+
+Almost every outbound group message looks up the chat's configured thread,
+enrollment checks run on most commands, rolls pick from the chat's eligible
+profile sources and roll notifications need the chat title.  Each of those
+used to be a database round-trip (or a ``getChat`` API call) per action.
+
+``ChatContext`` bundles the per-chat data that changes rarely:
+
+- thread IDs by type (``"main"``, ``"trade"``)
+- the set of enrolled user IDs
+- eligible profile sources (user/character IDs and names only — no images)
+
+It is loaded with a handful of small queries and kept for
+``CHAT_CONTEXT_TTL_SECONDS``.  Mutations made through this module (enroll,
+unenroll, thread configuration) and profile/character changes invalidate the
+entry immediately.  Chat titles are not in the database: they are recorded
+from incoming updates (``remember_title``) and by the notification sender.
+
+The bot and each API worker hold their own cache.  Bot processes call
+``enable_broadcast`` at startup, after which every invalidation is also
+published through the coordination backend (``utils.coordination``), so a
+``/profile`` update handled by one bot worker drops the affected entries in
+the others.  With the ``memory`` backend there is only one bot process and
+nothing to reach.  API workers do not subscribe: they only read thread IDs
+and pick up a changed thread configuration when their entry expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from repos import character_repo, thread_repo, user_repo
+
+if TYPE_CHECKING:
+    from utils.coordination import CoordinationBackend
+
+logger = logging.getLogger(__name__)
+
+CHAT_CONTEXT_TTL_SECONDS = 300
+# Coordination channel carrying invalidated chat IDs ("" for every chat)
+INVALIDATE_CHANNEL = "chat_context_invalidate"
+
+
+@dataclass(frozen=True)
+class ProfileSourceRef:
+    """A user or character that can be drawn for card generation."""
+
+    source_type: str  # "user" or "character"
+    source_id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class ChatContext:
+    """Snapshot of a chat's rarely-changing metadata."""
+
+    chat_id: str
+    thread_ids: Mapping[str, int]
+    member_ids: FrozenSet[int]
+    profile_sources: Tuple[ProfileSourceRef, ...]
+    loaded_at: float
+
+    def thread_id(self, thread_type: str = "main") -> Optional[int]:
+        return self.thread_ids.get(thread_type)
+
+    def is_member(self, user_id: int) -> bool:
+        return user_id in self.member_ids
+
+
+# chat_id -> context
+_contexts: Dict[str, ChatContext] = {}
+# chat_id -> (title, recorded_at)
+_titles: Dict[str, Tuple[str, float]] = {}
+_lock = threading.Lock()
+# One loader per chat at a time; concurrent misses wait and reuse its result.
+_load_locks: Dict[str, threading.Lock] = {}
+# Publishes an invalidation to the other workers (set by ``enable_broadcast``)
+_broadcast: Optional[Callable[[Optional[str]], None]] = None
+
+
+def _is_fresh(recorded_at: float) -> bool:
+    return time.monotonic() - recorded_at < CHAT_CONTEXT_TTL_SECONDS
+
+
+def _load(chat_id: str) -> ChatContext:
+    users = user_repo.get_chat_users_with_profile_names(chat_id)
+    characters = character_repo.get_character_names_by_chat(chat_id)
+    sources = tuple(
+        [ProfileSourceRef("user", user_id, name) for user_id, name in users]
+        + [ProfileSourceRef("character", char_id, name) for char_id, name in characters]
+    )
+    return ChatContext(
+        chat_id=chat_id,
+        thread_ids=thread_repo.get_thread_ids(chat_id),
+        member_ids=frozenset(user_repo.get_all_chat_users(chat_id)),
+        profile_sources=sources,
+        loaded_at=time.monotonic(),
+    )
+
+
+def get_context(chat_id: str) -> ChatContext:
+    """Return the cached context for a chat, loading it if missing or expired."""
+    chat_id = str(chat_id)
+    with _lock:
+        context = _contexts.get(chat_id)
+        if context is not None and _is_fresh(context.loaded_at):
+            return context
+        load_lock = _load_locks.setdefault(chat_id, threading.Lock())
+
+    with load_lock:
+        with _lock:
+            context = _contexts.get(chat_id)
+        if context is not None and _is_fresh(context.loaded_at):
+            return context
+        context = _load(chat_id)
+        with _lock:
+            _contexts[chat_id] = context
+        logger.debug(
+            "Loaded chat context for %s (%d members, %d profile sources)",
+            chat_id,
+            len(context.member_ids),
+            len(context.profile_sources),
+        )
+        return context
+
+
+def get_thread_id(chat_id: str, thread_type: str = "main") -> Optional[int]:
+    """Cached equivalent of ``thread_repo.get_thread_id``."""
+    return get_context(chat_id).thread_id(thread_type)
+
+
+def is_member(chat_id: str, user_id: int) -> bool:
+    """Cached equivalent of ``user_repo.is_user_in_chat``."""
+    return get_context(chat_id).is_member(user_id)
+
+
+def get_profile_sources(chat_id: str) -> Tuple[ProfileSourceRef, ...]:
+    """Users with a complete profile plus characters of the chat."""
+    return get_context(chat_id).profile_sources
+
+
+def invalidate(chat_id: Optional[str] = None) -> None:
+    """Drop the cached context for a chat (or for every chat when omitted).
+
+    Also reaches the other bot workers once ``enable_broadcast`` was called.
+    """
+    _invalidate_local(chat_id)
+    if _broadcast is not None:
+        _broadcast(chat_id)
+
+
+def _invalidate_local(chat_id: Optional[str]) -> None:
+    with _lock:
+        if chat_id is None:
+            _contexts.clear()
+        else:
+            _contexts.pop(str(chat_id), None)
+
+
+async def enable_broadcast(backend: "CoordinationBackend") -> None:
+    """Share invalidations with every worker subscribed through ``backend``.
+
+    Must be awaited on the process's event loop; ``invalidate`` may then be
+    called from any thread.
+    """
+    global _broadcast
+    loop = asyncio.get_running_loop()
+
+    def receive(payload: str) -> None:
+        _invalidate_local(payload or None)
+
+    def publish(chat_id: Optional[str]) -> None:
+        if loop.is_closed():
+            return  # Shutting down
+        payload = "" if chat_id is None else str(chat_id)
+        asyncio.run_coroutine_threadsafe(backend.publish(INVALIDATE_CHANNEL, payload), loop)
+
+    await backend.subscribe(INVALIDATE_CHANNEL, receive)
+    _broadcast = publish
+
+
+# ---------------------------------------------------------------------------
+# Titles
+# ---------------------------------------------------------------------------
+
+
+def remember_title(chat_id: str, title: Optional[str]) -> None:
+    """Record a chat's title as seen on an incoming update or ``getChat``."""
+    if not title:
+        return
+    with _lock:
+        _titles[str(chat_id)] = (title, time.monotonic())
+
+
+def get_title(chat_id: str) -> Optional[str]:
+    """Return the recorded title if it is recent enough, otherwise None."""
+    with _lock:
+        entry = _titles.get(str(chat_id))
+    if entry is None or not _is_fresh(entry[1]):
+        return None
+    return entry[0]
+
+
+# ---------------------------------------------------------------------------
+# Mutations
+# ---------------------------------------------------------------------------
+
+
+def add_member(chat_id: str, user_id: int) -> bool:
+    """Enroll a user in a chat. Returns True if a new row was inserted."""
+    inserted = user_repo.add_user_to_chat(chat_id, user_id)
+    invalidate(chat_id)
+    return inserted
+
+
+def remove_member(chat_id: str, user_id: int) -> bool:
+    """Unenroll a user from a chat. Returns True if a row was removed."""
+    removed = user_repo.remove_user_from_chat(chat_id, user_id)
+    invalidate(chat_id)
+    return removed
+
+
+def set_thread_id(chat_id: str, thread_id: int, thread_type: str = "main") -> bool:
+    """Configure the thread used for ``thread_type`` messages in a chat."""
+    success = thread_repo.set_thread_id(chat_id, thread_id, thread_type)
+    invalidate(chat_id)
+    return success
+
+
+def clear_thread_ids(chat_id: str) -> bool:
+    """Remove every thread configuration of a chat."""
+    success = thread_repo.clear_thread_ids(chat_id)
+    invalidate(chat_id)
+    return success
@@ -2,21 +2,35 @@
 
 Implements the observer pattern for telemetry event logging and
 notification of subscribers (e.g. achievement processors).
+
+``log`` writes the event and runs observers synchronously, which is fine for
+tools and worker threads but stalls an event loop on a commit plus
+achievement queries.  Async code paths (bot handlers, API routers) use
+``alog`` instead: it validates the outcome, stamps the event time and hands
+the event to a single background writer thread through a bounded queue.
+When the queue is full the event is dropped with a warning rather than
+blocking the caller.  ``shutdown`` (registered with ``atexit`` and called
+from the bot/API shutdown hooks) drains the queue before the process exits.
 """
 
 from __future__ import annotations
 
+import atexit
 import datetime
 import json
 import logging
+import queue
 import threading
+import time
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from utils.events import EventType, validate_outcome
 from utils.schemas import Event
 
 from repos import event_repo
+from settings.constants import EVENT_QUEUE_MAX_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +127,89 @@ def log(
     # Validate event_type and outcome combination
     validate_outcome(event_type, outcome)
 
+    return _persist(
+        _PendingEvent(
+            event_type=event_type,
+            outcome=outcome,
+            user_id=user_id,
+            chat_id=chat_id,
+            card_id=card_id,
+            aspect_id=aspect_id,
+            timestamp=datetime.datetime.now(datetime.timezone.utc),
+            payload=payload,
+        )
+    )
+
+
+def alog(
+    event_type: EventType,
+    outcome: Enum,
+    user_id: int,
+    chat_id: str,
+    card_id: Optional[int] = None,
+    aspect_id: Optional[int] = None,
+    **payload: Any,
+) -> None:
+    """
+    Queue a telemetry event for the background writer (fire-and-forget).
+
+    Takes the same arguments as ``log`` and returns immediately; it is a
+    plain function, not a coroutine, and is safe to call from the event loop
+    or any thread. The event keeps the time of this call. Observers run on
+    the writer thread after the event is committed.
+
+    Raises:
+        ValueError: If the outcome is not valid for the event type.
+    """
+    validate_outcome(event_type, outcome)
+
+    pending = _PendingEvent(
+        event_type=event_type,
+        outcome=outcome,
+        user_id=user_id,
+        chat_id=chat_id,
+        card_id=card_id,
+        aspect_id=aspect_id,
+        timestamp=datetime.datetime.now(datetime.timezone.utc),
+        payload=payload,
+    )
+    _ensure_writer()
+    try:
+        _queue.put_nowait(pending)
+    except queue.Full:
+        _record_drop(pending)
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class _PendingEvent:
+    """An accepted event that has not been written yet."""
+
+    event_type: EventType
+    outcome: Enum
+    user_id: int
+    chat_id: str
+    card_id: Optional[int]
+    aspect_id: Optional[int]
+    timestamp: datetime.datetime
+    payload: Dict[str, Any]
+
+
+def _persist(pending: _PendingEvent) -> Optional[Event]:
+    """Write an event and notify observers. Returns None if logging failed."""
+    event_type = pending.event_type
+    outcome = pending.outcome
+    user_id = pending.user_id
+    chat_id = pending.chat_id
+    card_id = pending.card_id
+    aspect_id = pending.aspect_id
+    payload = pending.payload
+    timestamp = pending.timestamp
+
     # JSONB column accepts native Python dicts directly
     payload_data: Optional[dict] = None
     if payload:
@@ -123,8 +220,6 @@ def log(
             logger.warning("Failed to serialize event payload: %s", e)
             payload_data = {"_serialization_error": str(e)}
 
-    timestamp = datetime.datetime.now(datetime.timezone.utc)
-
     try:
         event = event_repo.create_event(
             event_type=event_type.value,
@@ -166,3 +261,104 @@ def log(
             exc_info=True,
         )
         return None
+
+
+# ---------------------------------------------------------------------------
+# Background writer
+# ---------------------------------------------------------------------------
+
+_STOP = object()
+
+_queue: "queue.Queue[Any]" = queue.Queue(maxsize=EVENT_QUEUE_MAX_SIZE)
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_dropped = 0
+
+
+def _ensure_writer() -> None:
+    """Start the writer thread on first use (and after ``shutdown``)."""
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    with _writer_lock:
+        if _writer is not None and _writer.is_alive():
+            return
+        _writer = threading.Thread(target=_writer_loop, name="event-writer", daemon=True)
+        _writer.start()
+
+
+def _writer_loop() -> None:
+    while True:
+        item = _queue.get()
+        try:
+            if item is _STOP:
+                return
+            _persist(item)
+        except Exception as e:  # _persist already logs; never let the writer die
+            logger.error("Event writer failed: %s", e, exc_info=True)
+        finally:
+            _queue.task_done()
+
+
+def _record_drop(pending: _PendingEvent) -> None:
+    global _dropped
+    _dropped += 1
+    # The first drop and then every 1000th, so a backlog does not flood the log
+    if _dropped == 1 or _dropped % 1000 == 0:
+        logger.warning(
+            "Event queue full (%d pending); dropped %d events so far (latest %s.%s)",
+            EVENT_QUEUE_MAX_SIZE,
+            _dropped,
+            pending.event_type.value,
+            pending.outcome.value,
+        )
+
+
+def dropped_count() -> int:
+    """Number of ``alog`` events dropped because the queue was full."""
+    return _dropped
+
+
+def flush(timeout: Optional[float] = None) -> bool:
+    """
+    Block until every queued event has been written.
+
+    Args:
+        timeout: Maximum seconds to wait; ``None`` waits indefinitely.
+
+    Returns:
+        True if the queue drained, False on timeout.
+    """
+    if _writer is None or not _writer.is_alive():
+        return _queue.unfinished_tasks == 0
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with _queue.all_tasks_done:
+        while _queue.unfinished_tasks:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            _queue.all_tasks_done.wait(remaining)
+    return True
+
+
+def shutdown(timeout: Optional[float] = 10.0) -> None:
+    """Drain queued events and stop the writer thread."""
+    global _writer
+    with _writer_lock:
+        writer = _writer
+        if writer is None or not writer.is_alive():
+            return
+        if not flush(timeout):
+            # The writer is a daemon thread; whatever is left dies with the process.
+            logger.warning(
+                "Event writer did not drain within %ss; %d events not written",
+                timeout,
+                _queue.unfinished_tasks,
+            )
+            return
+        _queue.put(_STOP)
+        writer.join(timeout)
+        _writer = None
+
+
+atexit.register(shutdown)
@@ -40,32 +40,36 @@ def persist_notification(
     )
 
 
-def claim_and_complete(
-    user_id: int,
-    chat_id: str,
-    expected_notify_at: datetime.datetime,
-) -> bool:
-    """Check deliverability and atomically claim a notification.
-
-    Business logic checks (enrollment, preferences) run first, then
-    the repo's row-level lock claim prevents duplicate sends.
+def claim_due_notifications(limit: int) -> List[RollNotificationModel]:
+    """Claim a batch of due notifications and return the deliverable ones.
 
-    Returns True if claimed and marked sent, False otherwise.
+    Rows are locked with SKIP LOCKED and marked sent in one transaction, so
+    concurrent pollers never claim the same row. Claimed rows whose user
+    left the chat or opted out of roll notifications are consumed without
+    being returned; a newer roll re-arms the row via ``persist_notification``.
     """
     with get_session(commit=True) as session:
-        # Business logic: is user still enrolled in this chat?
-        if not user_repo.is_user_in_chat(chat_id, user_id, session=session):
-            return False
+        claimed = notification_repo.claim_due_batch(limit, session=session)
+        if not claimed:
+            return []
 
-        # Business logic: has user opted out of roll notifications?
-        if not preferences_repo.get_notify_rolls(user_id, session=session):
-            return False
-
-        # Atomic claim with row lock (pure data access)
-        return notification_repo.claim_notification(
-            user_id, chat_id, expected_notify_at, session=session,
+        enrolled = user_repo.get_enrolled_pairs(
+            [(n.chat_id, n.user_id) for n in claimed], session=session,
+        )
+        opted_out = preferences_repo.get_opted_out_of_rolls(
+            list({n.user_id for n in claimed}), session=session,
         )
 
+    return [
+        n for n in claimed
+        if (n.chat_id, n.user_id) in enrolled and n.user_id not in opted_out
+    ]
+
+
+def get_next_notify_at() -> Optional[datetime.datetime]:
+    """Earliest pending ``notify_at`` (or None if nothing is scheduled)."""
+    return notification_repo.get_next_notify_at()
+
 
 def mark_completed(
     user_id: int,
@@ -79,16 +83,6 @@ def mark_completed(
     notification_repo.mark_completed(user_id, chat_id, expected_notify_at)
 
 
-def get_all_unsent_overdue() -> List[RollNotificationModel]:
-    """Get all overdue unsent notification rows (no prefs/enrollment filter)."""
-    return notification_repo.get_all_unsent_overdue()
-
-
-def get_all_unsent_future() -> List[RollNotificationModel]:
-    """Get all future unsent notification rows (no prefs/enrollment filter)."""
-    return notification_repo.get_all_unsent_future()
-
-
 def fail_notification(
     user_id: int,
     chat_id: str,
@@ -0,0 +1,165 @@
+"""Slot symbol manager — versioned, pre-serialized slot reel symbol bundles.
+
+Opening the casino fetches every user/character slot icon of the chat plus
+the set icons, base64-encoded.  Re-encoding all of them on every request is
+wasted work because icons change rarely (profile updates, character
+add/update/delete, set icon regeneration).
+
+Each bundle is built once and cached in memory as serialized JSON together
+with a version hash.  The version is derived from a lightweight fingerprint
+query (ids, names and the icon version counters bumped on every icon write —
+no image bytes are read or hashed), so changes made by another process (e.g.
+``/profile`` in the bot) are picked up on the next request without any
+cross-process signalling.  Routers expose
+the version as an ``ETag`` so an unchanged bundle is answered with ``304``.
+
+Processes that mutate icons themselves call ``invalidate_chat`` /
+``invalidate_sets`` to drop the cached body eagerly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from repos import set_icon_repo, set_repo, user_repo
+from utils import assets
+
+logger = logging.getLogger(__name__)
+
+CLAIM_ICON_ASSET = "slots/claim_icon"
+# Special symbol ID that won't conflict with user/character IDs
+CLAIM_SYMBOL_ID = -1
+
+
+@dataclass(frozen=True)
+class SymbolBundle:
+    """A serialized list of ``SlotSymbolSummary`` objects and its version."""
+
+    version: str
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+
+_chat_bundles: Dict[str, SymbolBundle] = {}
+_set_bundles: Dict[int, SymbolBundle] = {}
+_lock = threading.Lock()
+
+
+def _compute_version(parts: Any) -> str:
+    payload = json.dumps(parts, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def _serialize(symbols: List[Dict[str, Any]]) -> bytes:
+    return json.dumps(symbols, separators=(",", ":")).encode("utf-8")
+
+
+def get_chat_bundle_version(chat_id: str) -> str:
+    """Return the current version hash of a chat's symbol bundle."""
+    fingerprints = user_repo.get_chat_slot_symbol_fingerprints(str(chat_id))
+    claim_icon = assets.get_asset(CLAIM_ICON_ASSET)
+    return _compute_version([fingerprints, claim_icon.fingerprint if claim_icon else None])
+
+
+def get_chat_bundle(chat_id: str, version: Optional[str] = None) -> SymbolBundle:
+    """Return the user/character/claim symbol bundle for a chat.
+
+    Args:
+        chat_id: Chat to build the bundle for.
+        version: Current version from ``get_chat_bundle_version`` if the
+            caller already computed it; otherwise it is computed here.
+    """
+    chat_id = str(chat_id)
+    if version is None:
+        version = get_chat_bundle_version(chat_id)
+
+    with _lock:
+        cached = _chat_bundles.get(chat_id)
+    if cached is not None and cached.version == version:
+        return cached
+
+    symbols = user_repo.get_chat_users_and_characters(chat_id)
+    claim_icon = assets.get_b64(CLAIM_ICON_ASSET)
+    if claim_icon:
+        symbols.append(
+            {
+                "id": CLAIM_SYMBOL_ID,
+                "display_name": "Claim",
+                "slot_icon_b64": claim_icon,
+                "type": "claim",
+            }
+        )
+
+    bundle = SymbolBundle(version=version, body=_serialize(symbols))
+    with _lock:
+        _chat_bundles[chat_id] = bundle
+    logger.debug("Built slot symbol bundle for chat %s (%d symbols)", chat_id, len(symbols))
+    return bundle
+
+
+def get_set_bundle_version(season_id: Optional[int] = None) -> str:
+    """Return the current version hash of the set symbol bundle."""
+    eligible_sets = set_repo.get_eligible_sets_for_slots(season_id)
+    fingerprints = set_icon_repo.get_icon_fingerprints(season_id)
+    return _compute_version(
+        [[s.id, s.name, fingerprints.get(s.id)] for s in eligible_sets]
+    )
+
+
+def get_set_bundle(
+    season_id: Optional[int] = None, version: Optional[str] = None
+) -> SymbolBundle:
+    """Return the set symbol bundle (eligible sets that have a slot icon)."""
+    if version is None:
+        version = get_set_bundle_version(season_id)
+    key = season_id if season_id is not None else -1
+
+    with _lock:
+        cached = _set_bundles.get(key)
+    if cached is not None and cached.version == version:
+        return cached
+
+    eligible_sets = set_repo.get_eligible_sets_for_slots(season_id)
+    icons = set_icon_repo.get_all_icons_b64(season_id) if eligible_sets else {}
+
+    symbols: List[Dict[str, Any]] = []
+    for s in eligible_sets:
+        icon_b64 = icons.get(s.id)
+        if not icon_b64:
+            continue
+        symbols.append(
+            {
+                "id": s.id,
+                "display_name": s.name,
+                "slot_icon_b64": icon_b64,
+                "type": "set",
+            }
+        )
+
+    bundle = SymbolBundle(version=version, body=_serialize(symbols))
+    with _lock:
+        _set_bundles[key] = bundle
+    return bundle
+
+
+def invalidate_chat(chat_id: Optional[str] = None) -> None:
+    """Drop the cached bundle for a chat (or every chat when omitted)."""
+    with _lock:
+        if chat_id is None:
+            _chat_bundles.clear()
+        else:
+            _chat_bundles.pop(str(chat_id), None)
+
+
+def invalidate_sets() -> None:
+    """Drop every cached set symbol bundle."""
+    with _lock:
+        _set_bundles.clear()
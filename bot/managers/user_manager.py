@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import NamedTuple
 
+from managers import chat_context_manager, slot_symbol_manager
 from repos import user_repo
 from utils.slot_icon import generate_slot_icon
 
@@ -27,6 +28,11 @@ def update_user_profile(user_id: int, display_name: str, profile_imageb64: str)
     saved = user_repo.update_user_profile(
         user_id, display_name, profile_imageb64, slot_icon_b64=slot_icon_b64
     )
+    if saved:
+        # The user may be enrolled in several chats; drop every cached bundle
+        # (a first profile also makes the user an eligible roll source).
+        slot_symbol_manager.invalidate_chat()
+        chat_context_manager.invalidate()
     return ProfileUpdateResult(
         profile_saved=saved,
         slot_icon_generated=slot_icon_b64 is not None,
@@ -18,13 +18,18 @@ Usage:
     # Get all aspect-definition counts for a chat/season
     counts = aspect_count_repo.get_counts(chat_id="-100123", season_id=1)
     # Returns: {"Rainy": 5, "Ancient": 3, ...}
+
+    # Bulk-add aggregated increments (rebuilds, see tools/backfill_aspect_counts.py)
+    aspect_count_repo.add_counts({("-100123", 1, "Rainy"): (42, 5)}, session=session)
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional, Tuple
 
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from settings.constants import CURRENT_SEASON
@@ -33,6 +38,10 @@ from utils.session import with_session
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT ... ON CONFLICT page in ``add_counts``
+# (5 bound parameters each, well under Postgres' 65535 limit)
+_BULK_UPSERT_CHUNK_SIZE = 1000
+
 
 @with_session(commit=True)
 def increment_count(
@@ -210,3 +219,66 @@ def reset_counts(
             e,
             exc_info=True,
         )
+
+
+@with_session(commit=True)
+def add_counts(
+    increments: Mapping[Tuple[str, int, str], Tuple[Optional[int], int]],
+    *,
+    session: Session,
+) -> int:
+    """Add aggregated increments to many counts in one bulk upsert.
+
+    Args:
+        increments: ``(chat_id, season_id, name) -> (definition_id, increment)``.
+            A missing ``definition_id`` keeps the stored one.
+
+    Returns:
+        The number of count rows written.
+    """
+    if not increments:
+        return 0
+
+    rows = [
+        {
+            "chat_id": str(chat_id),
+            "season_id": season_id,
+            "name": name,
+            "definition_id": definition_id,
+            "count": increment,
+        }
+        for (chat_id, season_id, name), (definition_id, increment) in increments.items()
+    ]
+    stmt = pg_insert(AspectCountModel)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            AspectCountModel.chat_id,
+            AspectCountModel.season_id,
+            AspectCountModel.name,
+        ],
+        set_={
+            "count": AspectCountModel.count + stmt.excluded.count,
+            "definition_id": func.coalesce(
+                AspectCountModel.definition_id, stmt.excluded.definition_id
+            ),
+        },
+    )
+    session.execute(
+        stmt,
+        rows,
+        execution_options={"insertmanyvalues_page_size": _BULK_UPSERT_CHUNK_SIZE},
+    )
+    return len(rows)
+
+
+@with_session(commit=True)
+def clear_counts(chat_id: Optional[str] = None, *, session: Session) -> int:
+    """Delete all counts (every season), or only those of ``chat_id``.
+
+    Returns:
+        The number of rows deleted.
+    """
+    query = session.query(AspectCountModel)
+    if chat_id is not None:
+        query = query.filter(AspectCountModel.chat_id == str(chat_id))
+    return query.delete(synchronize_session=False)
@@ -0,0 +1,195 @@
+"""Aspect definition stats repository — denormalized per-definition counters.
+
+Each row of ``aspect_definition_stats`` (``AspectDefinitionStatsModel``)
+holds how many instances of one aspect definition currently exist
+(``owned_count``), how many of those are equipped on cards
+(``equipped_count``), and how many were ever burned or consumed by
+recycling (``burned_count`` / ``recycled_count``).
+
+Counters are moved by ``apply_deltas`` from the event listener in
+``utils.aspect_definition_stats``; every call adds to the stored values in
+SQL (``SET owned_count = owned_count + delta``), so concurrent events never
+lose an update.  ``rebuild_live_counts`` recomputes the owned/equipped
+counters from ``owned_aspects`` and ``card_aspects`` should they ever
+drift (the cumulative counters have no source to rebuild from).
+
+Usage:
+    from repos import aspect_definition_stats_repo
+
+    aspect_definition_stats_repo.apply_deltas({42: {"owned_count": -1, "burned_count": 1}})
+
+    # Whole catalog with counters in one query
+    stats = aspect_definition_stats_repo.get_stats(season_id=1)
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import List, Mapping, Optional
+
+from sqlalchemy import BigInteger, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from utils.models import (
+    AspectDefinitionModel,
+    AspectDefinitionStatsModel,
+    CardAspectModel,
+    OwnedAspectModel,
+)
+from utils.schemas import AspectDefinitionStats
+from utils.session import with_session
+
+logger = logging.getLogger(__name__)
+
+# Counters that mirror live rows; clamped at zero so a missed creation event
+# cannot push them negative (``rebuild_live_counts`` restores exact values)
+LIVE_COUNTERS = ("owned_count", "equipped_count")
+# Cumulative counters; only ever incremented
+CUMULATIVE_COUNTERS = ("burned_count", "recycled_count")
+COUNTERS = LIVE_COUNTERS + CUMULATIVE_COUNTERS
+
+
+@with_session(commit=True)
+def apply_deltas(deltas: Mapping[int, Mapping[str, int]], *, session: Session) -> int:
+    """Add per-definition counter deltas in a single statement.
+
+    Args:
+        deltas: ``{definition_id: {counter_name: delta}}``.  Counter names
+            must be in ``COUNTERS``; missing counters are left unchanged.
+            Definitions that no longer exist are skipped.
+
+    Returns:
+        The number of stats rows inserted or updated.
+    """
+    rows = []
+    for definition_id, counters in deltas.items():
+        unknown = set(counters) - set(COUNTERS)
+        if unknown:
+            raise ValueError(f"Unknown aspect definition counters: {sorted(unknown)}")
+        if any(counters.values()):
+            rows.append((definition_id, *(counters.get(name, 0) for name in COUNTERS)))
+    if not rows:
+        return 0
+
+    delta = values(
+        column("definition_id", BigInteger),
+        *(column(name, BigInteger) for name in COUNTERS),
+        name="delta",
+    ).data(rows)
+    table = AspectDefinitionStatsModel.__table__
+
+    # Make sure every touched definition has a row, then add to it.  The
+    # UPDATE takes row locks, so concurrent deltas serialize instead of
+    # overwriting each other.
+    session.execute(
+        pg_insert(table)
+        .from_select(
+            ["definition_id", "season_id"],
+            select(AspectDefinitionModel.id, AspectDefinitionModel.season_id).join(
+                delta, delta.c.definition_id == AspectDefinitionModel.id
+            ),
+        )
+        .on_conflict_do_nothing(index_elements=[table.c.definition_id])
+    )
+
+    set_ = {name: func.greatest(table.c[name] + delta.c[name], 0) for name in LIVE_COUNTERS}
+    set_.update({name: table.c[name] + delta.c[name] for name in CUMULATIVE_COUNTERS})
+    set_["updated_at"] = func.now()
+    result = session.execute(
+        update(table).where(table.c.definition_id == delta.c.definition_id).values(set_)
+    )
+    return result.rowcount or 0
+
+
+def _stats_query():
+    """Definitions LEFT JOIN their counters (zeros for definitions without a row)."""
+    stats = AspectDefinitionStatsModel
+    return (
+        select(
+            AspectDefinitionModel.id.label("definition_id"),
+            AspectDefinitionModel.name,
+            AspectDefinitionModel.rarity,
+            AspectDefinitionModel.set_id,
+            AspectDefinitionModel.season_id,
+            AspectDefinitionModel.type_id,
+            AspectDefinitionModel.created_at,
+            *(func.coalesce(getattr(stats, name), 0).label(name) for name in COUNTERS),
+            stats.updated_at,
+        )
+        .outerjoin(stats, stats.definition_id == AspectDefinitionModel.id)
+    )
+
+
+@with_session
+def get_stats(
+    season_id: Optional[int] = None,
+    set_id: Optional[int] = None,
+    *,
+    session: Session,
+) -> List[AspectDefinitionStats]:
+    """Return every aspect definition with its counters, in one query.
+
+    Optionally filtered by season and/or set; ordered by set, then name.
+    """
+    stmt = _stats_query()
+    if season_id is not None:
+        stmt = stmt.where(AspectDefinitionModel.season_id == season_id)
+    if set_id is not None:
+        stmt = stmt.where(AspectDefinitionModel.set_id == set_id)
+    stmt = stmt.order_by(AspectDefinitionModel.set_id, AspectDefinitionModel.name)
+
+    return [AspectDefinitionStats(**row) for row in session.execute(stmt).mappings()]
+
+
+@with_session
+def get_stats_for_definition(
+    definition_id: int, *, session: Session
+) -> Optional[AspectDefinitionStats]:
+    """Return one definition with its counters, or None if it does not exist."""
+    row = (
+        session.execute(_stats_query().where(AspectDefinitionModel.id == definition_id))
+        .mappings()
+        .first()
+    )
+    return AspectDefinitionStats(**row) if row else None
+
+
+@with_session(commit=True)
+def rebuild_live_counts(season_id: Optional[int] = None, *, session: Session) -> int:
+    """Recompute ``owned_count`` / ``equipped_count`` from the live tables.
+
+    Burned and recycled counters are kept.  Creates rows for definitions
+    that have none.  Returns the number of stats rows written.
+    """
+    owned = (
+        select(func.count(OwnedAspectModel.id))
+        .where(OwnedAspectModel.aspect_definition_id == AspectDefinitionModel.id)
+        .scalar_subquery()
+    )
+    equipped = (
+        select(func.count(CardAspectModel.id))
+        .join(OwnedAspectModel, OwnedAspectModel.id == CardAspectModel.aspect_id)
+        .where(OwnedAspectModel.aspect_definition_id == AspectDefinitionModel.id)
+        .scalar_subquery()
+    )
+    source = select(
+        AspectDefinitionModel.id, AspectDefinitionModel.season_id, owned, equipped
+    )
+    if season_id is not None:
+        source = source.where(AspectDefinitionModel.season_id == season_id)
+
+    stmt = pg_insert(AspectDefinitionStatsModel).from_select(
+        ["definition_id", "season_id", "owned_count", "equipped_count"], source
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AspectDefinitionStatsModel.definition_id],
+        set_={
+            "owned_count": stmt.excluded.owned_count,
+            "equipped_count": stmt.excluded.equipped_count,
+            "updated_at": func.now(),
+        },
+    )
+    rebuilt = len(session.execute(stmt.returning(AspectDefinitionStatsModel.definition_id)).all())
+    logger.info("Rebuilt live aspect definition stats for %s definitions", rebuilt)
+    return rebuilt
@@ -11,11 +11,13 @@ import datetime
 import logging
 from typing import Dict, List, Optional
 
-from sqlalchemy import func
+from sqlalchemy import and_, case, exists, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload, noload
 
 from settings.constants import CURRENT_SEASON
-from utils.image import ImageUtil
+from utils import image_workers
 from utils.models import (
     AspectCountModel,
     AspectDefinitionModel,
@@ -25,14 +27,26 @@ from utils.models import (
     OwnedAspectModel,
     SetModel,
 )
-from utils.schemas import AspectDefinition, CardAspect, OwnedAspect, OwnedAspectWithImage
+from utils.schemas import (
+    AspectDefinition,
+    AspectDefinitionUpsert,
+    CardAspect,
+    EquippedAspectImage,
+    OwnedAspect,
+)
 from utils.session import with_session
 
 logger = logging.getLogger(__name__)
 
+_DEFINITION_NAME_CONSTRAINT = "uq_aspect_definitions_name_set_season"
+
 # Canonical rarity order for grouping output
 _RARITY_ORDER = ("Common", "Rare", "Epic", "Legendary")
 
+# Definitions per INSERT ... ON CONFLICT statement in bulk upserts
+# (5 bound parameters each, well under Postgres' 65535 limit)
+_BULK_UPSERT_CHUNK_SIZE = 1000
+
 
 # ---------------------------------------------------------------------------
 # Aspect definition queries
@@ -209,22 +223,22 @@ def get_aspect_definition_count_per_set(
     return {set_id: count for set_id, count in rows}
 
 
-@with_session
-def get_owned_count_for_definition(definition_id: int, *, session: Session) -> int:
-    """Return the number of owned aspect instances linked to a definition."""
-    return (
-        session.query(func.count(OwnedAspectModel.id))
-        .filter(OwnedAspectModel.aspect_definition_id == definition_id)
-        .scalar()
-        or 0
-    )
-
-
 # ---------------------------------------------------------------------------
 # Aspect definition CRUD
 # ---------------------------------------------------------------------------
 
 
+def _flush_definition(session: Session, name: str, set_id: int) -> None:
+    """Flush a created/updated definition, turning a duplicate name into ``ValueError``."""
+    try:
+        session.flush()
+    except IntegrityError as e:
+        diag = getattr(e.orig, "diag", None)
+        if getattr(diag, "constraint_name", None) != _DEFINITION_NAME_CONSTRAINT:
+            raise
+        raise ValueError(f"Aspect '{name}' already exists in set {set_id}") from e
+
+
 @with_session(commit=True)
 def create_aspect_definition(
     set_id: int,
@@ -246,6 +260,9 @@ def create_aspect_definition(
 
     Returns:
         The newly created ``AspectDefinition``.
+
+    Raises:
+        ValueError: An aspect with this name already exists in the set.
     """
     if season_id is None:
         season_id = CURRENT_SEASON
@@ -261,7 +278,7 @@ def create_aspect_definition(
         created_at=now,
     )
     session.add(definition)
-    session.flush()
+    _flush_definition(session, name, set_id)
     # Re-fetch with eager-loaded relationships for the DTO
     definition = (
         session.query(AspectDefinitionModel)
@@ -301,6 +318,9 @@ def update_aspect_definition(
 
     Returns:
         The updated ``AspectDefinition``, or ``None`` if not found.
+
+    Raises:
+        ValueError: The new name already exists in the (new) set.
     """
     definition = (
         session.query(AspectDefinitionModel)
@@ -321,7 +341,7 @@ def update_aspect_definition(
         # Convention: type_id=0 means "clear the type"
         definition.type_id = None if type_id == 0 else type_id
 
-    session.flush()
+    _flush_definition(session, definition.name, definition.set_id)
 
     # Re-query with eager loads so from_orm() sees updated relationships
     definition = (
@@ -391,53 +411,86 @@ def bulk_upsert_aspect_definitions(
     season_id: Optional[int] = None,
     *,
     session: Session,
-) -> int:
+) -> List[AspectDefinitionUpsert]:
     """Bulk insert or update aspect definitions.
 
     Each dict should contain at least ``set_id``, ``name``, ``rarity``.
     If a definition with the same ``(name, set_id, season_id)`` already
     exists, its rarity is updated; otherwise a new row is inserted.
 
+    Rows are written with a single ``INSERT ... ON CONFLICT DO UPDATE``
+    executed for all of them (one round-trip per ``_BULK_UPSERT_CHUNK_SIZE``
+    definitions) instead of a lookup per row.
+    When the same ``(name, set_id)`` appears more than once, the last one
+    wins.
+
     Returns:
-        The number of rows inserted or updated.
+        One result per distinct definition, in input order, telling whether
+        it was inserted or updated.
     """
     if season_id is None:
         season_id = CURRENT_SEASON
 
     now = datetime.datetime.now(datetime.timezone.utc)
-    count = 0
-
+    rows: Dict[tuple, dict] = {}
     for def_dict in definitions:
-        set_id = def_dict["set_id"]
-        name = def_dict["name"]
-        rarity = def_dict["rarity"]
-
-        existing = (
-            session.query(AspectDefinitionModel)
-            .filter(
-                AspectDefinitionModel.name == name,
-                AspectDefinitionModel.set_id == set_id,
-                AspectDefinitionModel.season_id == season_id,
+        key = (def_dict["set_id"], def_dict["name"])
+        rows.pop(key, None)  # re-insert so a repeated key keeps its last position
+        rows[key] = {
+            "set_id": def_dict["set_id"],
+            "season_id": season_id,
+            "name": def_dict["name"],
+            "rarity": def_dict["rarity"],
+            "created_at": now,
+        }
+
+    pending = list(rows.values())
+    if not pending:
+        return []
+
+    table = AspectDefinitionModel.__table__
+    stmt = pg_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_aspect_definitions_name_set_season",
+        set_={"rarity": stmt.excluded.rarity},
+    ).returning(
+        table.c.id,
+        table.c.set_id,
+        table.c.name,
+        # xmax is 0 only for a row version created by this INSERT
+        literal_column("xmax = 0").label("inserted"),
+    )
+    # Executemany: SQLAlchemy batches the rows into multi-row VALUES pages.
+    # RETURNING order is not guaranteed to follow the input once conflicting
+    # and new rows are mixed, so results are matched back by key.
+    result = session.execute(
+        stmt,
+        pending,
+        execution_options={"insertmanyvalues_page_size": _BULK_UPSERT_CHUNK_SIZE},
+    )
+    returned = {(row.set_id, row.name): row for row in result}
+    ordered = []
+    for params in pending:
+        row = returned[(params["set_id"], params["name"])]
+        ordered.append(
+            AspectDefinitionUpsert(
+                id=row.id,
+                set_id=params["set_id"],
+                name=params["name"],
+                rarity=params["rarity"],
+                inserted=row.inserted,
             )
-            .first()
         )
 
-        if existing:
-            existing.rarity = rarity
-        else:
-            session.add(
-                AspectDefinitionModel(
-                    set_id=set_id,
-                    season_id=season_id,
-                    name=name,
-                    rarity=rarity,
-                    created_at=now,
-                )
-            )
-        count += 1
-
-    logger.info("Bulk upserted %d aspect definitions for season %s", count, season_id)
-    return count
+    inserted = sum(1 for r in ordered if r.inserted)
+    logger.info(
+        "Bulk upserted %d aspect definitions for season %s (%d inserted, %d updated)",
+        len(ordered),
+        season_id,
+        inserted,
+        len(ordered) - inserted,
+    )
+    return ordered
 
 
 # ---------------------------------------------------------------------------
@@ -539,26 +592,6 @@ def get_unique_aspect_names(
     return [row[0] for row in results if row[0] is not None]
 
 
-@with_session
-def get_aspect_with_image(aspect_id: int, *, session: Session) -> Optional[OwnedAspectWithImage]:
-    """Get an owned aspect by its ID, including image data."""
-    row = (
-        session.query(OwnedAspectModel)
-        .options(
-            joinedload(OwnedAspectModel.aspect_definition).joinedload(
-                AspectDefinitionModel.aspect_set
-            ),
-            joinedload(OwnedAspectModel.aspect_definition).joinedload(
-                AspectDefinitionModel.aspect_type
-            ),
-            joinedload(OwnedAspectModel.image),
-        )
-        .filter(OwnedAspectModel.id == aspect_id)
-        .first()
-    )
-    return OwnedAspectWithImage.from_orm(row) if row else None
-
-
 @with_session
 def get_aspect_image(aspect_id: int, *, session: Session) -> Optional[str]:
     """Get the base64 encoded full-size image for an aspect.
@@ -629,7 +662,7 @@ def get_aspect_thumbnail(aspect_id: int, *, session: Session) -> Optional[str]:
         return None
 
     try:
-        thumb_bytes = ImageUtil.compress_to_fraction(aspect_image.image, scale_factor=1 / 4)
+        thumb_bytes = image_workers.run("compress_to_fraction", aspect_image.image, scale_factor=1 / 4)
         aspect_image.thumbnail = thumb_bytes
         return base64.b64encode(thumb_bytes).decode("utf-8")
     except Exception as exc:
@@ -684,7 +717,7 @@ def get_aspect_images_batch(aspect_ids: List[int], *, session: Session) -> Dict[
             continue
 
         try:
-            thumb_bytes = ImageUtil.compress_to_fraction(full, scale_factor=1 / 4)
+            thumb_bytes = image_workers.run("compress_to_fraction", full, scale_factor=1 / 4)
             ai.thumbnail = thumb_bytes
             fetched[aid] = base64.b64encode(thumb_bytes).decode("utf-8")
         except Exception as exc:
@@ -718,6 +751,39 @@ def get_aspects_for_card(card_id: int, *, session: Session) -> List[CardAspect]:
     return [CardAspect.from_orm(m) for m in rows]
 
 
+@with_session
+def get_equipped_aspect_images(card_id: int, *, session: Session) -> List[EquippedAspectImage]:
+    """Return the aspects equipped on a card with raw image bytes, in slot order.
+
+    One query loads the slots, aspects, definitions (with set and type) and
+    full-size images; thumbnails are not read.  Aspects without an image
+    are skipped.  Intended as input for ``GeminiUtil.generate_card_with_aspects``.
+    """
+    rows = session.execute(
+        select(CardAspectModel.order, OwnedAspectModel, AspectImageModel.image)
+        .join(OwnedAspectModel, OwnedAspectModel.id == CardAspectModel.aspect_id)
+        .join(AspectImageModel, AspectImageModel.aspect_id == OwnedAspectModel.id)
+        .options(
+            noload(OwnedAspectModel.image),
+            joinedload(OwnedAspectModel.aspect_definition).joinedload(
+                AspectDefinitionModel.aspect_set
+            ),
+            joinedload(OwnedAspectModel.aspect_definition).joinedload(
+                AspectDefinitionModel.aspect_type
+            ),
+        )
+        .where(
+            CardAspectModel.card_id == card_id,
+            AspectImageModel.image.isnot(None),
+        )
+        .order_by(CardAspectModel.order)
+    ).all()
+    return [
+        EquippedAspectImage.from_orm(aspect, order=order, image=image)
+        for order, aspect, image in rows
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Write operations
 # ---------------------------------------------------------------------------
@@ -1037,43 +1103,123 @@ def get_chat_aspects_for_trade(
     chat_id: str,
     exclude_user_id: int,
     season_id: Optional[int] = None,
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
     *,
     session: Session,
 ) -> List[OwnedAspect]:
-    """Return all tradeable aspects in a chat, excluding those owned by a specific user.
+    """Return tradeable aspects in a chat, excluding those owned by a specific user.
 
     Only returns aspects that are unequipped, making them eligible for trading.
-    Used to populate trade options in the mini app.
+    Used to populate trade options in the mini app, so only the columns the
+    picker renders are selected: ``file_id`` is left empty and the attached
+    definition carries its set name but no type or descriptions.
 
     Args:
         chat_id: The chat to scope the query to.
         exclude_user_id: User ID to exclude (the trade initiator).
         season_id: Season filter (defaults to ``CURRENT_SEASON``).
+        search: Optional case-insensitive match on aspect name or owner.
+        limit: Page size (all matches when None).
+        offset: Number of matches to skip.
     """
     if season_id is None:
         season_id = CURRENT_SEASON
 
-    rows = (
-        session.query(OwnedAspectModel)
-        .outerjoin(CardAspectModel, CardAspectModel.aspect_id == OwnedAspectModel.id)
-        .filter(
+    display_name = func.coalesce(OwnedAspectModel.name, AspectDefinitionModel.name, "")
+    query = (
+        select(
+            OwnedAspectModel.id,
+            OwnedAspectModel.aspect_definition_id,
+            OwnedAspectModel.name,
+            OwnedAspectModel.owner,
+            OwnedAspectModel.user_id,
+            OwnedAspectModel.chat_id,
+            OwnedAspectModel.season_id,
+            OwnedAspectModel.rarity,
+            OwnedAspectModel.locked,
+            OwnedAspectModel.created_at,
+            display_name.label("display_name"),
+            AspectDefinitionModel.name.label("definition_name"),
+            AspectDefinitionModel.rarity.label("definition_rarity"),
+            AspectDefinitionModel.set_id,
+            AspectDefinitionModel.season_id.label("definition_season_id"),
+            SetModel.name.label("set_name"),
+            SetModel.source.label("set_source"),
+        )
+        .outerjoin(
+            AspectDefinitionModel,
+            AspectDefinitionModel.id == OwnedAspectModel.aspect_definition_id,
+        )
+        .outerjoin(
+            SetModel,
+            and_(
+                SetModel.id == AspectDefinitionModel.set_id,
+                SetModel.season_id == AspectDefinitionModel.season_id,
+            ),
+        )
+        .where(
             OwnedAspectModel.chat_id == str(chat_id),
             OwnedAspectModel.season_id == season_id,
             OwnedAspectModel.user_id != exclude_user_id,
             OwnedAspectModel.user_id.isnot(None),
-            CardAspectModel.id.is_(None),  # unequipped only
+            ~exists().where(CardAspectModel.aspect_id == OwnedAspectModel.id),  # unequipped only
         )
-        .options(
-            joinedload(OwnedAspectModel.aspect_definition).joinedload(
-                AspectDefinitionModel.aspect_set
-            ),
-            joinedload(OwnedAspectModel.aspect_definition).joinedload(
-                AspectDefinitionModel.aspect_type
-            ),
+    )
+    if search:
+        query = query.where(
+            or_(
+                display_name.icontains(search, autoescape=True),
+                OwnedAspectModel.owner.icontains(search, autoescape=True),
+            )
         )
-        .all()
+
+    query = query.order_by(
+        case(
+            (OwnedAspectModel.rarity == "Unique", 1),
+            (OwnedAspectModel.rarity == "Legendary", 2),
+            (OwnedAspectModel.rarity == "Epic", 3),
+            (OwnedAspectModel.rarity == "Rare", 4),
+            else_=5,
+        ),
+        display_name,
+        OwnedAspectModel.id,
     )
-    return [OwnedAspect.from_orm(row) for row in rows]
+    if limit is not None:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+
+    return [
+        OwnedAspect(
+            id=row.id,
+            aspect_definition_id=row.aspect_definition_id,
+            name=row.name,
+            owner=row.owner,
+            user_id=row.user_id,
+            chat_id=row.chat_id,
+            season_id=row.season_id,
+            rarity=row.rarity,
+            locked=row.locked,
+            created_at=row.created_at,
+            display_name=row.display_name,
+            aspect_definition=(
+                AspectDefinition(
+                    id=row.aspect_definition_id,
+                    name=row.definition_name,
+                    rarity=row.definition_rarity,
+                    season_id=row.definition_season_id,
+                    set_id=row.set_id,
+                    set_name=row.set_name,
+                    source=row.set_source or "all",
+                )
+                if row.definition_name is not None
+                else None
+            ),
+        )
+        for row in session.execute(query).all()
+    ]
 
 
 @with_session
@@ -0,0 +1,80 @@
+"""Backfill checkpoint repository — resume points for chunked backfills.
+
+A backfill that applies its work in chunks saves the last event id it
+finished through ``save_checkpoint`` using the same session (transaction) as
+the chunk's writes, so the checkpoint can never run ahead of, or lag behind,
+the data it describes.
+
+Usage:
+    from repos import backfill_checkpoint_repo
+
+    checkpoint = backfill_checkpoint_repo.get_checkpoint("aspect_counts")  # None if not running
+    backfill_checkpoint_repo.save_checkpoint(
+        "aspect_counts", last_event_id=12345, end_event_id=99999, session=session
+    )
+    backfill_checkpoint_repo.delete_checkpoint("aspect_counts")
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from utils.models import BackfillCheckpointModel
+from utils.schemas import BackfillCheckpoint
+from utils.session import with_session
+
+logger = logging.getLogger(__name__)
+
+
+@with_session
+def get_checkpoint(name: str, *, session: Session) -> Optional[BackfillCheckpoint]:
+    """Saved progress of backfill ``name``, or ``None`` if it is not running."""
+    checkpoint = session.get(BackfillCheckpointModel, name)
+    if checkpoint is None:
+        return None
+    return BackfillCheckpoint(
+        name=checkpoint.name,
+        last_event_id=checkpoint.last_event_id,
+        end_event_id=checkpoint.end_event_id,
+        updated_at=checkpoint.updated_at,
+    )
+
+
+@with_session(commit=True)
+def save_checkpoint(
+    name: str,
+    last_event_id: int,
+    end_event_id: int,
+    *,
+    session: Session,
+) -> None:
+    """Record that backfill ``name`` has applied every event up to ``last_event_id``.
+
+    ``end_event_id`` is the last event the run covers (fixed when it starts).
+    """
+    stmt = pg_insert(BackfillCheckpointModel).values(
+        name=name, last_event_id=last_event_id, end_event_id=end_event_id
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BackfillCheckpointModel.name],
+        set_={
+            "last_event_id": stmt.excluded.last_event_id,
+            "end_event_id": stmt.excluded.end_event_id,
+            "updated_at": func.now(),
+        },
+    )
+    session.execute(stmt)
+    logger.debug("Saved backfill checkpoint %s at event %d", name, last_event_id)
+
+
+@with_session(commit=True)
+def delete_checkpoint(name: str, *, session: Session) -> None:
+    """Forget backfill ``name``'s checkpoint (its run completed)."""
+    session.query(BackfillCheckpointModel).filter(
+        BackfillCheckpointModel.name == name
+    ).delete(synchronize_session=False)
@@ -11,13 +11,20 @@ import datetime
 import logging
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import case, func, or_
+from sqlalchemy import and_, case, func, or_, select
 from sqlalchemy.orm import Session, joinedload, noload
 
 from settings.constants import CURRENT_SEASON
-from utils.image import ImageUtil
-from utils.models import AspectDefinitionModel, CardImageModel, CardModel, CardAspectModel, OwnedAspectModel
-from utils.schemas import Card, CardWithImage
+from utils import image_workers
+from utils.models import (
+    AspectDefinitionModel,
+    CardAspectModel,
+    CardImageModel,
+    CardModel,
+    OwnedAspectModel,
+    SetModel,
+)
+from utils.schemas import Card, CardAspect, CardWithImage, OwnedAspect
 from utils.session import with_session
 
 logger = logging.getLogger(__name__)
@@ -77,7 +84,7 @@ def add_card(
     if image_b64:
         try:
             image_data = base64.b64decode(image_b64)
-            thumb_data = ImageUtil.compress_to_fraction(image_data, scale_factor=1 / 4)
+            thumb_data = image_workers.run("compress_to_fraction", image_data, scale_factor=1 / 4)
         except Exception as exc:
             logger.warning("Failed to generate thumbnail for new card: %s", exc)
 
@@ -331,6 +338,147 @@ def get_all_cards(chat_id: Optional[str] = None, *, session: Session) -> List[Ca
     return [Card.from_orm(c) for c in query.all()]
 
 
+@with_session
+def get_trade_card_options(
+    chat_id: str,
+    exclude_user_id: int,
+    exclude_card_id: Optional[int] = None,
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    *,
+    session: Session,
+) -> List[Card]:
+    """Return owned cards of a chat that a user can ask for in a trade.
+
+    The user's own cards and the offered card are excluded in SQL, and only
+    the columns the trade picker renders are selected: ``file_id`` and
+    ``description`` are left empty and equipped aspects carry only their
+    display name and rarity.  Equipped aspects of the returned page are
+    fetched with one batched query.
+
+    Args:
+        chat_id: The chat to scope the query to.
+        exclude_user_id: The trade initiator, whose cards are skipped.
+        exclude_card_id: The offered card, if the offer is a card.
+        search: Optional case-insensitive match on card title or owner.
+        limit: Page size (all matches when None).
+        offset: Number of matches to skip.
+    """
+    query = (
+        select(
+            CardModel.id,
+            CardModel.base_name,
+            CardModel.modifier,
+            CardModel.rarity,
+            CardModel.owner,
+            CardModel.user_id,
+            CardModel.chat_id,
+            CardModel.locked,
+            CardModel.set_id,
+            CardModel.season_id,
+            CardModel.updated_at,
+            CardModel.aspect_count,
+            SetModel.name.label("set_name"),
+        )
+        .outerjoin(
+            SetModel,
+            and_(SetModel.id == CardModel.set_id, SetModel.season_id == CardModel.season_id),
+        )
+        .where(
+            CardModel.chat_id == str(chat_id),
+            CardModel.season_id == CURRENT_SEASON,
+            CardModel.owner.isnot(None),
+            CardModel.user_id.is_distinct_from(exclude_user_id),
+        )
+    )
+    if exclude_card_id is not None:
+        query = query.where(CardModel.id != exclude_card_id)
+    if search:
+        query = query.where(
+            or_(
+                func.concat_ws(" ", CardModel.modifier, CardModel.base_name).icontains(
+                    search, autoescape=True
+                ),
+                CardModel.owner.icontains(search, autoescape=True),
+            )
+        )
+
+    query = query.order_by(
+        _build_rarity_order_case(), CardModel.base_name, CardModel.modifier, CardModel.id
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+
+    rows = session.execute(query).all()
+    if not rows:
+        return []
+
+    equipped: Dict[int, List[CardAspect]] = {}
+    aspect_rows = session.execute(
+        select(
+            CardAspectModel.id,
+            CardAspectModel.card_id,
+            CardAspectModel.aspect_id,
+            CardAspectModel.order,
+            CardAspectModel.equipped_at,
+            OwnedAspectModel.name,
+            OwnedAspectModel.chat_id,
+            OwnedAspectModel.season_id,
+            OwnedAspectModel.rarity,
+            AspectDefinitionModel.name.label("definition_name"),
+        )
+        .join(OwnedAspectModel, OwnedAspectModel.id == CardAspectModel.aspect_id)
+        .outerjoin(
+            AspectDefinitionModel,
+            AspectDefinitionModel.id == OwnedAspectModel.aspect_definition_id,
+        )
+        .where(CardAspectModel.card_id.in_([row.id for row in rows]))
+        .order_by(CardAspectModel.card_id, CardAspectModel.order)
+    ).all()
+    for a in aspect_rows:
+        equipped.setdefault(a.card_id, []).append(
+            CardAspect(
+                id=a.id,
+                card_id=a.card_id,
+                aspect_id=a.aspect_id,
+                order=a.order,
+                equipped_at=a.equipped_at,
+                aspect=OwnedAspect(
+                    id=a.aspect_id,
+                    name=a.name,
+                    chat_id=a.chat_id,
+                    season_id=a.season_id,
+                    rarity=a.rarity,
+                    display_name=a.name or a.definition_name or "",
+                ),
+            )
+        )
+
+    return [
+        Card(
+            id=row.id,
+            base_name=row.base_name,
+            modifier=row.modifier,
+            rarity=row.rarity,
+            owner=row.owner,
+            user_id=row.user_id,
+            file_id=None,
+            chat_id=row.chat_id,
+            locked=row.locked,
+            set_id=row.set_id,
+            season_id=row.season_id,
+            set_name=row.set_name or "",
+            updated_at=row.updated_at,
+            aspect_count=row.aspect_count,
+            equipped_aspects=equipped.get(row.id, []),
+        )
+        for row in rows
+    ]
+
+
 @with_session
 def get_card(card_id: int, *, session: Session) -> Optional[CardWithImage]:
     """Get a card by its ID.
@@ -456,7 +604,7 @@ def get_card_thumbnail(card_id: int, *, session: Session) -> str | None:
         return None
 
     try:
-        thumb_bytes = ImageUtil.compress_to_fraction(card_image.image, scale_factor=1 / 4)
+        thumb_bytes = image_workers.run("compress_to_fraction", card_image.image, scale_factor=1 / 4)
         card_image.thumbnail = thumb_bytes
         return base64.b64encode(thumb_bytes).decode("utf-8")
     except Exception as exc:
@@ -511,7 +659,7 @@ def get_card_images_batch(card_ids: List[int], *, session: Session) -> dict[int,
             continue
 
         try:
-            thumb_bytes = ImageUtil.compress_to_fraction(full, scale_factor=1 / 4)
+            thumb_bytes = image_workers.run("compress_to_fraction", full, scale_factor=1 / 4)
             card_image.thumbnail = thumb_bytes
             fetched[cid] = base64.b64encode(thumb_bytes).decode("utf-8")
         except Exception as exc:
@@ -548,9 +696,10 @@ def get_total_cards_count(*, session: Session) -> int:
 def get_random_card_summaries(chat_id: str, count: int, *, session: Session) -> List[Dict[str, Any]]:
     """Get random card summaries (id, rarity, title) from a chat without loading images.
 
-    This is a lightweight query optimized for RTB game creation — it only fetches
-    the minimal columns needed (id, base_name, modifier, rarity) and avoids
-    loading image data or full ORM objects.
+    Fallback path for RTB game creation — it only fetches the minimal columns
+    needed (id, base_name, modifier, rarity) but still scans every owned card in
+    the chat. Prefer ``get_card_summaries_at_offsets`` when the pool size is
+    known (see ``managers.card_pool_manager``).
 
     Args:
         chat_id: The chat ID to select cards from.
@@ -592,6 +741,70 @@ def get_random_card_summaries(chat_id: str, count: int, *, session: Session) ->
     ]
 
 
+@with_session
+def get_card_summaries_at_offsets(
+    chat_id: str, offsets: List[int], *, session: Session
+) -> List[Dict[str, Any]]:
+    """Get card summaries at the given positions of a chat's owned-card pool.
+
+    Positions index into the chat's owned current-season cards ordered by id.
+    The positions are numbered from an index-only scan of the partial
+    ``idx_cards_chat_season_owned`` index (ids only, stopping at the largest
+    offset), and only the chosen cards are then loaded from the table, in one
+    round-trip.
+
+    Args:
+        chat_id: The chat ID to select cards from.
+        offsets: Zero-based positions in the id-ordered pool.
+
+    Returns:
+        List of dicts with keys: id, base_name, modifier, rarity, in the order
+        of ``offsets``. Offsets past the end of the pool produce no row, so the
+        result may be shorter than ``offsets`` if the pool shrank since the
+        caller computed its size.
+    """
+    if not offsets:
+        return []
+
+    positions = (
+        select(
+            CardModel.id.label("card_id"),
+            (func.row_number().over(order_by=CardModel.id) - 1).label("position"),
+        )
+        .where(
+            CardModel.owner.isnot(None),
+            CardModel.chat_id == str(chat_id),
+            CardModel.season_id == CURRENT_SEASON,
+        )
+        .order_by(CardModel.id)
+        .limit(max(offsets) + 1)
+        .subquery()
+    )
+    rows = session.execute(
+        select(
+            positions.c.position,
+            CardModel.id,
+            CardModel.base_name,
+            CardModel.modifier,
+            CardModel.rarity,
+        )
+        .join(CardModel, CardModel.id == positions.c.card_id)
+        .where(positions.c.position.in_(offsets))
+    ).all()
+
+    by_position = {row[0]: row for row in rows}
+    return [
+        {
+            "id": row[1],
+            "base_name": row[2],
+            "modifier": row[3],
+            "rarity": row[4],
+        }
+        for row in (by_position.get(offset) for offset in offsets)
+        if row is not None
+    ]
+
+
 @with_session
 def get_chat_card_rarity_counts(chat_id: str, *, session: Session) -> Dict[str, int]:
     """Get counts of cards per rarity in a chat for the current season.
@@ -798,7 +1011,7 @@ def update_card_image(card_id: int, image_b64: str, *, session: Session) -> bool
     if image_b64:
         try:
             image_data = base64.b64decode(image_b64)
-            thumb_data = ImageUtil.compress_to_fraction(image_data, scale_factor=1 / 4)
+            thumb_data = image_workers.run("compress_to_fraction", image_data, scale_factor=1 / 4)
         except Exception as exc:
             logger.warning("Failed to generate thumbnail for refreshed card %s: %s", card_id, exc)
 
@@ -7,12 +7,12 @@ creating, retrieving, updating, and deleting characters.
 from __future__ import annotations
 
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from utils.models import CharacterModel
+from utils.models import ICON_VERSION_SEQ, CharacterModel
 from utils.schemas import Character
 from utils.session import with_session
 
@@ -68,6 +68,7 @@ def update_character_image(character_id: int, imageb64: str, slot_icon_b64: Opti
     character.image = base64.b64decode(imageb64)
     if slot_icon_b64:
         character.slot_icon = base64.b64decode(slot_icon_b64)
+        character.slot_icon_version = ICON_VERSION_SEQ.next_value()
         logger.info("Updated character %s image and regenerated slot icon", character_id)
     else:
         logger.info(
@@ -95,8 +96,32 @@ def get_characters_by_chat(chat_id: str, *, session: Session) -> List[Character]
     return [Character.from_orm(r) for r in results]
 
 
+@with_session
+def get_character_names_by_chat(chat_id: str, *, session: Session) -> List[Tuple[int, str]]:
+    """Return ``(id, name)`` for every character of a chat, without images."""
+    rows = (
+        session.query(CharacterModel.id, CharacterModel.name)
+        .filter(CharacterModel.chat_id == str(chat_id))
+        .all()
+    )
+    return [(char_id, name) for char_id, name in rows]
+
+
 @with_session
 def get_character_by_id(character_id: int, *, session: Session) -> Optional[Character]:
     """Get a character by its ID."""
     result = session.query(CharacterModel).filter(CharacterModel.id == character_id).first()
     return Character.from_orm(result) if result else None
+
+
+@with_session
+def get_slot_icon_b64(character_id: int, *, session: Session) -> Optional[str]:
+    """Return a character's base64 slot icon without loading its full image."""
+    import base64
+
+    icon = (
+        session.query(CharacterModel.slot_icon)
+        .filter(CharacterModel.id == character_id)
+        .scalar()
+    )
+    return base64.b64encode(icon).decode("utf-8") if icon else None
@@ -0,0 +1,220 @@
+"""Event partition repository — monthly range partitions of ``events``.
+
+``events`` is partitioned by month on ``timestamp`` (UTC month bounds):
+``events_YYYY_MM`` holds one month and ``events_default`` catches rows for
+months whose partition does not exist yet, so a late ``ensure_partitions``
+never loses an event.  When it runs, ``ensure_partitions`` moves such
+stranded rows into the month's new partition.
+
+Retention works on whole partitions: ``retain`` detaches months older than
+the retention window (a catalog change, no row deletes) and can drop them
+once they are archived.  The event rollup tables keep counting detached
+months.
+
+Driven by ``tools/event_partitions.py`` (cron) and after every
+``tools/migrate.py`` run.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import re
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from settings.constants import EVENT_PARTITION_MONTHS_AHEAD
+from utils.schemas import EventPartition
+from utils.session import with_session
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "events"
+DEFAULT_PARTITION = "events_default"
+_MONTH_PARTITION_RE = re.compile(r"^events_(\d{4})_(\d{2})$")
+
+
+def month_start(value: datetime.datetime) -> datetime.datetime:
+    """First instant (UTC) of the month containing ``value``."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    value = value.astimezone(datetime.timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime.datetime, months: int) -> datetime.datetime:
+    """``month`` (a month start) shifted by ``months`` months."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime.datetime) -> str:
+    """Partition table name for the month starting at ``month``."""
+    return f"events_{month.year:04d}_{month.month:02d}"
+
+
+def _partition_from_name(name: str, attached: bool, estimated_rows: int) -> Optional[EventPartition]:
+    if name == DEFAULT_PARTITION:
+        return EventPartition(name=name, attached=attached, estimated_rows=estimated_rows)
+    match = _MONTH_PARTITION_RE.match(name)
+    if not match:
+        return None
+    start = datetime.datetime(
+        int(match.group(1)), int(match.group(2)), 1, tzinfo=datetime.timezone.utc
+    )
+    return EventPartition(
+        name=name,
+        start=start,
+        end=add_months(start, 1),
+        attached=attached,
+        estimated_rows=estimated_rows,
+    )
+
+
+@with_session
+def list_partitions(include_detached: bool = True, *, session: Session) -> List[EventPartition]:
+    """Monthly partitions (oldest first), then the default partition.
+
+    With ``include_detached``, ``events_YYYY_MM`` tables that retention
+    detached but did not drop are listed too (``attached=False``).
+    """
+    rows = session.execute(
+        text(
+            """
+            SELECT c.relname,
+                   c.relispartition,
+                   greatest(c.reltuples, 0)::bigint
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = current_schema()
+              AND c.relkind IN ('r', 'p')
+              AND (c.relname = :default_name OR c.relname ~ '^events_[0-9]{4}_[0-9]{2}$')
+            """
+        ),
+        {"default_name": DEFAULT_PARTITION},
+    ).all()
+
+    partitions = []
+    for name, attached, estimated_rows in rows:
+        if not attached and not include_detached:
+            continue
+        partition = _partition_from_name(name, attached, estimated_rows)
+        if partition is not None:
+            partitions.append(partition)
+
+    far_future = datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+    partitions.sort(key=lambda p: p.start or far_future)
+    return partitions
+
+
+def _create_partition(name: str, start: datetime.datetime, end: datetime.datetime, session: Session) -> int:
+    """Create and attach one month's partition. Returns rows moved out of the default partition."""
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    in_range = {"start": start, "end": end}
+
+    stranded = session.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE timestamp >= :start AND timestamp < :end)"
+        ),
+        in_range,
+    ).scalar_one()
+    if not stranded:
+        session.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bounds}"))
+        return 0
+
+    # Postgres refuses a new partition while the default partition holds rows
+    # in its range: build the month as a plain table, move the rows, attach.
+    session.execute(
+        text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    moved = session.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE timestamp >= :start AND timestamp < :end
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """
+        ),
+        in_range,
+    ).rowcount
+    session.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} {bounds}"))
+    return moved or 0
+
+
+@with_session(commit=True)
+def ensure_partitions(
+    months_ahead: int = EVENT_PARTITION_MONTHS_AHEAD,
+    now: Optional[datetime.datetime] = None,
+    *,
+    session: Session,
+) -> List[str]:
+    """Create missing monthly partitions and return their names.
+
+    Covers the current month and ``months_ahead`` months after it, plus any
+    month with rows stranded in the default partition (those rows are moved
+    into the new partition).
+    """
+    current = month_start(now or datetime.datetime.now(datetime.timezone.utc))
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    stranded_months = session.execute(
+        text(
+            "SELECT DISTINCT date_trunc('month', timestamp AT TIME ZONE 'UTC') "
+            f"FROM {DEFAULT_PARTITION}"
+        )
+    ).scalars()
+    months.update(month_start(m) for m in stranded_months)
+
+    existing = {p.name for p in list_partitions(session=session)}
+    created = []
+    for month in sorted(months):
+        name = partition_name(month)
+        if name in existing:
+            continue
+        moved = _create_partition(name, month, add_months(month, 1), session)
+        created.append(name)
+        logger.info("Created event partition %s (%d rows moved from default)", name, moved)
+    return created
+
+
+def retention_cutoff(keep_months: int, now: Optional[datetime.datetime] = None) -> datetime.datetime:
+    """Start of the oldest month kept when keeping ``keep_months`` months (current included)."""
+    current = month_start(now or datetime.datetime.now(datetime.timezone.utc))
+    return add_months(current, -(max(keep_months, 1) - 1))
+
+
+@with_session(commit=True)
+def retain(
+    cutoff: datetime.datetime,
+    drop: bool = False,
+    dry_run: bool = False,
+    *,
+    session: Session,
+) -> List[EventPartition]:
+    """Detach monthly partitions that end on or before ``cutoff``.
+
+    With ``drop``, detached partitions older than ``cutoff`` (including ones
+    detached by an earlier run) are dropped as well.  Returns the partitions
+    acted on; ``dry_run`` only reports them.
+    """
+    expired = [
+        p
+        for p in list_partitions(session=session)
+        if p.end is not None and p.end <= cutoff and (p.attached or drop)
+    ]
+    if dry_run:
+        return expired
+
+    for partition in expired:
+        if partition.attached:
+            session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition.name}"))
+            logger.info("Detached event partition %s", partition.name)
+        if drop:
+            session.execute(text(f"DROP TABLE {partition.name}"))
+            logger.info("Dropped event partition %s", partition.name)
+    return expired
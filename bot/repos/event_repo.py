@@ -1,23 +1,58 @@
 """Event repository for database access to telemetry events.
 
 This module provides data access functions for querying event records.
+
+Every insert also increments the hourly and daily rollups
+(``event_rollups_hourly`` / ``event_rollups_daily``) in the same
+transaction, so aggregate questions ("how many spins per chat per day")
+read a few rollup rows instead of scanning ``events``, and keep working for
+months whose partitions were retired (see ``repos.event_partition_repo``).
 """
 
 from __future__ import annotations
 
+import datetime
 import logging
 from enum import Enum
-from typing import List, Optional
+from typing import List, Literal, Optional
 
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from utils.events import EventType
-from utils.models import EventModel
-from utils.schemas import Event
+from utils.models import EventModel, EventRollupDailyModel, EventRollupHourlyModel
+from utils.schemas import Event, EventRollup
 from sqlalchemy.orm import Session
 from utils.session import with_session
 
 logger = logging.getLogger(__name__)
 
 
+def _increment_rollups(
+    event_type: str,
+    outcome: str,
+    chat_id: str,
+    timestamp: datetime.datetime,
+    session: Session,
+) -> None:
+    """Add one event to its hourly and daily rollup rows."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+    hour = timestamp.astimezone(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    for model, bucket in (
+        (EventRollupHourlyModel, {"bucket": hour}),
+        (EventRollupDailyModel, {"day": hour.date()}),
+    ):
+        stmt = pg_insert(model).values(
+            **bucket, event_type=event_type, outcome=outcome, chat_id=chat_id, count=1
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[*bucket, "event_type", "outcome", "chat_id"],
+            set_={"count": model.count + stmt.excluded.count},
+        )
+        session.execute(stmt)
+
+
 @with_session(commit=True)
 def create_event(
     event_type: str,
@@ -44,6 +79,7 @@ def create_event(
     )
     session.add(event_model)
     session.flush()
+    _increment_rollups(event_type, outcome, str(chat_id), timestamp, session)
 
     return Event.from_orm(event_model)
 
@@ -147,6 +183,9 @@ def count_events(
     """
     Count events matching the given filters.
 
+    Without ``user_id`` the count is summed from the daily rollups (which
+    also cover retired partitions); per-user counts scan ``events``.
+
     Args:
         user_id: Optional user ID filter.
         chat_id: Optional chat ID filter.
@@ -156,10 +195,17 @@ def count_events(
     Returns:
         Count of matching events.
     """
-    query = session.query(EventModel)
+    if user_id is None:
+        stmt = select(func.coalesce(func.sum(EventRollupDailyModel.count), 0))
+        if chat_id is not None:
+            stmt = stmt.where(EventRollupDailyModel.chat_id == str(chat_id))
+        if event_type is not None:
+            stmt = stmt.where(EventRollupDailyModel.event_type == event_type.value)
+        if outcome is not None:
+            stmt = stmt.where(EventRollupDailyModel.outcome == outcome.value)
+        return int(session.execute(stmt).scalar_one())
 
-    if user_id is not None:
-        query = query.filter(EventModel.user_id == user_id)
+    query = session.query(EventModel).filter(EventModel.user_id == user_id)
     if chat_id is not None:
         query = query.filter(EventModel.chat_id == str(chat_id))
     if event_type is not None:
@@ -168,3 +214,65 @@ def count_events(
         query = query.filter(EventModel.outcome == outcome.value)
 
     return query.count()
+
+
+@with_session
+def get_rollups(
+    granularity: Literal["hour", "day"] = "day",
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+    event_types: Optional[List[EventType]] = None,
+    outcomes: Optional[List[str]] = None,
+    chat_id: Optional[str] = None,
+    *,
+    session: Session,
+) -> List[EventRollup]:
+    """
+    Get event counts per hour or day, event type, outcome and chat.
+
+    Args:
+        granularity: ``"hour"`` or ``"day"`` (UTC days).
+        since: Optional inclusive lower bound on the bucket start.
+        until: Optional exclusive upper bound on the bucket start.
+        event_types: Optional list of event types to filter by.
+        outcomes: Optional list of outcome strings to filter by.
+        chat_id: Optional chat ID filter.
+
+    Returns:
+        List of EventRollup instances, ordered by bucket.
+    """
+    if granularity == "hour":
+        model, bucket = EventRollupHourlyModel, EventRollupHourlyModel.bucket
+    elif granularity == "day":
+        model, bucket = EventRollupDailyModel, EventRollupDailyModel.day
+    else:
+        raise ValueError(f"Unknown rollup granularity: {granularity!r}")
+
+    def _bound(value: datetime.datetime):
+        if granularity == "hour":
+            return value
+        return value.astimezone(datetime.timezone.utc).date()
+
+    stmt = select(bucket, model.event_type, model.outcome, model.chat_id, model.count)
+    if since is not None:
+        stmt = stmt.where(bucket >= _bound(since))
+    if until is not None:
+        stmt = stmt.where(bucket < _bound(until))
+    if event_types:
+        stmt = stmt.where(model.event_type.in_([et.value for et in event_types]))
+    if outcomes:
+        stmt = stmt.where(model.outcome.in_(outcomes))
+    if chat_id is not None:
+        stmt = stmt.where(model.chat_id == str(chat_id))
+    stmt = stmt.order_by(bucket, model.event_type, model.outcome, model.chat_id)
+
+    rollups = []
+    for key, event_type, outcome, chat, count in session.execute(stmt):
+        if isinstance(key, datetime.date) and not isinstance(key, datetime.datetime):
+            key = datetime.datetime.combine(key, datetime.time(), tzinfo=datetime.timezone.utc)
+        rollups.append(
+            EventRollup(
+                bucket=key, event_type=event_type, outcome=outcome, chat_id=chat, count=count
+            )
+        )
+    return rollups
@@ -1,8 +1,8 @@
 """Notification repository — data access for roll notifications.
 
 Handles CRUD operations for the roll_notifications table, including
-upserting notifications on roll, querying pending/future unsent
-notifications, and atomically claiming notifications with row-level locking.
+upserting notifications on roll, finding the next due time, and claiming
+due notifications in batches with row-level locking (SKIP LOCKED).
 """
 
 from __future__ import annotations
@@ -10,9 +10,9 @@ from __future__ import annotations
 import datetime
 import logging
 from datetime import timezone
-from typing import List
+from typing import List, Optional
 
-from sqlalchemy import and_, update
+from sqlalchemy import and_, func, update
 from sqlalchemy.orm import Session
 
 from utils.models import RollNotificationModel
@@ -60,40 +60,38 @@ def upsert_notification(
         session.add(notification)
 
 
-def claim_notification(
-    user_id: int,
-    chat_id: str,
-    expected_notify_at: datetime.datetime,
+def claim_due_batch(
+    limit: int,
     *,
     session: Session,
-) -> bool:
-    """Atomically lock and mark a notification as sent.
+) -> List[RollNotificationModel]:
+    """Lock up to ``limit`` due notifications and mark them as sent.
 
-    Uses SELECT ... FOR UPDATE to prevent concurrent workers from both
-    claiming the same notification. Filters on notify_at to guard
-    against stale jobs.
+    Uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent pollers (several
+    bot workers) each claim a disjoint batch instead of waiting on each
+    other. Oldest notifications are claimed first.
 
-    Must be called within an existing session/transaction (no decorator).
-    Returns True if claimed, False if not found / already sent / stale.
+    Must be called within an existing session/transaction (no decorator);
+    the claim becomes visible to other pollers when it commits.
     """
-    notification = (
+    now = datetime.datetime.now(timezone.utc)
+
+    rows = (
         session.query(RollNotificationModel)
         .filter(
-            RollNotificationModel.user_id == user_id,
-            RollNotificationModel.chat_id == str(chat_id),
             RollNotificationModel.sent == False,  # noqa: E712
-            RollNotificationModel.notify_at == expected_notify_at,
+            RollNotificationModel.notify_at <= now,
         )
-        .with_for_update()
-        .first()
+        .order_by(RollNotificationModel.notify_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
     )
 
-    if notification is None:
-        return False
-
-    notification.sent = True
-    notification.sent_at = datetime.datetime.now(timezone.utc)
-    return True
+    for row in rows:
+        row.sent = True
+        row.sent_at = now
+    return rows
 
 
 @with_session(commit=True)
@@ -122,36 +120,14 @@ def mark_completed(
 
 
 @with_session
-def get_all_unsent_overdue(
-    *, session: Session,
-) -> List[RollNotificationModel]:
-    """Get all unsent notifications that are due (notify_at <= now)."""
-    now = datetime.datetime.now(timezone.utc)
-
-    return (
-        session.query(RollNotificationModel)
-        .filter(
-            RollNotificationModel.sent == False,  # noqa: E712
-            RollNotificationModel.notify_at <= now,
-        )
-        .all()
-    )
-
-
-@with_session
-def get_all_unsent_future(
+def get_next_notify_at(
     *, session: Session,
-) -> List[RollNotificationModel]:
-    """Get all unsent notifications scheduled for the future."""
-    now = datetime.datetime.now(timezone.utc)
-
+) -> Optional[datetime.datetime]:
+    """Return the earliest ``notify_at`` among unsent notifications, if any."""
     return (
-        session.query(RollNotificationModel)
-        .filter(
-            RollNotificationModel.sent == False,  # noqa: E712
-            RollNotificationModel.notify_at > now,
-        )
-        .all()
+        session.query(func.min(RollNotificationModel.notify_at))
+        .filter(RollNotificationModel.sent == False)  # noqa: E712
+        .scalar()
     )
 
 
@@ -7,7 +7,7 @@ user_preferences table.
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import List, Optional, Set
 
 from sqlalchemy.orm import Session
 
@@ -33,6 +33,22 @@ def get_notify_rolls(user_id: int, *, session: Session) -> bool:
     return prefs.notify_rolls
 
 
+@with_session
+def get_opted_out_of_rolls(user_ids: List[int], *, session: Session) -> Set[int]:
+    """Return the subset of ``user_ids`` that turned roll notifications off."""
+    if not user_ids:
+        return set()
+    rows = (
+        session.query(UserPreferencesModel.user_id)
+        .filter(
+            UserPreferencesModel.user_id.in_(user_ids),
+            UserPreferencesModel.notify_rolls == False,  # noqa: E712
+        )
+        .all()
+    )
+    return {row[0] for row in rows}
+
+
 @with_session(commit=True)
 def toggle_notify_rolls(user_id: int, *, session: Session) -> bool:
     """Toggle the notify_rolls preference for a user.
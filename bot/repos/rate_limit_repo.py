@@ -0,0 +1,105 @@
+"""Rate limit repository — shared fixed-window counters for the API limiter.
+
+Each row of ``rate_limit_counters`` is one limiter window: a key (limit +
+client identity), the hits counted so far and when the window ends.
+``increment`` is a single ``INSERT ... ON CONFLICT DO UPDATE`` so concurrent
+hits from different API workers serialize on the row lock and always see
+each other's counts; an expired window is restarted by the same statement.
+
+Expired rows are harmless (they are overwritten on the next hit) and are
+removed in bulk by ``purge_expired``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+from typing import Optional
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from utils.models import RateLimitCounterModel
+from utils.session import with_session
+
+logger = logging.getLogger(__name__)
+
+
+@with_session(commit=True)
+def increment(key: str, expiry: int, amount: int = 1, *, session: Session) -> int:
+    """Add ``amount`` hits to ``key`` and return the window's new count.
+
+    Starts a new window of ``expiry`` seconds if the key is missing or its
+    window has ended.
+    """
+    window_end = func.now() + datetime.timedelta(seconds=expiry)
+    expired = RateLimitCounterModel.expires_at <= func.now()
+
+    stmt = pg_insert(RateLimitCounterModel).values(
+        key=key, count=amount, expires_at=window_end
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RateLimitCounterModel.key],
+        set_={
+            "count": case(
+                (expired, stmt.excluded.count),
+                else_=RateLimitCounterModel.count + stmt.excluded.count,
+            ),
+            "expires_at": case(
+                (expired, stmt.excluded.expires_at),
+                else_=RateLimitCounterModel.expires_at,
+            ),
+        },
+    ).returning(RateLimitCounterModel.count)
+
+    return session.execute(stmt).scalar_one()
+
+
+@with_session
+def get_count(key: str, *, session: Session) -> int:
+    """Hits counted in the current window of ``key`` (0 if none is active)."""
+    count = session.execute(
+        select(RateLimitCounterModel.count).where(
+            RateLimitCounterModel.key == key,
+            RateLimitCounterModel.expires_at > func.now(),
+        )
+    ).scalar_one_or_none()
+    return count or 0
+
+
+@with_session
+def get_expiry(key: str, *, session: Session) -> Optional[datetime.datetime]:
+    """End of the current window of ``key``, or None if none is active."""
+    return session.execute(
+        select(RateLimitCounterModel.expires_at).where(
+            RateLimitCounterModel.key == key,
+            RateLimitCounterModel.expires_at > func.now(),
+        )
+    ).scalar_one_or_none()
+
+
+@with_session(commit=True)
+def clear(key: str, *, session: Session) -> None:
+    """Drop the counter of ``key``."""
+    session.execute(
+        delete(RateLimitCounterModel).where(RateLimitCounterModel.key == key)
+    )
+
+
+@with_session(commit=True)
+def clear_all(*, session: Session) -> int:
+    """Drop every counter. Returns the number of rows removed."""
+    result = session.execute(delete(RateLimitCounterModel))
+    return result.rowcount or 0
+
+
+@with_session(commit=True)
+def purge_expired(*, session: Session) -> int:
+    """Delete counters whose window has ended. Returns the number removed."""
+    result = session.execute(
+        delete(RateLimitCounterModel).where(
+            RateLimitCounterModel.expires_at <= func.now()
+        )
+    )
+    return result.rowcount or 0
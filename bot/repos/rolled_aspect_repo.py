@@ -10,11 +10,11 @@ import datetime
 import logging
 from typing import Optional
 
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, aliased, load_only
 
-from utils.models import RolledAspectModel
-from utils.schemas import RolledAspect
+from utils.models import AspectDefinitionModel, OwnedAspectModel, RolledAspectModel, SetModel
+from utils.schemas import REROLL_WINDOW_SECONDS, RollItemSummary, RollSnapshot, RolledAspect
 from utils.session import with_session
 
 logger = logging.getLogger(__name__)
@@ -49,6 +49,99 @@ def get_rolled_aspect_by_roll_id(roll_id: int, *, session: Session) -> Optional[
     return RolledAspect.from_orm(rolled) if rolled else None
 
 
+def _aspect_summary(
+    aspect: Optional[OwnedAspectModel],
+    definition_name: Optional[str],
+    set_name: Optional[str],
+) -> Optional[RollItemSummary]:
+    if aspect is None:
+        return None
+    return RollItemSummary(
+        id=aspect.id,
+        rarity=aspect.rarity,
+        owner=aspect.owner,
+        user_id=aspect.user_id,
+        chat_id=aspect.chat_id,
+        # Custom name override first, then definition name (as OwnedAspect.from_orm)
+        name=aspect.name or definition_name or "",
+        set_name=set_name,
+    )
+
+
+@with_session
+def get_roll_snapshot(roll_id: int, *, session: Session) -> Optional[RollSnapshot]:
+    """Load a rolled aspect with its active and original aspect metadata in one query.
+
+    Definition and set names are joined in; sphere images live in
+    ``aspect_images`` and are never loaded.
+    """
+    summary_columns = ("id", "name", "rarity", "owner", "user_id", "chat_id")
+    original = aliased(OwnedAspectModel)
+    rerolled = aliased(OwnedAspectModel)
+    original_def = aliased(AspectDefinitionModel)
+    rerolled_def = aliased(AspectDefinitionModel)
+    original_set = aliased(SetModel)
+    rerolled_set = aliased(SetModel)
+    row = (
+        session.query(
+            RolledAspectModel,
+            original,
+            original_def.name,
+            original_set.name,
+            rerolled,
+            rerolled_def.name,
+            rerolled_set.name,
+        )
+        .outerjoin(original, original.id == RolledAspectModel.original_aspect_id)
+        .outerjoin(original_def, original_def.id == original.aspect_definition_id)
+        .outerjoin(
+            original_set,
+            and_(
+                original_set.id == original_def.set_id,
+                original_set.season_id == original_def.season_id,
+            ),
+        )
+        .outerjoin(rerolled, rerolled.id == RolledAspectModel.rerolled_aspect_id)
+        .outerjoin(rerolled_def, rerolled_def.id == rerolled.aspect_definition_id)
+        .outerjoin(
+            rerolled_set,
+            and_(
+                rerolled_set.id == rerolled_def.set_id,
+                rerolled_set.season_id == rerolled_def.season_id,
+            ),
+        )
+        .options(
+            load_only(*(getattr(original, c) for c in summary_columns)),
+            load_only(*(getattr(rerolled, c) for c in summary_columns)),
+        )
+        .filter(RolledAspectModel.roll_id == roll_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    (
+        rolled_orm,
+        original_aspect,
+        original_def_name,
+        original_set_name,
+        rerolled_aspect,
+        rerolled_def_name,
+        rerolled_set_name,
+    ) = row
+    rolled = RolledAspect.from_orm(rolled_orm)
+    original_summary = _aspect_summary(original_aspect, original_def_name, original_set_name)
+    if rolled.current_aspect_id == rolled.rerolled_aspect_id:
+        current_summary = _aspect_summary(rerolled_aspect, rerolled_def_name, rerolled_set_name)
+    else:
+        current_summary = original_summary
+    return RollSnapshot(
+        rolled=rolled,
+        item=current_summary,
+        original_item=original_summary,
+    )
+
+
 @with_session
 def get_rolled_aspect_by_aspect_id(aspect_id: int, *, session: Session) -> Optional[RolledAspect]:
     """Get a rolled aspect entry by either original or rerolled aspect ID."""
@@ -139,4 +232,4 @@ def is_rolled_aspect_reroll_expired(roll_id: int, *, session: Session) -> bool:
 
     now = datetime.datetime.now(datetime.timezone.utc)
     elapsed = (now - rolled.created_at).total_seconds()
-    return elapsed > 300  # 5 minutes
+    return elapsed > REROLL_WINDOW_SECONDS
@@ -11,10 +11,10 @@ import logging
 from typing import Optional
 
 from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased, load_only
 
-from utils.models import RolledCardModel
-from utils.schemas import RolledCard
+from utils.models import CardModel, RolledCardModel
+from utils.schemas import REROLL_WINDOW_SECONDS, RollItemSummary, RollSnapshot, RolledCard
 from utils.session import with_session
 
 logger = logging.getLogger(__name__)
@@ -44,6 +44,56 @@ def get_rolled_card_by_roll_id(roll_id: int, *, session: Session) -> Optional[Ro
     return RolledCard.from_orm(rolled) if rolled else None
 
 
+def _card_summary(card: Optional[CardModel]) -> Optional[RollItemSummary]:
+    if card is None:
+        return None
+    return RollItemSummary(
+        id=card.id,
+        rarity=card.rarity,
+        owner=card.owner,
+        user_id=card.user_id,
+        chat_id=card.chat_id,
+        name=card.base_name,
+        modifier=card.modifier,
+    )
+
+
+@with_session
+def get_roll_snapshot(roll_id: int, *, session: Session) -> Optional[RollSnapshot]:
+    """Load a rolled card with its active and original card metadata in one query.
+
+    Only the card columns needed for captions and permission checks are
+    selected; images live in ``card_images`` and are never loaded.
+    """
+    original = aliased(CardModel)
+    rerolled = aliased(CardModel)
+    summary_columns = ("id", "base_name", "modifier", "rarity", "owner", "user_id", "chat_id")
+    row = (
+        session.query(RolledCardModel, original, rerolled)
+        .outerjoin(original, original.id == RolledCardModel.original_card_id)
+        .outerjoin(rerolled, rerolled.id == RolledCardModel.rerolled_card_id)
+        .options(
+            load_only(*(getattr(original, c) for c in summary_columns)),
+            load_only(*(getattr(rerolled, c) for c in summary_columns)),
+        )
+        .filter(RolledCardModel.roll_id == roll_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    rolled_orm, original_card, rerolled_card = row
+    rolled = RolledCard.from_orm(rolled_orm)
+    current_card = (
+        rerolled_card if rolled.current_card_id == rolled.rerolled_card_id else original_card
+    )
+    return RollSnapshot(
+        rolled=rolled,
+        item=_card_summary(current_card),
+        original_item=_card_summary(original_card),
+    )
+
+
 @with_session
 def get_rolled_card_by_card_id(card_id: int, *, session: Session) -> Optional[RolledCard]:
     """Get a rolled card entry by either original or rerolled card ID."""
@@ -125,4 +175,4 @@ def is_rolled_card_reroll_expired(roll_id: int, *, session: Session) -> bool:
         return True
 
     time_since_creation = datetime.datetime.now(datetime.timezone.utc) - rolled.created_at
-    return time_since_creation.total_seconds() > 5 * 60
+    return time_since_creation.total_seconds() > REROLL_WINDOW_SECONDS
@@ -13,7 +13,7 @@ from typing import Dict, Optional
 from sqlalchemy.orm import Session
 
 from settings.constants import CURRENT_SEASON
-from utils.models import SetIconModel
+from utils.models import ICON_VERSION_SEQ, SetIconModel
 from utils.session import with_session
 
 logger = logging.getLogger(__name__)
@@ -62,9 +62,9 @@ def upsert_icon(
 
     Ensures stored bytes are always JPEG.
     """
-    from utils.image import ImageUtil
+    from utils import image_workers
 
-    icon_bytes = ImageUtil.to_jpeg(icon_bytes)
+    icon_bytes = image_workers.run("to_jpeg", icon_bytes)
 
     row = (
         session.query(SetIconModel)
@@ -73,6 +73,7 @@ def upsert_icon(
     )
     if row:
         row.icon = icon_bytes
+        row.icon_version = ICON_VERSION_SEQ.next_value()
     else:
         session.add(
             SetIconModel(set_id=set_id, season_id=season_id, icon=icon_bytes)
@@ -98,6 +99,27 @@ def get_all_icons_b64(
     }
 
 
+@with_session
+def get_icon_fingerprints(
+    season_id: Optional[int] = None,
+    *,
+    session: Session,
+) -> Dict[int, int]:
+    """Return ``{set_id: icon_version}`` for every set in *season_id*.
+
+    Reads the version renewed by ``upsert_icon`` (from ``icon_version_seq``,
+    so a deleted and recreated icon gets a new one), so neither icon bytes
+    nor a hash of them are touched.
+    """
+    sid = season_id if season_id is not None else CURRENT_SEASON
+    rows = (
+        session.query(SetIconModel.set_id, SetIconModel.icon_version)
+        .filter(SetIconModel.season_id == sid)
+        .all()
+    )
+    return {row[0]: row[1] for row in rows}
+
+
 @with_session(commit=True)
 def delete_icon(
     set_id: int,
@@ -9,11 +9,13 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
+from sqlalchemy import BigInteger, Boolean, Text, case, func, literal, or_, select, true, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from settings.constants import SPINS_FOR_MEGASPIN
 from utils.models import MegaspinsModel, SpinsModel
-from utils.schemas import Megaspins, Spins
+from utils.schemas import Megaspins, SpinConsumption, Spins
 from utils.session import with_session
 
 logger = logging.getLogger(__name__)
@@ -110,19 +112,152 @@ def decrement_user_spins(user_id: int, chat_id: str, amount: int = 1, *, session
 
 @with_session(commit=True)
 def consume_user_spin(user_id: int, chat_id: str, *, session: Session) -> bool:
-    """Consume one spin if available. Returns True if successful, False if no spins available."""
-    spins = (
-        session.query(SpinsModel)
-        .filter(
+    """Consume one spin if available. Returns True if successful, False if no spins available.
+
+    Does not touch the megaspin counter; the slots API uses
+    ``consume_spins_and_advance_megaspin`` instead.
+    """
+    result = session.execute(
+        update(SpinsModel)
+        .where(
             SpinsModel.user_id == user_id,
             SpinsModel.chat_id == str(chat_id),
+            SpinsModel.count > 0,
         )
-        .first()
+        .values(count=SpinsModel.count - 1)
+    )
+    return result.rowcount > 0
+
+
+@with_session(commit=True)
+def consume_spins_and_advance_megaspin(
+    user_id: int, chat_id: str, amount: int = 1, *, session: Session
+) -> SpinConsumption:
+    """Atomically spend ``amount`` spins and advance the megaspin counter.
+
+    Runs as a single statement: a guarded ``UPDATE spins ... WHERE count >= amount
+    RETURNING count`` feeds an ``INSERT ... ON CONFLICT DO UPDATE`` on megaspins,
+    so the balance check and decrement cannot interleave with a concurrent spin
+    and the megaspin counter only moves when the spend succeeded.
+
+    The megaspin counter follows ``spin_manager.decrement_megaspin_counter``:
+    it stops at 0 once a megaspin is available (megaspins do not accrue).
+
+    Returns:
+        SpinConsumption with the post-operation balance and megaspin state.
+        When the balance is insufficient nothing is modified and the current
+        state is returned with ``success=False``.
+    """
+    chat_id = str(chat_id)
+    spins_for_megaspin = _get_spins_for_megaspin()
+    initial_counter = max(spins_for_megaspin - amount, 0)
+
+    spent = (
+        update(SpinsModel)
+        .where(
+            SpinsModel.user_id == user_id,
+            SpinsModel.chat_id == chat_id,
+            SpinsModel.count >= amount,
+        )
+        .values(count=SpinsModel.count - amount)
+        .returning(SpinsModel.count)
+        .cte("spent")
+    )
+
+    advanced = (
+        pg_insert(MegaspinsModel)
+        .from_select(
+            ["user_id", "chat_id", "spins_until_megaspin", "megaspin_available"],
+            select(
+                literal(user_id, BigInteger),
+                literal(chat_id, Text),
+                literal(initial_counter, BigInteger),
+                literal(initial_counter == 0, Boolean),
+            ).select_from(spent),
+        )
+        .on_conflict_do_update(
+            index_elements=[MegaspinsModel.user_id, MegaspinsModel.chat_id],
+            set_={
+                "spins_until_megaspin": case(
+                    (MegaspinsModel.megaspin_available, MegaspinsModel.spins_until_megaspin),
+                    else_=func.greatest(MegaspinsModel.spins_until_megaspin - amount, 0),
+                ),
+                "megaspin_available": or_(
+                    MegaspinsModel.megaspin_available,
+                    MegaspinsModel.spins_until_megaspin - amount <= 0,
+                ),
+            },
+        )
+        .returning(MegaspinsModel.spins_until_megaspin, MegaspinsModel.megaspin_available)
+        .cte("advanced")
+    )
+
+    row = session.execute(
+        select(
+            spent.c.count,
+            advanced.c.spins_until_megaspin,
+            advanced.c.megaspin_available,
+        ).select_from(spent.join(advanced, true()))
+    ).first()
+
+    if row is not None:
+        if row.megaspin_available:
+            logger.info(f"User {user_id} in chat {chat_id} has a megaspin available")
+        return SpinConsumption(
+            success=True,
+            spins_remaining=row.count,
+            megaspins=Megaspins(
+                user_id=user_id,
+                chat_id=chat_id,
+                spins_until_megaspin=row.spins_until_megaspin,
+                megaspin_available=row.megaspin_available,
+            ),
+        )
+
+    return SpinConsumption(
+        success=False,
+        spins_remaining=get_user_spin_count(user_id, chat_id, session=session),
+        megaspins=get_user_megaspins(user_id, chat_id, session=session),
+    )
+
+
+@with_session(commit=True)
+def consume_megaspin_with_state(user_id: int, chat_id: str, *, session: Session) -> SpinConsumption:
+    """Atomically consume an available megaspin and return the resulting state.
+
+    A single ``UPDATE ... WHERE megaspin_available RETURNING`` both checks and
+    resets the megaspin, so two concurrent requests cannot both consume it.
+    """
+    chat_id = str(chat_id)
+    spins_for_megaspin = _get_spins_for_megaspin()
+
+    row = session.execute(
+        update(MegaspinsModel)
+        .where(
+            MegaspinsModel.user_id == user_id,
+            MegaspinsModel.chat_id == chat_id,
+            MegaspinsModel.megaspin_available.is_(True),
+        )
+        .values(megaspin_available=False, spins_until_megaspin=spins_for_megaspin)
+        .returning(MegaspinsModel.spins_until_megaspin, MegaspinsModel.megaspin_available)
+    ).first()
+
+    if row is None:
+        return SpinConsumption(
+            success=False,
+            megaspins=get_user_megaspins(user_id, chat_id, session=session),
+        )
+
+    logger.info(f"User {user_id} in chat {chat_id} consumed their megaspin")
+    return SpinConsumption(
+        success=True,
+        megaspins=Megaspins(
+            user_id=user_id,
+            chat_id=chat_id,
+            spins_until_megaspin=row.spins_until_megaspin,
+            megaspin_available=row.megaspin_available,
+        ),
     )
-    if spins and spins.count > 0:
-        spins.count -= 1
-        return True
-    return False
 
 
 @with_session(commit=True)
@@ -156,25 +291,7 @@ def get_user_megaspins(user_id: int, chat_id: str, *, session: Session) -> Megas
 @with_session(commit=True)
 def consume_megaspin(user_id: int, chat_id: str, *, session: Session) -> bool:
     """Consume a megaspin if available. Returns True if successful, False otherwise."""
-    spins_for_megaspin = _get_spins_for_megaspin()
-
-    megaspins = (
-        session.query(MegaspinsModel)
-        .filter(
-            MegaspinsModel.user_id == user_id,
-            MegaspinsModel.chat_id == str(chat_id),
-        )
-        .first()
-    )
-
-    if not megaspins or not megaspins.megaspin_available:
-        return False
-
-    # Consume the megaspin and reset the counter
-    megaspins.megaspin_available = False
-    megaspins.spins_until_megaspin = spins_for_megaspin
-    logger.info(f"User {user_id} in chat {chat_id} consumed their megaspin")
-    return True
+    return consume_megaspin_with_state(user_id, chat_id, session=session).success
 
 
 @with_session(commit=True)
@@ -7,7 +7,7 @@ getting, setting, and clearing thread IDs for chats.
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import Dict, Optional
 
 from sqlalchemy.orm import Session
 
@@ -36,6 +36,17 @@ def get_thread_id(chat_id: str, type: str = "main", *, session: Session) -> Opti
     return thread.thread_id if thread else None
 
 
+@with_session
+def get_thread_ids(chat_id: str, *, session: Session) -> Dict[str, int]:
+    """Get every configured thread of a chat as ``{type: thread_id}``."""
+    rows = (
+        session.query(ThreadModel.type, ThreadModel.thread_id)
+        .filter(ThreadModel.chat_id == str(chat_id))
+        .all()
+    )
+    return {thread_type: thread_id for thread_type, thread_id in rows}
+
+
 @with_session(commit=True)
 def set_thread_id(chat_id: str, thread_id: int, type: str = "main", *, session: Session) -> bool:
     """Set the thread_id for a chat_id and type. Returns True if successful.
@@ -7,12 +7,12 @@ and chat membership management.
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
 
-from utils.models import CardModel, CharacterModel, ChatModel, UserModel
+from utils.models import ICON_VERSION_SEQ, CardModel, CharacterModel, ChatModel, UserModel
 from utils.schemas import User
 from utils.session import with_session
 
@@ -133,6 +133,7 @@ def update_user_profile(user_id: int, display_name: str, profile_imageb64: str,
     user.profile_image = base64.b64decode(profile_imageb64)
     if slot_icon_b64:
         user.slot_icon = base64.b64decode(slot_icon_b64)
+        user.slot_icon_version = ICON_VERSION_SEQ.next_value()
         logger.info(f"Updated user profile and slot icon for user {user_id}")
     else:
         logger.info(f"Updated user profile for user {user_id} (slot icon generation failed)")
@@ -147,6 +148,15 @@ def get_user(user_id: int, *, session: Session) -> Optional[User]:
     return User.from_orm(result) if result else None
 
 
+@with_session
+def get_slot_icon_b64(user_id: int, *, session: Session) -> Optional[str]:
+    """Return a user's base64 slot icon without loading the rest of the profile."""
+    import base64
+
+    icon = session.query(UserModel.slot_icon).filter(UserModel.user_id == user_id).scalar()
+    return base64.b64encode(icon).decode("utf-8") if icon else None
+
+
 @with_session
 def user_exists(user_id: int, *, session: Session) -> bool:
     """Check whether a user exists in the users table."""
@@ -170,6 +180,28 @@ def get_all_chat_users_with_profile(chat_id: str, *, session: Session) -> List[U
     return [User.from_orm(r) for r in results]
 
 
+@with_session
+def get_chat_users_with_profile_names(
+    chat_id: str, *, session: Session
+) -> List[Tuple[int, str]]:
+    """Return ``(user_id, display_name)`` of chat users with a complete profile.
+
+    Same filter as ``get_all_chat_users_with_profile``, without loading images.
+    """
+    rows = (
+        session.query(UserModel.user_id, UserModel.display_name)
+        .join(ChatModel, ChatModel.user_id == UserModel.user_id)
+        .filter(
+            ChatModel.chat_id == str(chat_id),
+            UserModel.profile_image.isnot(None),
+            UserModel.display_name.isnot(None),
+            func.trim(UserModel.display_name) != "",
+        )
+        .all()
+    )
+    return [(user_id, display_name.strip()) for user_id, display_name in rows]
+
+
 @with_session
 def get_random_chat_user_with_profile(chat_id: str, *, session: Session) -> Optional[User]:
     """Return a random user enrolled in the chat with a stored profile image."""
@@ -234,6 +266,25 @@ def is_user_in_chat(chat_id: str, user_id: int, *, session: Session) -> bool:
     )
 
 
+@with_session
+def get_enrolled_pairs(
+    pairs: List[Tuple[str, int]], *, session: Session
+) -> Set[Tuple[str, int]]:
+    """Return the ``(chat_id, user_id)`` pairs from ``pairs`` that are enrolled."""
+    if not pairs:
+        return set()
+    rows = (
+        session.query(ChatModel.chat_id, ChatModel.user_id)
+        .filter(
+            tuple_(ChatModel.chat_id, ChatModel.user_id).in_(
+                [(str(chat_id), user_id) for chat_id, user_id in pairs]
+            )
+        )
+        .all()
+    )
+    return {(chat_id, user_id) for chat_id, user_id in rows}
+
+
 @with_session
 def get_all_chat_users(chat_id: str, *, session: Session) -> List[int]:
     """Get all user IDs enrolled in a specific chat."""
@@ -241,6 +292,40 @@ def get_all_chat_users(chat_id: str, *, session: Session) -> List[int]:
     return [c[0] for c in chats]
 
 
+@with_session
+def get_chat_slot_symbol_fingerprints(
+    chat_id: str, *, session: Session
+) -> List[Tuple[str, int, Optional[str], int]]:
+    """Return ``(type, id, display_name, icon_version)`` for every slot symbol in a chat.
+
+    Mirrors ``get_chat_users_and_characters`` but reads the icons' version
+    counters instead of the icons, so callers can cheaply detect whether a
+    cached symbol bundle is still current.
+    """
+    user_rows = (
+        session.query(
+            UserModel.user_id,
+            UserModel.display_name,
+            UserModel.slot_icon_version,
+        )
+        .join(ChatModel, ChatModel.user_id == UserModel.user_id)
+        .filter(ChatModel.chat_id == str(chat_id))
+        .all()
+    )
+    char_rows = (
+        session.query(
+            CharacterModel.id,
+            CharacterModel.name,
+            CharacterModel.slot_icon_version,
+        )
+        .filter(CharacterModel.chat_id == str(chat_id))
+        .all()
+    )
+    return [("user", row[0], row[1], row[2]) for row in user_rows] + [
+        ("character", row[0], row[1], row[2]) for row in char_rows
+    ]
+
+
 @with_session
 def get_chat_users_and_characters(chat_id: str, *, session: Session) -> List[Dict[str, Any]]:
     """Get all users and characters for a specific chat with id, display_name, slot_icon, and type."""
@@ -27,9 +27,12 @@ CARD_TEMPLATES_PATH = config["CARD_TEMPLATES_PATH"]
 SLOT_CARD_WIN_CHANCE = config["SLOT_CARD_WIN_CHANCE"]
 SLOT_ASPECT_WIN_CHANCE = config.get("SLOT_ASPECT_WIN_CHANCE", 0.04)
 SLOT_CLAIM_CHANCE = config["SLOT_CLAIM_CHANCE"]
+SLOT_MAX_AUTOSPIN = config.get("SLOT_MAX_AUTOSPIN", 50)
 MINESWEEPER_MINE_COUNT = config.get("MINESWEEPER_MINE_COUNT", 2)
 MINESWEEPER_CLAIM_POINT_COUNT = config.get("MINESWEEPER_CLAIM_POINT_COUNT", 1)
 GEMINI_TIMEOUT_SECONDS = config.get("GEMINI_TIMEOUT_SECONDS", 180)
+# Max concurrent candidate image generations per process (utils/generation.py)
+GENERATION_CONCURRENCY = config.get("GENERATION_CONCURRENCY", 4)
 
 # RTB (Ride the Bus) constants
 RTB_MIN_BET = config.get("RTB_MIN_BET", 10)
@@ -49,6 +52,8 @@ SPINS_FOR_MEGASPIN = config.get("SPINS_FOR_MEGASPIN", 100)
 
 # Environment-sourced settings
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+psycopg://localhost:5432/gacha")
+# Startup schema revision check: "strict" (refuse to start), "warn" or "off"
+DB_SCHEMA_CHECK = os.getenv("DB_SCHEMA_CHECK", "strict")
 CURRENT_SEASON = int(os.getenv("CURRENT_SEASON", "0"))
 
 # Rarity order derived from RARITIES keys (ordered in config.json)
@@ -224,6 +229,29 @@ CLAIM_UNLOCK_DELAY_HIGH = config.get("CLAIM_UNLOCK_DELAY_HIGH", 6)  # Maximum de
 # Roll-action fair-ordering buffer: buffers claim/lock/reroll callbacks per roll_id,
 # then drains them in (update_id, receipt_ns) order so the earliest clicker wins.
 ROLL_ACTION_BUFFER_WINDOW_MS = config.get("ROLL_ACTION_BUFFER_WINDOW_MS", 250)
+# "memory" (single bot process) or "postgres" (advisory locks across bot workers)
+COORDINATION_BACKEND = config.get("COORDINATION_BACKEND", "memory")
+# Bot update-processing processes; >1 shards updates by chat_id (core/workers.py)
+BOT_WORKERS = config.get("BOT_WORKERS", 1)
+# Max events buffered for the background event writer (event_manager.alog)
+EVENT_QUEUE_MAX_SIZE = config.get("EVENT_QUEUE_MAX_SIZE", 10000)
+# Monthly events partitions created ahead of time (repos/event_partition_repo.py)
+EVENT_PARTITION_MONTHS_AHEAD = config.get("EVENT_PARTITION_MONTHS_AHEAD", 2)
+# Months of raw events kept attached by tools/event_partitions.py retain (current month included)
+EVENT_RETENTION_MONTHS = config.get("EVENT_RETENTION_MONTHS", 12)
+# Processes for CPU-bound image operations (utils/image_workers.py); 0 runs them inline
+IMAGE_WORKER_PROCESSES = config.get("IMAGE_WORKER_PROCESSES", 2)
+
+# Roll notification scheduler (handlers/notifications.py)
+NOTIFICATION_POLL_INTERVAL_SECONDS = config.get("NOTIFICATION_POLL_INTERVAL_SECONDS", 30)
+NOTIFICATION_BATCH_SIZE = config.get("NOTIFICATION_BATCH_SIZE", 100)
+# Telegram bulk-message limit, shared by all bot workers
+NOTIFICATION_SENDS_PER_SECOND = config.get("NOTIFICATION_SENDS_PER_SECOND", 30)
+
+# API rate limit counters: "postgres" (shared by all API workers) or "memory" (per worker)
+RATE_LIMIT_STORAGE = config.get("RATE_LIMIT_STORAGE", "postgres")
+# Validated mini app init data strings cached per API worker (api/dependencies.py)
+INIT_DATA_CACHE_SIZE = config.get("INIT_DATA_CACHE_SIZE", 4096)
 
 # Roll type weights (base_card vs aspect)
 ROLL_TYPE_WEIGHTS = config.get("ROLL_TYPE_WEIGHTS", {"base_card": 10, "aspect": 90})
@@ -5,15 +5,32 @@ MINESWEEPER) and rebuilds aspect_counts from scratch.  Handles both
 payload-based name extraction and aspect_id fallback lookup.
 Card-only events (no aspect_name / no aspect_id) are skipped.
 
+Events are streamed in id order through a server-side cursor, one batch
+(``--batch-size`` events) per read transaction, and resolved ``--chunk-size``
+events at a time: aspect_id fallbacks are looked up with one ``IN`` query per
+chunk.  Counts are aggregated in memory until ``--max-keys`` distinct
+(chat, season, name) keys or the end of a batch, then added to aspect_counts
+with a bulk upsert in the same transaction as the run's checkpoint
+(``backfill_checkpoints``).  An interrupted run continues with ``--resume``
+without counting any event twice.
+
+The run covers events up to the newest one when it started; later events
+are counted by the bot's live listener (``utils.aspect_counts``).  ``--chat``
+rebuilds a single chat and leaves the others untouched.
+
 Usage:
     cd bot && python tools/backfill_aspect_counts.py
     cd bot && python tools/backfill_aspect_counts.py --dry-run
+    cd bot && python tools/backfill_aspect_counts.py --chat -100123456
+    cd bot && python tools/backfill_aspect_counts.py --resume [--chat -100123456]
 """
 
 from __future__ import annotations
 
 import argparse
+import logging
 import sys
+import time
 from collections import defaultdict
 from pathlib import Path
 
@@ -27,11 +44,13 @@ if str(PROJECT_ROOT) not in sys.path:
 
 load_dotenv(dotenv_path=PROJECT_ROOT / ".env", override=False)
 
-from sqlalchemy.orm import joinedload  # noqa: E402
+from sqlalchemy import func, select, tuple_  # noqa: E402
+from repos import aspect_count_repo, backfill_checkpoint_repo  # noqa: E402
+from utils import database  # noqa: E402
 from utils.session import get_session  # noqa: E402
 from utils.models import (  # noqa: E402
+    AspectDefinitionModel,
     EventModel,
-    AspectCountModel,
     OwnedAspectModel,
 )
 from settings.constants import CURRENT_SEASON  # noqa: E402
@@ -48,158 +67,273 @@ ASPECT_CREATION_EVENTS = {
     ("MINESWEEPER", "WON"),
 }
 
+DEFAULT_BATCH_SIZE = 50_000
+DEFAULT_CHUNK_SIZE = 5_000
+DEFAULT_MAX_KEYS = 20_000
 
-def _resolve_aspect_name(event: EventModel, aspect_cache: dict) -> tuple[str | None, int | None]:
-    """Extract aspect name and definition_id from an event.
-
-    Only looks for aspect-specific payload fields (aspect_name, aspect_definition_id).
-    Returns (name, definition_id) or (None, None) if unresolvable.
-    """
-    payload = event.payload or {}
-
-    name = payload.get("aspect_name")
-    definition_id = payload.get("aspect_definition_id")
-
-    if name:
-        return name, definition_id
+# (chat_id, season_id, name) -> [definition_id, count]
+Counts = dict[tuple[str, int, str], list]
 
-    # Fallback: look up by aspect_id
-    aspect_id = event.aspect_id
-    if aspect_id and aspect_id in aspect_cache:
-        cached = aspect_cache[aspect_id]
-        return cached["name"], cached["definition_id"]
 
-    return None, None
+def _checkpoint_name(chat_id: str | None) -> str:
+    return f"aspect_counts:{chat_id}" if chat_id else "aspect_counts"
 
 
-def backfill_aspect_counts(dry_run: bool = False) -> None:
-    """Rebuild aspect_counts from the events table."""
-    print("Loading aspect lookup cache...")
-    aspect_cache: dict[int, dict] = {}
-    def_season_cache: dict[int, int] = {}  # definition_id -> season_id
-    with get_session() as session:
-        aspects = (
-            session.query(OwnedAspectModel)
-            .options(joinedload(OwnedAspectModel.aspect_definition))
-            .all()
+def _event_query(after_id: int, end_id: int, chat_id: str | None, limit: int):
+    query = (
+        select(
+            EventModel.id,
+            EventModel.chat_id,
+            EventModel.aspect_id,
+            EventModel.payload,
         )
-        for a in aspects:
-            name = None
-            def_id = None
-            season = None
-            if a.aspect_definition:
-                name = a.aspect_definition.name
-                def_id = a.aspect_definition.id
-                season = a.aspect_definition.season_id
-            elif a.custom_name:
-                name = a.custom_name
-            if name:
-                aspect_cache[a.id] = {"name": name, "definition_id": def_id, "season_id": season}
-            if def_id and season:
-                def_season_cache[def_id] = season
-
-    print(f"  Cached {len(aspect_cache)} owned aspects.")
-
-    print("Querying creation events...")
-    with get_session() as session:
-        events = (
-            session.query(EventModel)
-            .filter(
-                EventModel.event_type.in_([t[0] for t in ASPECT_CREATION_EVENTS]),
-            )
-            .all()
+        .where(
+            tuple_(EventModel.event_type, EventModel.outcome).in_(sorted(ASPECT_CREATION_EVENTS)),
+            EventModel.id > after_id,
+            EventModel.id <= end_id,
         )
-
-    # Filter to matching (event_type, outcome) pairs
-    events = [
-        e for e in events
-        if (e.event_type, e.outcome) in ASPECT_CREATION_EVENTS
-    ]
-    print(f"  Found {len(events)} creation events to process.")
-
-    # Aggregate counts: (chat_id, season_id, name) -> {count, definition_id}
-    counts: dict[tuple[str, int | None, str], dict] = defaultdict(
-        lambda: {"count": 0, "definition_id": None}
+        .order_by(EventModel.id)
+        .limit(limit)
     )
+    if chat_id is not None:
+        query = query.where(EventModel.chat_id == chat_id)
+    return query
+
+
+def _lookup_aspects(session, aspect_ids: set[int]) -> dict[int, tuple[str, int | None, int]]:
+    """aspect_id -> (name, definition_id, season_id) for the given owned aspects."""
+    if not aspect_ids:
+        return {}
+    rows = session.execute(
+        select(
+            OwnedAspectModel.id,
+            OwnedAspectModel.name,
+            OwnedAspectModel.season_id,
+            AspectDefinitionModel.id,
+            AspectDefinitionModel.name,
+            AspectDefinitionModel.season_id,
+        )
+        .outerjoin(
+            AspectDefinitionModel,
+            AspectDefinitionModel.id == OwnedAspectModel.aspect_definition_id,
+        )
+        .where(OwnedAspectModel.id.in_(aspect_ids))
+    ).all()
+    found = {}
+    for aspect_id, custom_name, season_id, def_id, def_name, def_season_id in rows:
+        name = def_name or custom_name
+        if name:
+            found[aspect_id] = (name, def_id, def_season_id or season_id)
+    return found
+
+
+def _lookup_definition_seasons(session, definition_ids: set[int]) -> dict[int, int]:
+    if not definition_ids:
+        return {}
+    rows = session.execute(
+        select(AspectDefinitionModel.id, AspectDefinitionModel.season_id).where(
+            AspectDefinitionModel.id.in_(definition_ids)
+        )
+    ).all()
+    return dict(rows)
+
+
+def _aggregate_chunk(session, rows, counts: Counts, def_seasons: dict[int, int]) -> int:
+    """Resolve one chunk of events into ``counts``. Returns the number skipped."""
+    fallback_ids = set()
+    new_def_ids = set()
+    for _, _, aspect_id, payload in rows:
+        payload = payload or {}
+        if not payload.get("aspect_name"):
+            if aspect_id:
+                fallback_ids.add(aspect_id)
+        elif payload.get("season_id") is None:
+            def_id = payload.get("aspect_definition_id")
+            if def_id and def_id not in def_seasons:
+                new_def_ids.add(def_id)
+
+    aspects = _lookup_aspects(session, fallback_ids)
+    # Bounded by the size of the definition catalog
+    def_seasons.update(_lookup_definition_seasons(session, new_def_ids))
+
     skipped = 0
-    for event in events:
-        name, definition_id = _resolve_aspect_name(event, aspect_cache)
+    for _, chat_id, aspect_id, payload in rows:
+        payload = payload or {}
+        name = payload.get("aspect_name")
+        definition_id = payload.get("aspect_definition_id")
+        aspect_season = None
+        if not name and aspect_id in aspects:
+            name, definition_id, aspect_season = aspects[aspect_id]
         if not name:
             skipped += 1
             continue
 
-        # Determine season_id: payload → definition cache → CURRENT_SEASON
-        season_id = (event.payload or {}).get("season_id")
+        # Determine season_id: payload → definition → owned aspect → CURRENT_SEASON
+        season_id = payload.get("season_id")
         if season_id is None and definition_id:
-            season_id = def_season_cache.get(definition_id)
+            season_id = def_seasons.get(definition_id)
         if season_id is None:
-            cached = aspect_cache.get(getattr(event, "aspect_id", None) or 0)
-            if cached:
-                season_id = cached.get("season_id")
+            season_id = aspect_season
         if season_id is None:
             season_id = CURRENT_SEASON
 
-        key = (str(event.chat_id), season_id, name)
-        entry = counts[key]
-        entry["count"] += 1
-        if definition_id and not entry["definition_id"]:
-            entry["definition_id"] = definition_id
-
-    print(f"  Aggregated {len(counts)} unique (chat, season, name) combos ({skipped} events skipped).")
-
-    if dry_run:
-        print("\n[DRY RUN] Would upsert the following counts:")
-        for (chat_id, season_id, name), data in sorted(counts.items()):
-            print(
-                f"  chat={chat_id} season={season_id} name={name!r} "
-                f"count={data['count']} def_id={data['definition_id']}"
+        entry = counts.setdefault((str(chat_id), season_id, name), [None, 0])
+        entry[1] += 1
+        if definition_id and not entry[0]:
+            entry[0] = definition_id
+    return skipped
+
+
+def _flush(
+    counts: Counts,
+    season_totals: dict[int, int],
+    checkpoint: str,
+    last_id: int,
+    end_id: int,
+    dry_run: bool,
+) -> int:
+    """Add ``counts`` to aspect_counts and advance the checkpoint atomically."""
+    written = len(counts)
+    for (_, season_id, _), (_, count) in counts.items():
+        season_totals[season_id] += count
+    if not dry_run:
+        with get_session(commit=True) as session:
+            aspect_count_repo.add_counts(
+                {key: (def_id, count) for key, (def_id, count) in counts.items()},
+                session=session,
             )
-        print(f"\nTotal: {len(counts)} rows.")
-        return
-
-    # Clear and rebuild
-    print("Clearing existing aspect_counts...")
-    with get_session(commit=True) as session:
-        session.query(AspectCountModel).delete()
-
-    print("Inserting new aspect counts...")
-    inserted = 0
-    with get_session(commit=True) as session:
-        for (chat_id, season_id, name), data in counts.items():
-            record = AspectCountModel(
-                chat_id=str(chat_id),
-                season_id=season_id,
-                name=name,
-                definition_id=data["definition_id"],
-                count=data["count"],
+            backfill_checkpoint_repo.save_checkpoint(
+                checkpoint, last_event_id=last_id, end_event_id=end_id, session=session
             )
-            session.add(record)
-            inserted += 1
-
-    print(f"Successfully inserted {inserted} aspect count records.")
-
-    # Summary
+    counts.clear()
+    return written
+
+
+def backfill_aspect_counts(
+    dry_run: bool = False,
+    chat_id: str | None = None,
+    resume: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_keys: int = DEFAULT_MAX_KEYS,
+) -> int:
+    """Rebuild aspect_counts from the events table. Returns an exit code."""
+    checkpoint = _checkpoint_name(chat_id)
+    scope = f"chat {chat_id}" if chat_id else "all chats"
+
+    if resume:
+        saved = backfill_checkpoint_repo.get_checkpoint(checkpoint)
+        if saved is None:
+            print(f"No interrupted rebuild to resume for {scope}.")
+            return 1
+        last_id, end_id = saved.last_event_id, saved.end_event_id
+        print(f"Resuming rebuild for {scope} after event {last_id} (through {end_id}).")
+    else:
+        with get_session() as session:
+            end_id = session.execute(select(func.max(EventModel.id))).scalar() or 0
+        last_id = 0
+        if dry_run:
+            print(f"[DRY RUN] Scanning events for {scope} through {end_id}.")
+        else:
+            # Clearing and checkpointing together: a crash before the first
+            # flush resumes from an empty table instead of stale counts.
+            with get_session(commit=True) as session:
+                cleared = aspect_count_repo.clear_counts(chat_id, session=session)
+                backfill_checkpoint_repo.save_checkpoint(
+                    checkpoint, last_event_id=0, end_event_id=end_id, session=session
+                )
+            print(f"Cleared {cleared} aspect_counts rows for {scope}; rebuilding through event {end_id}.")
+
+    counts: Counts = {}
+    def_seasons: dict[int, int] = {}
+    season_totals: dict[int, int] = defaultdict(int)
+    processed = skipped = written = 0
+    started = time.monotonic()
+
+    while last_id < end_id:
+        batch_rows = 0
+        with get_session() as session:
+            result = session.execute(
+                _event_query(last_id, end_id, chat_id, batch_size),
+                execution_options={"yield_per": chunk_size},
+            )
+            for rows in result.partitions():
+                batch_rows += len(rows)
+                skipped += _aggregate_chunk(session, rows, counts, def_seasons)
+                processed += len(rows)
+                chunk_last_id = rows[-1][0]
+                if len(counts) >= max_keys:
+                    written += _flush(
+                        counts, season_totals, checkpoint, chunk_last_id, end_id, dry_run
+                    )
+                last_id = chunk_last_id
+
+        if batch_rows < batch_size:
+            # Short batch: nothing left before end_id
+            last_id = end_id
+        written += _flush(counts, season_totals, checkpoint, last_id, end_id, dry_run)
+        rate = processed / max(time.monotonic() - started, 1e-6)
+        print(f"  ... through event {last_id}/{end_id}: {processed} events, {rate:.0f}/s")
+
+    if not dry_run:
+        backfill_checkpoint_repo.delete_checkpoint(checkpoint)
+
+    verb = "Would add" if dry_run else "Added"
+    print(
+        f"{verb} {written} count increments from {processed} events ({skipped} events skipped)."
+    )
     print("\nSummary by season:")
-    season_totals: dict[int | None, int] = defaultdict(int)
-    for (_, season_id, _), data in counts.items():
-        season_totals[season_id] += data["count"]
-    for sid, total in sorted(season_totals.items(), key=lambda x: (x[0] is None, x[0])):
+    for sid, total in sorted(season_totals.items()):
         print(f"  Season {sid}: {total} total aspect creations")
+    return 0
 
 
-def main() -> None:
+def main() -> int:
     parser = argparse.ArgumentParser(
         description="Backfill aspect_counts table from the events table."
     )
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Show what would be inserted without making changes.",
+        help="Scan and aggregate without making changes.",
+    )
+    parser.add_argument("--chat", help="Only rebuild counts for this chat id.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted rebuild from its checkpoint.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Events per read transaction (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Events fetched and resolved at a time (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--max-keys",
+        type=int,
+        default=DEFAULT_MAX_KEYS,
+        help="Aggregated keys held in memory before writing (default: %(default)s).",
     )
     args = parser.parse_args()
-    backfill_aspect_counts(dry_run=args.dry_run)
 
+    logging.basicConfig(level=logging.WARNING)
+    database.initialize_database(pool_size=2)
+    return backfill_aspect_counts(
+        dry_run=args.dry_run,
+        chat_id=args.chat,
+        resume=args.resume,
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+        max_keys=args.max_keys,
+    )
 
-if __name__ == "__main__":
-    main()
 
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Benchmark for bulk aspect definition imports (``POST /admin/aspects/bulk``).
+
+Compares the previous row-by-row upsert (one SELECT per definition, then
+an ORM insert or update) with ``aspect_repo.bulk_upsert_aspect_definitions``
+(chunked ``INSERT ... ON CONFLICT DO UPDATE``). Each size is imported twice:
+once into an empty throwaway set (all inserts) and once more with changed
+rarities (all updates). A mixed batch (new definitions interleaved with
+existing ones) then checks that every returned id and inserted/updated
+status belongs to its own definition. Everything runs in a transaction that
+is rolled back, so the database is left untouched.
+
+Round-trips dominate the row-by-row version, so the gap grows with network
+latency (e.g. through the Cloud SQL proxy) beyond what a local database shows.
+
+Usage:
+    python bot/tools/bench_aspect_bulk_upsert.py [--sizes 1000 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import logging
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ensure project root is on sys.path for module imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent  # tools -> bot
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+load_dotenv(dotenv_path=PROJECT_ROOT / ".env", override=False)
+
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from repos import aspect_repo  # noqa: E402
+from utils import database  # noqa: E402
+from utils.models import AspectDefinitionModel, SetModel  # noqa: E402
+from utils.session import get_session  # noqa: E402
+
+# Throwaway set/season that only exists inside the rolled-back transaction
+BENCH_SET_ID = 990_001
+BENCH_SEASON_ID = 990_001
+
+RARITIES = ("Common", "Rare", "Epic", "Legendary")
+
+
+def _row_by_row_upsert(definitions: list[dict], season_id: int, session: Session) -> int:
+    """The previous implementation: a lookup per definition."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    count = 0
+    for def_dict in definitions:
+        existing = (
+            session.query(AspectDefinitionModel)
+            .filter(
+                AspectDefinitionModel.name == def_dict["name"],
+                AspectDefinitionModel.set_id == def_dict["set_id"],
+                AspectDefinitionModel.season_id == season_id,
+            )
+            .first()
+        )
+        if existing:
+            existing.rarity = def_dict["rarity"]
+        else:
+            session.add(
+                AspectDefinitionModel(
+                    set_id=def_dict["set_id"],
+                    season_id=season_id,
+                    name=def_dict["name"],
+                    rarity=def_dict["rarity"],
+                    created_at=now,
+                )
+            )
+        count += 1
+    session.flush()
+    return count
+
+
+def _set_based_upsert(definitions: list[dict], season_id: int, session: Session) -> int:
+    return len(
+        aspect_repo.bulk_upsert_aspect_definitions(definitions, season_id, session=session)
+    )
+
+
+def _definitions(size: int, set_id: int, shift: int) -> list[dict]:
+    return [
+        {"set_id": set_id, "name": f"Bench Aspect {i}", "rarity": RARITIES[(i + shift) % 4]}
+        for i in range(size)
+    ]
+
+
+def _bench(upsert, size: int, set_id: int) -> tuple[float, float]:
+    """(insert seconds, update seconds) for ``size`` definitions, rolled back."""
+    with get_session() as session:
+        try:
+            session.add(SetModel(id=set_id, season_id=BENCH_SEASON_ID, name="Bench"))
+            session.flush()
+
+            start = time.perf_counter()
+            upsert(_definitions(size, set_id, 0), BENCH_SEASON_ID, session)
+            insert_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            upsert(_definitions(size, set_id, 1), BENCH_SEASON_ID, session)
+            update_seconds = time.perf_counter() - start
+
+            stored = session.execute(
+                select(func.count()).where(AspectDefinitionModel.set_id == set_id)
+            ).scalar_one()
+            if stored != size:
+                raise RuntimeError(f"Expected {size} definitions, found {stored}")
+            return insert_seconds, update_seconds
+        finally:
+            session.rollback()
+
+
+def _check_mixed(size: int, set_id: int) -> float:
+    """Upsert a batch interleaving new and existing definitions and verify
+    each result against the stored rows. Returns seconds for the mixed batch."""
+    with get_session() as session:
+        try:
+            session.add(SetModel(id=set_id, season_id=BENCH_SEASON_ID, name="Bench"))
+            session.flush()
+
+            # Every other definition exists before the mixed batch
+            existing = _definitions(size, set_id, 0)[1::2]
+            before = {
+                r.name: r.id
+                for r in aspect_repo.bulk_upsert_aspect_definitions(
+                    existing, BENCH_SEASON_ID, session=session
+                )
+            }
+
+            batch = _definitions(size, set_id, 1)
+            start = time.perf_counter()
+            results = aspect_repo.bulk_upsert_aspect_definitions(
+                batch, BENCH_SEASON_ID, session=session
+            )
+            seconds = time.perf_counter() - start
+
+            stored = dict(
+                session.execute(
+                    select(AspectDefinitionModel.name, AspectDefinitionModel.id).where(
+                        AspectDefinitionModel.set_id == set_id
+                    )
+                ).all()
+            )
+            if [r.name for r in results] != [d["name"] for d in batch]:
+                raise RuntimeError("Mixed batch results are not in input order")
+            for r in results:
+                if r.id != stored[r.name]:
+                    raise RuntimeError(f"{r.name!r} returned id {r.id}, stored {stored[r.name]}")
+                if r.inserted == (r.name in before):
+                    raise RuntimeError(f"{r.name!r} reported inserted={r.inserted}")
+                if r.name in before and r.id != before[r.name]:
+                    raise RuntimeError(f"{r.name!r} changed id on update")
+            return seconds
+        finally:
+            session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    database.initialize_database(pool_size=1)
+
+    print(f"{'rows':>7} {'method':<12} {'insert':>10} {'update':>10} {'mixed':>10}")
+    for size in args.sizes:
+        for label, upsert in (("row-by-row", _row_by_row_upsert), ("set-based", _set_based_upsert)):
+            insert_seconds, update_seconds = _bench(upsert, size, BENCH_SET_ID)
+            mixed = ""
+            if upsert is _set_based_upsert:
+                mixed = f"{_check_mixed(size, BENCH_SET_ID) * 1000:>8.0f}ms"
+            print(
+                f"{size:>7} {label:<12} {insert_seconds * 1000:>8.0f}ms "
+                f"{update_seconds * 1000:>8.0f}ms {mixed:>10}"
+            )
+    print("mixed batches: ids and inserted/updated statuses verified")
+
+
+if __name__ == "__main__":
+    main()
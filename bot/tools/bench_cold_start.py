@@ -0,0 +1,214 @@
+"""Cold-start benchmark for the bot, API and tool entry points.
+
+Every measurement runs in a fresh interpreter, the way a deploy, a gunicorn
+worker recycled by ``--max-requests`` or a one-off tool starts:
+
+- ``api``: ``import api.server`` (config, database check, all routers);
+- ``bot``: ``import bot`` plus building the application and registering
+  handlers (everything before polling starts);
+- ``tool``: ``from utils import database`` plus ``initialize_database()``,
+  the minimum every script under ``tools/`` pays;
+- ``api-first-request`` (``--first-request``): from spawning uvicorn to the
+  first HTTP response, including the startup hooks.
+
+For the import targets the slowest modules are listed from one extra
+``python -X importtime`` run (cumulative), which is where to look when a new
+top-level import makes startup slower. Heavy dependencies that are only
+needed on first use (google-genai, PIL, python-telegram-bot in the API)
+should not show up here; see ``utils/lazy.py``.
+
+CI-style tracking: ``--budget api=1500`` fails (exit code 1) when a
+median exceeds its budget, and ``--json results.jsonl`` appends one line
+per run so cold start can be compared over time.
+
+Usage:
+    python bot/tools/bench_cold_start.py [--runs 5] [--first-request]
+        [--top 15] [--budget api=1500 --budget bot=2500] [--json out.jsonl]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent  # tools -> bot
+
+_IMPORT_TARGETS = {
+    "api": "import api.server\n",
+    "bot": (
+        "import bot\n"
+        "from core import create_application, register_handlers\n"
+        "register_handlers(create_application())\n"
+    ),
+    "tool": (
+        "from utils import database\n"
+        "database.initialize_database()\n"
+    ),
+}
+
+# Seconds to wait for uvicorn to answer before giving up
+_FIRST_REQUEST_TIMEOUT = 60.0
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    # The application is built but never connects; any syntactically valid token works
+    env.setdefault("TELEGRAM_AUTH_TOKEN", "123456:bench-token")
+    return env
+
+
+def _run_import_target(code: str, importtime: bool = False) -> Tuple[float, str]:
+    """Run ``code`` in a fresh interpreter; returns (seconds, stderr).
+
+    With ``importtime`` stderr carries the ``-X importtime`` report (which
+    itself slows the run down, so timed runs leave it off).
+    """
+    flags = ["-X", "importtime"] if importtime else []
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=PROJECT_ROOT,
+        env=_child_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"Benchmark target failed:\n{tail}")
+    return elapsed, result.stderr
+
+
+def _slowest_imports(report: str, top: int) -> List[Tuple[int, str]]:
+    """``(cumulative_us, module)`` for the slowest top-level-ish imports."""
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        rows.append((int(cumulative), name.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _time_first_request() -> float:
+    """Seconds from spawning uvicorn until the API answers an HTTP request."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/__cold_start_probe"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.server:app", "--port", str(port)],
+        cwd=PROJECT_ROOT,
+        env=_child_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < _FIRST_REQUEST_TIMEOUT:
+            if proc.poll() is not None:
+                raise RuntimeError("uvicorn exited before serving a request")
+            try:
+                urllib.request.urlopen(url, timeout=1)
+            except urllib.error.HTTPError:
+                pass  # Any HTTP status (404 here) means the app is serving
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.01)
+                continue
+            return time.perf_counter() - start
+        raise RuntimeError("API did not answer within the timeout")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def _parse_budgets(values: List[str]) -> Dict[str, float]:
+    budgets = {}
+    for value in values:
+        name, sep, ms = value.partition("=")
+        if not sep:
+            raise SystemExit(f"Invalid --budget {value!r}; expected target=milliseconds")
+        budgets[name] = float(ms)
+    return budgets
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--targets", nargs="+", choices=sorted(_IMPORT_TARGETS),
+        default=sorted(_IMPORT_TARGETS),
+    )
+    parser.add_argument(
+        "--first-request", action="store_true",
+        help="Also time uvicorn start to first API response",
+    )
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument(
+        "--budget", action="append", default=[], metavar="TARGET=MS",
+        help="Fail if the target's median exceeds MS milliseconds",
+    )
+    parser.add_argument("--json", type=Path, help="Append results as one JSON line")
+    args = parser.parse_args()
+
+    budgets = _parse_budgets(args.budget)
+    medians: Dict[str, float] = {}
+
+    for target in args.targets:
+        code = _IMPORT_TARGETS[target]
+        _, report = _run_import_target(code, importtime=True)  # also warms the bytecode cache
+        timings = [_run_import_target(code)[0] for _ in range(args.runs)]
+        medians[target] = statistics.median(timings) * 1000
+        print(f"\n{target}: median {medians[target]:.0f} ms "
+              f"(min {min(timings) * 1000:.0f}, max {max(timings) * 1000:.0f})")
+        for cumulative_us, name in _slowest_imports(report, args.top):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name.strip()}")
+
+    if args.first_request:
+        _time_first_request()  # warm the bytecode cache
+        timings = [_time_first_request() for _ in range(args.runs)]
+        medians["api-first-request"] = statistics.median(timings) * 1000
+        print(f"\napi-first-request: median {medians['api-first-request']:.0f} ms")
+
+    if args.json:
+        with args.json.open("a") as fh:
+            fh.write(json.dumps({
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "runs": args.runs,
+                "median_ms": {k: round(v, 1) for k, v in medians.items()},
+            }) + "\n")
+
+    failed = [
+        f"{name}: {medians[name]:.0f} ms > {limit:.0f} ms"
+        for name, limit in budgets.items()
+        if name in medians and medians[name] > limit
+    ]
+    if failed:
+        print("\nOver budget:\n  " + "\n  ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Request-latency benchmark: inline image work vs the image worker pool.
+
+Background threads generate thumbnails (``ImageUtil.compress_to_fraction``
+on a card-sized JPEG, or ``--op``) back to back, like concurrent card adds
+and thumbnail fetches, while the main thread times a small pure-Python
+"request" (serialize and parse a card list) every few milliseconds,
+measured from when it is due to when it finishes. Runs
+three phases:
+
+- ``idle``: no image work, the latency floor
+- ``inline``: thumbnails run on the background threads (today's behaviour)
+- ``pool``: the same threads dispatch to ``utils.image_workers``
+
+and reports request latency percentiles and thumbnail throughput for each.
+No database is needed.
+
+Usage:
+    python bot/tools/bench_image_workers.py [--threads 4] [--workers 2] [--duration 5]
+    python bot/tools/bench_image_workers.py --op crop_to_content
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path for module imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent  # tools -> bot
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from utils import image_workers  # noqa: E402
+from utils.image import ImageUtil  # noqa: E402
+
+# Card image size as generated (5:7)
+CARD_SIZE = (1024, 1434)
+# Pause between probe requests (seconds)
+PROBE_INTERVAL = 0.005
+
+_CARDS = [
+    {"id": i, "base_name": f"Card {i}", "modifier": "Shiny", "rarity": "Epic", "owner": "bench"}
+    for i in range(300)
+]
+
+
+def _card_image() -> bytes:
+    """A card-sized JPEG with enough detail to make resizing/encoding realistic."""
+    image = Image.effect_noise(CARD_SIZE, 24).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for i in range(0, CARD_SIZE[0], 32):
+        draw.line([(i, 0), (CARD_SIZE[0] - i, CARD_SIZE[1])], fill=(i % 255, 80, 160), width=6)
+    # A blank border so crop_to_content has work to do
+    framed = Image.new("RGB", (CARD_SIZE[0] + 80, CARD_SIZE[1] + 80), (255, 255, 255))
+    framed.paste(image, (40, 40))
+    buffer = io.BytesIO()
+    framed.save(buffer, "JPEG", quality=95)
+    return buffer.getvalue()
+
+
+def _request() -> None:
+    """Stand-in for a request handler's own Python work."""
+    json.loads(json.dumps(_CARDS))
+
+
+def _phase(mode: str, op: str, image: bytes, threads: int, duration: float) -> dict:
+    stop = threading.Event()
+    done = [0]
+    done_lock = threading.Lock()
+
+    def generate() -> None:
+        while not stop.is_set():
+            if mode == "pool":
+                image_workers.run(op, image)
+            else:
+                getattr(ImageUtil, op)(image)
+            with done_lock:
+                done[0] += 1
+
+    loaders = [threading.Thread(target=generate, daemon=True) for _ in range(threads)]
+    for loader in loaders:
+        loader.start()
+
+    # Latency counts from when the request is due, so time spent waiting for
+    # the GIL after the sleep is included, as it is for a real request
+    latencies = []
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        due = time.perf_counter() + PROBE_INTERVAL
+        time.sleep(PROBE_INTERVAL)
+        _request()
+        latencies.append((time.perf_counter() - due) * 1000)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    for loader in loaders:
+        loader.join()
+
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+        "max": max(latencies),
+        "images_per_s": done[0] / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent thumbnail threads")
+    parser.add_argument("--workers", type=int, default=2, help="Image worker processes")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase")
+    parser.add_argument(
+        "--op",
+        choices=sorted(image_workers.OPERATIONS - {"crop_to_aspect_ratio", "resize_to_dimensions"}),
+        default="compress_to_fraction",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)  # ImageUtil logs every operation
+    image = _card_image()
+    getattr(ImageUtil, args.op)(image)  # Import PIL plugins before timing
+
+    results = [_phase("idle", args.op, image, 0, args.duration)]
+    results.append(_phase("inline", args.op, image, args.threads, args.duration))
+    image_workers.start(args.workers)
+    try:
+        image_workers.run(args.op, image)  # Spawn the workers before timing
+        results.append(_phase("pool", args.op, image, args.threads, args.duration))
+    finally:
+        image_workers.shutdown()
+
+    print(
+        f"op={args.op} image={len(image) // 1024} KiB threads={args.threads} "
+        f"workers={args.workers} duration={args.duration:g}s"
+    )
+    print(f"{'mode':<8} {'requests':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'img/s':>7}")
+    for r in results:
+        print(
+            f"{r['mode']:<8} {r['requests']:>8} {r['p50']:>8.2f} {r['p95']:>8.2f} "
+            f"{r['p99']:>8.2f} {r['max']:>8.2f} {r['images_per_s']:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Micro-benchmark for Telegram mini app init data validation.
+
+Compares a full validation (parse, HMAC check, JSON decode) against a
+repeat validation of the same init data served from the cache in
+``api.dependencies``.
+
+Usage:
+    python bot/tools/bench_init_data.py [--iterations 20000] [--sessions 100]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+import urllib.parse
+from pathlib import Path
+
+# Ensure project root is on sys.path for module imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent  # tools -> bot
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Init data is signed with a throwaway token unless a real one is configured
+os.environ.setdefault("TELEGRAM_AUTH_TOKEN", "123456:bench-token")
+
+from api import dependencies  # noqa: E402
+from api.config import TELEGRAM_TOKEN  # noqa: E402
+
+
+def _signed_init_data(user_id: int) -> str:
+    """Build init data for ``user_id`` signed like the Telegram client does."""
+    fields = {
+        "auth_date": str(int(time.time())),
+        "query_id": f"AAE{user_id}",
+        "user": json.dumps(
+            {"id": user_id, "first_name": "Bench", "username": f"bench{user_id}"},
+            separators=(",", ":"),
+        ),
+    }
+    data_check_string = "\n".join(f"{k}={v}" for k, v in sorted(fields.items()))
+    secret_key = hmac.new(b"WebAppData", TELEGRAM_TOKEN.encode(), hashlib.sha256).digest()
+    fields["hash"] = hmac.new(
+        secret_key, data_check_string.encode(), hashlib.sha256
+    ).hexdigest()
+    return urllib.parse.urlencode(fields)
+
+
+def _time_per_call(fn, samples, iterations: int) -> float:
+    """Average microseconds per call of ``fn`` cycling through ``samples``."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        if fn(samples[i % len(samples)]) is None:
+            raise RuntimeError("Benchmark init data failed validation")
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument(
+        "--sessions", type=int, default=100,
+        help="Distinct init data strings (concurrent mini app sessions)",
+    )
+    args = parser.parse_args()
+
+    samples = [_signed_init_data(100000 + i) for i in range(args.sessions)]
+
+    uncached = _time_per_call(dependencies._verify_init_data, samples, args.iterations)
+    dependencies._init_data_cache.clear()
+    cached = _time_per_call(
+        dependencies.validate_telegram_init_data, samples, args.iterations
+    )
+
+    print(f"sessions={args.sessions} iterations={args.iterations}")
+    print(f"full validation:   {uncached:8.2f} us/call")
+    print(f"cached validation: {cached:8.2f} us/call")
+    print(f"speedup:           {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
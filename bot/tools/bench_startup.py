@@ -0,0 +1,74 @@
+"""Startup benchmark for database initialization.
+
+Times, in fresh interpreter processes, the database part of a cold start:
+
+- ``migrate``: the previous behaviour, where importing ``utils.database``
+  loaded the Alembic config, inspected the schema and ran ``upgrade head``
+  (a no-op on a current database);
+- ``verify``: the current ``initialize_database``, a single
+  ``SELECT version_num`` compared with the newest migration file.
+
+Run against a migrated database (``python tools/migrate.py`` first).
+
+Usage:
+    python bot/tools/bench_startup.py [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent  # tools -> bot
+
+_SCENARIOS = {
+    "migrate": (
+        "from utils import database\n"
+        "database.initialize_database(schema_check='off')\n"
+        "database.run_migrations()\n"
+    ),
+    "verify": (
+        "from utils import database\n"
+        "database.initialize_database(schema_check='strict')\n"
+    ),
+}
+
+
+def _time_run(code: str) -> float:
+    """Wall-clock seconds for one interpreter running ``code``."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # Baseline interpreter cost, so the numbers below are attributable to the DB step
+    baseline = statistics.median(_time_run("pass") for _ in range(args.runs))
+    print(f"runs={args.runs} (median, interpreter baseline {baseline * 1000:.0f} ms)")
+
+    results = {}
+    for name, code in _SCENARIOS.items():
+        _time_run(code)  # warm the bytecode cache
+        results[name] = statistics.median(_time_run(code) for _ in range(args.runs))
+        print(f"{name:8s} {results[name] * 1000:8.0f} ms")
+
+    print(f"speedup  {results['migrate'] / results['verify']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
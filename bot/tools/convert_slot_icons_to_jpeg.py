@@ -28,7 +28,7 @@ import io  # noqa: E402
 
 from utils.image import ImageUtil  # noqa: E402
 from utils.session import get_session  # noqa: E402
-from utils.models import UserModel, CharacterModel  # noqa: E402
+from utils.models import ICON_VERSION_SEQ, UserModel, CharacterModel  # noqa: E402
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
@@ -62,6 +62,7 @@ def main() -> None:
                 continue
             original_size = len(u.slot_icon)
             u.slot_icon = ImageUtil.to_jpeg(u.slot_icon)
+            u.slot_icon_version = ICON_VERSION_SEQ.next_value()
             logger.info(
                 "  [convert] user %s — %s → JPEG (%d → %d bytes)",
                 u.user_id, fmt, original_size, len(u.slot_icon),
@@ -82,6 +83,7 @@ def main() -> None:
                 continue
             original_size = len(c.slot_icon)
             c.slot_icon = ImageUtil.to_jpeg(c.slot_icon)
+            c.slot_icon_version = ICON_VERSION_SEQ.next_value()
             logger.info(
                 "  [convert] char %s (%s) — %s → JPEG (%d → %d bytes)",
                 c.id, c.name, fmt, original_size, len(c.slot_icon),
@@ -0,0 +1,98 @@
+"""Manage the monthly partitions of the events table.
+
+``events`` is range-partitioned by month (see ``repos/event_partition_repo.py``).
+Run ``ensure`` from cron (daily is plenty) so upcoming months have a
+partition before their first event; rows that still land in
+``events_default`` are moved into their month's partition by the next run.
+``tools/migrate.py`` also runs it after every migration.
+
+``retain`` detaches months older than the retention window
+(``EVENT_RETENTION_MONTHS``, current month included). A detached month is an
+ordinary table that can be archived (``pg_dump -t events_2025_01``) before
+``retain --drop`` removes it. Hourly/daily rollups are never touched, so
+aggregate counts survive retention.
+
+Usage:
+    python tools/event_partitions.py list
+    python tools/event_partitions.py ensure [--months-ahead 2]
+    python tools/event_partitions.py retain [--keep-months 12] [--drop] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ensure project root is on sys.path for module imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent  # tools -> bot
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+load_dotenv(dotenv_path=PROJECT_ROOT / ".env", override=False)
+
+from repos import event_partition_repo  # noqa: E402
+from settings.constants import (  # noqa: E402
+    EVENT_PARTITION_MONTHS_AHEAD,
+    EVENT_RETENTION_MONTHS,
+)
+from utils import database  # noqa: E402
+
+
+def _list(_args: argparse.Namespace) -> int:
+    print(f"{'partition':<16} {'from':<12} {'to':<12} {'state':<9} {'~rows':>10}")
+    for p in event_partition_repo.list_partitions():
+        start = p.start.date().isoformat() if p.start else "-"
+        end = p.end.date().isoformat() if p.end else "-"
+        state = "attached" if p.attached else "detached"
+        print(f"{p.name:<16} {start:<12} {end:<12} {state:<9} {p.estimated_rows:>10}")
+    return 0
+
+
+def _ensure(args: argparse.Namespace) -> int:
+    created = event_partition_repo.ensure_partitions(args.months_ahead)
+    print(f"Created {len(created)} partition(s): {', '.join(created) or '-'}")
+    return 0
+
+
+def _retain(args: argparse.Namespace) -> int:
+    cutoff = event_partition_repo.retention_cutoff(args.keep_months)
+    expired = event_partition_repo.retain(cutoff, drop=args.drop, dry_run=args.dry_run)
+    if args.dry_run:
+        label = "Would drop" if args.drop else "Would detach"
+    else:
+        label = "Dropped" if args.drop else "Detached"
+    print(f"Keeping months from {cutoff.date().isoformat()}")
+    print(f"{label}: {', '.join(p.name for p in expired) or '-'}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="Show partitions, including detached ones")
+
+    ensure = commands.add_parser("ensure", help="Create upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=EVENT_PARTITION_MONTHS_AHEAD)
+
+    retain = commands.add_parser("retain", help="Detach (or drop) months past retention")
+    retain.add_argument("--keep-months", type=int, default=EVENT_RETENTION_MONTHS)
+    retain.add_argument("--drop", action="store_true", help="Drop instead of only detaching")
+    retain.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    database.initialize_database(pool_size=1)
+
+    handler = {"list": _list, "ensure": _ensure, "retain": _retain}[args.command]
+    return handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,46 @@
 """Export all card images for a specific season as PNGs with rounded corners.
 
 Usage:
-    python tools/export_season_images.py <season_id> [--count N]
+    python tools/export_season_images.py <season_id> [--count N] [--workers N]
 
 Example:
     python tools/export_season_images.py 0
-    python tools/export_season_images.py 1 --count 50
+    python tools/export_season_images.py 1 --count 50 --workers 4
 
 This will:
-1. Query cards for the given season from the most common chat_id
-2. Process each card image to:
+1. Stream cards (with their image bytes) for the given season from the most
+   common chat_id through a server-side cursor, ``--chunk-size`` rows at a time
+2. Process each card image in a pool of worker processes to:
    - Resize to 5:7 aspect ratio (1024x1434)
    - Apply rounded corners matching the miniapp border-radius
-3. Save each image as PNG to data/output/
-4. Create a zip archive: season_{season_id}_images.zip
+3. Write each PNG straight into data/output/season_{season_id}_images.zip
+   as it finishes (no intermediate PNG directory)
+
+At most ``--workers * 2`` images are in flight and one cursor chunk is
+buffered, so memory stays flat however large the season is.
 
 Options:
-    --count N    Limit export to N cards (optional, exports all by default)
+    --count N       Limit export to N cards (optional, exports all by default)
+    --workers N     Image worker processes (default: CPU count)
+    --chunk-size N  Rows fetched per cursor round-trip (default: 16)
 """
 
 from __future__ import annotations
 
 import argparse
-import base64
 import io
 import logging
+import multiprocessing
 import os
-import shutil
 import sys
+import time
 import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
 
 from PIL import Image, ImageDraw
-from sqlalchemy import func
+from sqlalchemy import func, select
 
 # Ensure project root is on sys.path for module imports
 CURRENT_DIR = Path(__file__).resolve().parent
@@ -63,6 +71,9 @@ OUTPUT_HEIGHT = int(OUTPUT_WIDTH * (7 / 5))  # 1434
 DISPLAY_WIDTH_APPROX = 350
 BORDER_RADIUS = int(25 * (OUTPUT_WIDTH / DISPLAY_WIDTH_APPROX))
 
+DEFAULT_CHUNK_SIZE = 16
+PROGRESS_EVERY = 25
+
 
 def get_most_common_chat_id() -> str:
     """Get the most common chat_id from the cards table."""
@@ -81,9 +92,13 @@ def get_most_common_chat_id() -> str:
         return result[0]
 
 
+@lru_cache(maxsize=1)
 def create_rounded_mask(size: tuple[int, int], radius: int) -> Image.Image:
     """Create a rounded rectangle mask for the given size.
 
+    Cached: every image in an export shares the same mask, so each worker
+    draws it once.
+
     Args:
         size: Tuple of (width, height) for the mask
         radius: Corner radius in pixels
@@ -101,17 +116,15 @@ def create_rounded_mask(size: tuple[int, int], radius: int) -> Image.Image:
     return mask
 
 
-def process_image(image_b64: str) -> Image.Image:
-    """Process a base64 encoded image to the target format.
+def process_image(image_data: bytes) -> Image.Image:
+    """Process raw image bytes to the target format.
 
     Args:
-        image_b64: Base64 encoded image string
+        image_data: Encoded image bytes as stored in ``card_images.image``
 
     Returns:
         Processed PIL Image with rounded corners
     """
-    # Decode base64 to image
-    image_data = base64.b64decode(image_b64)
     image = Image.open(io.BytesIO(image_data))
 
     # Convert to RGBA if not already (for transparency support)
@@ -148,125 +161,124 @@ def process_image(image_b64: str) -> Image.Image:
     return output
 
 
-def export_season_images(season_id: int, count: int | None = None) -> None:
+def render_png(image_data: bytes) -> bytes:
+    """Worker entry point: process one card image and return it PNG-encoded."""
+    buffer = io.BytesIO()
+    process_image(image_data).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _sanitize(value: str) -> str:
+    return "".join(c if c.isalnum() or c in " -_" else "_" for c in value)
+
+
+def _card_filename(card_id: int, rarity: str, owner: str | None, modifier: str, base_name: str) -> str:
+    # <rarity>_<owner_username>_<card_id>_<modifier>_<name>.png
+    return (
+        f"{_sanitize(rarity)}_{_sanitize(owner or 'unowned')}_{card_id}_"
+        f"{_sanitize(modifier)}_{_sanitize(base_name)}.png"
+    )
+
+
+def export_season_images(
+    season_id: int,
+    count: int | None = None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
     """Export all card images for a specific season.
 
     Args:
         season_id: The season ID to export cards for
         count: Maximum number of cards to export (None for all)
+        workers: Image worker processes (None for the CPU count)
+        chunk_size: Rows fetched per server-side cursor round-trip
     """
+    workers = workers or os.cpu_count() or 1
     output_dir = PROJECT_ROOT / "data" / "output"
     output_dir.mkdir(parents=True, exist_ok=True)
-
-    # Create temp directory for this export
-    export_dir = output_dir / f"season_{season_id}_images"
-    if export_dir.exists():
-        shutil.rmtree(export_dir)
-    export_dir.mkdir(parents=True, exist_ok=True)
+    zip_path = output_dir / f"season_{season_id}_images.zip"
+    partial_path = zip_path.with_name(zip_path.name + ".part")
 
     # Get the most common chat_id
     chat_id = get_most_common_chat_id()
     logger.info(f"Using most common chat_id: {chat_id}")
 
-    logger.info(f"Exporting cards for season {season_id} to {export_dir}")
-
-    with get_session() as session:
-        # Query cards for the given season from the most common chat_id
-        query = session.query(CardModel).filter(
-            CardModel.season_id == season_id, CardModel.chat_id == chat_id
+    query = (
+        select(
+            CardModel.id,
+            CardModel.rarity,
+            CardModel.owner,
+            CardModel.modifier,
+            CardModel.base_name,
+            CardImageModel.image,
         )
-
-        if count is not None:
-            query = query.limit(count)
-
-        cards = query.all()
-
-        if not cards:
-            logger.warning(f"No cards found for season {season_id}")
-            return
-
-        logger.info(f"Found {len(cards)} cards for season {season_id}")
-
-        # Get card IDs
-        card_ids = [card.id for card in cards]
-
-        # Query all card images at once
-        card_images = (
-            session.query(CardImageModel).filter(CardImageModel.card_id.in_(card_ids)).all()
-        )
-
-        # Create lookup dict — image column is now LargeBinary (bytes), encode to b64 for processing
-        image_lookup = {
-            img.card_id: base64.b64encode(img.image).decode("utf-8")
-            for img in card_images
-            if img.image
-        }
-
-        logger.info(f"Found {len(image_lookup)} cards with images")
-
-        exported = 0
-        skipped = 0
-
-        for card in cards:
-            image_b64 = image_lookup.get(card.id)
-
-            if not image_b64:
-                logger.warning(f"Card {card.id} ({card.base_name} - {card.modifier}) has no image")
+        .outerjoin(CardImageModel, CardImageModel.card_id == CardModel.id)
+        .where(CardModel.season_id == season_id, CardModel.chat_id == chat_id)
+        .order_by(CardModel.id)
+    )
+    if count is not None:
+        query = query.limit(count)
+
+    logger.info(f"Exporting cards for season {season_id} to {zip_path} with {workers} workers")
+
+    exported = 0
+    skipped = 0
+    seen = 0
+    started = time.monotonic()
+    max_in_flight = workers * 2
+    in_flight: dict[Future, tuple[int, str]] = {}
+
+    def drain(block_until: int) -> None:
+        # Write finished images until at most ``block_until`` remain in flight
+        nonlocal exported, skipped
+        while len(in_flight) > block_until:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                card_id, filename = in_flight.pop(future)
+                try:
+                    zipf.writestr(filename, future.result())
+                    exported += 1
+                except Exception as e:
+                    logger.error(f"Failed to process card {card_id}: {e}")
+                    skipped += 1
+                    continue
+                if exported % PROGRESS_EVERY == 0:
+                    rate = exported / max(time.monotonic() - started, 1e-6)
+                    logger.info(f"Exported {exported} cards ({seen} read, {rate:.1f}/s)...")
+
+    # Spawned workers never inherit the parent's open database connection
+    context = multiprocessing.get_context("spawn")
+    with (
+        ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool,
+        zipfile.ZipFile(partial_path, "w", zipfile.ZIP_STORED) as zipf,  # PNGs are already compressed
+        get_session() as session,
+    ):
+        result = session.execute(query, execution_options={"yield_per": chunk_size})
+        for card_id, rarity, owner, modifier, base_name, image in result:
+            seen += 1
+            if not image:
+                logger.warning(f"Card {card_id} ({base_name} - {modifier}) has no image")
                 skipped += 1
                 continue
+            filename = _card_filename(card_id, rarity, owner, modifier, base_name)
+            in_flight[pool.submit(render_png, image)] = (card_id, filename)
+            drain(max_in_flight - 1)
+        drain(0)
 
-            try:
-                # Process the image
-                processed = process_image(image_b64)
-
-                # Create filename: <rarity>_<owner_username>_<card_id>_<modifier>_<name>.png
-                # Sanitize filename components
-                safe_rarity = "".join(c if c.isalnum() or c in " -_" else "_" for c in card.rarity)
-                safe_owner = "".join(
-                    c if c.isalnum() or c in " -_" else "_" for c in (card.owner or "unowned")
-                )
-                safe_modifier = "".join(
-                    c if c.isalnum() or c in " -_" else "_" for c in card.modifier
-                )
-                safe_basename = "".join(
-                    c if c.isalnum() or c in " -_" else "_" for c in card.base_name
-                )
-
-                filename = (
-                    f"{safe_rarity}_{safe_owner}_{card.id}_{safe_modifier}_{safe_basename}.png"
-                )
-                filepath = export_dir / filename
-
-                # Save as PNG
-                processed.save(filepath, "PNG")
-                exported += 1
-
-                if exported % 10 == 0:
-                    logger.info(f"Exported {exported}/{len(cards)} cards...")
-
-            except Exception as e:
-                logger.error(f"Failed to process card {card.id}: {e}")
-                skipped += 1
+    if seen == 0:
+        partial_path.unlink()
+        logger.warning(f"No cards found for season {season_id}")
+        return
 
-    logger.info(f"Exported {exported} cards, skipped {skipped}")
-
-    # Create zip archive
-    zip_path = output_dir / f"season_{season_id}_images.zip"
-    logger.info(f"Creating zip archive: {zip_path}")
-
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for file in export_dir.iterdir():
-            if file.is_file() and file.suffix == ".png":
-                zipf.write(file, file.name)
+    partial_path.replace(zip_path)
+    elapsed = time.monotonic() - started
+    logger.info(f"Exported {exported} cards, skipped {skipped} in {elapsed:.1f}s")
 
     # Calculate zip size
     zip_size_mb = zip_path.stat().st_size / (1024 * 1024)
     logger.info(f"Zip archive created: {zip_path} ({zip_size_mb:.2f} MB)")
 
-    # Optionally clean up the temporary export directory
-    # Keeping it for now so users can inspect individual files
-    logger.info(f"Individual images saved in: {export_dir}")
-
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -279,10 +291,22 @@ def main() -> None:
         default=None,
         help="Maximum number of cards to export (optional, exports all by default)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Image worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Rows fetched per database round-trip (default: %(default)s)",
+    )
 
     args = parser.parse_args()
 
-    export_season_images(args.season_id, args.count)
+    export_season_images(args.season_id, args.count, args.workers, args.chunk_size)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+"""Apply database migrations (the explicit migration step of a deploy).
+
+The bot and API no longer migrate on startup; they only verify that the
+database is at the newest revision and refuse to start otherwise (see
+``DB_SCHEMA_CHECK``). Run this once before starting them — docker-compose
+does so through the one-shot ``migrate`` service. Each run also creates
+the upcoming monthly ``events`` partitions (``tools/event_partitions.py``).
+
+Usage:
+    python tools/migrate.py            # upgrade to head
+    python tools/migrate.py --check    # report revisions, exit 1 if behind
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ensure project root is on sys.path for module imports
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent  # tools -> bot
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+load_dotenv(dotenv_path=PROJECT_ROOT / ".env", override=False)
+
+from utils import database  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def _alembic_head() -> str:
+    """Head revision according to Alembic's migration graph."""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(database._get_alembic_config()).get_current_head()
+
+
+def check() -> bool:
+    """Print the current and expected revisions; True if the database is current."""
+    head = database.get_head_revision()
+    alembic_head = _alembic_head()
+    if head != alembic_head:
+        logger.error(
+            "Migration file names resolve to head %s but Alembic's graph ends at %s; "
+            "check the newest migration's file name and revision id",
+            head,
+            alembic_head,
+        )
+        return False
+
+    current = database.get_current_revision()
+    logger.info("Current revision: %s", current or "<none>")
+    logger.info("Head revision:    %s", head)
+    return current == head
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only compare the database revision with head; do not migrate",
+    )
+    args = parser.parse_args()
+
+    database.initialize_database(pool_size=1, schema_check="off")
+
+    if args.check:
+        return 0 if check() else 1
+
+    database.run_migrations()
+    database.verify_schema_revision("strict")
+    # Alembic's env.py reconfigures logging, so report the outcome directly
+    print(f"Database is at revision {database.get_current_revision()}")
+
+    from repos import event_partition_repo
+
+    created = event_partition_repo.ensure_partitions()
+    if created:
+        print(f"Created event partitions: {', '.join(created)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,7 +16,7 @@ from PIL import Image
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from utils.session import get_session
-from utils.models import UserModel, CharacterModel
+from utils.models import ICON_VERSION_SEQ, UserModel, CharacterModel
 
 TARGET_SIZE = 256
 
@@ -95,6 +95,7 @@ def resize_user_icons(dry_run: bool = False):
                 user = session.query(UserModel).filter(UserModel.user_id == user_id).first()
                 if user:
                     user.slot_icon = base64.b64decode(resized_b64)
+                    user.slot_icon_version = ICON_VERSION_SEQ.next_value()
             print(f"  ✓ Updated user {user_id}")
         else:
             print(f"  [DRY RUN] Would update user {user_id}")
@@ -138,6 +139,7 @@ def resize_character_icons(dry_run: bool = False):
                 char = session.query(CharacterModel).filter(CharacterModel.id == char_id).first()
                 if char:
                     char.slot_icon = base64.b64decode(resized_b64)
+                    char.slot_icon_version = ICON_VERSION_SEQ.next_value()
             print(f"  ✓ Updated character {char_id}")
         else:
             print(f"  [DRY RUN] Would update character {char_id}")
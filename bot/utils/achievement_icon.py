@@ -7,10 +7,12 @@ import logging
 from io import BytesIO
 from pathlib import Path
 
-from PIL import Image
-
 from config import GOOGLE_API_KEY, IMAGE_GEN_MODEL
 from utils.image import ImageUtil
+from utils.lazy import lazy_import
+
+# Imported on first use (see utils/lazy.py)
+Image = lazy_import("PIL.Image")
 
 logger = logging.getLogger(__name__)
 
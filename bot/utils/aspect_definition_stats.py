@@ -0,0 +1,131 @@
+"""Aspect definition stats event listener.
+
+Subscribes to the event manager and keeps ``aspect_definition_stats`` in
+step with the events that create, equip or destroy aspects:
+
+- aspect creation (``ASPECT_CREATION_EVENTS``): ``owned_count`` +1;
+- ``REROLL.SUCCESS``: also ``owned_count`` -1 for the replaced aspect;
+- ``EQUIP.SUCCESS``: ``equipped_count`` +1;
+- ``BURN.SUCCESS``: ``owned_count`` -1, ``burned_count`` +1;
+- ``RECYCLE.SUCCESS`` / ``CREATE.SUCCESS``: ``owned_count`` -1 and
+  ``recycled_count`` +1 per consumed aspect; aspects destroyed with
+  recycled cards count ``owned_count`` -1 and ``equipped_count`` -1.
+
+Destroyed aspects no longer exist when the listener runs, so their
+definitions must travel in the event payload
+(``aspect_definition_id``, ``old_aspect_definition_id``,
+``recycled_aspect_definition_ids``, ``destroyed_aspect_definition_ids``).
+
+Start-up entry point: ``init_aspect_definition_stats_listener()`` — safe
+to call more than once.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+from utils.aspect_counts import ASPECT_CREATION_EVENTS
+
+LOGGER = logging.getLogger(__name__)
+
+# Track initialisation to prevent double-subscription
+_stats_initialized = False
+_stats_init_lock = threading.Lock()
+
+
+def _resolve_definition_id(event) -> Optional[int]:
+    """Definition of ``event.aspect_id``, from the payload or a lookup."""
+    definition_id = (event.payload or {}).get("aspect_definition_id")
+    if definition_id or not getattr(event, "aspect_id", None):
+        return definition_id
+
+    try:
+        from repos import aspect_repo
+
+        aspect = aspect_repo.get_aspect_by_id(event.aspect_id)
+    except Exception as exc:
+        LOGGER.warning(
+            "Failed to look up aspect %s for definition stats: %s",
+            event.aspect_id,
+            exc,
+        )
+        return None
+    return aspect.aspect_definition_id if aspect else None
+
+
+def _event_deltas(event) -> Dict[int, Dict[str, int]]:
+    """Counter deltas per definition id for one event (empty if irrelevant)."""
+    key = (event.event_type, event.outcome)
+    payload = event.payload or {}
+    deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    if key == ("BURN", "SUCCESS"):
+        definition_id = _resolve_definition_id(event)
+        if definition_id:
+            deltas[definition_id]["owned_count"] -= 1
+            deltas[definition_id]["burned_count"] += 1
+        return deltas
+
+    if key == ("EQUIP", "SUCCESS"):
+        definition_id = _resolve_definition_id(event)
+        if definition_id:
+            deltas[definition_id]["equipped_count"] += 1
+        return deltas
+
+    if key in ASPECT_CREATION_EVENTS and getattr(event, "aspect_id", None):
+        definition_id = _resolve_definition_id(event)
+        if definition_id:
+            deltas[definition_id]["owned_count"] += 1
+
+    if key == ("REROLL", "SUCCESS") and payload.get("old_aspect_definition_id"):
+        deltas[payload["old_aspect_definition_id"]]["owned_count"] -= 1
+
+    if key in (("RECYCLE", "SUCCESS"), ("CREATE", "SUCCESS")):
+        for definition_id in payload.get("recycled_aspect_definition_ids") or []:
+            deltas[definition_id]["owned_count"] -= 1
+            deltas[definition_id]["recycled_count"] += 1
+        for definition_id in payload.get("destroyed_aspect_definition_ids") or []:
+            deltas[definition_id]["owned_count"] -= 1
+            deltas[definition_id]["equipped_count"] -= 1
+
+    return deltas
+
+
+def _on_event(event) -> None:
+    """Apply the event's counter deltas to ``aspect_definition_stats``."""
+    deltas = _event_deltas(event)
+    if not deltas:
+        return
+
+    from repos import aspect_definition_stats_repo
+
+    aspect_definition_stats_repo.apply_deltas(deltas)
+
+    LOGGER.debug(
+        "Applied aspect definition stats for event %s.%s: %s",
+        event.event_type,
+        event.outcome,
+        {definition_id: dict(counters) for definition_id, counters in deltas.items()},
+    )
+
+
+def init_aspect_definition_stats_listener() -> None:
+    """Subscribe the aspect definition stats listener to the event manager.
+
+    Safe to call multiple times — subsequent calls are no-ops.
+    """
+    global _stats_initialized
+
+    from managers import event_manager
+
+    with _stats_init_lock:
+        if _stats_initialized:
+            LOGGER.debug("Aspect definition stats listener already initialized")
+            return
+
+        event_manager.subscribe(_on_event)
+        _stats_initialized = True
+        LOGGER.info("Aspect definition stats listener initialized")
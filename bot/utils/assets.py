@@ -0,0 +1,144 @@
+"""Static asset registry for the images bundled under ``bot/data/``.
+
+Slot/minesweeper icons and card templates used to be read from disk (and
+base64-encoded) on every request or generation.  They never change while the
+process runs, so everything is loaded once at import into immutable
+``Asset`` records keyed by ``"<directory>/<file stem>"``, e.g.
+``"slots/claim_icon"``, ``"minesweeper/mine_icon"``, ``"card_templates/rare"``.
+
+Card templates are read from ``CARD_TEMPLATES_PATH`` (relative paths resolve
+against the ``bot/`` directory, as before).  Each asset carries a content
+fingerprint, so ``asset_url`` produces a URL that can be cached forever: a
+changed file gets a new URL on the next deploy.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from settings.constants import CARD_TEMPLATES_PATH
+
+logger = logging.getLogger(__name__)
+
+BOT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BOT_ROOT, "data")
+# Public path of the assets router: the miniapp reaches the API through the
+# /api/ proxy (nginx, Vite dev server), which strips the prefix. /assets/ itself
+# is the miniapp's own Vite build output.
+ASSET_URL_PREFIX = "/api/assets"
+
+# Registry namespace -> directory on disk
+_ASSET_DIRS = {
+    "slots": os.path.join(DATA_DIR, "slots"),
+    "minesweeper": os.path.join(DATA_DIR, "minesweeper"),
+    "card_templates": (
+        CARD_TEMPLATES_PATH
+        if os.path.isabs(CARD_TEMPLATES_PATH)
+        else os.path.join(BOT_ROOT, CARD_TEMPLATES_PATH)
+    ),
+}
+_ASSET_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+@dataclass(frozen=True)
+class Asset:
+    """An immutable in-memory copy of a bundled asset."""
+
+    key: str
+    data: bytes
+    b64: str
+    mime_type: str
+    fingerprint: str
+
+    @property
+    def filename(self) -> str:
+        """Fingerprinted file name, e.g. ``claim_icon.3f2a9c1b04de.png``."""
+        stem = self.key.rsplit("/", 1)[-1]
+        extension = mimetypes.guess_extension(self.mime_type) or ""
+        return f"{stem}.{self.fingerprint}{extension}"
+
+    @property
+    def url(self) -> str:
+        """Root-relative, permanently cacheable URL served by the API (via ``/api/``)."""
+        namespace = self.key.rsplit("/", 1)[0]
+        return f"{ASSET_URL_PREFIX}/{namespace}/{self.filename}"
+
+
+def _load_assets() -> Mapping[str, Asset]:
+    assets: Dict[str, Asset] = {}
+    for namespace, directory in _ASSET_DIRS.items():
+        try:
+            filenames = sorted(os.listdir(directory))
+        except OSError as e:
+            logger.warning("Asset directory %s is unavailable: %s", directory, e)
+            continue
+
+        for filename in filenames:
+            stem, extension = os.path.splitext(filename)
+            if extension.lower() not in _ASSET_EXTENSIONS:
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                logger.warning("Failed to load asset %s: %s", path, e)
+                continue
+
+            key = f"{namespace}/{stem}"
+            assets[key] = Asset(
+                key=key,
+                data=data,
+                b64=base64.b64encode(data).decode("utf-8"),
+                mime_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                fingerprint=hashlib.sha256(data).hexdigest()[:12],
+            )
+
+    logger.debug("Loaded %d static assets", len(assets))
+    return MappingProxyType(assets)
+
+
+ASSETS: Mapping[str, Asset] = _load_assets()
+
+
+def get_asset(key: str) -> Optional[Asset]:
+    """Return the asset registered under ``key``, or ``None``."""
+    return ASSETS.get(key)
+
+
+def get_bytes(key: str) -> Optional[bytes]:
+    """Return the raw bytes of an asset, or ``None`` if it is missing."""
+    asset = ASSETS.get(key)
+    return asset.data if asset else None
+
+
+def get_b64(key: str) -> Optional[str]:
+    """Return the base64-encoded contents of an asset, or ``None`` if it is missing."""
+    asset = ASSETS.get(key)
+    return asset.b64 if asset else None
+
+
+def asset_url(key: str) -> Optional[str]:
+    """Return the fingerprinted URL of an asset, or ``None`` if it is missing."""
+    asset = ASSETS.get(key)
+    return asset.url if asset else None
+
+
+def find_by_filename(namespace: str, filename: str) -> Optional[Asset]:
+    """Resolve a fingerprinted file name (as produced by ``Asset.filename``).
+
+    Returns ``None`` when the fingerprint does not match the loaded content,
+    so stale URLs are never served with a permanent cache header.
+    """
+    stem = filename.split(".", 1)[0]
+    asset = ASSETS.get(f"{namespace}/{stem}")
+    if asset is None or asset.filename != filename:
+        return None
+    return asset
@@ -0,0 +1,339 @@
+"""Pluggable coordination backend for roll locks and fair-ordered action queues.
+
+The Telegram side guards two things with named exclusive locks:
+
+* ``roll-user:<user_id>`` — one ``/roll`` in flight per user (previously an
+  in-memory ``bot_data["rolling_users"]`` set).
+* ``roll-action:<roll_type>:<roll_id>`` — one ``RollActionBuffer`` drain per
+  roll, so claim/lock/reroll clicks on a roll are processed by one worker at
+  a time, in click order.
+
+Two implementations share the ``CoordinationBackend`` interface:
+
+``InMemoryCoordinationBackend``
+    FIFO ``asyncio.Lock`` per key. Correct for a single bot process.
+
+``PostgresCoordinationBackend``
+    The in-memory lock (for FIFO ordering between tasks of this process)
+    plus a session-level ``pg_advisory_lock`` held on a dedicated
+    connection, so several bot workers sharing one database exclude each
+    other. Releases ``NOTIFY`` a channel that waiting workers ``LISTEN`` on,
+    with a short poll as fallback for missed notifications.
+
+Backends also carry small broadcast messages (``publish`` / ``subscribe``),
+used to invalidate per-process caches in every worker (e.g.
+``chat_context_manager``). The in-memory backend delivers them within the
+process; the Postgres backend sends them with ``NOTIFY`` on the channel name.
+
+Select the backend with ``COORDINATION_BACKEND`` (``"memory"`` or
+``"postgres"``). Fair ordering of clicks on one roll still assumes that all
+callbacks of a chat reach the same worker (shard updates by ``chat_id``);
+the backend guarantees that no two workers ever drain the same roll at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CoordinationBackend(ABC):
+    """Named exclusive locks shared by every worker using the same backend."""
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, List[Callable[[str], None]]] = {}
+
+    @abstractmethod
+    async def try_acquire(self, key: str) -> bool:
+        """Take the lock if it is free. Returns ``False`` immediately otherwise."""
+
+    @abstractmethod
+    async def acquire(self, key: str) -> None:
+        """Wait until the lock is free, then take it (FIFO within a process)."""
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Release a lock previously taken by this process."""
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        """``async with backend.hold(key):`` — acquire, then always release."""
+        await self.acquire(key)
+        try:
+            yield
+        finally:
+            await self.release(key)
+
+    async def publish(self, channel: str, payload: str) -> None:
+        """Deliver ``payload`` to the ``channel`` subscribers of every worker."""
+        self._dispatch(channel, payload)
+
+    async def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        """Call ``callback(payload)`` on the event loop for every message on ``channel``."""
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        for callback in list(self._subscribers.get(channel, ())):
+            try:
+                callback(payload)
+            except Exception as exc:
+                logger.error("Coordination subscriber for %s failed: %s", channel, exc)
+
+    async def close(self) -> None:
+        """Release backend resources (connections, listener tasks)."""
+
+
+# ---------------------------------------------------------------------------
+# In-memory backend
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _LocalLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0  # holders + waiters; the entry is dropped when it reaches 0
+
+
+class InMemoryCoordinationBackend(CoordinationBackend):
+    """FIFO ``asyncio.Lock`` per key; only coordinates tasks of one process."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._locks: Dict[str, _LocalLock] = {}
+
+    async def try_acquire(self, key: str) -> bool:
+        entry = self._locks.get(key)
+        if entry is not None and entry.lock.locked():
+            return False
+        await self.acquire(key)  # free, so this does not wait
+        return True
+
+    async def acquire(self, key: str) -> None:
+        entry = self._locks.setdefault(key, _LocalLock())
+        entry.users += 1
+        try:
+            await entry.lock.acquire()
+        except BaseException:
+            self._drop_user(key, entry)
+            raise
+
+    async def release(self, key: str) -> None:
+        entry = self._locks.get(key)
+        if entry is None or not entry.lock.locked():
+            logger.warning("Release of coordination lock %s that is not held", key)
+            return
+        entry.lock.release()
+        self._drop_user(key, entry)
+
+    def _drop_user(self, key: str, entry: _LocalLock) -> None:
+        entry.users -= 1
+        if entry.users <= 0 and self._locks.get(key) is entry:
+            del self._locks[key]
+
+
+# ---------------------------------------------------------------------------
+# Postgres backend
+# ---------------------------------------------------------------------------
+
+
+class PostgresCoordinationBackend(CoordinationBackend):
+    """Advisory-lock backend for running several bot workers against one database.
+
+    Advisory locks are session-scoped and re-entrant within a session, so all
+    locks of this process live on one dedicated connection and the in-memory
+    backend keeps tasks of this process from "re-entering" each other's locks.
+    If the lock connection drops, Postgres releases its locks; the connection
+    is re-established on the next call.
+    """
+
+    CHANNEL = "coordination_release"
+
+    def __init__(self, dsn: str, poll_interval: float = 1.0) -> None:
+        super().__init__()
+        self._dsn = dsn
+        self._poll_interval = poll_interval
+        self._local = InMemoryCoordinationBackend()
+        self._conn = None
+        self._conn_lock = asyncio.Lock()
+        self._listener_task: Optional[asyncio.Task] = None
+        self._listening = asyncio.Event()
+        self._released: Dict[str, asyncio.Event] = {}
+
+    async def _connection(self):
+        import psycopg
+
+        if self._conn is None or self._conn.closed:
+            if self._conn is not None:
+                logger.warning("Coordination connection lost; advisory locks were released")
+            self._conn = await psycopg.AsyncConnection.connect(self._dsn, autocommit=True)
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen())
+        return self._conn
+
+    async def _execute_scalar(self, sql: str, key: str) -> Any:
+        async with self._conn_lock:
+            conn = await self._connection()
+            cursor = await conn.execute(sql, (key,))
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+    async def _pg_try_lock(self, key: str) -> bool:
+        return bool(
+            await self._execute_scalar("SELECT pg_try_advisory_lock(hashtextextended(%s, 0))", key)
+        )
+
+    async def _listen(self) -> None:
+        """Wake local waiters when another worker releases a lock they want,
+        and deliver published messages to local subscribers."""
+        import psycopg
+
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self._dsn, autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {self.CHANNEL}")
+                    for channel in list(self._subscribers):
+                        await conn.execute(f'LISTEN "{channel}"')
+                    self._listening.set()
+                    async for notification in conn.notifies():
+                        if notification.channel != self.CHANNEL:
+                            self._dispatch(notification.channel, notification.payload)
+                            continue
+                        event = self._released.get(notification.payload)
+                        if event is not None:
+                            event.set()
+            except asyncio.CancelledError:
+                self._listening.clear()
+                raise
+            except Exception as exc:
+                # Waiters fall back to polling until the listener reconnects.
+                self._listening.clear()
+                logger.warning("Coordination listener error: %s", exc)
+                await asyncio.sleep(self._poll_interval)
+
+    async def try_acquire(self, key: str) -> bool:
+        if not await self._local.try_acquire(key):
+            return False
+        try:
+            acquired = await self._pg_try_lock(key)
+        except BaseException:
+            await self._local.release(key)
+            raise
+        if not acquired:
+            await self._local.release(key)
+        return acquired
+
+    async def acquire(self, key: str) -> None:
+        await self._local.acquire(key)
+        try:
+            # Only the local holder of ``key`` gets here, so the event is not shared.
+            event = self._released.setdefault(key, asyncio.Event())
+            while True:
+                event.clear()
+                if await self._pg_try_lock(key):
+                    return
+                try:
+                    await asyncio.wait_for(event.wait(), self._poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._released.pop(key, None)
+            await self._local.release(key)
+            raise
+
+    async def release(self, key: str) -> None:
+        try:
+            await self._execute_scalar("SELECT pg_advisory_unlock(hashtextextended(%s, 0))", key)
+            await self._execute_scalar(f"SELECT pg_notify('{self.CHANNEL}', %s)", key)
+        except Exception as exc:
+            logger.error("Failed to release advisory lock %s: %s", key, exc)
+        finally:
+            self._released.pop(key, None)
+            await self._local.release(key)
+
+    async def publish(self, channel: str, payload: str) -> None:
+        # Delivered to this worker's subscribers by its own listener as well
+        try:
+            async with self._conn_lock:
+                conn = await self._connection()
+                await conn.execute("SELECT pg_notify(%s, %s)", (channel, payload))
+        except Exception as exc:
+            logger.error("Failed to publish on %s: %s", channel, exc)
+
+    async def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        await super().subscribe(channel, callback)
+        # Restart the listener so it LISTENs on the new channel too
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        async with self._conn_lock:
+            await self._connection()
+        try:
+            await asyncio.wait_for(self._listening.wait(), self._poll_interval * 5)
+        except asyncio.TimeoutError:
+            logger.warning("Coordination listener is not up yet; %s messages may be missed", channel)
+
+    async def close(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        if self._conn is not None and not self._conn.closed:
+            await self._conn.close()
+        self._conn = None
+
+
+# ---------------------------------------------------------------------------
+# bot_data helpers
+# ---------------------------------------------------------------------------
+
+_BOT_DATA_KEY = "coordination_backend"
+
+
+def create_backend(kind: str) -> CoordinationBackend:
+    """Build a backend by name (``"memory"`` or ``"postgres"``)."""
+    if kind == "postgres":
+        from sqlalchemy.engine import make_url
+
+        from settings.constants import DATABASE_URL
+
+        # psycopg wants a plain libpq URL, not the SQLAlchemy dialect+driver form.
+        dsn = make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        return PostgresCoordinationBackend(dsn)
+    if kind != "memory":
+        logger.warning("Unknown COORDINATION_BACKEND %r; using in-memory locks", kind)
+    return InMemoryCoordinationBackend()
+
+
+def get_backend(bot_data: dict[str, Any]) -> CoordinationBackend:
+    """Fetch (or lazily create) the shared coordination backend."""
+    backend = bot_data.get(_BOT_DATA_KEY)
+    if backend is None:
+        from settings.constants import COORDINATION_BACKEND
+
+        backend = create_backend(COORDINATION_BACKEND)
+        bot_data[_BOT_DATA_KEY] = backend
+    return backend
+
+
+async def close_backend(bot_data: dict[str, Any]) -> None:
+    """Close the shared backend if one was created."""
+    backend = bot_data.pop(_BOT_DATA_KEY, None)
+    if backend is not None:
+        await backend.close()
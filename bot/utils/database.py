@@ -2,17 +2,22 @@
 
 This module provides database setup, configuration, and migration functionality.
 For business logic operations, use the service modules in utils.services/.
+
+Migrations are not applied on import or at startup: they run once per deploy
+through ``tools/migrate.py`` (the ``migrate`` step in docker-compose) before
+the bot and API start.  ``initialize_database`` only compares the database's
+``alembic_version`` with the newest migration file, so a process never starts
+against a schema it does not know about.
 """
 
 import logging
 import os
 from typing import Optional
 
-from alembic import command
-from alembic.config import Config
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
 
-from settings.constants import DATABASE_URL
+from settings.constants import DATABASE_URL, DB_SCHEMA_CHECK
 from utils.session import get_session, get_engine, initialize_session as _init_session
 
 logger = logging.getLogger(__name__)
@@ -20,8 +25,18 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
 ALEMBIC_INI_PATH = os.path.join(PROJECT_ROOT, "alembic.ini")
 ALEMBIC_SCRIPT_LOCATION = os.path.join(PROJECT_ROOT, "alembic")
+ALEMBIC_VERSIONS_PATH = os.path.join(ALEMBIC_SCRIPT_LOCATION, "versions")
 INITIAL_ALEMBIC_REVISION = "20240924_0001"
 
+# Arbitrary key for the advisory lock serializing concurrent migration runs
+_MIGRATION_LOCK_KEY = 0x6761636861  # "gacha"
+
+SCHEMA_CHECK_MODES = ("strict", "warn", "off")
+
+
+class SchemaRevisionError(RuntimeError):
+    """Raised when the database schema is not at the expected Alembic revision."""
+
 
 class DatabaseConfig:
     """Configuration for database connection pool."""
@@ -49,15 +64,23 @@ class DatabaseConfig:
 _db_config: Optional[DatabaseConfig] = None
 
 
-def initialize_database(pool_size: int = 6, timeout_seconds: int = 30) -> None:
+def initialize_database(
+    pool_size: int = 6,
+    timeout_seconds: int = 30,
+    schema_check: str = DB_SCHEMA_CHECK,
+) -> None:
     """
-    Initialize database configuration.
+    Initialize database configuration and verify the schema revision.
 
     This should be called once at application startup before any database operations.
+    It does not apply migrations; run ``tools/migrate.py`` for that.
 
     Args:
         pool_size: Size of the connection pool (default: 6)
         timeout_seconds: Connection timeout in seconds (default: 30)
+        schema_check: ``"strict"`` raises ``SchemaRevisionError`` when the
+            database is not at the newest migration, ``"warn"`` only logs it,
+            ``"off"`` skips the check (default: ``DB_SCHEMA_CHECK``)
     """
     global _db_config
     _db_config = DatabaseConfig(pool_size, timeout_seconds)
@@ -71,6 +94,8 @@ def initialize_database(pool_size: int = 6, timeout_seconds: int = 30) -> None:
         _db_config.timeout_seconds,
     )
 
+    verify_schema_revision(schema_check)
+
 
 def _get_config() -> DatabaseConfig:
     """Get the database configuration, initializing with defaults if needed."""
@@ -81,8 +106,69 @@ def _get_config() -> DatabaseConfig:
     return _db_config
 
 
-def _get_alembic_config() -> Config:
+def get_head_revision() -> Optional[str]:
+    """Newest migration revision, read from the migration file names.
+
+    Migration files are named ``<revision>_<slug>.py`` with date-ordered
+    revision ids (``YYYYMMDD_NNNN``), so the head is the greatest prefix.
+    This avoids importing every migration through Alembic at startup;
+    ``tools/migrate.py --check`` cross-checks it against Alembic's own graph.
+    """
+    revisions = [
+        name[:13]
+        for name in os.listdir(ALEMBIC_VERSIONS_PATH)
+        if name.endswith(".py") and name[:8].isdigit() and name[8:9] == "_"
+    ]
+    return max(revisions) if revisions else None
+
+
+def get_current_revision() -> Optional[str]:
+    """Revision recorded in ``alembic_version``, or None if it is missing or empty."""
+    try:
+        with get_session() as session:
+            return session.execute(
+                text("SELECT version_num FROM alembic_version")
+            ).scalar_one_or_none()
+    except SQLAlchemyError as exc:
+        # Undefined table: migrations have never been run against this database
+        if getattr(exc.orig, "sqlstate", None) == "42P01":
+            return None
+        raise
+
+
+def verify_schema_revision(mode: str = "strict") -> bool:
+    """Check that the database is migrated to the newest revision.
+
+    Costs one ``SELECT version_num`` round-trip.  Returns True when the
+    revisions match (or the check is off).  On a mismatch, ``"strict"``
+    raises ``SchemaRevisionError`` and ``"warn"`` logs and returns False.
+    """
+    if mode not in SCHEMA_CHECK_MODES:
+        logger.warning("Unknown schema check mode %r; falling back to strict", mode)
+        mode = "strict"
+    if mode == "off":
+        return True
+
+    expected = get_head_revision()
+    current = get_current_revision()
+    if current == expected:
+        logger.info("Database schema at revision %s", current)
+        return True
+
+    message = (
+        f"Database schema is at revision {current or '<none>'} but the code expects "
+        f"{expected}; run `python tools/migrate.py` before starting"
+    )
+    if mode == "strict":
+        raise SchemaRevisionError(message)
+    logger.warning(message)
+    return False
+
+
+def _get_alembic_config():
     """Build an Alembic configuration pointing at the project's migration setup."""
+    from alembic.config import Config
+
     config = Config(ALEMBIC_INI_PATH)
     config.set_main_option("script_location", ALEMBIC_SCRIPT_LOCATION)
     config.set_main_option("sqlalchemy.url", DATABASE_URL)
@@ -104,7 +190,24 @@ def _create_schema_from_models():
 
 
 def run_migrations():
-    """Apply Alembic migrations to bring the database schema up to date."""
+    """Apply Alembic migrations to bring the database schema up to date.
+
+    Holds a Postgres advisory lock for the duration, so concurrent runs
+    (e.g. two deploys overlapping) apply migrations one after another.
+    """
+    with get_engine().connect() as lock_conn:
+        lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+        try:
+            _run_migrations_locked()
+        finally:
+            lock_conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": _MIGRATION_LOCK_KEY}
+            )
+
+
+def _run_migrations_locked():
+    from alembic import command
+
     config = _get_alembic_config()
 
     # CASE 1: Completely fresh database — no tables at all.
@@ -137,7 +240,3 @@ def run_migrations():
 def create_tables():
     """Backwards-compatible wrapper that now applies Alembic migrations."""
     run_migrations()
-
-
-# Run migrations on module import
-create_tables()
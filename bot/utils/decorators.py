@@ -11,6 +11,7 @@ from telegram.constants import ChatType
 from telegram.ext import ContextTypes
 
 from repos import user_repo
+from managers import chat_context_manager
 
 # Load environment variables for shadow staggered usernames
 load_dotenv()
@@ -118,7 +119,8 @@ def verify_user_in_chat(handler: HandlerFunc) -> HandlerFunc:
             return None
 
         chat_id = str(chat.id)
-        is_member = await asyncio.to_thread(user_repo.is_user_in_chat, chat_id, db_user.user_id)
+        chat_context_manager.remember_title(chat_id, chat.title)
+        is_member = await asyncio.to_thread(chat_context_manager.is_member, chat_id, db_user.user_id)
         if is_member:
             return await handler(update, context, *args, **kwargs)
 
@@ -1,13 +1,12 @@
+from __future__ import annotations
+
 import base64
+import functools
 import logging
-import os
 import random
+import threading
 from io import BytesIO
 
-from google import genai
-from google.genai import types
-from PIL import Image
-
 from settings.constants import (
     ASPECT_GENERATION_PROMPT,
     ASPECT_SET_CONTEXT,
@@ -15,15 +14,34 @@ from settings.constants import (
     BASE_CARD_GENERATION_PROMPT,
     CARD_WITH_ASPECTS_PROMPT,
     RARITIES,
-    CARD_TEMPLATES_PATH,
     SLOT_MACHINE_INSTRUCTION,
     UNIQUE_ASPECT_ADDENDUM,
 )
+from utils import assets, image_workers
 from utils.image import ImageUtil
+from utils.lazy import lazy_import
+
+# google-genai and PIL are imported on first use (see utils/lazy.py)
+genai = lazy_import("google.genai")
+types = lazy_import("google.genai.types")
+Image = lazy_import("PIL.Image")
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _downscaled_template_png(template_name: str, max_size: int) -> bytes:
+    """Downscale a bundled card template once; templates never change at runtime."""
+    template_bytes = assets.get_bytes(f"card_templates/{template_name}")
+    if template_bytes is None:
+        raise FileNotFoundError(f"Card template '{template_name}' is not available")
+    img = Image.open(BytesIO(template_bytes))
+    img.thumbnail((max_size, max_size), Image.LANCZOS)
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
 class GeminiUtil:
     def __init__(self, google_api_key: str, image_gen_model: str):
         """
@@ -33,11 +51,26 @@ class GeminiUtil:
             google_api_key: Google API key for Gemini
             image_gen_model: Model name for image generation
         """
-        self.client = genai.Client(api_key=google_api_key)
+        self._api_key = google_api_key
+        self._client = None
+        self._client_lock = threading.Lock()
         self.model_name = image_gen_model
+        logger.info(f"GeminiUtil initialized with model {image_gen_model}")
 
-        # Configure safety settings to be least restrictive
-        self.safety_settings = [
+    @property
+    def client(self) -> genai.Client:
+        """Gemini client, created (and google-genai imported) on first use."""
+        if self._client is None:
+            # Generations run in worker threads; build a single shared client
+            with self._client_lock:
+                if self._client is None:
+                    self._client = genai.Client(api_key=self._api_key)
+        return self._client
+
+    @functools.cached_property
+    def safety_settings(self) -> list[types.SafetySetting]:
+        """Least restrictive safety settings, sent with every request."""
+        return [
             types.SafetySetting(
                 category=types.HarmCategory.HARM_CATEGORY_HARASSMENT,
                 threshold=types.HarmBlockThreshold.BLOCK_NONE,
@@ -55,7 +88,6 @@ class GeminiUtil:
                 threshold=types.HarmBlockThreshold.BLOCK_NONE,
             ),
         ]
-        logger.info(f"GeminiUtil initialized with model {image_gen_model}")
 
     @staticmethod
     def _prepare_image_part(
@@ -89,6 +121,15 @@ class GeminiUtil:
             media_resolution=types.MediaResolution.MEDIA_RESOLUTION_MEDIUM,
         )
 
+    @staticmethod
+    def _prepare_template_part(template_name: str, max_size: int = 768) -> types.Part:
+        """Return a Gemini Part for a bundled card template (e.g. ``"rare"``)."""
+        return types.Part.from_bytes(
+            data=_downscaled_template_png(template_name, max_size),
+            mime_type="image/png",
+            media_resolution=types.MediaResolution.MEDIA_RESOLUTION_MEDIUM,
+        )
+
     def generate_image(
         self,
         base_name: str,
@@ -115,8 +156,7 @@ class GeminiUtil:
                 f"Requesting base card image generation for '{base_name}', rarity '{rarity}' (temperature {temperature})"
             )
 
-            template_image_path = os.path.join(CARD_TEMPLATES_PATH, f"{rarity.lower()}.png")
-            template_part = self._prepare_image_part(image_path=template_image_path)
+            template_part = self._prepare_template_part(rarity.lower())
             img_part = self._prepare_image_part(
                 image_path=base_image_path, image_b64=base_image_b64
             )
@@ -137,9 +177,10 @@ class GeminiUtil:
             for part in response.candidates[0].content.parts:
                 if part.inline_data:
                     image_bytes = part.inline_data.data
-                    image_bytes = ImageUtil.to_jpeg(image_bytes)
-                    processed_image_bytes = ImageUtil.crop_to_content(image_bytes)
-                    processed_image_bytes = ImageUtil.crop_to_aspect_ratio(processed_image_bytes, 5/7)
+                    processed_image_bytes = image_workers.run_steps(
+                        image_bytes,
+                        [("to_jpeg",), ("crop_to_content",), ("crop_to_aspect_ratio", 5/7)],
+                    )
                     logger.info(f"Image for '{base_name}' generated and processed successfully.")
                     return base64.b64encode(processed_image_bytes).decode("utf-8")
             logger.warning("No image data found in response.")
@@ -202,15 +243,17 @@ class GeminiUtil:
             for part in response.candidates[0].content.parts:
                 if part.inline_data:
                     image_bytes = part.inline_data.data
-                    image_bytes = ImageUtil.to_jpeg(image_bytes)
                     logger.info("Processing slot machine icon")
-                    processed_image_bytes = ImageUtil.crop_to_content(image_bytes)
-                    processed_image_bytes = ImageUtil.crop_to_aspect_ratio(processed_image_bytes, 1.0)
-
-                    # Resize to target size (default 256x256) to reduce payload size
-                    resized_image_bytes = ImageUtil.resize_to_dimensions(
-                        processed_image_bytes, target_size, target_size,
-                        output_format="JPEG",
+                    # Crop, square, then resize to target size (default 256x256)
+                    # to reduce payload size
+                    resized_image_bytes = image_workers.run_steps(
+                        image_bytes,
+                        [
+                            ("to_jpeg",),
+                            ("crop_to_content",),
+                            ("crop_to_aspect_ratio", 1.0),
+                            ("resize_to_dimensions", target_size, target_size, {"output_format": "JPEG"}),
+                        ],
                     )
                     logger.info(
                         f"Slot machine icon generated and resized to {target_size}x{target_size}."
@@ -278,14 +321,14 @@ class GeminiUtil:
             for part in response.candidates[0].content.parts:
                 if part.inline_data:
                     image_bytes = part.inline_data.data
-                    image_bytes = ImageUtil.to_jpeg(image_bytes)
-                    processed_image_bytes = ImageUtil.crop_to_content(image_bytes)
-                    processed_image_bytes = ImageUtil.crop_to_aspect_ratio(
-                        processed_image_bytes, 1.0
-                    )
-                    resized_image_bytes = ImageUtil.resize_to_dimensions(
-                        processed_image_bytes, target_size, target_size,
-                        output_format="JPEG",
+                    resized_image_bytes = image_workers.run_steps(
+                        image_bytes,
+                        [
+                            ("to_jpeg",),
+                            ("crop_to_content",),
+                            ("crop_to_aspect_ratio", 1.0),
+                            ("resize_to_dimensions", target_size, target_size, {"output_format": "JPEG"}),
+                        ],
                     )
                     logger.info(
                         "Set slot icon for '%s' generated and resized to %dx%d.",
@@ -371,8 +414,7 @@ class GeminiUtil:
             )
 
             # Load the sphere template
-            sphere_template_path = os.path.join(CARD_TEMPLATES_PATH, "aspect_sphere.png")
-            template_part = self._prepare_image_part(image_path=sphere_template_path)
+            template_part = self._prepare_template_part("aspect_sphere")
 
             config = types.GenerateContentConfig(
                 temperature=temperature,
@@ -393,10 +435,11 @@ class GeminiUtil:
             for part in response.candidates[0].content.parts:
                 if part.inline_data:
                     image_bytes = part.inline_data.data
-                    image_bytes = ImageUtil.to_jpeg(image_bytes)
                     # Crop borders, then force 1:1 square
-                    processed = ImageUtil.crop_to_content(image_bytes)
-                    processed = ImageUtil.crop_to_aspect_ratio(processed, 1.0)
+                    processed = image_workers.run_steps(
+                        image_bytes,
+                        [("to_jpeg",), ("crop_to_content",), ("crop_to_aspect_ratio", 1.0)],
+                    )
                     logger.info(
                         f"Aspect sphere for '{aspect_name}' generated and processed successfully."
                     )
@@ -425,7 +468,8 @@ class GeminiUtil:
         Args:
             rarity: Card rarity (for template selection, color, creativeness).
             card_name: Full display name for the card nameplate.
-            aspects: List of OwnedAspectWithImage objects for ALL equipped aspects.
+            aspects: ``EquippedAspectImage`` objects for ALL equipped aspects, in
+                slot order (see ``aspect_repo.get_equipped_aspect_images``).
             base_image_path: Path to the character's base photo.
             base_image_b64: Base64-encoded character base photo.
             temperature: Gemini sampling temperature.
@@ -463,10 +507,9 @@ class GeminiUtil:
             )
 
             # Prepare image parts: rarity template + character photo + labeled aspect references
-            template_image_path = os.path.join(CARD_TEMPLATES_PATH, f"{rarity.lower()}.png")
             contents: list = [prompt]
             contents.append("Card template:")
-            contents.append(self._prepare_image_part(image_path=template_image_path))
+            contents.append(self._prepare_template_part(rarity.lower()))
             contents.append("Character photo:")
             contents.append(
                 self._prepare_image_part(image_path=base_image_path, image_b64=base_image_b64)
@@ -474,7 +517,7 @@ class GeminiUtil:
             for a in aspects:
                 label = f'Aspect {a.aspect_definition.context_label(include_descriptions=False) if a.aspect_definition else f"{a.display_name}"}'
                 contents.append(f'{label} reference:')
-                contents.append(self._prepare_image_part(image_bytes=base64.b64decode(a.image_b64)))
+                contents.append(self._prepare_image_part(image_bytes=a.image))
 
             config = types.GenerateContentConfig(
                 temperature=temperature,
@@ -492,9 +535,10 @@ class GeminiUtil:
             for part in response.candidates[0].content.parts:
                 if part.inline_data:
                     image_bytes = part.inline_data.data
-                    image_bytes = ImageUtil.to_jpeg(image_bytes)
-                    processed = ImageUtil.crop_to_content(image_bytes)
-                    processed = ImageUtil.crop_to_aspect_ratio(processed, 5/7)
+                    processed = image_workers.run_steps(
+                        image_bytes,
+                        [("to_jpeg",), ("crop_to_content",), ("crop_to_aspect_ratio", 5/7)],
+                    )
                     logger.info(f"Card-with-aspects image for '{card_name}' generated successfully.")
                     return base64.b64encode(processed).decode("utf-8")
 
@@ -0,0 +1,198 @@
+"""Concurrent N-candidate image generation.
+
+Flows that offer the user a choice between several generated images (e.g.
+``/refresh``) used to produce them one after another, so the wait was the
+sum of every generation.  ``CandidateGeneration`` fans the candidates out at
+once and the wait becomes roughly the slowest one:
+
+- each candidate runs its blocking generator in a worker thread and retries
+  on its own, independently of the others;
+- all candidates of the process share the ``GENERATION_CONCURRENCY`` budget,
+  so a burst of refreshes cannot open an unbounded number of Gemini calls;
+- callers can show the first finished candidate right away
+  (``first_ready``) and collect the rest as they complete (``as_completed``);
+- ``cancel`` stops pending candidates once the user has made a choice.
+
+A generation already running in a thread cannot be interrupted, so a
+cancelled candidate keeps its budget slot until that call returns and its
+result is discarded.  Retries and not-yet-started candidates are dropped
+immediately.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple, Type
+
+from settings.constants import GENERATION_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+# Pause between retries of one candidate (seconds)
+RETRY_DELAY_SECONDS = 1.0
+
+_budget: Optional[asyncio.Semaphore] = None
+
+
+def _get_budget() -> asyncio.Semaphore:
+    """Process-wide generation semaphore (created on the bot's event loop)."""
+    global _budget
+    if _budget is None:
+        _budget = asyncio.Semaphore(max(1, GENERATION_CONCURRENCY))
+    return _budget
+
+
+class CandidateGenerationError(Exception):
+    """Raised when no candidate could be generated."""
+
+
+class CandidateGeneration:
+    """A batch of candidates generated concurrently.
+
+    Args:
+        generate: Blocking callable producing candidate ``index`` (0-based).
+            Runs in a worker thread; an empty result counts as a failure.
+        count: Number of candidates.
+        max_retries: Extra attempts per candidate after a failure.
+        fatal_errors: Exception types that are not retried and fail the
+            whole batch (e.g. a card without a usable source).
+        label: Used in log messages.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[int], Optional[str]],
+        count: int,
+        *,
+        max_retries: int = 0,
+        fatal_errors: Tuple[Type[BaseException], ...] = (),
+        label: str = "candidate",
+    ):
+        self._generate = generate
+        self._count = count
+        self._attempts = max(1, max_retries + 1)
+        self._fatal_errors = fatal_errors
+        self._label = label
+        self._tasks: Dict[asyncio.Task, int] = {}
+        self._reported: Set[asyncio.Task] = set()
+        self.results: Dict[int, str] = {}
+        self.errors: Dict[int, BaseException] = {}
+
+    def start(self) -> "CandidateGeneration":
+        """Schedule every candidate; returns ``self`` for chaining."""
+        if not self._tasks:
+            for index in range(self._count):
+                task = asyncio.create_task(self._run(index))
+                task.add_done_callback(_consume_exception)
+                self._tasks[task] = index
+        return self
+
+    @property
+    def pending(self) -> int:
+        """Number of candidates still being generated."""
+        return sum(1 for task in self._tasks if not task.done())
+
+    def cancel(self) -> None:
+        """Stop every candidate that has not finished."""
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+
+    async def as_completed(self) -> AsyncIterator[Tuple[int, str]]:
+        """Yield ``(index, image_b64)`` for each successful candidate as it finishes.
+
+        Candidates already yielded by an earlier call (e.g. ``first_ready``)
+        are skipped.  Raises the first fatal error (after cancelling the
+        rest) if one occurs.
+        """
+        remaining = set(self._tasks) - self._reported
+        while remaining:
+            done, remaining = await asyncio.wait(
+                remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                self._reported.add(task)
+                if task.cancelled():
+                    continue
+                exc = task.exception()
+                if exc is not None:
+                    if isinstance(exc, self._fatal_errors):
+                        self.cancel()
+                        raise exc
+                    continue
+                index = self._tasks[task]
+                yield index, self.results[index]
+
+    async def first_ready(self) -> Tuple[int, str]:
+        """Wait for the first successful candidate.
+
+        Raises:
+            CandidateGenerationError: If every candidate failed.
+            Any ``fatal_errors`` type raised by a candidate.
+        """
+        async for result in self.as_completed():
+            return result
+        raise self._failure()
+
+    async def wait_all(self) -> List[str]:
+        """Wait for every candidate; returns the successful ones in index order.
+
+        Raises ``CandidateGenerationError`` if none succeeded.
+        """
+        async for _ in self.as_completed():
+            pass
+        if not self.results:
+            raise self._failure()
+        return [self.results[i] for i in sorted(self.results)]
+
+    def _failure(self) -> CandidateGenerationError:
+        last_error = next(reversed(self.errors.values()), None)
+        return CandidateGenerationError(
+            f"All {self._count} {self._label}s failed"
+            + (f": {last_error}" if last_error else "")
+        )
+
+    async def _run(self, index: int) -> str:
+        attempt = 1
+        while True:
+            try:
+                image_b64 = await self._generate_once(index)
+                if not image_b64:
+                    raise CandidateGenerationError("Empty image returned")
+                self.results[index] = image_b64
+                return image_b64
+            except self._fatal_errors:
+                raise
+            except Exception as exc:
+                self.errors[index] = exc
+                logger.warning(
+                    "%s %s attempt %s/%s failed: %s",
+                    self._label.capitalize(),
+                    index + 1,
+                    attempt,
+                    self._attempts,
+                    exc,
+                )
+                if attempt >= self._attempts:
+                    raise
+            attempt += 1
+            await asyncio.sleep(RETRY_DELAY_SECONDS)
+
+    async def _generate_once(self, index: int) -> Optional[str]:
+        budget = _get_budget()
+        await budget.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(None, self._generate, index)
+        except BaseException:
+            budget.release()
+            raise
+        # Release when the thread returns, even if this task is cancelled first.
+        future.add_done_callback(lambda f: (budget.release(), _consume_exception(f)))
+        return await asyncio.shield(future)
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    """Mark a failure as retrieved; candidates nobody waits for fail silently."""
+    if not future.cancelled():
+        future.exception()
@@ -1,7 +1,10 @@
 import io
 import logging
 
-from PIL import Image
+from utils.lazy import lazy_import
+
+# Imported on first use (see utils/lazy.py)
+Image = lazy_import("PIL.Image")
 
 logger = logging.getLogger(__name__)
 
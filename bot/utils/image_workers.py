@@ -0,0 +1,276 @@
+"""Process-pool service for CPU-bound ``ImageUtil`` operations.
+
+PIL resizing/encoding and ``crop_to_content``'s per-pixel scan hold the GIL
+for most of their run time, so doing them on a request thread stalls every
+other request in the same process.  This module runs them in a small pool
+of worker processes instead (``IMAGE_WORKER_PROCESSES``).
+
+Image bytes travel through ``multiprocessing.shared_memory`` segments rather
+than being pickled through the pool's pipe: the caller writes the input into
+a segment, the worker reads it, runs the steps and writes the result into a
+segment of its own, which the caller copies out and unlinks.
+
+A call is one or more ``ImageUtil`` steps applied in order inside a single
+worker round-trip.  When the pool is not running (tools, migrations, or
+``IMAGE_WORKER_PROCESSES = 0``) the steps run inline, so callers never have
+to care whether ``start`` was called.  A pool that breaks (a worker killed)
+is replaced on the next call; the call that hit it falls back to inline.
+
+Workers are started with the ``spawn`` method, like ``core/workers.py``, so
+no database connection or event loop is inherited.
+
+Usage:
+    from utils import image_workers
+
+    image_workers.start()  # at startup; no-op when disabled
+    thumb = image_workers.run("compress_to_fraction", image_bytes, scale_factor=1 / 4)
+    thumb = await image_workers.run_async("compress_to_fraction", image_bytes)
+    icon = image_workers.run_steps(
+        image_bytes,
+        [
+            ("to_jpeg",),
+            ("crop_to_content",),
+            ("crop_to_aspect_ratio", 1.0),
+            ("resize_to_dimensions", 256, 256, {"output_format": "JPEG"}),
+        ],
+    )
+    image_workers.shutdown()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Optional, Sequence, Tuple
+
+from settings.constants import IMAGE_WORKER_PROCESSES
+from utils.image import ImageUtil
+
+logger = logging.getLogger(__name__)
+
+# ImageUtil static methods that may be dispatched to a worker
+OPERATIONS = frozenset(
+    {
+        "to_jpeg",
+        "crop_to_content",
+        "compress_to_fraction",
+        "crop_to_aspect_ratio",
+        "crop_to_square",
+        "resize_to_dimensions",
+    }
+)
+
+# (operation, *positional args[, kwargs dict]) applied to the image bytes
+Step = Tuple[Any, ...]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+_lock = threading.Lock()
+
+
+def _split_step(step: Step) -> Tuple[str, tuple, dict]:
+    op, *args = step
+    if op not in OPERATIONS:
+        raise ValueError(f"Unknown image operation: {op!r}")
+    kwargs = args.pop() if args and isinstance(args[-1], dict) else {}
+    return op, tuple(args), kwargs
+
+
+def _apply_steps(image_bytes: bytes, steps: Sequence[Step]) -> bytes:
+    for step in steps:
+        op, args, kwargs = _split_step(step)
+        image_bytes = getattr(ImageUtil, op)(image_bytes, *args, **kwargs)
+    return image_bytes
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+
+def _worker_init() -> None:
+    # The parent process owns shutdown (Ctrl+C reaches the whole process group)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _worker_run(input_name: str, input_size: int, steps: Sequence[Step]) -> Tuple[str, int]:
+    """Apply ``steps`` to the input segment; return the output segment's name and size."""
+    segment = shared_memory.SharedMemory(name=input_name)
+    try:
+        image_bytes = bytes(segment.buf[:input_size])
+    finally:
+        segment.close()
+
+    result = _apply_steps(image_bytes, steps)
+
+    # The caller unlinks the output segment once it has copied the result
+    output = shared_memory.SharedMemory(create=True, size=max(len(result), 1))
+    try:
+        output.buf[: len(result)] = result
+    finally:
+        output.close()
+    return output.name, len(result)
+
+
+# ---------------------------------------------------------------------------
+# Caller side
+# ---------------------------------------------------------------------------
+
+
+def start(max_workers: int = IMAGE_WORKER_PROCESSES) -> bool:
+    """Start the worker pool. Returns whether it is running (``False`` when disabled)."""
+    global _pool, _pool_size
+    with _lock:
+        if _pool is not None:
+            return True
+        if max_workers <= 0:
+            logger.info("Image worker pool disabled; image operations run inline")
+            return False
+        _pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+        )
+        _pool_size = max_workers
+        logger.info("Image worker pool started with %d processes", max_workers)
+        return True
+
+
+def shutdown() -> None:
+    """Stop the worker pool, waiting for in-flight operations."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+        logger.info("Image worker pool stopped")
+
+
+def is_running() -> bool:
+    """Whether operations are currently dispatched to worker processes."""
+    return _pool is not None
+
+
+def _replace_broken_pool(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    with _lock:
+        if _pool is not broken:
+            return  # Another caller already replaced it
+        _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+    logger.warning("Image worker pool broke; restarting it")
+    start(_pool_size)
+
+
+def _submit(image_bytes: bytes, steps: Sequence[Step]):
+    """Copy the input into shared memory and submit the steps.
+
+    Returns ``(pool, future, input segment)``, or ``None`` when the pool is
+    not running.
+    """
+    pool = _pool
+    if pool is None:
+        return None
+    for step in steps:
+        _split_step(step)  # Reject unknown operations before touching a worker
+
+    segment = shared_memory.SharedMemory(create=True, size=max(len(image_bytes), 1))
+    segment.buf[: len(image_bytes)] = image_bytes
+    try:
+        future = pool.submit(_worker_run, segment.name, len(image_bytes), list(steps))
+    except BrokenProcessPool:
+        _release(segment)
+        _replace_broken_pool(pool)
+        return None
+    except RuntimeError:
+        # Shut down between the check and the submit
+        _release(segment)
+        return None
+    return pool, future, segment
+
+
+def _release(segment: shared_memory.SharedMemory) -> None:
+    segment.close()
+    segment.unlink()
+
+
+def _collect(pool: ProcessPoolExecutor, future: Future, segment) -> Optional[bytes]:
+    """Wait for a submission's result bytes; ``None`` if the pool broke or shut down.
+
+    Exceptions raised by the operation itself propagate as if run inline.
+    """
+    try:
+        output_name, output_size = future.result()
+    except BrokenProcessPool:
+        _replace_broken_pool(pool)
+        return None
+    except CancelledError:
+        return None
+    finally:
+        _release(segment)
+
+    output = shared_memory.SharedMemory(name=output_name)
+    try:
+        return bytes(output.buf[:output_size])
+    finally:
+        _release(output)
+
+
+def run_steps(image_bytes: bytes, steps: Sequence[Step]) -> bytes:
+    """Apply ``steps`` in a worker process, blocking the calling thread until done.
+
+    The calling thread waits without holding the GIL, so other threads keep
+    running.  Falls back to running the steps inline when the pool is not
+    running.
+    """
+    submitted = _submit(image_bytes, steps)
+    if submitted is not None:
+        result = _collect(*submitted)
+        if result is not None:
+            return result
+    return _apply_steps(image_bytes, steps)
+
+
+async def run_steps_async(image_bytes: bytes, steps: Sequence[Step]) -> bytes:
+    """Async ``run_steps``: awaits the worker without blocking the event loop.
+
+    Without a pool the steps run in a thread (``asyncio.to_thread``) instead.
+    """
+    submitted = _submit(image_bytes, steps)
+    if submitted is not None:
+        pool, future, segment = submitted
+        try:
+            # asyncio.wait never cancels the pool future, so the segments can
+            # still be released if this coroutine is cancelled
+            await asyncio.wait([asyncio.wrap_future(future)])
+        except asyncio.CancelledError:
+            future.add_done_callback(lambda f: _discard(pool, f, segment))
+            raise
+        result = _collect(pool, future, segment)
+        if result is not None:
+            return result
+    return await asyncio.to_thread(_apply_steps, image_bytes, steps)
+
+
+def _discard(pool: ProcessPoolExecutor, future: Future, segment) -> None:
+    """Release the segments of a submission nobody waits for anymore."""
+    try:
+        _collect(pool, future, segment)
+    except Exception as exc:
+        logger.debug("Discarded image operation failed: %s", exc)
+
+
+def run(op: str, image_bytes: bytes, *args: Any, **kwargs: Any) -> bytes:
+    """Run one ``ImageUtil`` operation in a worker (see ``run_steps``)."""
+    return run_steps(image_bytes, [(op, *args, kwargs)])
+
+
+async def run_async(op: str, image_bytes: bytes, *args: Any, **kwargs: Any) -> bytes:
+    """Run one ``ImageUtil`` operation in a worker (see ``run_steps_async``)."""
+    return await run_steps_async(image_bytes, [(op, *args, kwargs)])
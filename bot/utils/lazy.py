@@ -0,0 +1,55 @@
+"""Deferred imports for heavy optional-at-startup dependencies.
+
+``google.genai`` alone takes several hundred milliseconds to import, and
+PIL, while cheaper, is only needed once an image is actually processed.
+``lazy_import`` returns a stand-in that imports the real module on first
+attribute access, so a module can keep the familiar ``types.Part`` /
+``Image.open`` spelling without every process paying for the import at
+boot (API workers are recycled by ``--max-requests`` and pay it each time).
+
+Use it only for modules accessed as attributes; ``from x import y`` of a
+lazy module is not supported.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """Module stand-in that imports ``name`` on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real module has been imported yet."""
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        if attr in ("_name", "_module", "_lock"):
+            # Not yet initialized (e.g. during copy/unpickling)
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a ``LazyModule`` for ``name`` (nothing is imported yet)."""
+    return LazyModule(name)
@@ -7,9 +7,7 @@ This module handles:
 - Database operations for minesweeper games
 """
 
-import base64
 import logging
-import os
 import random
 import sys
 from datetime import datetime, timezone
@@ -18,7 +16,7 @@ from typing import Optional, List, Tuple
 from utils.schemas import MinesweeperGame
 from utils.session import get_session
 from utils.models import MinesweeperGameModel
-from utils import rolling
+from utils import assets, rolling
 from settings.constants import MINESWEEPER_MINE_COUNT, MINESWEEPER_CLAIM_POINT_COUNT
 
 logger = logging.getLogger(__name__)
@@ -27,6 +25,8 @@ logger = logging.getLogger(__name__)
 GRID_SIZE = 9  # 3x3 grid
 SAFE_REVEALS_REQUIRED = 3  # Number of safe cells to reveal to win
 DEBUG_MODE = "--debug" in sys.argv  # Keep sys.argv check for backward compatibility
+CLAIM_ICON_ASSET = "slots/claim_icon"
+MINE_ICON_ASSET = "minesweeper/mine_icon"
 
 
 def set_debug_mode(debug: bool) -> None:
@@ -40,40 +40,15 @@ def set_debug_mode(debug: bool) -> None:
     DEBUG_MODE = debug
 
 
-def get_minesweeper_icons() -> Tuple[Optional[str], Optional[str]]:
+def get_minesweeper_icon_urls() -> Tuple[Optional[str], Optional[str]]:
     """
-    Load minesweeper game icons (claim point and mine).
+    Get fingerprinted static URLs of the minesweeper icons.
 
     Returns:
-        Tuple of (claim_point_icon_b64, mine_icon_b64)
-        Either or both can be None if loading fails
+        Tuple of (claim_point_icon_url, mine_icon_url)
+        Either or both can be None if the asset is missing
     """
-    claim_point_icon = None
-    mine_icon = None
-
-    # Load claim point icon from slots directory
-    try:
-        claim_icon_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), "data", "slots", "claim_icon.png"
-        )
-        with open(claim_icon_path, "rb") as f:
-            claim_icon_bytes = f.read()
-            claim_point_icon = base64.b64encode(claim_icon_bytes).decode("utf-8")
-    except Exception as e:
-        logger.warning(f"Failed to load claim icon: {e}")
-
-    # Load mine icon from minesweeper directory
-    try:
-        mine_icon_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), "data", "minesweeper", "mine_icon.png"
-        )
-        with open(mine_icon_path, "rb") as f:
-            mine_icon_bytes = f.read()
-            mine_icon = base64.b64encode(mine_icon_bytes).decode("utf-8")
-    except Exception as e:
-        logger.warning(f"Failed to load mine icon: {e}")
-
-    return claim_point_icon, mine_icon
+    return assets.asset_url(CLAIM_ICON_ASSET), assets.asset_url(MINE_ICON_ASSET)
 
 
 def get_source_icon(source_type: str, source_id: int) -> Optional[str]:
@@ -92,19 +67,15 @@ def get_source_icon(source_type: str, source_id: int) -> Optional[str]:
 
     normalized_type = (source_type or "").strip().lower()
 
+    icon = None
     if normalized_type == "user":
-        user = user_repo.get_user(source_id)
-        if user:
-            if user.slot_icon_b64:
-                return user.slot_icon_b64
+        icon = user_repo.get_slot_icon_b64(source_id)
     elif normalized_type == "character":
-        character = character_repo.get_character_by_id(source_id)
-        if character:
-            if character.slot_icon_b64:
-                return character.slot_icon_b64
+        icon = character_repo.get_slot_icon_b64(source_id)
 
-    logger.warning(f"No icon found for source {source_type}:{source_id}")
-    return None
+    if not icon:
+        logger.warning(f"No icon found for source {source_type}:{source_id}")
+    return icon
 
 
 def generate_mine_positions(n: int = 2) -> List[int]:
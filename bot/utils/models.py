@@ -11,9 +11,11 @@ import html
 from typing import Optional, List, TYPE_CHECKING
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     BigInteger,
     CheckConstraint,
+    Date,
     DateTime,
     Float,
     ForeignKey,
@@ -21,12 +23,15 @@ from sqlalchemy import (
     Index,
     Integer,
     LargeBinary,
+    Sequence,
     String,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.event import listen
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -39,6 +44,11 @@ class Base(DeclarativeBase):
     pass
 
 
+# Shared by every slot icon version column: a value is never reused, so an
+# icon that is deleted and recreated cannot reproduce an old bundle version
+ICON_VERSION_SEQ = Sequence("icon_version_seq", metadata=Base.metadata)
+
+
 class CardModel(Base):
     """Represents a gacha card in the database."""
 
@@ -102,6 +112,13 @@ class CardModel(Base):
         Index("idx_cards_rarity", "rarity"),
         Index("idx_cards_season_id", "season_id"),
         Index("idx_cards_season_user", "season_id", "user_id"),
+        Index(
+            "idx_cards_chat_season_owned",
+            "chat_id",
+            "season_id",
+            "id",
+            postgresql_where=text("owner IS NOT NULL"),
+        ),
     )
 
     def title(self, include_id: bool = False, include_rarity: bool = False) -> str:
@@ -160,6 +177,11 @@ class UserModel(Base):
     display_name: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     profile_image: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
     slot_icon: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # Renewed from ICON_VERSION_SEQ on every slot_icon write; slot symbol
+    # bundles are versioned by it
+    slot_icon_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=ICON_VERSION_SEQ.next_value()
+    )
 
     # Relationship to chat memberships
     chat_memberships: Mapped[List["ChatModel"]] = relationship(
@@ -242,6 +264,11 @@ class CharacterModel(Base):
     name: Mapped[str] = mapped_column(Text, nullable=False)
     image: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
     slot_icon: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # Renewed from ICON_VERSION_SEQ on every slot_icon write; slot symbol
+    # bundles are versioned by it
+    slot_icon_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=ICON_VERSION_SEQ.next_value()
+    )
 
     __table_args__ = (Index("ix_characters_chat_id", "chat_id"),)
 
@@ -317,6 +344,11 @@ class SetIconModel(Base):
     set_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     season_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, default=0)
     icon: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Renewed from ICON_VERSION_SEQ on every icon write; the set symbol
+    # bundle is versioned by it
+    icon_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=ICON_VERSION_SEQ.next_value()
+    )
 
     aspect_set: Mapped[Optional["SetModel"]] = relationship(
         "SetModel", back_populates="icon"
@@ -394,7 +426,13 @@ class RideTheBusGameModel(Base):
 
 
 class EventModel(Base):
-    """Represents a telemetry event for logging and analytics."""
+    """Represents a telemetry event for logging and analytics.
+
+    Range-partitioned by month on ``timestamp`` (``events_YYYY_MM`` plus the
+    ``events_default`` catch-all), so the primary key includes ``timestamp``.
+    Partitions are created and retired by ``repos.event_partition_repo``;
+    per-hour/day counts live in the rollup tables below.
+    """
 
     __tablename__ = "events"
 
@@ -405,7 +443,9 @@ class EventModel(Base):
     chat_id: Mapped[str] = mapped_column(Text, nullable=False)
     card_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     aspect_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
-    timestamp: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    timestamp: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
     payload: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
 
     __table_args__ = (
@@ -414,6 +454,54 @@ class EventModel(Base):
         Index("idx_events_chat_timestamp", "chat_id", "timestamp"),
         Index("idx_events_card_id", "card_id"),
         Index("idx_events_aspect_id", "aspect_id"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
+
+# A partitioned table without partitions rejects every insert; schemas created
+# from the models (fresh databases) get the catch-all partition straight away.
+listen(
+    EventModel.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS events_default PARTITION OF events DEFAULT"),
+)
+
+
+class EventRollupHourlyModel(Base):
+    """Event counts per hour, event type, outcome and chat.
+
+    Incremented in the same transaction as each event insert, so it always
+    matches ``events``, and it keeps counting for partitions that retention
+    has detached or dropped.
+    """
+
+    __tablename__ = "event_rollups_hourly"
+
+    bucket: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    event_type: Mapped[str] = mapped_column(Text, primary_key=True)
+    outcome: Mapped[str] = mapped_column(Text, primary_key=True)
+    chat_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("idx_event_rollups_hourly_type_bucket", "event_type", "outcome", "bucket"),
+    )
+
+
+class EventRollupDailyModel(Base):
+    """Event counts per UTC day, event type, outcome and chat (see the hourly rollup)."""
+
+    __tablename__ = "event_rollups_daily"
+
+    day: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    event_type: Mapped[str] = mapped_column(Text, primary_key=True)
+    outcome: Mapped[str] = mapped_column(Text, primary_key=True)
+    chat_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("idx_event_rollups_daily_type_day", "event_type", "outcome", "day"),
+        Index("idx_event_rollups_daily_chat_day", "chat_id", "day"),
     )
 
 
@@ -477,6 +565,9 @@ class AspectDefinitionModel(Base):
             ["sets.id", "sets.season_id"],
             name="fk_aspect_definitions_set_season",
         ),
+        UniqueConstraint(
+            "name", "set_id", "season_id", name="uq_aspect_definitions_name_set_season"
+        ),
         Index("idx_aspect_definitions_set_season", "set_id", "season_id"),
         Index("idx_aspect_definitions_rarity", "rarity"),
         Index("idx_aspect_definitions_name", "name"),
@@ -691,6 +782,33 @@ class AspectCountModel(Base):
     )
 
 
+class AspectDefinitionStatsModel(Base):
+    """Denormalized per-definition usage counters for the admin catalog.
+
+    Maintained incrementally from the event pipeline (see
+    ``utils.aspect_definition_stats``).  ``owned_count`` and
+    ``equipped_count`` mirror the current ``owned_aspects`` /
+    ``card_aspects`` rows and can be rebuilt from them; ``burned_count`` and
+    ``recycled_count`` are cumulative and only exist here.
+    """
+
+    __tablename__ = "aspect_definition_stats"
+
+    definition_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("aspect_definitions.id", ondelete="CASCADE"), primary_key=True
+    )
+    season_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    owned_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    equipped_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    burned_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    recycled_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (Index("idx_aspect_definition_stats_season", "season_id"),)
+
+
 class AdminUserModel(Base):
     """Admin user for the modifier management dashboard.
 
@@ -774,3 +892,42 @@ class RollNotificationModel(Base):
     __table_args__ = (
         Index("idx_roll_notifications_pending", "sent", "notify_at"),
     )
+
+
+class RateLimitCounterModel(Base):
+    """Fixed-window API rate limit counters shared by every API worker.
+
+    ``UNLOGGED``: counters are not worth WAL traffic and losing them on a
+    crash only resets the current windows.
+    """
+
+    __tablename__ = "rate_limit_counters"
+
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    __table_args__ = (
+        Index("idx_rate_limit_counters_expires_at", "expires_at"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+
+class BackfillCheckpointModel(Base):
+    """Resume point of a chunked maintenance backfill (see ``tools/``).
+
+    Written in the same transaction as the data it covers, so a resumed run
+    never applies a chunk twice.  ``end_event_id`` pins the last event the run
+    covers; later events are left to the live listeners.
+    """
+
+    __tablename__ = "backfill_checkpoints"
+
+    name: Mapped[str] = mapped_column(Text, primary_key=True)
+    last_event_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    end_event_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
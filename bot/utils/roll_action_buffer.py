@@ -18,9 +18,13 @@ click order. Ordering key is ``(update_id, server_receipt_ns)``:
 * ``server_receipt_ns`` is only a tiebreaker for updates arriving in the
   same Telegram batch with equal IDs (shouldn't happen, but defensive).
 
-The buffer lives on ``application.bot_data`` and is safe in-process:
-the ``bot`` service runs as a single process (the ``api`` service's 5
-Gunicorn workers do NOT receive Telegram updates).
+The buffer lives on ``application.bot_data``. Each drain holds the
+``roll-action:<roll_key>`` lock of the coordination backend
+(``utils.coordination``), so when several bot workers run against one
+database (``COORDINATION_BACKEND = "postgres"``) no two of them process the
+same roll concurrently. Click ordering is per worker, so callbacks for one
+chat must be routed to one worker (the ``api`` service's Gunicorn workers do
+NOT receive Telegram updates).
 """
 
 from __future__ import annotations
@@ -34,6 +38,7 @@ from typing import Any, Awaitable, Callable, Literal, Optional
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from utils.coordination import CoordinationBackend, InMemoryCoordinationBackend, get_backend
 from utils.schemas import User
 
 logger = logging.getLogger(__name__)
@@ -77,10 +82,13 @@ class _RollSlot:
 class RollActionBuffer:
     """Per-``roll_key`` fair-ordering buffer for claim/lock/reroll callbacks."""
 
-    def __init__(self, window_ms: int = 250) -> None:
+    def __init__(
+        self, window_ms: int = 250, backend: Optional[CoordinationBackend] = None
+    ) -> None:
         self._window_ns = window_ms * 1_000_000
         self._slots: dict[str, _RollSlot] = {}
         self._lock = asyncio.Lock()
+        self._backend = backend or InMemoryCoordinationBackend()
 
     async def submit(self, pending: PendingAction) -> bool:
         """Enqueue a pending action. Returns ``False`` if dropped as duplicate.
@@ -157,35 +165,10 @@ class RollActionBuffer:
                     break
                 await asyncio.sleep(remaining_ns / 1_000_000_000)
 
-            # Phase 2: drain in order. New clicks arriving while we run this loop
-            # are appended to slot.queue and will be processed in subsequent
-            # iterations (re-sorted each time) without overlap.
-            while True:
-                async with self._lock:
-                    slot = self._slots.get(roll_key)
-                    if slot is None or not slot.queue:
-                        # All done — clean up the slot entirely so a fresh
-                        # window starts for the next click.
-                        if slot is not None:
-                            self._slots.pop(roll_key, None)
-                        return
-                    slot.queue.sort(key=lambda p: p.sort_key)
-                    self._log_drain_order(roll_key, slot)
-                    next_action = slot.queue.pop(0)
-
-                # Process outside the buffer lock so other clicks can still enqueue.
-                # Dedup key stays registered for the duration of processing, so a
-                # user clicking while their own previous click is in-flight gets
-                # silently dropped (matches the old @prevent_concurrency behavior).
-                try:
-                    await self._invoke(next_action)
-                finally:
-                    async with self._lock:
-                        slot2 = self._slots.get(roll_key)
-                        if slot2 is not None:
-                            slot2.dedup_keys.discard(
-                                (next_action.user.user_id, next_action.action)
-                            )
+            # Phase 2: drain in order, holding the roll's coordination lock so no
+            # other worker drains the same roll at the same time.
+            async with self._backend.hold(f"roll-action:{roll_key}"):
+                await self._drain_in_order(roll_key)
         except Exception:
             logger.exception("Drain loop crashed for %s", roll_key)
             # Fail any remaining futures so callers don't hang forever.
@@ -196,6 +179,40 @@ class RollActionBuffer:
                         if not p.future.done():
                             p.future.set_exception(RuntimeError("drain-loop-crashed"))
 
+    async def _drain_in_order(self, roll_key: str) -> None:
+        """Process queued entries in sort-key order until the slot is empty.
+
+        New clicks arriving while we run this loop are appended to
+        ``slot.queue`` and processed in subsequent iterations (re-sorted
+        each time) without overlap.
+        """
+        while True:
+            async with self._lock:
+                slot = self._slots.get(roll_key)
+                if slot is None or not slot.queue:
+                    # All done — clean up the slot entirely so a fresh
+                    # window starts for the next click.
+                    if slot is not None:
+                        self._slots.pop(roll_key, None)
+                    return
+                slot.queue.sort(key=lambda p: p.sort_key)
+                self._log_drain_order(roll_key, slot)
+                next_action = slot.queue.pop(0)
+
+            # Process outside the buffer lock so other clicks can still enqueue.
+            # Dedup key stays registered for the duration of processing, so a
+            # user clicking while their own previous click is in-flight gets
+            # silently dropped (matches the old @prevent_concurrency behavior).
+            try:
+                await self._invoke(next_action)
+            finally:
+                async with self._lock:
+                    slot2 = self._slots.get(roll_key)
+                    if slot2 is not None:
+                        slot2.dedup_keys.discard(
+                            (next_action.user.user_id, next_action.action)
+                        )
+
     def _log_drain_order(self, roll_key: str, slot: _RollSlot) -> None:
         first = slot.first_seen_ns or 0
         parts = []
@@ -272,6 +289,9 @@ def get_buffer(bot_data: dict[str, Any]) -> RollActionBuffer:
         # Import here to avoid a circular import at module load time.
         from settings.constants import ROLL_ACTION_BUFFER_WINDOW_MS
 
-        buf = RollActionBuffer(window_ms=ROLL_ACTION_BUFFER_WINDOW_MS)
+        buf = RollActionBuffer(
+            window_ms=ROLL_ACTION_BUFFER_WINDOW_MS,
+            backend=get_backend(bot_data),
+        )
         bot_data[_BOT_DATA_KEY] = buf
     return buf
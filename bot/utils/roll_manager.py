@@ -7,6 +7,11 @@ construction, state queries, and claim/lock/reroll delegation.
 Claim logic is fully delegated to the service layer (atomic
 ``card_service.try_claim_card`` / ``aspect_service.try_claim_aspect``),
 so there is **no** multi-transaction race-condition window.
+
+State is read from a :class:`~utils.schemas.RollSnapshot` — the roll row
+joined with the active and original items' metadata in a single query (no
+image data).  The snapshot is cached on the manager and only reloaded after
+one of its own mutations, so a caption + keyboard pass costs one query.
 """
 
 from __future__ import annotations
@@ -45,8 +50,10 @@ from repos import rolled_card_repo
 from repos import rolled_aspect_repo
 from repos import aspect_repo
 from managers import card_manager
+from managers import card_pool_manager
 from managers import aspect_manager
-from utils.schemas import CardWithImage, OwnedAspect, RolledCard, RolledAspect
+from utils import roll_state
+from utils.schemas import RollItemSummary, RollSnapshot, RolledCard, RolledAspect
 
 logger = logging.getLogger(__name__)
 
@@ -104,35 +111,57 @@ class RollManager:
                  ``rolled_aspects`` table.
     """
 
-    def __init__(self, roll_type: Literal["card", "aspect"], roll_id: int):
+    def __init__(
+        self,
+        roll_type: Literal["card", "aspect"],
+        roll_id: int,
+        snapshot: Optional[RollSnapshot] = None,
+    ):
         self.roll_type = roll_type
         self.roll_id = roll_id
+        # A caller that already holds current state (e.g. the claim countdown)
+        # can pass it in to render captions without touching the database.
+        self._snapshot: Optional[RollSnapshot] = snapshot
+        self._snapshot_loaded = snapshot is not None
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @property
+    def snapshot(self) -> Optional[RollSnapshot]:
+        """Roll state, loaded on first access and cached until a mutation."""
+        if not self._snapshot_loaded:
+            if self.roll_type == "card":
+                self._snapshot = rolled_card_repo.get_roll_snapshot(self.roll_id)
+            else:
+                self._snapshot = rolled_aspect_repo.get_roll_snapshot(self.roll_id)
+            self._snapshot_loaded = True
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot so the next read reloads it."""
+        self._snapshot = None
+        self._snapshot_loaded = False
+
+    def _after_mutation(self) -> None:
+        """Invalidate the snapshot and notify a waiting claim countdown, if any."""
+        self.invalidate()
+        if roll_state.is_tracked(self.roll_type, self.roll_id):
+            roll_state.publish(self.roll_type, self.roll_id, self.snapshot)
+
     def _get_rolled(self) -> Optional[RolledCard | RolledAspect]:
-        if self.roll_type == "card":
-            return rolled_card_repo.get_rolled_card_by_roll_id(self.roll_id)
-        return rolled_aspect_repo.get_rolled_aspect_by_roll_id(self.roll_id)
+        snapshot = self.snapshot
+        return snapshot.rolled if snapshot else None
 
-    def _get_item(self):
-        """Return the active card or aspect schema, or None."""
-        rolled = self._get_rolled()
-        if rolled is None:
-            return None
-        if self.roll_type == "card":
-            return card_repo.get_card(rolled.current_card_id)
-        return aspect_repo.get_aspect_by_id(rolled.current_aspect_id)
+    def _get_item(self) -> Optional[RollItemSummary]:
+        """Return the active card or aspect summary, or None."""
+        snapshot = self.snapshot
+        return snapshot.item if snapshot else None
 
-    def _get_original_item(self):
-        rolled = self._get_rolled()
-        if rolled is None:
-            return None
-        if self.roll_type == "card":
-            return card_repo.get_card(rolled.original_card_id)
-        return aspect_repo.get_aspect_by_id(rolled.original_aspect_id)
+    def _get_original_item(self) -> Optional[RollItemSummary]:
+        snapshot = self.snapshot
+        return snapshot.original_item if snapshot else None
 
     # Callback prefixes
     @property
@@ -194,9 +223,8 @@ class RollManager:
         return rolled is not None and bool(rolled.rerolled)
 
     def is_reroll_expired(self) -> bool:
-        if self.roll_type == "card":
-            return rolled_card_repo.is_rolled_card_reroll_expired(self.roll_id)
-        return rolled_aspect_repo.is_rolled_aspect_reroll_expired(self.roll_id)
+        snapshot = self.snapshot
+        return snapshot is None or snapshot.is_reroll_expired()
 
     def can_user_reroll(self, user_id: int) -> bool:
         rolled = self._get_rolled()
@@ -273,6 +301,7 @@ class RollManager:
                 chat_id=chat_id,
                 claim_cost=claim_cost,
             )
+        self._after_mutation()
 
         if not claimed:
             # Check if user already owns it (double-click)
@@ -355,6 +384,7 @@ class RollManager:
             rolled_card_repo.set_rolled_card_being_rerolled(self.roll_id, being_rerolled)
         else:
             rolled_aspect_repo.set_rolled_aspect_being_rerolled(self.roll_id, being_rerolled)
+        self._after_mutation()
 
     def mark_rerolled(
         self,
@@ -373,43 +403,42 @@ class RollManager:
                 new_item_id,
                 original_rarity,
             )
+        self._after_mutation()
 
     def set_locked(self, is_locked: bool) -> None:
         if self.roll_type == "card":
             rolled_card_repo.set_rolled_card_locked(self.roll_id, is_locked)
         else:
             rolled_aspect_repo.set_rolled_aspect_locked(self.roll_id, is_locked)
+        self._after_mutation()
 
     def add_claim_attempt(self, username: str) -> None:
         if self.roll_type == "card":
             rolled_card_repo.update_rolled_card_attempted_by(self.roll_id, username)
         else:
             rolled_aspect_repo.update_rolled_aspect_attempted_by(self.roll_id, username)
+        self._after_mutation()
 
     # ------------------------------------------------------------------
     # Caption generation
     # ------------------------------------------------------------------
 
-    def _card_base_caption(self, card: CardWithImage) -> str:
+    def _card_base_caption(self, card: RollItemSummary) -> str:
         return CARD_CAPTION_BASE.format(
             card_id=card.id,
             card_title=card.title(),
             rarity=card.rarity,
         )
 
-    def _aspect_base_caption(self, aspect: OwnedAspect) -> str:
+    def _aspect_base_caption(self, aspect: RollItemSummary) -> str:
         return ASPECT_CAPTION_BASE.format(
             aspect_id=aspect.id,
-            aspect_name=aspect.display_name,
+            aspect_name=aspect.name,
             rarity=aspect.rarity,
-            set_name=(
-                aspect.aspect_definition.set_name
-                if aspect.aspect_definition and aspect.aspect_definition.set_name
-                else ""
-            ).title(),
+            set_name=(aspect.set_name or "").title(),
         )
 
-    def _base_caption(self, item) -> str:
+    def _base_caption(self, item: RollItemSummary) -> str:
         if self.roll_type == "card":
             return self._card_base_caption(item)
         return self._aspect_base_caption(item)
@@ -613,6 +642,7 @@ class RollManager:
             )
             new_item_id = card_repo.add_card_from_generated(generated, chat_id)
             card_repo.delete_card(old_item_id)
+            card_pool_manager.invalidate(chat_id)
             self.mark_rerolled(new_item_id, original_rarity)
 
             return RerollResult(
@@ -639,6 +669,7 @@ class RollManager:
                 max_retries,
                 source=source,
             )
+            old_aspect = aspect_repo.get_aspect_by_id(old_item_id)
             aspect_repo.delete_aspect(old_item_id)
             self.mark_rerolled(generated.aspect_id, original_rarity)
 
@@ -654,6 +685,9 @@ class RollManager:
                     "type": "aspect",
                     "aspect_name": generated.aspect_name,
                     "aspect_definition_id": generated.aspect_definition_id,
+                    "old_aspect_definition_id": (
+                        old_aspect.aspect_definition_id if old_aspect else None
+                    ),
                 },
             )
 
@@ -0,0 +1,104 @@
+"""In-process registry of roll state for claim countdowns.
+
+``process_claim_countdown`` used to rebuild a ``RollManager`` and query the
+database two or three times per rotation tick to learn whether the roll had
+been claimed or rerolled in the meantime.  Instead, the countdown registers
+the roll here with its initial ``RollSnapshot`` and waits on an
+``asyncio.Event``; ``RollManager`` publishes a fresh snapshot after each of
+its mutations (claim, lock, reroll) while a countdown is tracking the roll.
+Ticks therefore read cached state only, and a claim wakes the countdown
+immediately instead of at the next poll.
+
+Mutations usually run in worker threads (``asyncio.to_thread``), so
+publishing hands the update to the countdown's event loop with
+``call_soon_threadsafe``.  Like ``RollActionBuffer`` this relies on the bot
+service handling all roll callbacks of a chat in one process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+from utils.schemas import RollSnapshot
+
+logger = logging.getLogger(__name__)
+
+RollKey = Tuple[str, int]
+
+
+class TrackedRoll:
+    """Latest known snapshot of a roll plus an event set whenever it changes."""
+
+    def __init__(self, snapshot: Optional[RollSnapshot]):
+        self.snapshot = snapshot
+        self.loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+
+    @property
+    def is_claimable(self) -> bool:
+        """True while the active item exists, is unowned, and is not being rerolled."""
+        snapshot = self.snapshot
+        return (
+            snapshot is not None
+            and snapshot.item is not None
+            and snapshot.item.owner is None
+            and not snapshot.rolled.being_rerolled
+        )
+
+    def _update(self, snapshot: Optional[RollSnapshot]) -> None:
+        self.snapshot = snapshot
+        self._changed.set()
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; return True early if the roll changed."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+
+_tracked: Dict[RollKey, TrackedRoll] = {}
+
+
+def track(roll_type: str, roll_id: int, snapshot: Optional[RollSnapshot]) -> TrackedRoll:
+    """Start tracking a roll (call from the event loop). Replaces any previous entry."""
+    entry = TrackedRoll(snapshot)
+    _tracked[(roll_type, roll_id)] = entry
+    return entry
+
+
+def untrack(roll_type: str, roll_id: int, entry: TrackedRoll) -> None:
+    """Stop tracking a roll, unless a newer countdown has replaced ``entry``."""
+    key = (roll_type, roll_id)
+    if _tracked.get(key) is entry:
+        del _tracked[key]
+
+
+def is_tracked(roll_type: str, roll_id: int) -> bool:
+    """Return True if a countdown is currently waiting on this roll."""
+    return (roll_type, roll_id) in _tracked
+
+
+def publish(roll_type: str, roll_id: int, snapshot: Optional[RollSnapshot]) -> None:
+    """Record a roll's new state and wake its countdown. Safe from any thread."""
+    entry = _tracked.get((roll_type, roll_id))
+    if entry is None:
+        return
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is entry.loop:
+        entry._update(snapshot)
+        return
+    try:
+        entry.loop.call_soon_threadsafe(entry._update, snapshot)
+    except RuntimeError:
+        # Loop already closed (shutdown); nothing is waiting any more.
+        logger.debug("Dropping roll state update for %s:%s", roll_type, roll_id)
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from typing import List, Literal, Optional
 
 from settings.constants import CURRENT_SEASON, RARITIES, ROLL_TYPE_WEIGHTS
+from managers import chat_context_manager
 from repos import user_repo
 from repos import character_repo
 from repos import aspect_repo
@@ -79,47 +80,28 @@ class RollResult:
 
 
 def select_random_source_with_image(chat_id: str) -> Optional[SelectedProfile]:
-    """Pick a random source (user or character) that can be used for card generation."""
-    # Get all eligible users from the chat
-    eligible_users = user_repo.get_all_chat_users_with_profile(chat_id)
+    """Pick a random source (user or character) that can be used for card generation.
 
-    # Create SelectedProfile objects for all eligible users
-    user_profiles = []
-    for user in eligible_users:
-        display_name = (user.display_name or "").strip()
-        profile_image = (user.profile_image_b64 or "").strip()
-
-        if display_name and profile_image:
-            user_profiles.append(
-                SelectedProfile(
-                    name=display_name,
-                    image_b64=profile_image,
-                    source_type="user",
-                    source_id=user.user_id,
-                    user=user,
-                )
-            )
-
-    # Get all characters for this chat and create SelectedProfile objects
-    characters = character_repo.get_characters_by_chat(chat_id)
-    character_profiles = [
-        SelectedProfile(
-            name=char.name,
-            image_b64=char.image_b64,
-            source_type="character",
-            source_id=char.id,
-            character=char,
-        )
-        for char in characters
-    ]
-
-    # Combine all profiles
-    all_profiles = user_profiles + character_profiles
+    Candidates come from the cached chat context (IDs and names only), so
+    only the chosen profile's image is loaded.  If the cached candidate no
+    longer qualifies, the context is reloaded and the draw repeated once.
+    """
+    for _ in range(2):
+        sources = chat_context_manager.get_profile_sources(chat_id)
+        if not sources:
+            return None
 
-    if not all_profiles:
-        return None
+        source = random.choice(sources)
+        try:
+            return get_profile_for_source(source.source_type, source.source_id)
+        except (InvalidSourceError, NoEligibleUserError):
+            logger.debug(
+                "Cached profile source %s %s is stale for chat %s",
+                source.source_type, source.source_id, chat_id,
+            )
+            chat_context_manager.invalidate(chat_id)
 
-    return random.choice(all_profiles)
+    return None
 
 
 def get_random_rarity(source: Optional[str] = None) -> str:
@@ -417,9 +399,9 @@ def generate_aspect_for_chat(
             import base64 as _b64
 
             image_bytes = _b64.b64decode(image_b64)
-            from utils.image import ImageUtil
+            from utils import image_workers
 
-            thumbnail_bytes = ImageUtil.compress_to_fraction(image_bytes)
+            thumbnail_bytes = image_workers.run("compress_to_fraction", image_bytes)
 
             aspect_id = aspect_repo.add_owned_aspect(
                 aspect_definition_id=aspect_def.id,
@@ -9,9 +9,9 @@ from __future__ import annotations
 import base64
 import datetime
 import html
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class User(BaseModel):
@@ -326,6 +326,19 @@ class Megaspins(BaseModel):
         )
 
 
+class SpinConsumption(BaseModel):
+    """Result of an atomic spin or megaspin consumption.
+
+    ``spins_remaining`` is the regular spin balance after the operation (None
+    for megaspin consumption, which does not touch the regular balance) and
+    ``megaspins`` is the megaspin progress after the operation.
+    """
+
+    success: bool
+    spins_remaining: Optional[int] = None
+    megaspins: Megaspins
+
+
 class MinesweeperGame(BaseModel):
     """Minesweeper game state data transfer object."""
 
@@ -469,6 +482,45 @@ class Event(BaseModel):
         )
 
 
+class EventRollup(BaseModel):
+    """Event count for one hour or day, event type, outcome and chat."""
+
+    model_config = ConfigDict(frozen=True)
+
+    bucket: datetime.datetime  # Start of the hour or (UTC) day
+    event_type: str
+    outcome: str
+    chat_id: str
+    count: int
+
+
+class EventPartition(BaseModel):
+    """A monthly partition of the ``events`` table (or the default partition)."""
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    start: Optional[datetime.datetime] = None  # None for the default partition
+    end: Optional[datetime.datetime] = None
+    attached: bool = True
+    estimated_rows: int = 0
+
+    @property
+    def is_default(self) -> bool:
+        return self.start is None
+
+
+class BackfillCheckpoint(BaseModel):
+    """Progress of a chunked backfill: events ``<= last_event_id`` are applied."""
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    last_event_id: int
+    end_event_id: int
+    updated_at: datetime.datetime
+
+
 class Achievement(BaseModel):
     """Achievement data transfer object."""
 
@@ -615,6 +667,37 @@ class AspectDefinition(BaseModel):
         )
 
 
+class AspectDefinitionUpsert(BaseModel):
+    """Outcome of one row of ``aspect_repo.bulk_upsert_aspect_definitions``."""
+
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    set_id: int
+    name: str
+    rarity: str
+    inserted: bool  # False: an existing definition was updated
+
+
+class AspectDefinitionStats(BaseModel):
+    """An aspect definition with its ``aspect_definition_stats`` counters."""
+
+    model_config = ConfigDict(frozen=True)
+
+    definition_id: int
+    name: str
+    rarity: str
+    set_id: int
+    season_id: int
+    type_id: Optional[int] = None
+    created_at: Optional[datetime.datetime] = None
+    owned_count: int = 0
+    equipped_count: int = 0
+    burned_count: int = 0
+    recycled_count: int = 0
+    updated_at: Optional[datetime.datetime] = None  # None: no counters recorded yet
+
+
 class OwnedAspect(BaseModel):
     """Owned aspect instance data transfer object (without image data)."""
 
@@ -672,27 +755,19 @@ class OwnedAspect(BaseModel):
         )
 
 
-class OwnedAspectWithImage(OwnedAspect):
-    """Owned aspect instance with base64-encoded sphere image data."""
+class EquippedAspectImage(OwnedAspect):
+    """Aspect equipped on a card, with its slot and raw sphere image bytes.
 
-    image_b64: str = ""
-    thumbnail_b64: str = ""
+    Used as image-generation input, so the image is kept as bytes rather
+    than base64.
+    """
 
-    def get_media(self):
-        """Return file_id if available, otherwise return decoded base64 image data."""
-        if self.file_id:
-            return self.file_id
-        return base64.b64decode(self.image_b64)
+    order: int
+    image: bytes
 
     @classmethod
-    def from_orm(cls, aspect_orm) -> "OwnedAspectWithImage":
-        """Convert an OwnedAspectModel (with eager-loaded image) to schema."""
-        image_bytes = aspect_orm.image.image if aspect_orm.image else None
-        thumbnail_bytes = aspect_orm.image.thumbnail if aspect_orm.image else None
-        image_b64 = base64.b64encode(image_bytes).decode("utf-8") if image_bytes else ""
-        thumbnail_b64 = base64.b64encode(thumbnail_bytes).decode("utf-8") if thumbnail_bytes else ""
-
-        # Resolve display name
+    def from_orm(cls, aspect_orm, order: int, image: bytes) -> "EquippedAspectImage":
+        """Convert an OwnedAspectModel plus its slot and image bytes to schema."""
         display_name = aspect_orm.name or ""
         aspect_def = None
         if aspect_orm.aspect_definition is not None:
@@ -714,8 +789,8 @@ class OwnedAspectWithImage(OwnedAspect):
             created_at=aspect_orm.created_at,
             display_name=display_name,
             aspect_definition=aspect_def,
-            image_b64=image_b64,
-            thumbnail_b64=thumbnail_b64,
+            order=order,
+            image=image,
         )
 
 
@@ -789,6 +864,55 @@ class RolledAspect(BaseModel):
         )
 
 
+# Rerolls are only offered within this many seconds of the roll.
+REROLL_WINDOW_SECONDS = 5 * 60
+
+
+class RollItemSummary(BaseModel):
+    """Metadata of a rolled card or aspect needed for captions and checks (no image data)."""
+
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    rarity: str
+    owner: Optional[str] = None
+    user_id: Optional[int] = None
+    chat_id: Optional[str] = None
+    name: str = ""  # Card base name, or resolved aspect display name
+    modifier: Optional[str] = None  # Cards only
+    set_name: Optional[str] = None  # Aspects only
+
+    def title(self, include_id: bool = False, include_rarity: bool = False) -> str:
+        """Return the item's title, matching ``Card.title`` / ``OwnedAspect.title``."""
+        parts: list[str] = []
+        if include_id:
+            parts.append(f"[{self.id}]")
+        if include_rarity:
+            parts.append(self.rarity.capitalize())
+        if self.modifier:
+            parts.append(self.modifier)
+        parts.append(self.name)
+        return html.escape(" ".join(parts).strip())
+
+
+class RollSnapshot(BaseModel):
+    """Immutable view of a roll and its active/original items, loaded in one query."""
+
+    model_config = ConfigDict(frozen=True)
+
+    rolled: Union[RolledCard, RolledAspect]
+    item: Optional[RollItemSummary] = None
+    original_item: Optional[RollItemSummary] = None
+
+    def is_reroll_expired(self) -> bool:
+        """Return True once the reroll window has passed."""
+        created_at = self.rolled.created_at
+        if created_at is None:
+            return True
+        elapsed = datetime.datetime.now(datetime.timezone.utc) - created_at
+        return elapsed.total_seconds() > REROLL_WINDOW_SECONDS
+
+
 class AdminUser(BaseModel):
     """Admin user data transfer object (excludes sensitive fields)."""
 
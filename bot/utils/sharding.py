@@ -0,0 +1,22 @@
+"""Chat sharding for the multi-worker bot.
+
+With ``BOT_WORKERS > 1`` the dispatcher (``core/workers.py``) routes every
+Telegram update to the worker process that owns its chat, so all updates of
+one chat are handled by one process.  The mapping is a stable hash of the
+chat id (``zlib.crc32``, not ``hash()``, which is salted per process), so
+the mapping never changes between runs of the dispatcher.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Union
+
+ChatId = Union[int, str]
+
+
+def shard_for_chat(chat_id: ChatId, worker_count: int) -> int:
+    """Return the index of the worker that owns ``chat_id``."""
+    if worker_count <= 1:
+        return 0
+    return zlib.crc32(str(chat_id).encode("utf-8")) % worker_count
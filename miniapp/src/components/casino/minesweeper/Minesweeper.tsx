@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useCallback, useRef } from 'react';
-import { ApiService } from '@/services/api';
+import { ApiService, resolveAssetUrl } from '@/services/api';
 import { TelegramUtils } from '@/utils/telegram';
 import { CardGrid, CardModal } from '@/components/cards';
 import { Title, ActionPanel } from '@/components/common';
@@ -28,8 +28,8 @@ interface GameData {
   minePositions?: number[] | null;
   claimPointPositions?: number[] | null;
   cardIcon?: string | null;
-  claimPointIcon?: string | null;
-  mineIcon?: string | null;
+  claimPointIconUrl?: string | null;
+  mineIconUrl?: string | null;
   nextRefreshTime?: string | null;
   playerRevealedCells: number[];
 }
@@ -116,8 +116,8 @@ const Minesweeper: React.FC<MinesweeperProps> = ({ chatId, initData, onClaimPoin
             minePositions: existingGame.mine_positions,
             claimPointPositions: existingGame.claim_point_positions,
             cardIcon: existingGame.card_icon,
-            claimPointIcon: existingGame.claim_point_icon,
-            mineIcon: existingGame.mine_icon,
+            claimPointIconUrl: existingGame.claim_point_icon_url,
+            mineIconUrl: existingGame.mine_icon_url,
             nextRefreshTime: existingGame.next_refresh_time,
             playerRevealedCells: existingGame.revealed_cells ?? []
           });
@@ -205,8 +205,8 @@ const Minesweeper: React.FC<MinesweeperProps> = ({ chatId, initData, onClaimPoin
         minePositions: newGame.mine_positions,
         claimPointPositions: newGame.claim_point_positions,
         cardIcon: newGame.card_icon,
-        claimPointIcon: newGame.claim_point_icon,
-        mineIcon: newGame.mine_icon,
+        claimPointIconUrl: newGame.claim_point_icon_url,
+        mineIconUrl: newGame.mine_icon_url,
         nextRefreshTime: newGame.next_refresh_time,
         playerRevealedCells: newGame.revealed_cells ?? []
       });
@@ -354,16 +354,16 @@ const Minesweeper: React.FC<MinesweeperProps> = ({ chatId, initData, onClaimPoin
         className={className}
         onClick={canInteract ? () => handleCellClick(row, col) : undefined}
       >
-        {shouldShowMine && gameData?.mineIcon && (
+        {shouldShowMine && gameData?.mineIconUrl && (
           <img
-            src={getIconObjectUrl(gameData.mineIcon)}
+            src={resolveAssetUrl(gameData.mineIconUrl)}
             alt="Mine"
             className="minesweeper-cell-icon minesweeper-cell-icon-mine"
           />
         )}
-        {shouldShowClaim && gameData?.claimPointIcon && (
+        {shouldShowClaim && gameData?.claimPointIconUrl && (
           <img
-            src={getIconObjectUrl(gameData.claimPointIcon)}
+            src={resolveAssetUrl(gameData.claimPointIconUrl)}
             alt="Claim Point"
             className="minesweeper-cell-icon minesweeper-cell-icon-claim"
           />
@@ -16,6 +16,15 @@ import type {
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || '/api';
 
+/**
+ * Resolve a static asset URL returned by the API.
+ *
+ * The API builds fingerprinted asset URLs under the default `/api` proxy path;
+ * rebase them onto `VITE_API_BASE_URL` when the API is served from elsewhere.
+ */
+export const resolveAssetUrl = (url: string): string =>
+  url.startsWith('/api/') ? `${API_BASE_URL}${url.slice('/api'.length)}` : url;
+
 export class ApiService {
   private static getHeaders(initData?: string | null): HeadersInit {
     const headers: HeadersInit = {
@@ -818,8 +827,8 @@ export class ApiService {
     mine_positions?: number[] | null;
     claim_point_positions?: number[] | null;
     card_icon?: string | null;
-    claim_point_icon?: string | null;
-    mine_icon?: string | null;
+    claim_point_icon_url?: string | null;
+    mine_icon_url?: string | null;
     next_refresh_time?: string | null;
   } | null> {
     const params = new URLSearchParams({
@@ -867,8 +876,8 @@ export class ApiService {
     mine_positions?: number[] | null;
     claim_point_positions?: number[] | null;
     card_icon?: string | null;
-    claim_point_icon?: string | null;
-    mine_icon?: string | null;
+    claim_point_icon_url?: string | null;
+    mine_icon_url?: string | null;
     next_refresh_time?: string | null;
   }> {
     const response = await fetch(`${API_BASE_URL}/minesweeper/game/create`, {